@@ -0,0 +1,9 @@
+# benchmarks/__init__.py
+"""
+Performans ölçüm betikleri. Uygulama koduna bağımlı değildir; her betik
+geçici bir veritabanı kurar, ölçer ve sonucu yazdırır.
+
+    python -m benchmarks.nb_plan_benchmark
+    python -m benchmarks.nb_regresyon --cikti sonuc.json      # JSON, sürüm takibi
+    python -m benchmarks.nb_sentetik /tmp/nb.db --birim 4     # yalnızca veritabanı
+"""
@@ -0,0 +1,143 @@
+# benchmarks/nb_plan_benchmark.py
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# NbAlgoritma.plan_olustur ölçümü (60 personel, 6 grup, 1 ay)
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+"""
+Geçici bir veritabanını MigrationManager ile kurar, bir birimi
+sentetik verilerle doldurur ve plan_olustur'u tekrar tekrar çalıştırır.
+
+Raporlanan değerler:
+  - süre  : en iyi / medyan (sn)
+  - sorgu : bir plan_olustur çağrısında çalışan SQL ifadesi sayısı
+  - satır : üretilen NB_PlanSatir sayısı
+
+Kullanım:
+    python -m benchmarks.nb_plan_benchmark
+    python -m benchmarks.nb_plan_benchmark --personel 60 --grup 6 --tekrar 5
+    python -m benchmarks.nb_plan_benchmark --motor cozucu --sure 5
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import shutil
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.nb_sentetik import SentetikAyar
+from benchmarks.nb_sentetik import veri_olustur as sentetik_veri_olustur
+
+
+def veri_olustur(db, yil: int, ay: int, personel_sayisi: int,
+                 grup_sayisi: int, tohum: int = 42) -> str:
+    """Birim + ayar + gruplar + personel + izin/tercih/devir kayıtları; BirimID döner."""
+    ayar = SentetikAyar(personel=personel_sayisi, grup=grup_sayisi,
+                        yil=yil, ay=ay, tohum=tohum)
+    return sentetik_veri_olustur(db, ayar)[0].birim_id
+
+
+# ════════════════ ÖLÇÜM ════════════════
+
+class _SorguSayaci:
+    """Yazıcı ve bu thread'in okuyucu bağlantısında çalışan SQL sayısı."""
+
+    def __init__(self, db):
+        self.adet = 0
+        self._baglantilar = {id(c): c for c in (db._havuz.yazici, db._havuz.okuyucu())}
+
+    def _say(self, _sql) -> None:
+        self.adet += 1
+
+    def __enter__(self):
+        for c in self._baglantilar.values():
+            c.set_trace_callback(self._say)
+        return self
+
+    def __exit__(self, *exc):
+        for c in self._baglantilar.values():
+            c.set_trace_callback(None)
+        return False
+
+
+def calistir(personel: int = 60, grup: int = 6, yil: int = 2026, ay: int = 3,
+             tekrar: int = 5, motor: str = "acgozlu",
+             sure: float | None = None) -> dict:
+    from database.migrations import MigrationManager
+    from database.repository_registry import RepositoryRegistry
+    from database.sqlite_manager import SQLiteManager
+    from core.services.nobet.nb_algoritma import NbAlgoritma
+
+    klasor = Path(tempfile.mkdtemp(prefix="nb_bench_"))
+    db = None
+    try:
+        db_yolu = str(klasor / "bench.db")
+        MigrationManager(db_yolu).run_migrations()
+        db = SQLiteManager(db_path=db_yolu)
+        birim_id = veri_olustur(db, yil, ay, personel, grup)
+        algoritma = NbAlgoritma(RepositoryRegistry(db))
+
+        sureler, sorgular, satir = [], [], 0
+        for _ in range(tekrar):
+            with _SorguSayaci(db) as sayac:
+                t0 = time.perf_counter()
+                sonuc = algoritma.plan_olustur(
+                    birim_id, yil, ay, motor=motor, sure_butcesi_sn=sure)
+                sureler.append(time.perf_counter() - t0)
+            if not sonuc.basarili:
+                raise RuntimeError(sonuc.mesaj)
+            sorgular.append(sayac.adet)
+            satir = db.execute(
+                "SELECT COUNT(*) FROM NB_PlanSatir WHERE PlanID=?",
+                (sonuc.veri["PlanID"],)).fetchone()[0]
+
+        return {
+            "motor":    motor,
+            "personel": personel,
+            "grup":     grup,
+            "donem":    f"{yil}-{ay:02d}",
+            "tekrar":   tekrar,
+            "en_iyi_sn": round(min(sureler), 4),
+            "medyan_sn": round(statistics.median(sureler), 4),
+            "sorgu":    sorgular[-1],
+            "satir":    satir,
+            "bos_slot": len(sonuc.veri["uyarilar"]),
+            "metrikler": sonuc.veri.get("metrikler", {}),
+        }
+    finally:
+        if db is not None:
+            db.close()
+        shutil.rmtree(klasor, ignore_errors=True)
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description="NbAlgoritma.plan_olustur ölçümü")
+    ap.add_argument("--personel", type=int, default=60)
+    ap.add_argument("--grup", type=int, default=6)
+    ap.add_argument("--yil", type=int, default=2026)
+    ap.add_argument("--ay", type=int, default=3)
+    ap.add_argument("--tekrar", type=int, default=5)
+    ap.add_argument("--motor", choices=("acgozlu", "cozucu"), default="acgozlu")
+    ap.add_argument("--sure", type=float, default=None,
+                    help="çözücü süre bütçesi (sn)")
+    args = ap.parse_args(argv)
+
+    # Algoritmanın satır başı INFO logları ölçümü bastırmasın
+    logging.disable(logging.INFO)
+    s = calistir(args.personel, args.grup, args.yil, args.ay, args.tekrar,
+                 args.motor, args.sure)
+    m = s["metrikler"]
+    print(
+        f"plan_olustur [{s['motor']}]  {s['personel']} personel / {s['grup']} grup / {s['donem']}\n"
+        f"  en iyi : {s['en_iyi_sn']:.4f} sn\n"
+        f"  medyan : {s['medyan_sn']:.4f} sn  ({s['tekrar']} tekrar)\n"
+        f"  sorgu  : {s['sorgu']}\n"
+        f"  satır  : {s['satir']}  (boş slot: {s['bos_slot']})\n"
+        f"  adalet : sapma ort {m.get('sapma_ort_saat')}s / maks {m.get('sapma_maks_saat')}s, "
+        f"jain {m.get('jain')}, hafta sonu {m.get('hafta_sonu_min')}-{m.get('hafta_sonu_maks')}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+# benchmarks/nb_regresyon.py
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Nöbet modülü regresyon ölçümü (JSON çıktı)
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+"""
+nb_sentetik ile geçici veritabanı kurar ve nöbet akışının ana adımlarını
+sırayla ölçer:
+
+  plan_olustur   NbAlgoritma.plan_olustur (tüm birimler)
+  mesai_hesapla  NbMesaiService.mesai_hesapla (onaylı planlar, tüm birimler)
+  rapor_verisi   NobetAdapter.get_onayli_rapor_verisi (ay, tüm birimler)
+  plan_sayfasi   PlanTakvimModeli.yukle — plan sayfasının veri yüklemesi
+
+Her ölçüm için ilk (soğuk) / en iyi / medyan süre ve son çağrıdaki SQL
+ifadesi sayısı raporlanır. Sonuç JSON'u sürümler arasında saklanır;
+--karsilastir önceki sonuca göre yavaşlayan veya daha çok sorgu çalıştıran
+adımları listeler ve varsa 1 ile çıkar.
+
+Kullanım:
+    python -m benchmarks.nb_regresyon --cikti sonuc.json
+    python -m benchmarks.nb_regresyon --birim 4 --personel 40 --tekrar 3
+    python -m benchmarks.nb_regresyon --karsilastir onceki.json --esik 1.25
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.nb_plan_benchmark import _SorguSayaci
+from benchmarks.nb_sentetik import SentetikAyar, veritabani_olustur
+
+# Bu sürenin altındaki medyan farkları gürültü sayılır (sn)
+GURULTU_SN = 0.005
+
+
+def _olc(db, fn, tekrar: int) -> dict:
+    """fn'i tekrar kez çalıştırır; süre ve sorgu sayısı özetini döner."""
+    sureler, sorgu = [], 0
+    for _ in range(tekrar):
+        with _SorguSayaci(db) as sayac:
+            t0 = time.perf_counter()
+            fn()
+            sureler.append(time.perf_counter() - t0)
+        sorgu = sayac.adet
+    return {
+        "ilk_sn":    round(sureler[0], 4),
+        "en_iyi_sn": round(min(sureler), 4),
+        "medyan_sn": round(statistics.median(sureler), 4),
+        "sorgu":     sorgu,
+        "tekrar":    tekrar,
+    }
+
+
+def _basarili(sonuc):
+    if not sonuc.basarili:
+        raise RuntimeError(sonuc.mesaj)
+    return sonuc.veri
+
+
+def _git_surumu() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent, capture_output=True,
+            text=True, timeout=5, check=True).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def calistir(ayar: SentetikAyar, tekrar: int = 5,
+             motor: str = "acgozlu") -> dict:
+    from core.config import AppConfig
+    from core.services.nobet.nb_algoritma import NbAlgoritma
+    from core.services.nobet.nobet_adapter import NobetAdapter
+    from database.repository_registry import RepositoryRegistry
+    from ui.pages.nobet.nobet_plan_modeli import PlanTakvimModeli
+
+    klasor = Path(tempfile.mkdtemp(prefix="nb_regresyon_"))
+    db = None
+    try:
+        db, birimler = veritabani_olustur(str(klasor / "regresyon.db"), ayar)
+        registry = RepositoryRegistry(db)
+        algoritma = NbAlgoritma(registry)
+        svc = NobetAdapter(registry)
+        yil, ay = ayar.yil, ayar.ay
+
+        planlar: dict[str, dict] = {}
+
+        def _plan_olustur():
+            for b in birimler:
+                planlar[b.birim_id] = _basarili(algoritma.plan_olustur(
+                    b.birim_id, yil, ay, motor=motor))
+
+        olcumler = {"plan_olustur": _olc(db, _plan_olustur, tekrar)}
+        olcumler["plan_olustur"]["satir"] = db.execute(
+            "SELECT COUNT(*) FROM NB_PlanSatir WHERE PlanID IN (%s) AND Durum='aktif'"
+            % ",".join("?" * len(planlar)),
+            [p["PlanID"] for p in planlar.values()]).fetchone()[0]
+        olcumler["plan_olustur"]["bos_slot"] = sum(
+            len(p.get("uyarilar", ())) for p in planlar.values())
+
+        for b in birimler:
+            _basarili(svc.plan.onayla(b.birim_id, yil, ay, "regresyon"))
+
+        def _mesai_hesapla():
+            for b in birimler:
+                _basarili(svc.mesai.mesai_hesapla(
+                    b.birim_id, planlar[b.birim_id]["PlanID"], yil, ay))
+
+        def _rapor_verisi():
+            _basarili(svc.get_onayli_rapor_verisi(yil, ay))
+
+        def _plan_sayfasi():
+            for b in birimler:
+                PlanTakvimModeli.yukle(svc, b.birim_id, b.birim_adi, yil, ay)
+
+        olcumler["mesai_hesapla"] = _olc(db, _mesai_hesapla, tekrar)
+        olcumler["rapor_verisi"]  = _olc(db, _rapor_verisi, tekrar)
+        olcumler["plan_sayfasi"]  = _olc(db, _plan_sayfasi, tekrar)
+
+        return {
+            "surum":    AppConfig.VERSION,
+            "commit":   _git_surumu(),
+            "tarih":    datetime.now().isoformat(timespec="seconds"),
+            "python":   platform.python_version(),
+            "platform": platform.platform(),
+            "motor":    motor,
+            "ayar":     asdict(ayar),
+            "olcumler": olcumler,
+        }
+    finally:
+        if db is not None:
+            db.close()
+        shutil.rmtree(klasor, ignore_errors=True)
+
+
+def karsilastir(onceki: dict, simdiki: dict, esik: float = 1.25) -> list[str]:
+    """
+    Geriye giden adımlar: medyan süre esik katını (ve GURULTU_SN'yi) aşan
+    veya sorgu sayısı artan ölçümler.
+    """
+    # JSON'dan okunan ayarla karşılaştırmak için (tuple → list)
+    if onceki.get("ayar") != json.loads(json.dumps(simdiki.get("ayar"))):
+        print("UYARI  karşılaştırılan sonuçların veri ayarları farklı",
+              file=sys.stderr)
+    geriye = []
+    for ad, yeni in simdiki.get("olcumler", {}).items():
+        eski = onceki.get("olcumler", {}).get(ad)
+        if not eski:
+            continue
+        e, y = eski["medyan_sn"], yeni["medyan_sn"]
+        if y - e > GURULTU_SN and e > 0 and y / e > esik:
+            geriye.append(f"{ad}: medyan {e:.4f} → {y:.4f} sn (x{y / e:.2f})")
+        if yeni.get("sorgu", 0) > eski.get("sorgu", 0):
+            geriye.append(f"{ad}: sorgu {eski['sorgu']} → {yeni['sorgu']}")
+    return geriye
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Nöbet modülü regresyon ölçümü")
+    ap.add_argument("--birim", type=int, default=2)
+    ap.add_argument("--personel", type=int, default=60, help="birim başına")
+    ap.add_argument("--grup", type=int, default=6, help="birim başına")
+    ap.add_argument("--yil", type=int, default=2026)
+    ap.add_argument("--ay", type=int, default=3)
+    ap.add_argument("--izin", type=float, default=0.4,
+                    help="bu aya izni düşen personel oranı")
+    ap.add_argument("--tatil", type=int, nargs="*", default=[1, 15])
+    ap.add_argument("--tohum", type=int, default=42)
+    ap.add_argument("--tekrar", type=int, default=5)
+    ap.add_argument("--motor", choices=("acgozlu", "cozucu"), default="acgozlu")
+    ap.add_argument("--cikti", help="sonuç JSON dosyası (yoksa stdout)")
+    ap.add_argument("--karsilastir", help="önceki sonuç JSON dosyası")
+    ap.add_argument("--esik", type=float, default=1.25,
+                    help="medyan süre artış eşiği (kat)")
+    args = ap.parse_args(argv)
+
+    logging.disable(logging.INFO)
+    ayar = SentetikAyar(birim_sayisi=args.birim, personel=args.personel,
+                        grup=args.grup, yil=args.yil, ay=args.ay,
+                        izin_yogunlugu=args.izin, tatil_gunleri=tuple(args.tatil),
+                        tohum=args.tohum)
+    sonuc = calistir(ayar, args.tekrar, args.motor)
+
+    metin = json.dumps(sonuc, ensure_ascii=False, indent=2)
+    if args.cikti:
+        Path(args.cikti).write_text(metin + "\n", encoding="utf-8")
+        for ad, o in sonuc["olcumler"].items():
+            print(f"{ad:<14} ilk {o['ilk_sn']:.4f}  en iyi {o['en_iyi_sn']:.4f}  "
+                  f"medyan {o['medyan_sn']:.4f} sn  sorgu {o['sorgu']}")
+    else:
+        print(metin)
+
+    if args.karsilastir:
+        onceki = json.loads(Path(args.karsilastir).read_text(encoding="utf-8"))
+        geriye = karsilastir(onceki, sonuc, args.esik)
+        for satir in geriye:
+            print(f"GERİLEME  {satir}", file=sys.stderr)
+        return 1 if geriye else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+# benchmarks/nb_sentetik.py
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Nöbet modülü için sentetik veritabanı üreteci
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+"""
+Gerçek şemayı (MigrationManager) kurup birim, vardiya grubu, personel,
+izin, tatil, tercih ve önceki ay devir kayıtlarıyla doldurur. Aynı
+ayar + tohum her zaman aynı veritabanını üretir.
+
+    ayar = SentetikAyar(birim_sayisi=4, personel=40, izin_yogunlugu=0.3)
+    db, birimler = veritabani_olustur("/tmp/nb.db", ayar)
+
+    python -m benchmarks.nb_sentetik /tmp/nb.db --birim 4 --personel 40
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import uuid
+from calendar import monthrange
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+
+@dataclass
+class SentetikAyar:
+    """Üretilecek verinin boyutları (personel / grup birim başınadır)."""
+    birim_sayisi: int = 1
+    personel: int = 60
+    grup: int = 6
+    yil: int = 2026
+    ay: int = 3
+    izin_yogunlugu: float = 0.4      # bu aya izni düşen personel oranı
+    gecmis_izin: int = 40            # personel başına geçmiş yıllara ait izin
+    tatil_gunleri: tuple[int, ...] = field(default=(1, 15))
+    tohum: int = 42
+
+
+@dataclass
+class SentetikBirim:
+    birim_id: str
+    birim_adi: str
+    personel_idler: list[str]
+
+
+def _id(kimlik: random.Random) -> str:
+    """Tohumdan türetilen UUID; aynı ayar + tohum aynı ID'leri üretir."""
+    return str(uuid.UUID(int=kimlik.getrandbits(128), version=4))
+
+
+def birim_olustur(db, ayar: SentetikAyar, rnd: random.Random,
+                  birim_kodu: str, birim_adi: str,
+                  pid_baslangic: int = 0) -> SentetikBirim:
+    """Tek birim: ayar + gruplar + personel + izin/tercih/devir kayıtları."""
+    yil, ay = ayar.yil, ayar.ay
+    # ID'ler ayrı akıştan: rnd'nin ürettiği izin / devir verisi ID'lerden etkilenmez
+    kimlik = random.Random(f"{ayar.tohum}:{birim_kodu}")
+    birim_id = _id(kimlik)
+    ay_bas = date(yil, ay, 1)
+    ay_son = monthrange(yil, ay)[1]
+
+    with db.transaction():
+        db.execute(
+            "INSERT INTO NB_Birim (BirimID, BirimKodu, BirimAdi) VALUES (?, ?, ?)",
+            (birim_id, birim_kodu, birim_adi))
+        db.execute(
+            "INSERT INTO NB_BirimAyar (AyarID, BirimID, GunlukSlotSayisi, "
+            "MaxGunlukSureDakika, FmMaxSaat) VALUES (?, ?, ?, ?, ?)",
+            (_id(kimlik), birim_id, 1, 720, 60))
+
+        # Her grupta gündüz + gece (12s + 12s)
+        for g in range(ayar.grup):
+            grup_id = _id(kimlik)
+            db.execute(
+                "INSERT INTO NB_VardiyaGrubu (GrupID, BirimID, GrupAdi, Sira) "
+                "VALUES (?, ?, ?, ?)",
+                (grup_id, birim_id, f"Grup {g + 1}", g + 1))
+            for sira, (adi, bas, bit) in enumerate(
+                    (("Gündüz", "08:00", "20:00"), ("Gece", "20:00", "08:00")), 1):
+                db.execute(
+                    "INSERT INTO NB_Vardiya (VardiyaID, GrupID, BirimID, VardiyaAdi, "
+                    "BasSaat, BitSaat, SureDakika, Sira) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (_id(kimlik), grup_id, birim_id, adi, bas, bit, 720, sira))
+
+        pidler = [f"{10000000000 + pid_baslangic + i}" for i in range(ayar.personel)]
+        db.executemany(
+            "INSERT INTO Personel (KimlikNo, AdSoyad, GorevYeri, Durum) VALUES (?, ?, ?, ?)",
+            [(pid, f"Personel {pid_baslangic + i}", birim_adi, "Aktif")
+             for i, pid in enumerate(pidler)])
+        db.executemany(
+            "INSERT INTO NB_BirimPersonel (ID, BirimID, PersonelID, GorevBaslangic) "
+            "VALUES (?, ?, ?, ?)",
+            [(_id(kimlik), birim_id, pid, "2020-01-01") for pid in pidler])
+
+        # Geçmiş yıllara ait izinler (tablo büyüklüğü) + bu aya düşen onaylı izinler
+        izinler = []
+        for pid in pidler:
+            for _ in range(ayar.gecmis_izin):
+                bas = date(yil - rnd.randint(1, 5), rnd.randint(1, 12), rnd.randint(1, 28))
+                gun = rnd.randint(1, 10)
+                izinler.append((_id(kimlik), pid, "Yıllık İzin", bas.isoformat(), gun,
+                                (bas + timedelta(days=gun - 1)).isoformat(), "Onaylandı"))
+            if rnd.random() < ayar.izin_yogunlugu:
+                bas = ay_bas + timedelta(days=rnd.randint(0, ay_son - 1))
+                gun = rnd.randint(1, 7)
+                izinler.append((_id(kimlik), pid, "Yıllık İzin", bas.isoformat(), gun,
+                                (bas + timedelta(days=gun - 1)).isoformat(), "Onaylandı"))
+        db.executemany(
+            "INSERT INTO Izin_Giris (Izinid, Personelid, IzinTipi, BaslamaTarihi, "
+            "Gun, BitisTarihi, Durum) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            izinler)
+
+        # Tercihler: birkaç emzirme/sendika + FM gönüllüleri
+        tercihler = []
+        for i, pid in enumerate(pidler):
+            if i % 10 == 0:
+                tercihler.append((_id(kimlik), pid, birim_id, yil, ay, "zorunlu", "emzirme"))
+            elif i % 10 == 1:
+                tercihler.append((_id(kimlik), pid, birim_id, yil, ay, "zorunlu", "sendika"))
+            elif i % 10 == 2:
+                tercihler.append((_id(kimlik), pid, birim_id, yil, ay,
+                                  "fazla_mesai_gonullu", "normal"))
+        db.executemany(
+            "INSERT INTO NB_PersonelTercih (TercihID, PersonelID, BirimID, Yil, Ay, "
+            "NobetTercihi, HedefTipi) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            tercihler)
+
+        # Önceki ay devir bakiyeleri
+        prev_yil, prev_ay = (yil - 1, 12) if ay == 1 else (yil, ay - 1)
+        prev_plan = _id(kimlik)
+        db.execute(
+            "INSERT INTO NB_Plan (PlanID, BirimID, Yil, Ay, Durum) VALUES (?, ?, ?, ?, ?)",
+            (prev_plan, birim_id, prev_yil, prev_ay, "onaylandi"))
+        db.executemany(
+            "INSERT INTO NB_MesaiHesap (HesapID, PersonelID, BirimID, PlanID, Yil, Ay, "
+            "DevireGidenDakika) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(_id(kimlik), pid, birim_id, prev_plan, prev_yil, prev_ay,
+              rnd.choice((-720, -360, 0, 0, 360, 720))) for pid in pidler])
+
+    return SentetikBirim(birim_id, birim_adi, pidler)
+
+
+def tatilleri_olustur(db, ayar: SentetikAyar) -> None:
+    """Ayın tatil_gunleri günlerini Tatiller'e yazar (mevcutlar korunur)."""
+    ay_son = monthrange(ayar.yil, ayar.ay)[1]
+    db.executemany(
+        "INSERT OR IGNORE INTO Tatiller (Tarih, ResmiTatil) VALUES (?, ?)",
+        [(date(ayar.yil, ayar.ay, g).isoformat(), "Tatil")
+         for g in ayar.tatil_gunleri if 1 <= g <= ay_son])
+
+
+def veri_olustur(db, ayar: SentetikAyar) -> list[SentetikBirim]:
+    """Şeması kurulu db'yi ayar'a göre doldurur."""
+    rnd = random.Random(ayar.tohum)
+    birimler = []
+    for b in range(ayar.birim_sayisi):
+        kod, adi = (("BENCH", "Benchmark Birimi") if b == 0
+                    else (f"BENCH{b + 1}", f"Benchmark Birimi {b + 1}"))
+        birimler.append(birim_olustur(db, ayar, rnd, kod, adi,
+                                      pid_baslangic=b * ayar.personel))
+    tatilleri_olustur(db, ayar)
+    return birimler
+
+
+def veritabani_olustur(db_yolu: str, ayar: SentetikAyar):
+    """db_yolu'nda şemayı kurar ve doldurur; (SQLiteManager, birimler) döner."""
+    from database.migrations import MigrationManager
+    from database.sqlite_manager import SQLiteManager
+
+    MigrationManager(db_yolu).run_migrations()
+    db = SQLiteManager(db_path=db_yolu)
+    return db, veri_olustur(db, ayar)
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description="Nöbet modülü sentetik veritabanı")
+    ap.add_argument("db_yolu")
+    ap.add_argument("--birim", type=int, default=1)
+    ap.add_argument("--personel", type=int, default=60, help="birim başına")
+    ap.add_argument("--grup", type=int, default=6, help="birim başına")
+    ap.add_argument("--yil", type=int, default=2026)
+    ap.add_argument("--ay", type=int, default=3)
+    ap.add_argument("--izin", type=float, default=0.4,
+                    help="bu aya izni düşen personel oranı")
+    ap.add_argument("--gecmis-izin", type=int, default=40)
+    ap.add_argument("--tatil", type=int, nargs="*", default=[1, 15],
+                    help="ayın tatil günleri")
+    ap.add_argument("--tohum", type=int, default=42)
+    args = ap.parse_args(argv)
+
+    logging.disable(logging.INFO)
+    ayar = SentetikAyar(args.birim, args.personel, args.grup, args.yil, args.ay,
+                        args.izin, args.gecmis_izin, tuple(args.tatil), args.tohum)
+    db, birimler = veritabani_olustur(args.db_yolu, ayar)
+    db.close()
+    for b in birimler:
+        print(f"{b.birim_id}  {b.birim_adi}  ({len(b.personel_idler)} personel)")
+
+
+if __name__ == "__main__":
+    main()
@@ -16,6 +16,7 @@ class AppConfig:
 
     AUTO_SYNC = True
     SYNC_INTERVAL_MIN = 15
+    SYNC_WORKERS = 4            # eşzamanlı tablo sync sayısı (1 = sıralı)
 
     # Uygulama çalışma modu
     MODE_ONLINE = "online"
@@ -115,6 +116,16 @@ def get_auto_sync(cls) -> bool:
             return bool(_app_settings.get("auto_sync", cls.AUTO_SYNC))
         return cls.AUTO_SYNC
 
+    @classmethod
+    def get_sync_workers(cls) -> int:
+        """ayarlar.json 'sync_workers' değeri (yoksa SYNC_WORKERS)."""
+        if _app_settings:
+            try:
+                return max(1, int(_app_settings.get("sync_workers", cls.SYNC_WORKERS)))
+            except (TypeError, ValueError):
+                pass
+        return cls.SYNC_WORKERS
+
 
 # Import anında modu çözümle (env/settings/credentials)
 AppConfig.resolve_app_mode()
@@ -2,12 +2,10 @@
 """
 Hesaplama modülü
 - Fiili Hizmet Süresi Zammı (Şua) hak ediş hesabı
-- İş günü hesabı (numpy busday_count)
+- İş günü hesabı (core.is_takvimi → numpy busdaycalendar)
 - Türkçe karakter desteği
 """
-import numpy as np
 import math
-from datetime import timedelta
 
 
 # --- YARDIMCI METİN FONKSİYONLARI ---
@@ -43,23 +41,12 @@ def is_gunu_hesapla(baslangic, bitis, tatil_listesi=None):
     """
     İki tarih arasındaki iş günlerini hesaplar.
     Hafta sonları ve verilen tatil listesi düşülür.
-    numpy.busday_count ile yüksek performanslı hesap.
+    Hesap core.is_takvimi.IsTakvimi'ye devredilir; aynı tatil listesi
+    için numpy takvimi bir kez kurulur.
     """
-    if tatil_listesi is None:
-        tatil_listesi = []
-
     try:
-        dates_start = baslangic.strftime('%Y-%m-%d')
-        # Bitiş günü dahil olsun diye +1 gün eklenir
-        dates_end = (bitis + timedelta(days=1)).strftime('%Y-%m-%d')
-
-        # '1111100' -> Pzt-Cum çalışılır (1), Cmt-Paz tatil (0)
-        workdays = np.busday_count(
-            dates_start, dates_end,
-            weekmask='1111100',
-            holidays=tatil_listesi
-        )
-        return int(workdays)
+        from core.is_takvimi import listeden_takvim
+        return listeden_takvim(tatil_listesi).is_gunu(baslangic, bitis)
     except Exception:
         return 0
 
@@ -0,0 +1,167 @@
+# core/is_takvimi.py
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# İş günü takvimi (Tatiller → numpy.busdaycalendar)
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+"""
+Hafta sonu + Tatiller'i bir kez numpy.busdaycalendar'a çevirir; iş günü
+sayımları bu takvim üzerinden yapılır (gün gün döngü yok, her çağrıda
+tatil listesi yeniden dönüştürülmez).
+
+    takvim = is_takvimi_al(db)                  # Resmi + DiniBayram
+    takvim.is_gunu(bas, bit)                    # bitiş dahil
+    takvim.is_gunu_dizi(baslar, bitler)         # aralık dizisi → np.ndarray
+    takvim.ay_is_gunu(2026, 3)
+
+is_takvimi_al, db dosyası + tatil türü başına tek takvim tutar. Tatiller
+değişince (BaseRepository yazımı, SyncService pull'u, SettingsService)
+tablo önbelleğinin nesli artar; sonraki çağrı takvimi yeniden kurar.
+
+Tarih girdileri date/datetime veya "YYYY-MM-DD" (ve date_utils'in
+tanıdığı diğer biçimler) olabilir.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from calendar import monthrange
+from datetime import date
+from functools import lru_cache
+from typing import Iterable, Optional
+
+import numpy as np
+
+from core.date_utils import parse_date
+from core.logger import logger
+
+
+HAFTA_MASKESI = "1111100"                        # Pzt-Cum çalışılır
+HEDEF_TATIL_TURLERI = ("Resmi", "DiniBayram")    # hedef / iş günü hesabı
+VARSAYILAN_TATIL_TURU = "Resmi"                  # TatilTuru kolonu yoksa / boşsa
+
+
+def _gun64(deger) -> np.datetime64:
+    if isinstance(deger, np.datetime64):
+        return deger.astype("datetime64[D]")
+    if isinstance(deger, date):
+        return np.datetime64(deger, "D")
+    d = parse_date(deger)
+    if d is None:
+        raise ValueError(f"Geçersiz tarih: {deger!r}")
+    return np.datetime64(d, "D")
+
+
+def _gun_dizisi(degerler) -> np.ndarray:
+    if isinstance(degerler, np.ndarray) and np.issubdtype(degerler.dtype, np.datetime64):
+        return degerler.astype("datetime64[D]")
+    try:
+        # ISO metin / date / datetime — NumPy doğrudan dönüştürür
+        return np.array(degerler, dtype="datetime64[D]")
+    except (ValueError, TypeError):
+        return np.array([_gun64(d) for d in degerler], dtype="datetime64[D]")
+
+
+class IsTakvimi:
+    """Hafta sonu + verilen tatiller üzerinden iş günü hesabı."""
+
+    def __init__(self, tatiller: Iterable = ()):
+        gunler = sorted({d for d in (parse_date(t) for t in tatiller) if d})
+        self.tatiller: frozenset[str] = frozenset(d.isoformat() for d in gunler)
+        self._takvim = np.busdaycalendar(
+            weekmask=HAFTA_MASKESI,
+            holidays=np.array(gunler, dtype="datetime64[D]"))
+
+    # ── Tekil ───────────────────────────────────────────────
+
+    def is_gunu(self, bas, bit) -> int:
+        """bas..bit (ikisi dahil) arasındaki iş günü; bas > bit → 0."""
+        b, s = _gun64(bas), _gun64(bit)
+        if b > s:
+            return 0
+        return int(np.busday_count(b, s + 1, busdaycal=self._takvim))
+
+    def is_gunu_mu(self, tarih) -> bool:
+        return bool(np.is_busday(_gun64(tarih), busdaycal=self._takvim))
+
+    def ay_is_gunu(self, yil: int, ay: int) -> int:
+        return self.is_gunu(date(yil, ay, 1), date(yil, ay, monthrange(yil, ay)[1]))
+
+    def ay_maskesi(self, yil: int, ay: int) -> int:
+        """Ayın iş günleri bit maskesi (bit d-1 = ayın d. günü)."""
+        gunler = np.arange(np.datetime64(date(yil, ay, 1), "D"),
+                           np.datetime64(date(yil, ay, monthrange(yil, ay)[1]), "D") + 1)
+        bitler = np.is_busday(gunler, busdaycal=self._takvim)
+        return sum(1 << i for i in np.flatnonzero(bitler).tolist())
+
+    # ── Vektörel ────────────────────────────────────────────
+
+    def is_gunu_dizi(self, baslar, bitler) -> np.ndarray:
+        """Her (bas, bit) aralığının iş günü (bitiş dahil); bas > bit → 0."""
+        b = _gun_dizisi(baslar)
+        s = _gun_dizisi(bitler)
+        sayim = np.busday_count(b, s + 1, busdaycal=self._takvim)
+        return np.where(b <= s, sayim, 0).astype(np.int64)
+
+    def kesisim_is_gunu(self, baslar, bitler, donem_bas, donem_bit) -> int:
+        """Aralıkların [donem_bas, donem_bit] ile kesişen iş günleri toplamı."""
+        if len(baslar) == 0:
+            return 0
+        b = np.maximum(_gun_dizisi(baslar), _gun64(donem_bas))
+        s = np.minimum(_gun_dizisi(bitler), _gun64(donem_bit))
+        return int(self.is_gunu_dizi(b, s).sum())
+
+
+# ══════════════════════════════════════════════════════════════
+#  Paylaşılan takvimler
+# ══════════════════════════════════════════════════════════════
+
+_takvimler: dict[tuple, tuple[int, IsTakvimi]] = {}
+_takvim_kilidi = threading.Lock()
+
+
+def _tatilleri_oku(db, turler: Optional[tuple]) -> list[str]:
+    try:
+        rows = db.execute("SELECT * FROM Tatiller").fetchall()
+    except Exception as e:
+        logger.warning(f"IsTakvimi: Tatiller okunamadı: {e}")
+        return []
+    sonuc = []
+    for r in rows:
+        r = dict(r)
+        if turler is not None:
+            turu = str(r.get("TatilTuru") or VARSAYILAN_TATIL_TURU)
+            if turu not in turler:
+                continue
+        sonuc.append(r.get("Tarih"))
+    return sonuc
+
+
+def is_takvimi_al(db, turler: Optional[tuple] = HEDEF_TATIL_TURLERI) -> IsTakvimi:
+    """
+    db'nin Tatiller tablosundan takvim (turler None → tüm tatiller).
+    db: SQLiteManager veya RepositoryRegistry.
+    """
+    from database.table_cache import onbellek_al
+
+    db = getattr(db, "db", db)
+    yol = getattr(db, "db_path", None)
+    anahtar = (os.path.abspath(yol) if yol and yol != ":memory:" else id(db), turler)
+    onbellek = onbellek_al(db)
+    nesil = onbellek.nesil("Tatiller")
+    with _takvim_kilidi:
+        kayit = _takvimler.get(anahtar)
+        if kayit and kayit[0] == nesil:
+            return kayit[1]
+    takvim = IsTakvimi(_tatilleri_oku(db, turler))
+    with _takvim_kilidi:
+        _takvimler[anahtar] = (nesil, takvim)
+    return takvim
+
+
+@lru_cache(maxsize=32)
+def _listeden(tatiller: tuple) -> IsTakvimi:
+    return IsTakvimi(tatiller)
+
+
+def listeden_takvim(tatil_listesi) -> IsTakvimi:
+    """Hazır tatil listesinden takvim; aynı liste tekrar dönüştürülmez."""
+    return _listeden(tuple(tatil_listesi or ()))
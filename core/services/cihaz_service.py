@@ -63,6 +63,20 @@ def cihaz_ekle(self, veri: dict) -> SonucYonetici:
         except Exception as e:
             return SonucYonetici.hata(e, "CihazService.cihaz_ekle")
 
+    def toplu_cihaz_ekle(self, kayitlar: list[dict]) -> SonucYonetici:
+        """
+        Çok sayıda cihazı tek transaction'da ekler (Excel içe aktarma).
+        veri: {kayitlar indeksi: hata mesajı} — yalnızca eklenemeyenler.
+        """
+        try:
+            hatalar = self._r.get("Cihazlar").insert_many_raporlu(kayitlar)
+            return SonucYonetici.tamam(
+                f"{len(kayitlar) - len(hatalar)} cihaz eklendi",
+                veri={i: str(exc) for i, exc in hatalar.items()},
+            )
+        except Exception as e:
+            return SonucYonetici.hata(e, "CihazService.toplu_cihaz_ekle")
+
     def cihaz_guncelle(self, cihaz_id: str, veri: dict) -> SonucYonetici:
         """Cihaz bilgilerini güncelle."""
         try:
@@ -97,7 +97,7 @@ def _yaklasan_ndk(self, today: datetime, today_str: str) -> SonucYonetici:
             six_months = (today + timedelta(days=180)).strftime("%Y-%m-%d")
             count = self._count_where(
                 "Cihazlar",
-                lambda r: today_str <= str(r.get("BitisTarihi", "")) <= six_months
+                lambda q: q.between("BitisTarihi", today_str, six_months)
             ).veri or 0
             return SonucYonetici.tamam(veri=count)
         except Exception as e:
@@ -109,9 +109,9 @@ def _aylik_bakim(self, today: datetime) -> SonucYonetici:
             m_start, m_end = self._month_range(today)
             count = self._count_where(
                 "Periyodik_Bakim",
-                lambda r: (
-                    m_start <= str(r.get("PlanlananTarih", "")) <= m_end
-                    and str(r.get("Durum", "")).strip() == "Planlandı"
+                lambda q: (
+                    q.between("PlanlananTarih", m_start, m_end)
+                    .where_trimmed(Durum="Planlandı")
                 )
             ).veri or 0
             return SonucYonetici.tamam(veri=count)
@@ -124,9 +124,9 @@ def _aylik_kalibrasyon(self, today: datetime) -> SonucYonetici:
             m_start, m_end = self._month_range(today)
             count = self._count_where(
                 "Kalibrasyon",
-                lambda r: (
-                    m_start <= str(r.get("BitisTarihi", "")) <= m_end
-                    and str(r.get("Durum", "")).strip() == "Tamamlandı"
+                lambda q: (
+                    q.between("BitisTarihi", m_start, m_end)
+                    .where_trimmed(Durum="Tamamlandı")
                 )
             ).veri or 0
             return SonucYonetici.tamam(veri=count)
@@ -139,9 +139,9 @@ def _yeni_arizalar(self, today: datetime, today_str: str) -> SonucYonetici:
             one_week_ago = (today - timedelta(days=7)).strftime("%Y-%m-%d")
             count = self._count_where(
                 "Cihaz_Ariza",
-                lambda r: (
-                    str(r.get("BaslangicTarihi", "")) >= one_week_ago
-                    and str(r.get("Durum", "")).strip() != "Kapatıldı"
+                lambda q: (
+                    q.between("BaslangicTarihi", bas=one_week_ago)
+                    .where_not_trimmed(Durum="Kapatıldı")
                 )
             ).veri or 0
             return SonucYonetici.tamam(veri=count)
@@ -153,7 +153,7 @@ def _aktif_personel(self) -> SonucYonetici:
         try:
             count = self._count_where(
                 "Personel",
-                lambda r: str(r.get("Durum", "")).strip() == "Aktif"
+                lambda q: q.where_trimmed(Durum="Aktif")
             ).veri or 0
             return SonucYonetici.tamam(veri=count)
         except Exception as e:
@@ -165,9 +165,9 @@ def _yaklasan_rke(self, today: datetime, today_str: str) -> SonucYonetici:
             one_month = (today + timedelta(days=30)).strftime("%Y-%m-%d")
             count = self._count_where(
                 "RKE_List",
-                lambda r: (
-                    today_str <= str(r.get("KontrolTarihi", "")) <= one_month
-                    and str(r.get("Durum", "")).strip() == "Planlandı"
+                lambda q: (
+                    q.between("KontrolTarihi", today_str, one_month)
+                    .where_trimmed(Durum="Planlandı")
                 )
             ).veri or 0
             return SonucYonetici.tamam(veri=count)
@@ -180,9 +180,9 @@ def _yaklasan_saglik(self, today: datetime, today_str: str) -> SonucYonetici:
             three_months = (today + timedelta(days=90)).strftime("%Y-%m-%d")
             count = self._count_where(
                 "Personel_Saglik_Takip",
-                lambda r: (
-                    today_str <= str(r.get("SonrakiKontrolTarihi", "")) <= three_months
-                    and str(r.get("Durum", "")).strip() != "Pasif"
+                lambda q: (
+                    q.between("SonrakiKontrolTarihi", today_str, three_months)
+                    .where_not_trimmed(Durum="Pasif")
                 )
             ).veri or 0
             return SonucYonetici.tamam(veri=count)
@@ -194,10 +194,9 @@ def _gecmis_saglik(self, today_str: str) -> SonucYonetici:
         try:
             count = self._count_where(
                 "Personel_Saglik_Takip",
-                lambda r: (
-                    str(r.get("SonrakiKontrolTarihi", "")).strip() != ""
-                    and str(r.get("SonrakiKontrolTarihi", "")) < today_str
-                    and str(r.get("Durum", "")).strip() != "Pasif"
+                lambda q: (
+                    q.less_than("SonrakiKontrolTarihi", today_str)
+                    .where_not_trimmed(SonrakiKontrolTarihi="", Durum="Pasif")
                 )
             ).veri or 0
             return SonucYonetici.tamam(veri=count)
@@ -209,7 +208,7 @@ def _acik_arizalar(self) -> SonucYonetici:
         try:
             count = self._count_where(
                 "Cihaz_Ariza",
-                lambda r: str(r.get("Durum", "")).strip() == "Açık"
+                lambda q: q.where_trimmed(Durum="Açık")
             ).veri or 0
             return SonucYonetici.tamam(veri=count)
         except Exception as e:
@@ -220,10 +219,10 @@ def _gecmis_kalibrasyon(self, today_str: str) -> SonucYonetici:
         try:
             count = self._count_where(
                 "Kalibrasyon",
-                lambda r: (
-                    str(r.get("BitisTarihi", "")).strip() != ""
-                    and str(r.get("BitisTarihi", "")) < today_str
-                    and str(r.get("Durum", "")).strip() == "Tamamlandı"
+                lambda q: (
+                    q.less_than("BitisTarihi", today_str)
+                    .where_not_trimmed(BitisTarihi="")
+                    .where_trimmed(Durum="Tamamlandı")
                 )
             ).veri or 0
             return SonucYonetici.tamam(veri=count)
@@ -241,7 +240,9 @@ def _aylik_izin_stats(self, today: datetime) -> SonucYonetici:
         }
         try:
             m_start, m_end = self._month_range(today)
-            records = self._r.get("Izin_Giris").get_all() or []
+            # Ay sonundan sonra başlayan izinler hiç ilgilenmez → SQL'de ele
+            records = (self._r.get("Izin_Giris").query()
+                       .less_than("BaslamaTarihi", m_end).all())
             by_type: dict[str, set] = {"yillik": set(), "sua": set(), "rapor": set(), "diger": set()}
             all_personnel: set = set()
 
@@ -273,10 +274,10 @@ def _aylik_izin_stats(self, today: datetime) -> SonucYonetici:
     #  Yardımcılar
     # ───────────────────────────────────────────────────────────
 
-    def _count_where(self, table: str, predicate) -> SonucYonetici:
-        """Bir tablodaki kayıtları filtre fonksiyonu ile say."""
-        rows = self._r.get(table).get_all() or []
-        return SonucYonetici.tamam(veri=sum(1 for r in rows if predicate(r)))
+    def _count_where(self, table: str, filtre) -> SonucYonetici:
+        """Bir tablodaki kayıtları Query filtresi ile SQLite tarafında say."""
+        sorgu = filtre(self._r.get(table).query())
+        return SonucYonetici.tamam(veri=sorgu.count())
 
     def _month_range(self, today: datetime) -> tuple[str, str]:
         """Ayın ilk ve son günü string olarak döndür."""
@@ -42,6 +42,11 @@
 
 TC_REGEX = re.compile(r"^\d{11}$")
 
+# Şablon yerleşimi: başlık 6. satır, veri 7–56. satırlar, A–N kolonları
+BASLIK_SATIRI  = 6
+VERI_SON_SATIR = 56
+SON_KOLON      = 14
+
 # Türkçe ay adları → numara
 _AY_MAP = {
     "oca": 1, "ocak": 1,
@@ -202,11 +207,27 @@ def excel_oku(
             import_tarihi=import_tarihi,
         )
 
+        # read_only: hücreler satır satır akar; stiller ve diğer sayfalar
+        # belleğe alınmaz. Sayfa yalnızca bir kez baştan sona okunur.
         try:
-            wb = openpyxl.load_workbook(dosya_yolu, data_only=True)
+            wb = openpyxl.load_workbook(dosya_yolu, read_only=True, data_only=True)
         except Exception as e:
             return SonucYonetici.hata(ValueError(f"Dosya açılamadı: {e}"), "DisAlanImportService.excel_oku")
 
+        try:
+            return self._sayfa_oku(wb, sonuc, donem_ay, donem_yil, katsayi_cache)
+        finally:
+            wb.close()
+
+    def _sayfa_oku(
+        self,
+        wb,
+        sonuc: ImportSonucu,
+        donem_ay: int,
+        donem_yil: int,
+        katsayi_cache: Optional[dict],
+    ) -> SonucYonetici:
+        import_tarihi = sonuc.import_tarihi
         if "Veri Girişi" not in wb.sheetnames:
             return SonucYonetici.hata(ValueError(
                 "'Veri Girişi' sayfası bulunamadı — "
@@ -214,14 +235,24 @@ def excel_oku(
             ), "DisAlanImportService.excel_oku")
 
         ws = wb["Veri Girişi"]
+        satir_akisi = ws.iter_rows(
+            min_row=1, max_row=VERI_SON_SATIR, max_col=SON_KOLON, values_only=True
+        )
+        # Satır 1–6: üst bilgi + başlık (değerler 0 tabanlı: [satır-1][kolon-1])
+        ust = [tuple(r) for _, r in zip(range(BASLIK_SATIRI), satir_akisi)]
+        ust += [()] * (BASLIK_SATIRI - len(ust))
+
+        def _hucre(satir: int, kolon: int):
+            degerler = ust[satir - 1]
+            return degerler[kolon - 1] if kolon <= len(degerler) else None
 
         # Üst bilgi — B3:AnaBilimDali, B4:Birim, F3:Dönem
-        anabilim = str(ws["B3"].value or "").strip()
-        birim    = str(ws["B4"].value or "").strip()
+        anabilim = str(_hucre(3, 2) or "").strip()
+        birim    = str(_hucre(4, 2) or "").strip()
 
         # Dönem: D3=Ay, D4=Yıl
-        d3_val = ws["D3"].value
-        d4_val = ws["D4"].value
+        d3_val = _hucre(3, 4)
+        d4_val = _hucre(4, 4)
 
         # Yıl — D4
         if not donem_yil:
@@ -251,7 +282,7 @@ def excel_oku(
         sonuc.donem_yil     = donem_yil
 
         # Kolon haritası
-        kolon_idx = self._kolon_haritasi_bul(ws, baslik_satiri=6)
+        kolon_idx = self._kolon_haritasi_bul(ust[BASLIK_SATIRI - 1])
         if not kolon_idx:
             return SonucYonetici.hata(ValueError(
                 "Başlık satırı tanınamadı. "
@@ -262,9 +293,9 @@ def excel_oku(
         # Aynı kişi (TCKimlik) + dönem için tutarlılık kontrolü
         kisi_donem_ad_map: dict[tuple[str, int, int], dict] = {}
         conflict_items: list[dict] = []
-        for row in range(7, 57):
+        for row, degerler in enumerate(satir_akisi, start=BASLIK_SATIRI + 1):
             row_vals = {
-                alan: ws.cell(row=row, column=col).value
+                alan: degerler[col - 1] if col <= len(degerler) else None
                 for alan, col in kolon_idx.items()
             }
             if all(v is None or str(v).strip() == "" for v in row_vals.values()):
@@ -443,10 +474,10 @@ def _fmt_row(veri: dict) -> str:
         )
         return SonucYonetici.tamam(veri=sonuc)
 
-    def _kolon_haritasi_bul(self, ws, baslik_satiri: int) -> dict[str, int]:
+    def _kolon_haritasi_bul(self, baslik: tuple) -> dict[str, int]:
+        """Başlık satırı değerlerinden {iç alan adı: kolon no (1 tabanlı)}."""
         harita = {}
-        for col_idx in range(1, 15):
-            val = ws.cell(row=baslik_satiri, column=col_idx).value
+        for col_idx, val in enumerate(baslik[:SON_KOLON], start=1):
             if val is None:
                 continue
             val_str = str(val).strip()
@@ -606,64 +637,58 @@ def kaydet(
           2. DokumanId'yi TutanakNo, import tarihini TutanakTarihi olarak
              tüm satırlara yaz
           3. Dis_Alan_Calisma tablosuna satırları ekle
+
+        Dokumanlar kaydı ve tüm satırlar tek transaction'da yazılır;
+        satırlar insert_many (executemany) ile tek seferde eklenir.
         """
 
         if not self._r:
             return SonucYonetici.hata(RuntimeError("RepositoryRegistry bağlı değil"), "DisAlanImportService.kaydet")
 
         try:
-            # ── Adım 1: Dokumanlar kaydı ─────────────────────────
-            dokuman_id    = self._dokumanlar_kaydet(sonuc, dosya_yolu, kaydeden)
-            tutanak_no    = dokuman_id
-            tutanak_tarihi = datetime.now().strftime("%Y-%m-%d")
-
-            sonuc.dokuman_id   = dokuman_id
-            sonuc.tutanak_no   = tutanak_no
-            sonuc.import_tarihi = tutanak_tarihi
-
-            logger.info(f"Tutanak oluşturuldu | DokumanId: {dokuman_id}")
-
-            # ── Adım 2–3: Satır kayıtları ─────────────────────────
-            repo = self._r.get("Dis_Alan_Calisma")
-            kaydedilen = atlanan = 0
-
-            for satir in sonuc.satirlar:
-                if not satir.gecerli and not satir.kullanici_onayladi:
-                    atlanan += 1
-                    continue
-
-                veri = {
-                    **satir.veri,
-                    "TutanakNo":          tutanak_no,
-                    "TutanakTarihi":      tutanak_tarihi,
-                    "KaydedenKullanici":  kaydeden or "Import",
+            with self._r.db.transaction():
+                # ── Adım 1: Dokumanlar kaydı ─────────────────────────
+                dokuman_id    = self._dokumanlar_kaydet(sonuc, dosya_yolu, kaydeden)
+                tutanak_no    = dokuman_id
+                tutanak_tarihi = datetime.now().strftime("%Y-%m-%d")
+
+                sonuc.dokuman_id   = dokuman_id
+                sonuc.tutanak_no   = tutanak_no
+                sonuc.import_tarihi = tutanak_tarihi
+
+                logger.info(f"Tutanak oluşturuldu | DokumanId: {dokuman_id}")
+
+                # ── Adım 2–3: Satır kayıtları ─────────────────────────
+                repo = self._r.get("Dis_Alan_Calisma")
+                atlanan = 0
+
+                # Tutanağa ait mevcut PK'lar tek sorguda
+                mevcut = {
+                    repo._pk_key(r)
+                    for r in repo.query(*repo.pk_list).where(TutanakNo=tutanak_no).all()
                 }
+                yazilacak: dict[str, dict] = {}
 
-                try:
-                    pk = (
-                        str(veri.get("TCKimlik",  "")),
-                        str(veri.get("DonemAy",   "")),
-                        str(veri.get("DonemYil",  "")),
-                        str(veri.get("TutanakNo", "")),
-                    )
-                    if repo.get_by_pk(pk):
+                for satir in sonuc.satirlar:
+                    if not satir.gecerli and not satir.kullanici_onayladi:
+                        atlanan += 1
+                        continue
+
+                    veri = {
+                        **satir.veri,
+                        "TutanakNo":          tutanak_no,
+                        "TutanakTarihi":      tutanak_tarihi,
+                        "KaydedenKullanici":  kaydeden or "Import",
+                    }
+
+                    anahtar = repo._pk_key(veri)
+                    if anahtar in mevcut or anahtar in yazilacak:
                         satir.uyarilar.append("Zaten kayıtlı — atlandı")
                         atlanan += 1
                         continue
+                    yazilacak[anahtar] = veri
 
-                    repo.insert(veri)
-                    kaydedilen += 1
-                    logger.info(
-                        f"Import | {veri.get('AdSoyad')} | "
-                        f"{veri.get('IslemTipi')} | "
-                        f"Vaka:{veri.get('VakaSayisi')} | "
-                        f"{veri.get('HesaplananSaat', 0):.2f} saat"
-                    )
-                except Exception as e:
-                    satir.hatalar.append(f"DB hatası: {e}")
-                    satir.gecerli = False
-                    atlanan += 1
-                    logger.error(f"Import satır {satir.satir_no}: {e}")
+                kaydedilen = repo.insert_many(yazilacak.values())
 
             sonuc.kaydedilen = kaydedilen
             sonuc.atlanan    = atlanan
@@ -54,7 +54,8 @@ def get_dis_alan_personeli(self) -> SonucYonetici:
         Dis_Alan_Calisma tablosundan benzersiz kişi (TCKimlik, AdSoyad) listesi döndürür.
         """
         try:
-            rows = self._r.get("Dis_Alan_Calisma").get_all() or []
+            rows = (self._r.get("Dis_Alan_Calisma")
+                    .query("TCKimlik", "AdSoyad").all())
             unique = {}
             for r in rows:
                 tc = str(r.get("TCKimlik", "")).strip()
@@ -77,14 +78,14 @@ def get_calisma_listesi(
     ) -> SonucYonetici:
         """Filtrelenmiş çalışma kayıtlarını döndürür."""
         try:
-            rows = self._r.get("Dis_Alan_Calisma").get_all() or []
-
+            q = self._r.get("Dis_Alan_Calisma").query()
             if tckimlik is not None:
-                rows = [r for r in rows if str(r.get("TCKimlik", "")) == str(tckimlik)]
+                q.where(TCKimlik=str(tckimlik))
             if donem_ay is not None:
-                rows = [r for r in rows if str(r.get("DonemAy", "")) == str(donem_ay)]
+                q.where(DonemAy=str(donem_ay))
             if donem_yil is not None:
-                rows = [r for r in rows if str(r.get("DonemYil", "")) == str(donem_yil)]
+                q.where(DonemYil=str(donem_yil))
+            rows = q.all()
 
             return SonucYonetici.tamam(veri=rows)
         except Exception as e:
@@ -92,9 +93,8 @@ def get_calisma_listesi(
 
     def get_tutanak_listesi(self, tutanak_no: str) -> SonucYonetici:
         try:
-            rows = self._r.get("Dis_Alan_Calisma").get_all() or []
             hedef = str(tutanak_no).strip()
-            rows = [r for r in rows if str(r.get("TutanakNo", "")).strip() == hedef]
+            rows = self._r.get("Dis_Alan_Calisma").query().where(TutanakNo=hedef).all()
             return SonucYonetici.tamam(veri=rows)
         except Exception as e:
             return SonucYonetici.hata(e, "DisAlanService.get_tutanak_listesi")
@@ -345,10 +345,10 @@ def get_yillik_ozet_listesi(
         sadece_onaysiz=True → RksOnay=0 olanları filtreler (RKS takip ekranı için).
         """
         try:
-            rows = self._r.get("Dis_Alan_Izin_Ozet").get_all() or []
-            rows = [r for r in rows if str(r.get("DonemYil", "")) == str(yil)]
+            q = self._r.get("Dis_Alan_Izin_Ozet").query().where(DonemYil=str(yil))
             if sadece_onaysiz:
-                rows = [r for r in rows if int(r.get("RksOnay", 0)) == 0]
+                q.where(RksOnay=0)
+            rows = q.all()
             return SonucYonetici.tamam(veri=rows)
         except Exception as e:
             return SonucYonetici.hata(e, "DisAlanService.get_yillik_ozet_listesi")
@@ -0,0 +1,403 @@
+# -*- coding: utf-8 -*-
+"""
+dozimetre_pdf_service.py — RADAT dozimetre PDF raporu ayrıştırıcı
+
+    header, rows = parse_radat_pdf(pdf_path)
+
+Sayfalar birbirinden bağımsız ayrıştırılır; pdfplumber extract_tables()
+CPU yoğun olduğundan sayfa grupları ProcessPoolExecutor'a dağıtılır
+(süreçler "spawn" ile açılır, her işçi PDF'i kendisi açar). Sonuçlar
+sayfa sırasıyla birleştirilir.
+
+Başlık (RaporNo / Periyot / Yil / DozimetriTipi) yalnızca ilk
+BASLIK_SAYFA_SAYISI sayfanın metninde aranır — diğer sayfalarda
+extract_text() çalışmaz. Bulunamayan alan olursa kalan sayfaların
+metnine sırayla bakılır.
+
+Sonuç dosya içeriğinin SHA-1'i ile önbelleğe alınır (bellek + TEMP_DIR);
+aynı PDF yeniden açıldığında ayrıştırma yapılmaz.
+
+    eslestirici = PersonelEslestirici(personel_listesi)
+    personel, skor = eslestirici.eslestir(maskeli_tc, pdf_adi)
+
+PersonelEslestirici içe aktarma başına bir kez kurulur: maskeli TC için
+(uzunluk, önek, sonek) dizini + önceden normalize edilmiş ad parçaları.
+Satır başına iş personel sayısından bağımsızdır.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import unicodedata
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from core.logger import logger
+from core.paths import TEMP_DIR
+
+# Başlığın arandığı ilk sayfa sayısı
+BASLIK_SAYFA_SAYISI = 2
+# Bu sayfa sayısına kadar süreç açılmaz (açılış maliyeti ayrıştırmadan büyük)
+SIRALI_SAYFA_ESIGI = 8
+
+_BASLIK_ALANLARI = ("RaporNo", "Periyot", "DozimetriTipi")
+
+# Ayrıştırma mantığı değişirse artırılır (eski önbellek kayıtları geçersizleşir)
+_ONBELLEK_SURUM = "1"
+_ONBELLEK_DIZIN = os.path.join(TEMP_DIR, "radat_pdf")
+_ONBELLEK_BELLEK_LIMIT = 16
+_onbellek: dict[str, tuple[dict, list[dict]]] = {}
+
+
+# ─── Satır ayrıştırma ───────────────────────────────────────────
+def _parse_hp(raw) -> Optional[float]:
+    if not raw: return None
+    s = str(raw).strip()
+    if "0,05" in s or "altındadır" in s: return 0.05
+    s = s.replace(",", ".")
+    try:
+        v = float(s)
+        return v if 0 <= v <= 500 else None
+    except ValueError:
+        return None
+
+def _is_tc_masked(s: str) -> bool:
+    """Maskelenmiş TC formatını tanı: rakam + yıldız + rakam"""
+    return bool(re.match(r"^\d+\*+\d+$", str(s).strip()))
+
+
+def _smart_parse_row(row: list) -> dict:
+    birim = vucut = dzm_no = durum = ""
+    hp10 = hp007 = None
+
+    # row[1] ve row[2] arasında TC ile ad tespiti
+    # PDF'de bazı satırlarda TC önce, ad sonra gelebiliyor
+    r1 = str(row[1] or "").strip().replace("\n", " ")
+    r2 = str(row[2] or "").strip().replace("\n", " ")
+
+    if _is_tc_masked(r1.split()[0] if r1.split() else ""):
+        # row[1] TC, row[2] ad
+        tc_raw  = r1.split()[0]   # ilk token TC
+        ad_soyad = r2
+    else:
+        # Normal düzen: row[1] ad, row[2] TC
+        ad_soyad = r1
+        tc_raw   = r2.split()[0] if r2.split() else r2
+
+    for i in range(3, len(row)):
+        v = row[i]
+        if not v: continue
+        s = str(v).strip()
+        if "Radyoloji" in s and not birim:
+            birim = "Radyoloji A.B.D."
+        elif any(k in s for k in ("Vücut","Önlük","Bilek","Yaka")) and not vucut:
+            vucut = s.replace("\n"," ")
+        elif s.isdigit() and not dzm_no:
+            dzm_no = s
+        elif "Sınırın" in s or "Aşım" in s:
+            durum = s
+        elif _parse_hp(s) is not None and dzm_no:
+            if hp10 is None: hp10 = _parse_hp(s)
+            elif hp007 is None: hp007 = _parse_hp(s)
+
+    return {
+        "AdSoyad":      ad_soyad,
+        "PersonelID":   tc_raw,   # masked TC → başlangıç değeri, eşleşince gerçek TC yazılır
+        "CalistiBirim": birim or "Radyoloji A.B.D.",
+        "VucutBolgesi": vucut,
+        "DozimetreNo":  dzm_no,
+        "Hp10":         hp10,
+        "Hp007":        hp007,
+        "Durum":        durum or "Sınırın Altında",
+    }
+
+
+# ─── Başlık ─────────────────────────────────────────────────────
+def _baslik_ara(text: str, header: dict) -> None:
+    """Sayfa metninde header'da henüz olmayan alanları arar (yerinde günceller)."""
+    if "RaporNo" not in header:
+        # Öncelik 1: "Rapor No" etiketi yanındaki sayı
+        m = re.search(
+            r"Rapor\s*(?:No|Numaras[ıiIİ])\s*[:\s]+([0-9]{3,12})",
+            text, re.IGNORECASE
+        )
+        if m:
+            header["RaporNo"] = m.group(1).strip()
+        else:
+            # Öncelik 2: Satırda tek başına duran 3-12 haneli sayı
+            # AB-0730-T gibi tire içindekiler ve 04-24 gibi tarihler atlanır
+            for line in text.splitlines():
+                line = line.strip()
+                if re.fullmatch(r"\d{3,12}", line):
+                    header["RaporNo"] = line
+                    break
+
+    if "Periyot" not in header:
+        m = re.search(
+            r"Periyot\s*/\s*Y[ıi]l\s*[:\s]+(\d+)\s*\(([^)]+)\)\s*/\s*(\d{4})",
+            text, re.IGNORECASE
+        )
+        if m:
+            header["Periyot"]    = int(m.group(1))
+            header["PeriyotAdi"] = m.group(2).strip()
+            header["Yil"]        = int(m.group(3))
+        else:
+            m = re.search(r"(\d+)[.\s]*\s*Periyot\s*/\s*(\d{4})", text, re.IGNORECASE)
+            if m:
+                header["Periyot"] = int(m.group(1))
+                header["Yil"]     = int(m.group(2))
+
+    if "DozimetriTipi" not in header:
+        m = re.search(r"Dozimetr[ei]\s+Tip[i]?\s*[:\s]+(\w+)", text, re.IGNORECASE)
+        if m:
+            header["DozimetriTipi"] = m.group(1)
+
+
+def _baslik_tamam(header: dict) -> bool:
+    return all(k in header for k in _BASLIK_ALANLARI)
+
+
+# ─── Sayfa işçisi ───────────────────────────────────────────────
+def _sayfalari_isle(pdf_path: str, sayfalar: list[int]) -> list[tuple[int, dict, list[dict]]]:
+    """
+    İşçi süreç girişi: verilen sayfaları ayrıştırır.
+    Döner: [(sayfa_no, sayfadaki başlık alanları, tablo satırları), ...]
+    """
+    import pdfplumber
+
+    sonuc = []
+    with pdfplumber.open(pdf_path) as pdf:
+        for idx in sayfalar:
+            page = pdf.pages[idx]
+            header: dict = {}
+            if idx < BASLIK_SAYFA_SAYISI:
+                _baslik_ara(page.extract_text() or "", header)
+
+            rows: list[dict] = []
+            for table in page.extract_tables():
+                for row in table:
+                    if not row or not row[0]: continue
+                    if not str(row[0]).strip().isdigit(): continue
+                    rows.append(_smart_parse_row(row))
+            sonuc.append((idx, header, rows))
+    return sonuc
+
+
+def _kalan_sayfalarda_baslik(pdf_path: str, sayfa_sayisi: int, header: dict) -> None:
+    """İlk sayfalarda bulunamayan başlık alanları için kalan sayfaların metni."""
+    import pdfplumber
+
+    with pdfplumber.open(pdf_path) as pdf:
+        for idx in range(BASLIK_SAYFA_SAYISI, sayfa_sayisi):
+            _baslik_ara(pdf.pages[idx].extract_text() or "", header)
+            if _baslik_tamam(header):
+                return
+
+
+# ─── Önbellek ───────────────────────────────────────────────────
+def _icerik_hash(pdf_path: str) -> str:
+    h = hashlib.sha1(_ONBELLEK_SURUM.encode("ascii"))
+    with open(pdf_path, "rb") as f:
+        for blok in iter(lambda: f.read(1 << 20), b""):
+            h.update(blok)
+    return h.hexdigest()
+
+
+def _kopya(sonuc: tuple[dict, list[dict]]) -> tuple[dict, list[dict]]:
+    """Çağıran satırları değiştirir (eşleştirme); önbellek kaydı korunur."""
+    header, rows = sonuc
+    return dict(header), [dict(r) for r in rows]
+
+
+def _onbellek_oku(anahtar: str) -> Optional[tuple[dict, list[dict]]]:
+    if anahtar in _onbellek:
+        return _onbellek[anahtar]
+    yol = os.path.join(_ONBELLEK_DIZIN, f"{anahtar}.json")
+    try:
+        with open(yol, encoding="utf-8") as f:
+            kayit = json.load(f)
+        sonuc = (kayit["header"], kayit["rows"])
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"RADAT önbellek okunamadı ({yol}): {e}")
+        return None
+    _bellege_yaz(anahtar, sonuc)
+    return sonuc
+
+
+def _bellege_yaz(anahtar: str, sonuc: tuple[dict, list[dict]]) -> None:
+    _onbellek[anahtar] = sonuc
+    while len(_onbellek) > _ONBELLEK_BELLEK_LIMIT:
+        _onbellek.pop(next(iter(_onbellek)))
+
+
+def _onbellek_yaz(anahtar: str, sonuc: tuple[dict, list[dict]]) -> None:
+    _bellege_yaz(anahtar, sonuc)
+    yol = os.path.join(_ONBELLEK_DIZIN, f"{anahtar}.json")
+    try:
+        os.makedirs(_ONBELLEK_DIZIN, exist_ok=True)
+        gecici = f"{yol}.{os.getpid()}.tmp"
+        with open(gecici, "w", encoding="utf-8") as f:
+            json.dump({"header": sonuc[0], "rows": sonuc[1]}, f, ensure_ascii=False)
+        os.replace(gecici, yol)
+    except Exception as e:
+        logger.warning(f"RADAT önbellek yazılamadı ({yol}): {e}")
+
+
+# ─── Giriş ──────────────────────────────────────────────────────
+def parse_radat_pdf(pdf_path: str, max_isci: Optional[int] = None,
+                    onbellek: bool = True) -> tuple[dict, list[dict]]:
+    """
+    RADAT raporunu ayrıştırır → (header, rows). rows sayfa ve tablo
+    sırasındadır. max_isci: süreç sayısı üst sınırı (None → CPU sayısı,
+    1 → süreç açılmaz). onbellek=False içerik önbelleğini atlar.
+    """
+    anahtar = _icerik_hash(pdf_path) if onbellek else ""
+    if anahtar:
+        kayit = _onbellek_oku(anahtar)
+        if kayit is not None:
+            return _kopya(kayit)
+
+    import pdfplumber
+
+    with pdfplumber.open(pdf_path) as pdf:
+        sayfa_sayisi = len(pdf.pages)
+
+    isci = max(1, min(max_isci or os.cpu_count() or 1, sayfa_sayisi))
+    if sayfa_sayisi <= SIRALI_SAYFA_ESIGI or isci == 1:
+        sayfa_sonuclari = _sayfalari_isle(pdf_path, list(range(sayfa_sayisi)))
+    else:
+        # İşçi başına ~2 ardışık sayfa grubu: yük dengesi + az PDF açılışı
+        grup = -(-sayfa_sayisi // (isci * 2))
+        gruplar = [list(range(b, min(b + grup, sayfa_sayisi)))
+                   for b in range(0, sayfa_sayisi, grup)]
+        with ProcessPoolExecutor(
+                max_workers=isci,
+                mp_context=multiprocessing.get_context("spawn")) as havuz:
+            isler = [havuz.submit(_sayfalari_isle, pdf_path, g) for g in gruplar]
+            sayfa_sonuclari = [s for fut in isler for s in fut.result()]
+
+    header: dict = {}
+    all_rows: list[dict] = []
+    for _, sayfa_basligi, rows in sorted(sayfa_sonuclari, key=lambda s: s[0]):
+        for k, v in sayfa_basligi.items():
+            header.setdefault(k, v)
+        all_rows.extend(rows)
+
+    if not _baslik_tamam(header) and sayfa_sayisi > BASLIK_SAYFA_SAYISI:
+        _kalan_sayfalarda_baslik(pdf_path, sayfa_sayisi, header)
+
+    logger.info(
+        f"RADAT PDF ayrıştırıldı | {os.path.basename(pdf_path)} | "
+        f"{sayfa_sayisi} sayfa, {len(all_rows)} satır, {isci} işçi"
+    )
+    if anahtar:
+        _onbellek_yaz(anahtar, (header, all_rows))
+        return _kopya((header, all_rows))
+    return header, all_rows
+
+
+# ─── Personel eşleştirme ────────────────────────────────────────
+_MASKE_RE = re.compile(r"^([0-9]+)(\*+)([0-9]+)$")
+
+
+def _norm(s: str) -> str:
+    """Büyük harf + aksan/Türkçe karakter sadeleştirme (İ/ı → I, Ş → S ...)."""
+    s = unicodedata.normalize("NFKD", s.upper())
+    return s.encode("ascii", "ignore").decode()
+
+
+def _pdf_segmentleri(pdf_name: str) -> list[str]:
+    """
+    PDF'deki kısmi isimden yıldız-arası TÜM görünür segmentler (normalize).
+    Örnek: 'ZEYN**TÜRKDÖNM**' → ['ZEYN', 'TURKDONM'].
+    """
+    segs = []
+    for pp in pdf_name.split():
+        for seg in pp.split("*"):
+            seg_n = _norm(seg) if seg else ""
+            if seg_n:
+                segs.append(seg_n)
+    return segs
+
+
+def _segment_skoru(segs: list[str], real_parts: list[str]) -> int:
+    """Bir gerçek ad parçasının başıyla örtüşen segmentlerin karakter toplamı."""
+    score = 0
+    for seg in segs:
+        for rp in real_parts:
+            if rp.startswith(seg):
+                score += len(seg)
+                break   # bu segment için tek eşleşme yeterli
+    return score
+
+
+class PersonelEslestirici:
+    """
+    RADAT satırlarını personel listesiyle eşleştirir.
+
+    TC dizini maske biçimine (önek, sonek, toplam uzunluk) göre ilk
+    kullanımda kurulur — bir raporda maskeler genellikle aynı biçimdedir.
+    Ad parçaları bir kez normalize edilir. Eşleşme her zaman TC maskesi
+    + isim skoruyla yapılır; yalnızca isme göre atama yapılmaz.
+    """
+
+    def __init__(self, personel_list: list[dict]):
+        self._personel = personel_list
+        self._tcler = [str(p.get("KimlikNo", "") or "").strip() for p in personel_list]
+        self._parcalar = [[_norm(x) for x in str(p.get("AdSoyad", "") or "").split()]
+                          for p in personel_list]
+        self._tc_dizin: dict[tuple[int, int, int], dict[tuple[str, str], list[int]]] = {}
+
+    # ── TC ──
+    def _tc_adaylari(self, maske: str) -> Optional[list[int]]:
+        """Maskeye uyan personel sıraları; maske çözülemezse None."""
+        m = _MASKE_RE.match(str(maske or "").strip())
+        if not m:
+            return None
+        onek, sonek = m.group(1), m.group(3)
+        bicim = (len(onek), len(sonek), len(onek) + len(m.group(2)) + len(sonek))
+        dizin = self._tc_dizin.get(bicim)
+        if dizin is None:
+            k, j, uzunluk = bicim
+            dizin = defaultdict(list)
+            for i, tc in enumerate(self._tcler):
+                if len(tc) == uzunluk:
+                    dizin[(tc[:k], tc[len(tc) - j:])].append(i)
+            self._tc_dizin[bicim] = dizin
+        return dizin.get((onek, sonek), [])
+
+    def adaylar(self, maske: str) -> list[dict]:
+        """Maskeli TC'ye uyan personel kayıtları (liste sırasıyla)."""
+        return [self._personel[i] for i in self._tc_adaylari(maske) or ()]
+
+    def eslestir(self, maske: str, pdf_name: str) -> tuple[Optional[dict], int]:
+        """
+        En iyi aday ve isim skoru → (personel | None, skor).
+
+        1. TC maskesiyle aday bul; aday yoksa None (masked TC kalır).
+        2. Adaylar arasında en yüksek isim skoru > 0 olan döner; tüm
+           skorlar 0 ise None — tek aday olsa bile isim uyuşmuyorsa
+           yanlış eşleşme olmaz.
+        3. Maske çözülemezse (bozuk/eksik TC) None — isim tek başına
+           doz kaydını bir kişiye atamak için yeterli değildir.
+        """
+        adaylar = self._tc_adaylari(maske)
+        if not adaylar:
+            return None, 0
+        segs = _pdf_segmentleri(str(pdf_name or ""))
+
+        en_iyi: Optional[int] = None
+        en_iyi_skor = 0
+        for i in adaylar:
+            skor = _segment_skoru(segs, self._parcalar[i])
+            if skor > en_iyi_skor:
+                en_iyi_skor, en_iyi = skor, i
+        if en_iyi is None:
+            return None, 0
+        return self._personel[en_iyi], en_iyi_skor
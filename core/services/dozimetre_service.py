@@ -49,13 +49,14 @@ def _personel_repo(self):
     #  Sorgular
     # ──────────────────────────────────────────────────────────
 
-    def get_tum_olcumler(self) -> SonucYonetici:
+    def get_tum_olcumler(self, compact: bool = False) -> SonucYonetici:
         """
         Tüm ölçüm kayıtlarını döner.
         Personel JOIN için Personel tablosundan adı zenginleştirir.
+        compact=True → kompakt Satir listesi (JOIN alanları ek anahtar olur).
         """
         try:
-            olcumler = self._repo().get_all() or []
+            olcumler = self._repo().get_all(compact=compact) or []
             # Personel adlarını cache'le — gereksiz tekrar sorgu engeli
             personel_map: dict[str, dict] = {}
             for p in (self._personel_repo().get_all() or []):
@@ -305,31 +306,7 @@ def olcum_ekle(self, kayit: dict) -> SonucYonetici:
             Aciklama / Durum   → Durum
         """
         try:
-            kayit_no = kayit.get("KayitNo") or uuid.uuid4().hex[:12].upper()
-
-            hp10  = self._float(kayit.get("DerinDoz",    kayit.get("Hp10",  "")))
-            hp007 = self._float(kayit.get("YuzeyselDoz", kayit.get("Hp007", "")))
-            durum = kayit.get("Aciklama") or kayit.get("Durum") or "Excel İçe Aktarma"
-
-            veri = {
-                "KayitNo":       kayit_no,
-                "RaporNo":       kayit.get("RaporNo", ""),
-                "Periyot":       self._int(kayit.get("Periyot", "")),
-                "PeriyotAdi":    kayit.get("PeriyotAdi", ""),
-                "Yil":           self._int(kayit.get("Yil", "")),
-                "DozimetriTipi": kayit.get("DozimetriTipi", "Excel"),
-                "AdSoyad":       kayit.get("AdSoyad", ""),
-                "CalistiBirim":  kayit.get("CalistiBirim", ""),
-                "PersonelID":    kayit.get("PersonelID", kayit.get("TCKimlikNo", "")),
-                "DozimetreNo":   kayit.get("DozimetreNo", ""),
-                "VucutBolgesi":  kayit.get("VucutBolgesi", ""),
-                "Hp10":          hp10,
-                "Hp007":         hp007,
-                "Durum":         durum,
-                "OlusturmaTarihi": kayit.get("OlusturmaTarihi", ""),
-            }
-
-            self._repo().insert(veri)
+            self._repo().insert(self._olcum_verisi(kayit))
             return SonucYonetici.tamam("Ölçüm kaydedildi.")
 
         except Exception as exc:
@@ -341,10 +318,50 @@ def olcum_ekle(self, kayit: dict) -> SonucYonetici:
                 )
             return SonucYonetici.hata(exc, "DozimetreService.olcum_ekle")
 
+    def olcum_ekle_toplu(self, kayitlar: list[dict]) -> SonucYonetici:
+        """
+        Çok sayıda ölçümü tek transaction'da ekler (PDF / Excel import).
+        olcum_ekle() ile aynı alan eşlemesi; veri = eklenen satır sayısı.
+        Hata olursa hiçbir satır yazılmaz.
+        """
+        try:
+            adet = self._repo().insert_many(
+                self._olcum_verisi(k) for k in kayitlar
+            )
+            return SonucYonetici.tamam(f"{adet} ölçüm kaydedildi.", veri=adet)
+        except Exception as exc:
+            return SonucYonetici.hata(exc, "DozimetreService.olcum_ekle_toplu")
+
     # ──────────────────────────────────────────────────────────
     #  Yardımcı dönüşümler
     # ──────────────────────────────────────────────────────────
 
+    def _olcum_verisi(self, kayit: dict) -> dict:
+        """Excel / PDF alan adlarını Dozimetre_Olcum kolonlarına eşler."""
+        kayit_no = kayit.get("KayitNo") or uuid.uuid4().hex[:12].upper()
+
+        hp10  = self._float(kayit.get("DerinDoz",    kayit.get("Hp10",  "")))
+        hp007 = self._float(kayit.get("YuzeyselDoz", kayit.get("Hp007", "")))
+        durum = kayit.get("Aciklama") or kayit.get("Durum") or "Excel İçe Aktarma"
+
+        return {
+            "KayitNo":       kayit_no,
+            "RaporNo":       kayit.get("RaporNo", ""),
+            "Periyot":       self._int(kayit.get("Periyot", "")),
+            "PeriyotAdi":    kayit.get("PeriyotAdi", ""),
+            "Yil":           self._int(kayit.get("Yil", "")),
+            "DozimetriTipi": kayit.get("DozimetriTipi", "Excel"),
+            "AdSoyad":       kayit.get("AdSoyad", ""),
+            "CalistiBirim":  kayit.get("CalistiBirim", ""),
+            "PersonelID":    kayit.get("PersonelID", kayit.get("TCKimlikNo", "")),
+            "DozimetreNo":   kayit.get("DozimetreNo", ""),
+            "VucutBolgesi":  kayit.get("VucutBolgesi", ""),
+            "Hp10":          hp10,
+            "Hp007":         hp007,
+            "Durum":         durum,
+            "OlusturmaTarihi": kayit.get("OlusturmaTarihi", ""),
+        }
+
     @staticmethod
     def _float(val) -> float | None:
         if val is None or str(val).strip() == "":
@@ -8,15 +8,26 @@
     satirlar   = svc.donustur(df, harita, konfig)
     satirlar   = svc.duplicate_kontrol(satirlar, konfig, db)
     sonuc      = svc.yukle(satirlar, konfig, db, kaydeden="kullanici")
+
+Büyük dosyalar için akışlı okuma (dosya hiçbir aşamada bütün olarak
+belleğe alınmaz):
+    sutunlar, tahmini = svc.excel_basligi(dosya_yolu)
+    harita     = svc.otomatik_eslestir(sutunlar, konfig)
+    satirlar   = svc.dosyadan_hazirla(dosya_yolu, harita, konfig, db,
+                                      ilerleme=lambda okunan, toplam: ...)
 """
 
 from __future__ import annotations
 
 import re
 import unicodedata
+from contextlib import nullcontext
 from dataclasses import dataclass, field
-from typing import Callable, Optional
+from datetime import date
+from pathlib import Path
+from typing import Callable, Iterator, Optional
 
+import numpy as np
 import pandas as pd
 
 
@@ -44,12 +55,18 @@ def _to_tc(val: str) -> str:
     return digits.zfill(11) if digits else ""
 
 
+# "%Y-%m-%d %H:%M:%S": pd.read_excel(dtype=str) tarih hücrelerini bu biçimde
+# verir; dayfirst'li serbest ayrıştırmaya kalırsa gün ≤ 12'de gün/ay yer değiştirir
+_TARIH_FORMATLARI = ("%d.%m.%Y", "%d/%m/%Y", "%Y-%m-%d", "%d-%m-%Y", "%m/%d/%Y",
+                     "%Y-%m-%d %H:%M:%S")
+
+
 def _to_date(val: str) -> str:
     """Çeşitli formatları YYYY-MM-DD'ye çevirir; hatalıysa boş döner."""
     val = val.strip()
     if not val:
         return ""
-    for fmt in ("%d.%m.%Y", "%d/%m/%Y", "%Y-%m-%d", "%d-%m-%Y", "%m/%d/%Y"):
+    for fmt in _TARIH_FORMATLARI:
         try:
             return pd.to_datetime(val, format=fmt).strftime("%Y-%m-%d")
         except (ValueError, TypeError):
@@ -93,6 +110,190 @@ def _to_str(val: str) -> str:
 }
 
 
+# ---------------------------------------------------------------------------
+# Yardımcı: akışlı Excel okuma
+# ---------------------------------------------------------------------------
+
+# excel_parcalari() varsayılan parça boyutu (satır)
+EXCEL_PARCA_BOYUTU = 2000
+
+# İlerleme bildirimi: (okunan_satir, toplam_satir); toplam bilinmiyorsa 0
+IlerlemeFn = Callable[[int, int], None]
+
+_EXCEL_HATA_KODLARI = frozenset(
+    ("#NULL!", "#DIV/0!", "#VALUE!", "#REF!", "#NAME?", "#NUM!", "#N/A")
+)
+
+
+def _hucre_metni(deger) -> str:
+    """
+    openpyxl hücre değerini pd.read_excel(dtype=str) + fillna("") ile aynı
+    metne çevirir: tam sayı değerli float → "5", tarih → "2024-01-05 00:00:00",
+    boş / hata hücresi → "".
+    """
+    if deger is None:
+        return ""
+    if isinstance(deger, float):
+        return str(int(deger)) if deger.is_integer() else str(deger)
+    if isinstance(deger, date):
+        return str(pd.Timestamp(deger))
+    if isinstance(deger, str) and deger in _EXCEL_HATA_KODLARI:
+        return ""
+    return str(deger)
+
+
+def _baslik_adlari(hucreler) -> list[str]:
+    """
+    Başlık satırından sütun adları; pd.read_excel gibi boş başlık →
+    "Unnamed: i", tekrar eden başlık → "Ad.1", "Ad.2".
+    """
+    metinler = [_hucre_metni(h) for h in hucreler]
+    while metinler and metinler[-1] == "":
+        metinler.pop()
+    adlar: list[str] = []
+    gorulen: dict[str, int] = {}
+    for i, metin in enumerate(metinler):
+        ad = metin.strip() if metin else f"Unnamed: {i}"
+        if ad in gorulen:
+            sayac = gorulen[ad]
+            while f"{ad}.{sayac}" in gorulen:
+                sayac += 1
+            gorulen[ad] = sayac + 1
+            ad = f"{ad}.{sayac}"
+        gorulen[ad] = gorulen.get(ad, 1)
+        adlar.append(ad)
+    return adlar
+
+
+def _parca_df(satirlar: list[list[str]], sutunlar: list[str], baslangic: int) -> pd.DataFrame:
+    """Okunan satırlardan excel_oku ile aynı biçimde (str) bir DataFrame parçası."""
+    return pd.DataFrame(
+        satirlar, columns=sutunlar,
+        index=pd.RangeIndex(baslangic, baslangic + len(satirlar)),
+    ).astype(str)
+
+
+# ---------------------------------------------------------------------------
+# Yardımcı: sütun bazlı (vektörel) tip dönüşümleri
+# ---------------------------------------------------------------------------
+# Girdi: _ham_sutun() ile str(...).strip() uygulanmış Series. Sonuçlar _TIP_DONUSTUR'daki
+# tekil fonksiyonlarla aynıdır (test_excel_import_sayi.py); vektörel yolun
+# tanımadığı dolu değerler (ör. "1_000", Latin dışı rakamlar) tekil
+# fonksiyona bırakılır.
+
+def _ham_sutun(s: pd.Series) -> pd.Series:
+    """Hücreleri str(hucre).strip() olarak döner."""
+    if not (isinstance(s.dtype, pd.StringDtype) and s.notna().all()):
+        s = s.astype(object).map(str)       # NaN → "nan", sayı → str(sayı)
+    return s.str.strip()
+
+
+def _tekil_uygula(sonuc: pd.Series, girdi: pd.Series, maske: pd.Series,
+                  fn: Callable[[str], str]) -> pd.Series:
+    """maske'deki girdilere fn'i (her farklı değer için bir kez) uygulayıp sonuca yazar."""
+    if maske.any():
+        degerler = girdi[maske]
+        sonuc[maske] = degerler.map({d: fn(d) for d in pd.unique(degerler)})
+    return sonuc
+
+
+def _sutun_tc(s: pd.Series) -> pd.Series:
+    rakamlar = s.str.replace(r"\D", "", regex=True)
+    return rakamlar.str.zfill(11).where(rakamlar != "", "")
+
+
+_SAAT_DILIMI = r"(?:Z|[+-]\d{2}:?\d{2})$"
+
+
+def _sutun_date(s: pd.Series) -> pd.Series:
+    """Formatlar sırayla, henüz ayrıştırılamamış farklı değerlere toplu uygulanır."""
+    benzersiz = pd.Series(pd.unique(s[s != ""]), dtype=object)
+    tarih = pd.Series("", index=benzersiz.index, dtype=object)
+    kalan = pd.Series(True, index=benzersiz.index)
+
+    def _yaz(t: pd.Series) -> None:
+        ok = t.notna()
+        tarih[ok[ok].index] = t[ok].dt.strftime("%Y-%m-%d")
+        kalan[ok[ok].index] = False
+
+    for fmt in _TARIH_FORMATLARI:
+        if not kalan.any():
+            break
+        _yaz(pd.to_datetime(benzersiz[kalan], format=fmt, errors="coerce"))
+
+    if kalan.any():
+        adaylar = benzersiz[kalan]
+        # Saat dilimli değerler toplu ayrıştırmada karışık dilim hatası verir
+        dilimli = adaylar.str.contains(_SAAT_DILIMI, regex=True)
+        tarih[dilimli[dilimli].index] = adaylar[dilimli].map(_to_date)
+        duz = adaylar[~dilimli]
+        try:
+            _yaz(pd.to_datetime(duz, dayfirst=True, format="mixed", errors="coerce"))
+        except Exception:
+            tarih[duz.index] = duz.map(_to_date)
+    return s.map(dict(zip(benzersiz, tarih))).fillna("")
+
+
+# Düz ondalık / bilimsel gösterim; diğer her şey (boş, "nan", "1_000" …) NaN kalır
+_SAYI_DESENI = r"^[+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?$"
+
+
+def _sayi_sutunu(s: pd.Series) -> pd.Series:
+    """
+    float(...) ile birebir aynı (doğru yuvarlanmış) değerler. pd.to_numeric
+    kendi ayrıştırıcısını kullanır ve son basamakta sapabilir
+    ("0.30000000000000004" → 0.3); object → float64 dönüşümü ise her
+    değer için CPython ayrıştırıcısını çağırır.
+    """
+    sayi = pd.Series(np.nan, index=s.index, dtype="float64")
+    maske = s.str.fullmatch(_SAYI_DESENI).fillna(False).astype(bool)
+    if maske.any():
+        sayi[maske] = s[maske].astype(object).astype("float64")
+    return sayi
+
+
+def _sutun_int(s: pd.Series) -> pd.Series:
+    sayi = _sayi_sutunu(s)
+    ok = np.isfinite(sayi)
+    sonuc = pd.Series("", index=s.index, dtype=object)
+    sonuc[ok] = [str(int(x)) for x in sayi[ok].tolist()]
+    return _tekil_uygula(sonuc, s, sayi.isna() & (s != ""), _to_int)
+
+
+def _sutun_float(s: pd.Series) -> pd.Series:
+    sayi = _sayi_sutunu(s.str.replace(",", ".", regex=False))
+    ok = sayi.notna()
+    sonuc = pd.Series("", index=s.index, dtype=object)
+    sonuc[ok] = [str(x) for x in sayi[ok].tolist()]
+    # "nan" metni float("nan") → "nan" olur; ayrıştırılamayanlarla birlikte tekil yola
+    return _tekil_uygula(sonuc, s, ~ok & (s != ""), _to_float)
+
+
+def _sutun_str(s: pd.Series) -> pd.Series:
+    return s.str.normalize("NFC").str.strip()
+
+
+_SUTUN_DONUSTUR: dict[str, Callable[[pd.Series], pd.Series]] = {
+    "tc":    _sutun_tc,
+    "date":  _sutun_date,
+    "int":   _sutun_int,
+    "float": _sutun_float,
+    "str":   _sutun_str,
+}
+
+
+def _validator_mesajlari(degerler: pd.Series, alan_tanimi: "AlanTanimi") -> pd.Series:
+    """Dolu değerlerin validator hata mesajı ("" → geçerli); her farklı değer bir kez."""
+    mesajlar: dict[str, str] = {}
+    for deger in pd.unique(degerler[degerler != ""]):
+        try:
+            gecerli, hata_msg = alan_tanimi.validator(deger)
+            mesajlar[deger] = "" if gecerli else f"'{alan_tanimi.goruntu}': {hata_msg}"
+        except Exception as exc:
+            mesajlar[deger] = f"'{alan_tanimi.goruntu}' validasyon hatası: {exc}"
+    return degerler.map(mesajlar).fillna("")
+
+
 # ---------------------------------------------------------------------------
 # Veri Modelleri
 # ---------------------------------------------------------------------------
@@ -158,6 +359,11 @@ class ImportKonfig:
     # None → yalnızca standart tip dönüşümleri uygulanır.
     # Fn   → standart dönüşüm SONRASINDA çağrılır; tablo özel ek mantık içerir.
     #        def normalize(kayit: dict) -> dict: ...
+    servis_toplu_metod: Optional[str] = None
+    # None → yukle() her satır için servis_metod'u çağırır.
+    # Ad   → yüklenecek tüm satırlar tek çağrıda verilir (executemany):
+    #        def toplu_ekle(kayitlar: list[dict]) -> SonucYonetici
+    #        veri = {kayitlar indeksi: hata mesajı} (yalnızca başarısızlar)
 
 
 # ---------------------------------------------------------------------------
@@ -284,6 +490,16 @@ def uyarilar(self) -> list[SatirSonucu]:
         return [s for s in self.satirlar if s.durum == "yumusak_duplicate"]
 
 
+class _SatirGeriAl(Exception):
+    """Servis başarısız döndü — satırın SAVEPOINT'i geri alınsın."""
+
+
+def _transaction(db):
+    """db.transaction() varsa onu, yoksa etkisiz bir context döner."""
+    tx = getattr(db, "transaction", None)
+    return tx() if callable(tx) else nullcontext()
+
+
 # ---------------------------------------------------------------------------
 # Motor
 # ---------------------------------------------------------------------------
@@ -304,13 +520,125 @@ def excel_oku(self, dosya_yolu: str) -> pd.DataFrame:
         Döner: pd.DataFrame
         Fırlatır: ValueError (dosya okunamazsa)
         """
+        parcalar = list(self.excel_parcalari(dosya_yolu))
+        if not parcalar:
+            return pd.DataFrame()
+        return parcalar[0] if len(parcalar) == 1 else pd.concat(parcalar)
+
+    def excel_basligi(self, dosya_yolu: str) -> tuple[list[str], int]:
+        """
+        Yalnızca başlık satırını okur.
+        Döner: (sütun adları, tahmini veri satırı sayısı — bilinmiyorsa 0)
+        Fırlatır: ValueError (dosya okunamazsa)
+        """
+        if Path(dosya_yolu).suffix.lower() == ".xls":
+            df = self.excel_oku(dosya_yolu)
+            return list(df.columns), len(df)
+        try:
+            import openpyxl
+            wb = openpyxl.load_workbook(dosya_yolu, read_only=True, data_only=True)
+            try:
+                ws = wb.worksheets[0]
+                baslik = next(ws.iter_rows(max_row=1, values_only=True), ())
+                return _baslik_adlari(baslik), max(int(ws.max_row or 0) - 1, 0)
+            finally:
+                wb.close()
+        except Exception as exc:
+            raise ValueError(f"Excel dosyası okunamadı: {exc}") from exc
+
+    def excel_parcalari(
+        self,
+        dosya_yolu: str,
+        parca_boyutu: int = EXCEL_PARCA_BOYUTU,
+        ilerleme: Optional[IlerlemeFn] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        İlk sayfayı openpyxl read_only modunda satır satır okur ve
+        parca_boyutu satırlık DataFrame'ler üretir; stil ve diğer sayfalar
+        belleğe alınmaz. Sütunlar / hücre metinleri excel_oku ile aynıdır,
+        index dosya sırasını sürdürür (satir_no = index + 2). Sondaki boş
+        satırlar atlanır; veri yoksa sütunları taşıyan boş bir parça üretir.
+        Başlığı olmayan sağdaki sütunlar okunmaz.
+
+        ilerleme(okunan, toplam): her parça işlendikten sonra çağrılır;
+        toplam dosyanın boyut bilgisinden gelir (yoksa 0).
+        Fırlatır: ValueError (dosya okunamazsa)
+
+        .xls (openpyxl desteklemez) pd.read_excel ile okunup parçalanır.
+        """
+        parca_boyutu = max(int(parca_boyutu), 1)
+        if Path(dosya_yolu).suffix.lower() == ".xls":
+            yield from self._xls_parcalari(dosya_yolu, parca_boyutu, ilerleme)
+            return
+
+        try:
+            import openpyxl
+            wb = openpyxl.load_workbook(dosya_yolu, read_only=True, data_only=True)
+        except Exception as exc:
+            raise ValueError(f"Excel dosyası okunamadı: {exc}") from exc
+
+        try:
+            ws = wb.worksheets[0]
+            toplam = max(int(ws.max_row or 0) - 1, 0)
+            satir_akisi = ws.iter_rows(values_only=True)
+            sutunlar = _baslik_adlari(next(satir_akisi, ()))
+            if not sutunlar:
+                return
+            genislik = len(sutunlar)
+            bos_satir = [""] * genislik
+
+            parca: list[list[str]] = []
+            baslangic = 0
+            bekleyen_bos = 0        # ara boş satırlar; ardından veri gelirse eklenir
+            uretildi = False
+            for hucreler in satir_akisi:
+                metinler = [_hucre_metni(h) for h in hucreler[:genislik]]
+                if not any(metinler):
+                    bekleyen_bos += 1
+                    continue
+                if len(metinler) < genislik:
+                    metinler += bos_satir[len(metinler):]
+                if bekleyen_bos:
+                    parca.extend([bos_satir] * bekleyen_bos)
+                    bekleyen_bos = 0
+                parca.append(metinler)
+                if len(parca) >= parca_boyutu:
+                    yield _parca_df(parca, sutunlar, baslangic)
+                    uretildi = True
+                    baslangic += len(parca)
+                    parca = []
+                    if ilerleme:
+                        ilerleme(baslangic, toplam)
+
+            if parca or not uretildi:
+                yield _parca_df(parca, sutunlar, baslangic)
+                baslangic += len(parca)
+            if ilerleme:
+                ilerleme(baslangic, baslangic)
+        except ValueError:
+            raise
+        except Exception as exc:
+            raise ValueError(f"Excel dosyası okunamadı: {exc}") from exc
+        finally:
+            wb.close()
+
+    def _xls_parcalari(
+        self,
+        dosya_yolu: str,
+        parca_boyutu: int,
+        ilerleme: Optional[IlerlemeFn],
+    ) -> Iterator[pd.DataFrame]:
         try:
             df = pd.read_excel(dosya_yolu, dtype=str)
             df = df.fillna("").astype(str)
             df.columns = [str(c).strip() for c in df.columns]
-            return df
         except Exception as exc:
             raise ValueError(f"Excel dosyası okunamadı: {exc}") from exc
+        toplam = len(df)
+        for bas in range(0, max(toplam, 1), parca_boyutu):
+            yield df.iloc[bas:bas + parca_boyutu]
+            if ilerleme:
+                ilerleme(min(bas + parca_boyutu, toplam), toplam)
 
     # ------------------------------------------------------------------
     # 2) Otomatik sütun eşleştirme
@@ -375,70 +703,87 @@ def donustur(
         manuel_degerler: Adım 2'de "Elle Gir" ile girilen sabit değerler.
         Her satıra aynı değer uygulanır. Excel sütununa eşleştirilmiş
         alanlar için manuel_degerler göz ardı edilir.
+
+        Dönüşüm sütun bazlıdır: her alan tüm sütun üzerinde tek seferde
+        dönüştürülür, zorunlu alan / validator kontrolleri maske olarak
+        hesaplanır; hata metni yalnızca hatalı satırlar için üretilir.
         """
         # Ters harita: db_alan → excel_sutun
         ters_harita: dict[str, str] = {v: k for k, v in harita.items()}
         manuel = manuel_degerler or {}
-
-        sonuclar: list[SatirSonucu] = []
-
-        for idx, row in df.iterrows():
-            satir_no = int(idx) + 2
-            kayit: dict = {}
-            hata_mesajlari: list[str] = []
-            durum = ""
-
-            for alan_tanimi in konfig.alanlar:
-                db_alan = alan_tanimi.alan
-                excel_sutun = ters_harita.get(db_alan)
-
-                # Değer önceliği: Excel sütunu > manuel giriş > varsayılan
-                if excel_sutun and excel_sutun in row.index:
-                    ham = str(row[excel_sutun]).strip()
-                elif db_alan in manuel and manuel[db_alan]:
+        if df.empty:
+            return []
+
+        n = len(df)
+        kolonlar: dict[str, list] = {}
+        mesaj_sutunlari: list[np.ndarray] = []      # alan sırasıyla, "" → hata yok
+        zorunlu_eksik = np.zeros(n, dtype=bool)
+        hatali = np.zeros(n, dtype=bool)
+
+        for alan_tanimi in konfig.alanlar:
+            db_alan = alan_tanimi.alan
+            excel_sutun = ters_harita.get(db_alan)
+
+            # Değer önceliği: Excel sütunu > manuel giriş > varsayılan
+            if excel_sutun and excel_sutun in df.columns:
+                donustur_fn = _SUTUN_DONUSTUR.get(alan_tanimi.tip, _sutun_str)
+                deger = donustur_fn(_ham_sutun(df[excel_sutun]))
+            else:
+                if db_alan in manuel and manuel[db_alan]:
                     ham = manuel[db_alan]
                 elif alan_tanimi.varsayilan:
                     ham = alan_tanimi.varsayilan
                 else:
                     ham = ""
+                sabit = _TIP_DONUSTUR.get(alan_tanimi.tip, _to_str)(ham)
+                deger = pd.Series(sabit, index=df.index, dtype=object)
+
+            bos = (deger == "").to_numpy()
+            mesaj = np.full(n, "", dtype=object)
+
+            # Zorunlu alan kontrolü
+            if alan_tanimi.zorunlu and bos.any():
+                mesaj[bos] = f"'{alan_tanimi.goruntu}' zorunlu"
+                zorunlu_eksik |= bos
 
-                # Tip dönüşümü
-                donustur_fn = _TIP_DONUSTUR.get(alan_tanimi.tip, _to_str)
-                donusturulmus = donustur_fn(ham)
-
-                # Zorunlu alan kontrolü
-                if alan_tanimi.zorunlu and not donusturulmus:
-                    hata_mesajlari.append(f"'{alan_tanimi.goruntu}' zorunlu")
-                    durum = "zorunlu_eksik"
-
-                # Validator kontrolü (değer doluysa)
-                elif donusturulmus and alan_tanimi.validator:
-                    try:
-                        gecerli, hata_msg = alan_tanimi.validator(donusturulmus)
-                        if not gecerli:
-                            hata_mesajlari.append(f"'{alan_tanimi.goruntu}': {hata_msg}")
-                            if durum == "":
-                                durum = "hatali"
-                    except Exception as exc:
-                        hata_mesajlari.append(f"'{alan_tanimi.goruntu}' validasyon hatası: {exc}")
-                        if durum == "":
-                            durum = "hatali"
-
-                kayit[db_alan] = donusturulmus
+            # Validator kontrolü (değer doluysa)
+            if alan_tanimi.validator and not bos.all():
+                v_mesaj = _validator_mesajlari(deger, alan_tanimi).to_numpy()
+                v_hata = v_mesaj != ""
+                mesaj[v_hata] = v_mesaj[v_hata]
+                hatali |= v_hata
+
+            if (mesaj != "").any():
+                mesaj_sutunlari.append(mesaj)
+            kolonlar[db_alan] = deger.tolist()
+
+        # zorunlu_eksik, hatali'ya göre önceliklidir
+        durumlar = np.where(zorunlu_eksik, "zorunlu_eksik",
+                            np.where(hatali, "hatali", ""))
+
+        alanlar = list(kolonlar)
+        sonuclar: list[SatirSonucu] = []
+        satir_degerleri = zip(*kolonlar.values()) if kolonlar else [()] * n
+        for i, (idx, degerler) in enumerate(zip(df.index, satir_degerleri)):
+            kayit = dict(zip(alanlar, degerler))
+            durum = str(durumlar[i])
+            hata_mesaji = ""
+            if durum:
+                hata_mesaji = "; ".join(m[i] for m in mesaj_sutunlari if m[i])
 
             # Tablo özel normalize_fn (standart dönüşüm SONRASINDA)
-            if konfig.normalize_fn and durum not in ("zorunlu_eksik", "hatali"):
+            elif konfig.normalize_fn:
                 try:
                     kayit = konfig.normalize_fn(kayit)
                 except Exception as exc:
-                    hata_mesajlari.append(f"Normalize hatası: {exc}")
+                    hata_mesaji = f"Normalize hatası: {exc}"
                     durum = "hatali"
 
             sonuclar.append(SatirSonucu(
-                satir_no=satir_no,
+                satir_no=int(idx) + 2,
                 veri=kayit,
                 durum=durum,
-                hata_mesaji="; ".join(hata_mesajlari),
+                hata_mesaji=hata_mesaji,
             ))
 
         return sonuclar
@@ -452,20 +797,32 @@ def duplicate_kontrol(
         satirlar: list[SatirSonucu],
         konfig: ImportKonfig,
         db,
+        pk_onbellek: Optional[dict[tuple, set[tuple]]] = None,
     ) -> list[SatirSonucu]:
         """
         Mevcut DB kayıtlarıyla karşılaştırır.
         Yalnızca durum=="" olan (henüz temiz) satırlar kontrol edilir.
         pk_duplicate / yumusak_duplicate olarak işaretler.
+
+        pk_onbellek: parça parça çağrılarda mevcut anahtar kümeleri bir kez
+        sorgulanıp burada saklanır (alan listesi → küme).
         """
         dup = konfig.duplicate
         temiz = [s for s in satirlar if s.durum == ""]
         if not temiz:
             return satirlar
 
+        def _mevcut(alanlar: list[str]) -> set[tuple]:
+            if pk_onbellek is None:
+                return self._mevcut_pk_seti(konfig.tablo_adi, alanlar, db)
+            anahtar = tuple(alanlar)
+            if anahtar not in pk_onbellek:
+                pk_onbellek[anahtar] = self._mevcut_pk_seti(konfig.tablo_adi, alanlar, db)
+            return pk_onbellek[anahtar]
+
         # --- PK duplicate ---
         if dup.pk_alanlar:
-            mevcut_pkler = self._mevcut_pk_seti(konfig.tablo_adi, dup.pk_alanlar, db)
+            mevcut_pkler = _mevcut(dup.pk_alanlar)
             for satir in temiz:
                 anahtar = tuple(satir.veri.get(a, "") for a in dup.pk_alanlar)
                 if anahtar in mevcut_pkler:
@@ -477,9 +834,7 @@ def duplicate_kontrol(
 
         # --- Yumuşak duplicate ---
         if dup.yumusak_alanlar:
-            mevcut_yumusak = self._mevcut_pk_seti(
-                konfig.tablo_adi, dup.yumusak_alanlar, db
-            )
+            mevcut_yumusak = _mevcut(dup.yumusak_alanlar)
             for satir in temiz:
                 if satir.durum != "":
                     continue
@@ -500,6 +855,30 @@ def duplicate_kontrol(
 
         return satirlar
 
+    def dosyadan_hazirla(
+        self,
+        dosya_yolu: str,
+        harita: dict[str, str],
+        konfig: ImportKonfig,
+        db,
+        manuel_degerler: Optional[dict[str, str]] = None,
+        parca_boyutu: int = EXCEL_PARCA_BOYUTU,
+        ilerleme: Optional[IlerlemeFn] = None,
+    ) -> list[SatirSonucu]:
+        """
+        excel_parcalari → donustur → duplicate_kontrol zincirini parça
+        parça çalıştırır; bellekte yalnızca o anki parça ve SatirSonucu
+        listesi bulunur. Sonuç excel_oku + donustur + duplicate_kontrol
+        ile aynıdır.
+        Fırlatır: ValueError (dosya okunamazsa)
+        """
+        pk_onbellek: dict[tuple, set[tuple]] = {}
+        satirlar: list[SatirSonucu] = []
+        for parca in self.excel_parcalari(dosya_yolu, parca_boyutu, ilerleme):
+            sonuc = self.donustur(parca, harita, konfig, manuel_degerler)
+            satirlar.extend(self.duplicate_kontrol(sonuc, konfig, db, pk_onbellek))
+        return satirlar
+
     def _mevcut_pk_seti(
         self,
         tablo: str,
@@ -508,14 +887,14 @@ def _mevcut_pk_seti(
     ) -> set[tuple]:
         """
         Tek SQL sorgusunda mevcut PK kombinasyonlarını çeker.
-        db parametresi sqlite3 uyumlu cursor() metoduna sahip olmalıdır.
+        db parametresi execute() metoduna sahip olmalıdır
+        (SQLiteManager veya sqlite3.Connection).
         """
         if not alanlar:
             return set()
         alan_listesi = ", ".join(alanlar)
         try:
-            cur = db.cursor()
-            cur.execute(f"SELECT {alan_listesi} FROM {tablo}")
+            cur = db.execute(f"SELECT {alan_listesi} FROM {tablo}")
             return {
                 tuple(str(v) if v is not None else "" for v in row)
                 for row in cur.fetchall()
@@ -547,11 +926,19 @@ def yukle(
           svc = konfig.servis_fabrika(db)
           metod = getattr(svc, konfig.servis_metod)
           sonuc = metod(veri_dict)
+
+        Tüm yükleme tek transaction'dır (satır başına commit yok); her satır
+        kendi SAVEPOINT'inde çalışır, başarısız satırın yarım yazımları
+        geri alınır ve diğer satırlar etkilenmez.
+
+        konfig.servis_toplu_metod tanımlı ve serviste varsa tüm satırlar o
+        metoda tek seferde verilir; satır bazlı hatalar metodun döndürdüğü
+        {indeks: hata} sözlüğünden işaretlenir.
         """
         svc = konfig.servis_fabrika(db)
-        metod = getattr(svc, konfig.servis_metod)
         dup = konfig.duplicate
 
+        yuklenecek: list[SatirSonucu] = []
         for satir in satirlar:
             if satir.durum == "":
                 pass  # temiz
@@ -561,38 +948,80 @@ def yukle(
                 pass  # uyar ama yine de ekle
             else:
                 continue  # diğerleri → atla
+            yuklenecek.append(satir)
 
+        def _veri(satir: SatirSonucu) -> dict:
             veri = dict(satir.veri)
             if kaydeden:
                 veri["kaydeden"] = kaydeden
+            return veri
 
-            try:
-                sonuc = metod(veri)
-                # SonucYonetici uyumluluğu:
-                #   .basarili_mi  (yeni standart)
-                #   .basarili     (mevcut servisler — personel, cihaz vb.)
-                #   .hata / .mesaj  hata açıklaması için
-                if hasattr(sonuc, "basarili_mi"):
-                    ok = sonuc.basarili_mi
-                elif hasattr(sonuc, "basarili"):
-                    ok = sonuc.basarili
-                else:
-                    ok = True   # dönüş değeri belirsizse başarılı say
+        toplu_metod = (getattr(svc, konfig.servis_toplu_metod, None)
+                       if konfig.servis_toplu_metod else None)
+        if toplu_metod is not None:
+            if yuklenecek:
+                self._toplu_yukle(toplu_metod, yuklenecek,
+                                  [_veri(s) for s in yuklenecek], db)
+            return self._ozet_olustur(satirlar)
 
-                if ok:
+        metod = getattr(svc, konfig.servis_metod)
+        with _transaction(db):
+            for satir in yuklenecek:
+                veri = _veri(satir)
+                try:
+                    with _transaction(db):
+                        sonuc = metod(veri)
+                        # SonucYonetici uyumluluğu:
+                        #   .basarili_mi  (yeni standart)
+                        #   .basarili     (mevcut servisler — personel, cihaz vb.)
+                        #   .hata / .mesaj  hata açıklaması için
+                        if hasattr(sonuc, "basarili_mi"):
+                            ok = sonuc.basarili_mi
+                        elif hasattr(sonuc, "basarili"):
+                            ok = sonuc.basarili
+                        else:
+                            ok = True   # dönüş değeri belirsizse başarılı say
+
+                        if not ok:
+                            raise _SatirGeriAl(str(
+                                getattr(sonuc, "hata", None)
+                                or getattr(sonuc, "mesaj", None)
+                                or sonuc
+                            ))
                     satir.durum = "basarili"
-                else:
+                except Exception as exc:
                     satir.durum = "hatali"
-                    satir.hata_mesaji = str(
-                        getattr(sonuc, "hata", None)
-                        or getattr(sonuc, "mesaj", None)
-                        or sonuc
-                    )
-            except Exception as exc:
+                    satir.hata_mesaji = str(exc)
+
+        return self._ozet_olustur(satirlar)
+
+    def _toplu_yukle(
+        self,
+        toplu_metod: Callable,
+        satirlar: list[SatirSonucu],
+        veriler: list[dict],
+        db,
+    ) -> None:
+        """servis_toplu_metod çağrısı; satır durumlarını sonuca göre işaretler."""
+        try:
+            with _transaction(db):
+                sonuc = toplu_metod(veriler)
+                ok = getattr(sonuc, "basarili", True)
+                if not ok:
+                    raise _SatirGeriAl(str(getattr(sonuc, "mesaj", None) or sonuc))
+        except Exception as exc:
+            for satir in satirlar:
                 satir.durum = "hatali"
                 satir.hata_mesaji = str(exc)
+            return
 
-        return self._ozet_olustur(satirlar)
+        hatalar = getattr(sonuc, "veri", None) or {}
+        for i, satir in enumerate(satirlar):
+            if i in hatalar:
+                satir.durum = "hatali"
+                satir.hata_mesaji = str(hatalar[i])
+            else:
+                satir.durum = "basarili"
 
     # ------------------------------------------------------------------
     # 6) Yeniden yükleme (hata düzeltme ekranından)
@@ -30,10 +30,10 @@ def get_sabitler_repo(self) -> SonucYonetici:
 
     def get_sabitler_listesi(self, kod: Optional[str] = None) -> SonucYonetici:
         try:
-            rows = self._r.get("Sabitler").get_all() or []
+            q = self._r.get("Sabitler").query()
             if kod is not None:
-                hedef = str(kod).strip()
-                rows = [r for r in rows if str(r.get("Kod", "")).strip() == hedef]
+                q.where_trimmed(Kod=kod)
+            rows = q.all()
             return SonucYonetici.tamam(veri=rows)
         except Exception as e:
             return SonucYonetici.hata(e, "FhszService.get_sabitler_listesi")
@@ -57,14 +57,14 @@ def get_puantaj_listesi(
             personel_id: Personel filtresi
         """
         try:
-            tum = self._r.get("FHSZ_Puantaj").get_all() or []
-
+            q = self._r.get("FHSZ_Puantaj").query()
             if yil is not None:
-                tum = [r for r in tum if str(r.get("AitYil", "")) == str(yil)]
+                q.where(AitYil=str(yil))
             if donem is not None:
-                tum = [r for r in tum if str(r.get("Donem", "")) == str(donem)]
+                q.where(Donem=str(donem))
             if personel_id is not None:
-                tum = [r for r in tum if str(r.get("Personelid", "")).strip() == str(personel_id).strip()]
+                q.where(Personelid=str(personel_id).strip())
+            tum = q.all()
 
             return SonucYonetici.tamam(veri=tum)
         except Exception as e:
@@ -81,11 +81,11 @@ def get_donem_puantaj_listesi(self, yil: str | int, donem: str | int) -> SonucYo
 
     def sua_bakiye_guncelle(self, yil_str: str) -> SonucYonetici:
         try:
-            tum = self._r.get("FHSZ_Puantaj").get_all() or []
+            tum = (self._r.get("FHSZ_Puantaj")
+                   .query("Personelid", "FiiliCalismaSaat")
+                   .where(AitYil=str(yil_str).strip()).all())
             personel_toplam: dict[str, float] = {}
             for r in tum:
-                if str(r.get("AitYil", "")).strip() != str(yil_str):
-                    continue
                 tc = str(r.get("Personelid", "")).strip()
                 try:
                     saat = float(str(r.get("FiiliCalismaSaat", 0)).replace(",", "."))
@@ -115,9 +115,11 @@ def donem_puantaj_kaydet(self, yil: str | int, donem: str | int, kayitlar: list[
             yil_str = str(yil)
             donem_str = str(donem)
             repo = self._r.get("FHSZ_Puantaj")
-            tum = repo.get_all() or []
-            for r in tum:
-                if str(r.get("AitYil", "")).strip() == yil_str and str(r.get("Donem", "")).strip() == donem_str:
+            # Dönem silme + yeniden yazma + şua bakiyesi tek transaction
+            with self._r.db.transaction():
+                tum = (repo.query("Personelid", "AitYil", "Donem")
+                       .where(AitYil=yil_str, Donem=donem_str).all())
+                for r in tum:
                     pk = [
                         str(r.get("Personelid", "")),
                         str(r.get("AitYil", "")),
@@ -127,9 +129,9 @@ def donem_puantaj_kaydet(self, yil: str | int, donem: str | int, kayitlar: list[
                         repo.delete(pk)
                     except Exception:
                         pass
-            for kayit in kayitlar:
-                repo.insert(kayit)
-            sonuc = self.sua_bakiye_guncelle(yil_str)
+                for kayit in kayitlar:
+                    repo.insert(kayit)
+                sonuc = self.sua_bakiye_guncelle(yil_str)
             if not sonuc.basarili:
                 return sonuc
             return SonucYonetici.tamam(veri=len(kayitlar))
@@ -198,9 +200,10 @@ def get_izin_listesi(self, yil: Optional[int] = None) -> SonucYonetici:
     def get_tatil_gunleri(self, yil: Optional[int] = None) -> SonucYonetici:
         """Resmi tatil günlerini getir."""
         try:
-            tum = self._r.get("Tatiller").get_all() or []
+            q = self._r.get("Tatiller").query()
             if yil is not None:
-                tum = [r for r in tum if str(yil) in str(r.get("Tarih", ""))]
+                q.between("Tarih", f"{int(yil):04d}-01-01", f"{int(yil):04d}-12-31")
+            tum = q.all()
             return SonucYonetici.tamam(veri=tum)
         except Exception as e:
             return SonucYonetici.hata(e, "FhszService.get_tatil_gunleri")
@@ -208,12 +211,12 @@ def get_tatil_gunleri(self, yil: Optional[int] = None) -> SonucYonetici:
     def get_sabitler_by_kod(self, kod: str) -> SonucYonetici:
         """Belirli Kod'a ait sabit değerleri döndür."""
         try:
-            sabitler = self._r.get("Sabitler").get_all() or []
+            sabitler = (self._r.get("Sabitler").query("MenuEleman")
+                        .where_trimmed(Kod=kod).column("MenuEleman"))
             data = sorted({
-                str(s.get("MenuEleman", "")).strip()
-                for s in sabitler
-                if str(s.get("Kod", "")).strip() == kod
-                   and str(s.get("MenuEleman", "")).strip()
+                str(m or "").strip()
+                for m in sabitler
+                if str(m or "").strip()
             })
             return SonucYonetici.tamam(veri=data)
         except Exception as e:
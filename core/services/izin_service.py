@@ -63,6 +63,49 @@ def insert_izin_giris(self, data: dict) -> SonucYonetici:
         except Exception as e:
             return SonucYonetici.hata(e, "IzinService.insert_izin_giris")
 
+    def toplu_izin_giris_ekle(self, kayitlar: List[Dict]) -> SonucYonetici:
+        """
+        Çok sayıda izin giriş kaydını tek transaction'da ekler (Excel içe
+        aktarma). Süre limiti insert_izin_giris'teki gibi doğrulanır; limit
+        her (personel, izin tipi) için bir kez hesaplanır.
+
+        Returns:
+            SonucYonetici — veri: {kayitlar indeksi: hata mesajı}
+            (yalnızca eklenemeyen satırlar)
+        """
+        try:
+            hatalar: Dict[int, str] = {}
+            yazilacak: List[int] = []
+            limitler: Dict[Tuple[str, str], Optional[int]] = {}
+            for i, data in enumerate(kayitlar):
+                tc = str(data.get("Personelid", "")).strip()
+                izin_tipi = str(data.get("IzinTipi", "")).strip()
+                try:
+                    gun = int(data.get("Gun", 0))
+                except (TypeError, ValueError):
+                    gun = 0
+
+                if tc and izin_tipi and gun > 0:
+                    anahtar = (tc, izin_tipi)
+                    if anahtar not in limitler:
+                        limitler[anahtar] = self.get_izin_max_gun(tc=tc, izin_tipi=izin_tipi)
+                    max_gun = limitler[anahtar]
+                    if max_gun is not None and gun > max_gun:
+                        hatalar[i] = f"{izin_tipi} için maksimum {max_gun} gün girilebilir."
+                        continue
+                yazilacak.append(i)
+
+            repo_hatalari = self._r.get("Izin_Giris").insert_many_raporlu(
+                [kayitlar[i] for i in yazilacak]
+            )
+            for j, exc in repo_hatalari.items():
+                hatalar[yazilacak[j]] = str(exc)
+            return SonucYonetici.tamam(
+                f"{len(kayitlar) - len(hatalar)} izin giriş kaydı eklendi", veri=hatalar
+            )
+        except Exception as e:
+            return SonucYonetici.hata(e, "IzinService.toplu_izin_giris_ekle")
+
     def update_izin_giris(self, izin_id: str, data: dict) -> SonucYonetici:
         """İzin giriş kaydını güncelle."""
         try:
@@ -177,10 +220,9 @@ def get_izin_max_gun(self, tc: str, izin_tipi: str) -> Optional[int]:
                 return max(0, int(sua_hak))
 
             # Diğer izinler: Sabitler.Aciklama sayısal ise limit, boşsa limitsiz.
-            sabitler = self._r.get("Sabitler").get_all() or []
+            sabitler = (self._r.get("Sabitler").query("MenuEleman", "Aciklama")
+                        .where_trimmed(Kod="İzin_Tipi").all())
             for row in sabitler:
-                if str(row.get("Kod", "")).strip() != "İzin_Tipi":
-                    continue
                 if str(row.get("MenuEleman", "")).strip() != tip:
                     continue
                 return self._parse_max_from_aciklama(str(row.get("Aciklama", "")))
@@ -321,12 +363,12 @@ def get_izin_tipleri(self) -> SonucYonetici:
             İzin türleri listesi
         """
         try:
-            sabitler = self._r.get("Sabitler").get_all() or []
+            sabitler = (self._r.get("Sabitler").query("MenuEleman")
+                        .where_trimmed(Kod="IzinTipi").column("MenuEleman"))
             tipleri = [
-                str(s.get("MenuEleman", "")).strip()
-                for s in sabitler
-                if str(s.get("Kod", "")).strip() == "IzinTipi"
-                and str(s.get("MenuEleman", "")).strip()
+                str(m or "").strip()
+                for m in sabitler
+                if str(m or "").strip()
             ]
             return SonucYonetici.tamam(veri=sorted(list(set(tipleri))))
         except Exception as e:
@@ -355,7 +397,9 @@ def get_izinli_personeller_bugun(self) -> SonucYonetici:
         """
         try:
             today = date.today()
-            izin_kayitlari = self._r.get("Izin_Giris").get_all() or []
+            # Bugünden sonra başlayan izinler elenir (bitiş boş olabilir)
+            izin_kayitlari = (self._r.get("Izin_Giris").query()
+                              .between("BaslamaTarihi", bit=today).all())
             
             izinli_map: Dict[str, List[Tuple[str, str]]] = {}
             
@@ -449,10 +493,13 @@ def get_tatiller_raw(self) -> SonucYonetici:
         except Exception as e:
             return SonucYonetici.hata(e, "IzinService.get_tatiller_raw")
 
-    def get_tum_izin_giris(self) -> SonucYonetici:
-        """Tüm izin giriş kayıtlarını döner."""
+    def get_tum_izin_giris(self, compact: bool = False) -> SonucYonetici:
+        """
+        Tüm izin giriş kayıtlarını döner.
+        compact=True → salt okuma listeleri için kompakt Satir listesi.
+        """
         try:
-            data = self._r.get("Izin_Giris").get_all() or []
+            data = self._r.get("Izin_Giris").get_all(compact=compact) or []
             return SonucYonetici.tamam(veri=data)
         except Exception as e:
             return SonucYonetici.hata(e, "IzinService.get_tum_izin_giris")
@@ -483,7 +530,10 @@ def has_izin_cakisma(
             if not yeni_bas or not yeni_bit:
                 return SonucYonetici.tamam(veri=False)
 
-            all_izin = self._r.get("Izin_Giris").get_all() or []
+            all_izin = (self._r.get("Izin_Giris").query()
+                        .where(Personelid=tc_str)
+                        .between("BaslamaTarihi", bit=yeni_bit)
+                        .all())
             for kayit in all_izin:
                 if str(kayit.get("Durum", "")).strip() == "İptal":
                     continue
@@ -13,10 +13,17 @@
 from __future__ import annotations
 
 import uuid
-from calendar import monthrange
 from datetime import date, timedelta
 
 from core.hata_yonetici import SonucYonetici, logger
+# Sabitler nb_planlama_baglami'nda; eski içe aktarmalar için burada da erişilebilir
+from core.services.nobet.nb_planlama_baglami import (  # noqa: F401
+    GUNLUK_DK, HAFTASONU, ONAY_DURUMLAR, VARSAYILAN_SLOT,
+    PlanlamaBaglami, PlanlamaHatasi,
+)
+from core.services.nobet.nb_cozucu import (
+    VARSAYILAN_TOHUM, NbCozucu, adalet_metrikleri,
+)
 from database.repository_registry import RepositoryRegistry
 
 
@@ -29,16 +36,6 @@ def _yeni_id() -> str:
     return str(uuid.uuid4())
 
 
-# ──────────────────────────────────────────────────────────────
-#  Sabitler
-# ──────────────────────────────────────────────────────────────
-
-ONAY_DURUMLAR    = {"Onaylandı", "onaylandi", "onaylı", "approved"}
-GUNLUK_DK        = 420   # 7 saat Ï— 60 dk
-VARSAYILAN_SLOT  = 4
-HAFTASONU        = {5, 6}   # Cumartesi, Pazar
-
-
 # ──────────────────────────────────────────────────────────────
 #  Ana Sınıf
 # ──────────────────────────────────────────────────────────────
@@ -49,411 +46,100 @@ def __init__(self, registry: RepositoryRegistry):
         self._r = registry
 
     # ──────────────────────────────────────────────────────────
-    #  ADIM 1 = Yardımcı Metodlar
-    # ──────────────────────────────────────────────────────────
-
-    @staticmethod
-    def _networkdays(bas: date, bit: date,
-                     tatiller: set[str]) -> int:
-        """
-        Excel TAMİŞGÜNÜ.ULUSL karşılığı.
-        bas-bit arasındaki (her ikisi dahil) hafta iÇi iş günlerini sayar.
-        tatiller: 'YYYY-MM-DD' string seti.
-        """
-        if bas > bit:
-            return 0
-        sayi = 0
-        gun  = bas
-        while gun <= bit:
-            if gun.weekday() < 5 and gun.isoformat() not in tatiller:
-                sayi += 1
-            gun += timedelta(days=1)
-        return sayi
-
-    def _tatil_set(self, yil: int, ay: int) -> set[str]:
-        """
-        O aya ait Resmi + DiniBayram tatil tarihlerini set olarak döner.
-        """
-        try:
-            rows   = self._r.get("Tatiller").get_all() or []
-            ay_bas = f"{yil:04d}-{ay:02d}-01"
-            ay_bit = f"{yil:04d}-{ay:02d}-31"
-            return {
-                str(r.get("Tarih", ""))
-                for r in rows
-                if ay_bas <= str(r.get("Tarih", "")) <= ay_bit
-                and str(r.get("TatilTuru", "Resmi"))
-                in ("Resmi", "DiniBayram")
-            }
-        except Exception:
-            return set()
-
-    def _resmi_tatil_set(self, yil: int, ay: int) -> set[str]:
-        """O aya ait resmi/idari tatil tarihlerini döner."""
-        try:
-            rows   = self._r.get("Tatiller").get_all() or []
-            ay_bas = f"{yil:04d}-{ay:02d}-01"
-            ay_bit = f"{yil:04d}-{ay:02d}-31"
-            return {
-                str(r.get("Tarih", ""))
-                for r in rows
-                if ay_bas <= str(r.get("Tarih", "")) <= ay_bit
-                and str(r.get("TatilTuru", "Resmi")) in ("Resmi", "Idari")
-            }
-        except Exception:
-            return set()
-        
-    def _dini_set(self, yil: int, ay: int) -> set[str]:
-        """Sadece DiniBayram tarihlerini döner (atama yapılmaz)."""
-        try:
-            rows   = self._r.get("Tatiller").get_all() or []
-            ay_bas = f"{yil:04d}-{ay:02d}-01"
-            ay_bit = f"{yil:04d}-{ay:02d}-31"
-            return {
-                str(r.get("Tarih", ""))
-                for r in rows
-                if ay_bas <= str(r.get("Tarih", "")) <= ay_bit
-                and str(r.get("TatilTuru", "")) == "DiniBayram"
-            }
-        except Exception:
-            return set()
-
-    def _izin_map(self, yil: int, ay: int) -> dict[str, set[str]]:
-        """
-        Personelin o aydaki onaylı izin günleri (hafta sonu dahil).
-        Kullanım: _atanabilir'de gün bloklama.
-        {pid: {'2025-08-05', '2025-08-06', ...}}
-        """
-        ay_bas = date(yil, ay, 1)
-        ay_bit = date(yil, ay, monthrange(yil, ay)[1])
-        sonuc: dict[str, set[str]] = {}
-        try:
-            rows = self._r.get("Izin_Giris").get_all() or []
-            for r in rows:
-                pid = str(r.get("Personelid", "")).strip()
-                if not pid:
-                    continue
-                if str(r.get("Durum", "")).strip() not in ONAY_DURUMLAR:
-                    continue
-                try:
-                    bas = date.fromisoformat(
-                        str(r.get("BaslamaTarihi", "")))
-                    bit = date.fromisoformat(
-                        str(r.get("BitisTarihi", "")))
-                except Exception:
-                    continue
-                gun = max(bas, ay_bas)
-                son = min(bit, ay_bit)
-                while gun <= son:
-                    sonuc.setdefault(pid, set()).add(gun.isoformat())
-                    gun += timedelta(days=1)
-        except Exception as e:
-            logger.warning(f"_izin_map: {e}")
-        return sonuc
-
-    # Hedef tipi ââ€ ' günlük Çalışma saati
-    # Emzirme: günde 1.5 saat erken Çıkış ââ€ ' 7 - 1.5 = 5.5s
-    # Sendika: günde 0.8 saat erken Çıkış ââ€ ' 7 - 0.8 = 6.2s
-    _GUNLUK_SAAT = {
-        "normal":    7.0,
-        "emzirme":   5.5,
-        "sendika":   6.2,
-        "sua":       0.0,   # Şua izninde nöbet tutulmaz
-        "rapor":     7.0,   # Raporlu = normal hedef ama izin günleri düşülür
-        "yillik":    7.0,
-        "idari":     7.0,
-    }
-
-    def _hedef_hesapla(self, personel_id: str,
-                       yil: int, ay: int) -> int:
-        """
-        Excel formülü:
-          1. ay_is   = NETWORKDAYS(ay_bas, ay_bit, tatiller)
-          2. izin_is = NETWORKDAYS(max(izin_bas,ay_bas), min(izin_bit,ay_bit), tatiller)
-          3. hedef   = (ay_is - izin_is) Ï= günlük_dk
-
-        Günlük dakika: HedefTipi'ne göre değişir
-          Normal:   420 dk (7 saat)
-          Emzirme:  330 dk (5.5 saat)
-          Sendika:  372 dk (6.2 saat)
-          Şua:        0 dk (nöbet tutulmaz)
-        """
-        try:
-            tatiller = self._tatil_set(yil, ay)
-            ay_bas   = date(yil, ay, 1)
-            ay_bit   = date(yil, ay, monthrange(yil, ay)[1])
-
-            # Ay iş günü
-            ay_is = self._networkdays(ay_bas, ay_bit, tatiller)
-
-            # Personelin hedef tipi (NB_PersonelTercih'ten)
-            hedef_tipi = self._hedef_tipi(personel_id, yil, ay)
-            gunluk_saat = self._GUNLUK_SAAT.get(hedef_tipi, 7.0)
-            gunluk_dk   = round(gunluk_saat * 60)
-
-            # Şua iznindeyse hiÇ atama yapılmaz
-            if hedef_tipi == "sua":
-                return 0
-
-            # Onaylı izin iş günleri
-            rows    = self._r.get("Izin_Giris").get_all() or []
-            izin_is = 0
-            for r in rows:
-                if str(r.get("Personelid","")).strip() != str(personel_id).strip():
-                    continue
-                if str(r.get("Durum","")).strip() not in ONAY_DURUMLAR:
-                    continue
-                try:
-                    bas = date.fromisoformat(str(r.get("BaslamaTarihi","")))
-                    bit = date.fromisoformat(str(r.get("BitisTarihi","")))
-                except Exception:
-                    continue
-                klamp_bas = max(bas, ay_bas)
-                klamp_bit = min(bit, ay_bit)
-                if klamp_bas > klamp_bit:
-                    continue
-                izin_is += self._networkdays(klamp_bas, klamp_bit, tatiller)
-
-            hedef = max(0, ay_is - izin_is) * gunluk_dk
-            logger.debug(
-                f"[Hedef] {personel_id} ({hedef_tipi}): "
-                f"ay_is={ay_is} izin_is={izin_is} "
-                f"net={ay_is-izin_is} * {gunluk_saat}s "
-                f"ââ€ ' {hedef//60}s")
-            return hedef
-        except Exception as e:
-            logger.warning(f"_hedef_hesapla({personel_id}): {e}")
-            return 20 * GUNLUK_DK
-
-    def _hedef_tipi(self, personel_id: str,
-                    yil: int, ay: int) -> str:
-        """NB_PersonelTercih'ten HedefTipi'ni döner. Varsayılan: 'normal'"""
-        try:
-            rows = self._r.get("NB_PersonelTercih").get_all() or []
-            kayit = next(
-                (r for r in rows
-                 if str(r.get("PersonelID","")) == str(personel_id)
-                 and int(r.get("Yil", 0)) == yil
-                 and int(r.get("Ay",  0)) == ay),
-                None)
-            return str(kayit.get("HedefTipi","normal")).lower() if kayit else "normal"
-        except Exception:
-            return "normal"
-
-    # ──────────────────────────────────────────────────────────
-    #  ADIM 2 = Hazırlık
+    #  ADIM 1 = Hazırlık
     # ──────────────────────────────────────────────────────────
 
     def _hazirla(self, birim_id: str, yil: int, ay: int) -> dict:
         """
-        Plan oluşturmadan önce tüm verileri hazırlar.
-        Döner: {ok, hata?, ayar, gruplar, personeller,
-                gonulluler, izin_map, tatil_set, resmi_set, dini_set,
-                hafta_sonu_calisma, resmi_tatil_calisma, dini_bayram_calisma,
-                hedef_map, plan_id}
+        Plan oluşturmadan önce tüm verileri tek seferde okur
+        (PlanlamaBaglami) ve plan başlığını hazırlar.
+        Döner: {ok, hata?, baglam, plan_id}
         """
         sonuc = {"ok": False}
 
-        # ── Birim ayarı ───────────────────────────────────────
         try:
-            a_rows = self._r.get("NB_BirimAyar").get_all() or []
-            ayar   = next(
-                (r for r in a_rows
-                 if str(r.get("BirimID","")) == str(birim_id)),
-                None)
-            if ayar is None:
-                ayar = {"GunlukSlotSayisi": VARSAYILAN_SLOT,
-                        "OtomatikBolunme": 1}
-        except Exception as e:
-            sonuc["hata"] = f"Birim ayarı okunamadı: {e}"
+            baglam = PlanlamaBaglami.olustur(self._r, birim_id, yil, ay)
+        except PlanlamaHatasi as e:
+            sonuc["hata"] = str(e)
             return sonuc
 
-        def _bool_ayar(deger, varsayilan: int = 1) -> bool:
-            if deger is None:
-                return bool(varsayilan)
-            if isinstance(deger, bool):
-                return deger
-            if isinstance(deger, (int, float)):
-                return int(deger) != 0
-            return str(deger).strip().lower() in ("1", "true", "evet", "yes")
-
-        slot_sayisi = int(ayar.get("GunlukSlotSayisi", VARSAYILAN_SLOT))
-        hafta_sonu_calisma = _bool_ayar(ayar.get("HaftasonuCalismaVar"), 1)
-        resmi_tatil_calisma = _bool_ayar(ayar.get("ResmiTatilCalismaVar"), 1)
-        dini_bayram_calisma = _bool_ayar(
-            ayar.get("DiniBayramCalismaVar",
-                     ayar.get("DiniBayramAtama", 0)),
-            0
-        )
-        ardisik_gun_izinli = _bool_ayar(ayar.get("ArdisikGunIzinli"), 0)
         logger.info(
-            f"[Birim ayarı] slot={slot_sayisi} "
-            f"FmMax={ayar.get('FmMaxSaat',60)}s "
-            f"MaxGunluk={ayar.get('MaxGunlukSureDakika',720)}dk "
-            f"HaftaSonu={'Evet' if hafta_sonu_calisma else 'Hayır'} "
-            f"ResmiTatil={'Evet' if resmi_tatil_calisma else 'Hayır'} "
-            f"DiniBayram={'Evet' if dini_bayram_calisma else 'Hayır'}"
+            f"[Birim ayarı] slot={baglam.slot_sayisi} "
+            f"FmMax={baglam.fm_max_dk // 60}s "
+            f"MaxGunluk={baglam.birim_max_gun_dk}dk "
+            f"HaftaSonu={'Evet' if baglam.hafta_sonu_calisma else 'Hayır'} "
+            f"ResmiTatil={'Evet' if baglam.resmi_tatil_calisma else 'Hayır'} "
+            f"DiniBayram={'Evet' if baglam.dini_bayram_calisma else 'Hayır'}"
         )
-
-        # ── Vardiya grupları ──────────────────────────────────
+        # Grup yapısını logla = gerÇek veriyi görmek iÇin
+        for g in baglam.gruplar:
+            vlist = [
+                f"{v.get('VardiyaAdi','')} "
+                f"{v.get('BasSaat','')}-{v.get('BitSaat','')} "
+                f"{v.get('SureDakika',0)}dk"
+                for v in g["ana"]]
+            logger.info(
+                f"[Grup] '{g['GrupAdi']}' "
+                f"toplam_dk={g['toplam_dk']} "
+                f"vardiya_sayisi={len(g['ana'])} "
+                f"| {vlist}")
+        for pid, hedef in baglam.hedef_map.items():
+            logger.info(f"[Hedef] {pid} ââ€ ' {hedef}dk = {hedef//60}s")
+
+        # ── Plan başlığı (yazım _plani_kaydet'te) ───────────
         try:
-            g_rows = self._r.get("NB_VardiyaGrubu").get_all() or []
-            v_rows = self._r.get("NB_Vardiya").get_all() or []
-
-            aktif_gruplar = sorted(
-                [g for g in g_rows
-                 if str(g.get("BirimID","")) == str(birim_id)
-                 and int(g.get("Aktif", 1))],
-                key=lambda g: int(g.get("Sira", 1)))
-
-            if not aktif_gruplar:
-                sonuc["hata"] = "Bu birime ait aktif vardiya grubu yok"
-                return sonuc
-
-            gruplar = []
-            for g in aktif_gruplar:
-                gid  = g["GrupID"]
-                ana  = sorted(
-                    [v for v in v_rows
-                     if str(v.get("GrupID","")) == gid
-                     and str(v.get("Rol","ana")) == "ana"
-                     and int(v.get("Aktif", 1))],
-                    key=lambda v: int(v.get("Sira", 1)))
-                if not ana:
-                    continue
-                toplam_dk = sum(int(v.get("SureDakika", 0)) for v in ana)
-                gruplar.append({
-                    "GrupID":    gid,
-                    "GrupAdi":   g.get("GrupAdi",""),
-                    "ana":       ana,
-                    "toplam_dk": toplam_dk,
-                })
-
-            if not gruplar:
-                sonuc["hata"] = "HiÇbir grupta ana rolünde aktif vardiya yok"
-                return sonuc
-
-            # Grup yapısını logla = gerÇek veriyi görmek iÇin
-            for g in gruplar:
-                vlist = [
-                    f"{v.get('VardiyaAdi','')} "
-                    f"{v.get('BasSaat','')}-{v.get('BitSaat','')} "
-                    f"{v.get('SureDakika',0)}dk"
-                    for v in g["ana"]]
-                logger.info(
-                    f"[Grup] '{g['GrupAdi']}' "
-                    f"toplam_dk={g['toplam_dk']} "
-                    f"vardiya_sayisi={len(g['ana'])} "
-                    f"| {vlist}")
-
+            mevcut = self._mevcut_plan(birim_id, yil, ay)
         except Exception as e:
-            sonuc["hata"] = f"Vardiya grupları okunamadı: {e}"
+            sonuc["hata"] = f"Plan başlığı okunamadı: {e}"
             return sonuc
-
-        # ── Personel havuzları ────────────────────────────────
-        try:
-            # NB_BirimPersonel ââ€ ' GorevYeri fallback
-            pid_listesi = []
-            try:
-                bp_rows = self._r.get("NB_BirimPersonel").get_all() or []
-                pid_listesi = [
-                    str(r.get("PersonelID",""))
-                    for r in bp_rows
-                    if str(r.get("BirimID","")) == str(birim_id)
-                    and int(r.get("Aktif", 1))
-                    and str(r.get("PersonelID",""))
-                ]
-            except Exception:
-                pass
-
-            if not pid_listesi:
-                # GorevYeri fallback
-                p_rows = self._r.get("Personel").get_all() or []
-                birim_adi_rows = self._r.get("NB_Birim").get_all() or []
-                birim_adi = next(
-                    (r.get("BirimAdi","") for r in birim_adi_rows
-                     if str(r.get("BirimID","")) == str(birim_id)),
-                    "")
-                pid_listesi = [
-                    str(p["KimlikNo"]) for p in p_rows
-                    if str(p.get("GorevYeri","")).strip() == birim_adi
-                ]
-
-            if not pid_listesi:
-                sonuc["hata"] = "Bu birime atanmış personel bulunamadı"
-                return sonuc
-
-            # Tercih haritası = sadece "fazla_mesai_gonullu" işaretlenir
-            # Herkes nöbet tutar; FM Gönüllü manuel ekleme iÇin işaretlenir
-            t_rows = self._r.get("NB_PersonelTercih").get_all() or []
-            fm_gonullu_set: set[str] = set()
-            for r in t_rows:
-                if (str(r.get("BirimID","")) == str(birim_id)
-                        and int(r.get("Yil", 0)) == yil
-                        and int(r.get("Ay",  0)) == ay
-                        and str(r.get("NobetTercihi","")) == "fazla_mesai_gonullu"):
-                    fm_gonullu_set.add(str(r.get("PersonelID","")))
-
-            # Tüm personel zorunlu nöbet tutar
-            personeller = [pid for pid in pid_listesi if pid]
-            gonulluler  = [pid for pid in pid_listesi if pid in fm_gonullu_set]
-
-            if not personeller:
-                sonuc["hata"] = "Birime atanmış aktif personel yok"
+        if mevcut:
+            durum = str(mevcut.get("Durum",""))
+            if durum in ("onaylandi","yururlukte"):
+                sonuc["hata"] = (
+                    f"Plan '{durum}' durumunda, değiştirilemez")
                 return sonuc
 
-        except Exception as e:
-            sonuc["hata"] = f"Personel listesi okunamadı: {e}"
-            return sonuc
-
-        # ── Hedef haritası (izin düşülmüş, kişiye özel) ──────
-        hedef_map: dict[str, int] = {}
-        for pid in personeller + gonulluler:
-            hedef_map[pid] = self._hedef_hesapla(pid, yil, ay)
-            logger.info(
-                f"[Hedef] {pid} ââ€ ' {hedef_map[pid]}dk "
-                f"= {hedef_map[pid]//60}s")
-
-        # ── İzin, tatil setleri ───────────────────────────────
-        tatil_set       = self._tatil_set(yil, ay)  # hedef hesabı iÇin
-        resmi_tatil_set = self._resmi_tatil_set(yil, ay)
-        dini_set        = self._dini_set(yil, ay)
-        izin_map        = self._izin_map(yil, ay)
+        sonuc.update({
+            "ok":      True,
+            "baglam":  baglam,
+            "mevcut":  mevcut,
+            "plan_id": str(mevcut["PlanID"]) if mevcut else _yeni_id(),
+        })
+        return sonuc
 
-        # ── Plan başlığı (mevcut taslak temizle) ─────────────
-        try:
-            pl_rows = self._r.get("NB_Plan").get_all() or []
-            ilgili = [
-                r for r in pl_rows
-                if str(r.get("BirimID", "")) == str(birim_id)
-                and int(r.get("Yil", 0)) == yil
-                and int(r.get("Ay", 0)) == ay
-            ]
-            mevcut = max(ilgili, key=lambda r: int(r.get("Versiyon", 1))) if ilgili else None
+    def _mevcut_plan(self, birim_id: str, yil: int, ay: int) -> dict | None:
+        """Birim/dönemin en yüksek versiyonlu planı (yoksa None)."""
+        ilgili = (self._r.get("NB_Plan").query()
+                  .where(BirimID=str(birim_id), Yil=yil, Ay=ay).all())
+        return max(ilgili, key=lambda r: int(r.get("Versiyon", 1))) if ilgili else None
 
+    def _plani_kaydet(self, birim_id: str, yil: int, ay: int,
+                      plan_id: str, mevcut: dict | None,
+                      satirlar: list[dict]) -> None:
+        """
+        Bellekte üretilen planı tek transaction'da yazar:
+        eski taslak satırlarını sil → plan başlığı → satırlar (insert_many).
+        Hata olursa hiçbiri yazılmaz; yarım plan kalmaz.
+        """
+        plan_repo  = self._r.get("NB_Plan")
+        satir_repo = self._r.get("NB_PlanSatir")
+        with self._r.db.transaction():
             if mevcut:
-                durum = str(mevcut.get("Durum",""))
-                if durum in ("onaylandi","yururlukte"):
-                    sonuc["hata"] = (
-                        f"Plan '{durum}' durumunda, değiştirilemez")
-                    return sonuc
+                # Hesaplama sürerken plan onaylanmış olabilir
+                guncel = plan_repo.get_by_id(plan_id) or {}
+                durum = str(guncel.get("Durum", ""))
+                if durum in ("onaylandi", "yururlukte"):
+                    raise ValueError(f"Plan '{durum}' durumunda, değiştirilemez")
+
                 # Mevcut tüm satırları fiziksel sil (DB şişmesini önle)
-                s_rows = self._r.get("NB_PlanSatir").get_all() or []
-                silinen = 0
-                for s in s_rows:
-                    if str(s.get("PlanID","")) == str(mevcut["PlanID"]):
-                        try:
-                            self._r.get("NB_PlanSatir").delete(s["SatirID"])
-                            silinen += 1
-                        except Exception:
-                            pass
+                silinen = satir_repo.delete_many(
+                    satir_repo.query().where(PlanID=plan_id).column("SatirID"))
                 if silinen:
                     logger.info(f"Eski taslak silindi: {silinen} satır")
-                plan_id = str(mevcut["PlanID"])
 
                 # Otomatik plan, revizyon modunu sonlandıran yeni bir taslak üretir.
                 # Bu nedenle önceki onay izi alanlarını temizle.
-                self._r.get("NB_Plan").update(plan_id, {
+                plan_repo.update(plan_id, {
                     "Durum": "taslak",
                     "OnaylayanID": None,
                     "OnayTarihi": None,
@@ -461,8 +147,10 @@ def _bool_ayar(deger, varsayilan: int = 1) -> bool:
                     "updated_at": _simdi(),
                 })
             else:
-                plan_id = _yeni_id()
-                self._r.get("NB_Plan").insert({
+                # Hesaplama sürerken (ör. toplu üretimde) başka plan açılmış olabilir
+                if self._mevcut_plan(birim_id, yil, ay):
+                    raise ValueError("Plan hesaplanırken bu dönem için başka bir plan oluşturuldu")
+                plan_repo.insert({
                     "PlanID":    plan_id,
                     "BirimID":   birim_id,
                     "Yil":       yil,
@@ -472,42 +160,57 @@ def _bool_ayar(deger, varsayilan: int = 1) -> bool:
                     "updated_at": _simdi(),
                 })
 
+            satir_repo.insert_many(satirlar)
+
+    def _kaydet_veya_beklet(self, h: dict, satirlar: list[dict],
+                            kaydet: bool) -> dict:
+        """kaydet → hemen yaz ({} döner); değilse {"kayit": ...} (plan_kaydet girdisi)."""
+        baglam = h["baglam"]
+        if kaydet:
+            self._plani_kaydet(baglam.birim_id, baglam.yil, baglam.ay,
+                               h["plan_id"], h["mevcut"], satirlar)
+            return {}
+        return {"kayit": {
+            "BirimID":  baglam.birim_id,
+            "Yil":      baglam.yil,
+            "Ay":       baglam.ay,
+            "PlanID":   h["plan_id"],
+            "mevcut":   dict(h["mevcut"]) if h["mevcut"] else None,
+            "satirlar": satirlar,
+        }}
+
+    def plan_kaydet(self, kayit: dict) -> SonucYonetici:
+        """plan_olustur(kaydet=False) ile üretilmiş planı tek transaction'da yazar."""
+        try:
+            self._plani_kaydet(kayit["BirimID"], kayit["Yil"], kayit["Ay"],
+                               kayit["PlanID"], kayit["mevcut"], kayit["satirlar"])
+            return SonucYonetici.tamam(
+                f"{len(kayit['satirlar'])} nöbet satırı kaydedildi",
+                veri={"PlanID": kayit["PlanID"]})
         except Exception as e:
-            sonuc["hata"] = f"Plan başlığı oluşturulamadı: {e}"
-            return sonuc
-
-        sonuc.update({
-            "ok":          True,
-            "ayar":        ayar,
-            "slot_sayisi": slot_sayisi,
-            "gruplar":     gruplar,
-            "personeller": personeller,
-            "gonulluler":  gonulluler,
-            "fm_gonullu":  gonulluler,
-            "hedef_map":   hedef_map,
-            "izin_map":    izin_map,
-            "tatil_set":   tatil_set,
-            "resmi_set":   resmi_tatil_set,
-            "dini_set":    dini_set,
-            "hafta_sonu_calisma": hafta_sonu_calisma,
-            "resmi_tatil_calisma": resmi_tatil_calisma,
-            "dini_bayram_calisma": dini_bayram_calisma,
-            "ardisik_gun_izinli": ardisik_gun_izinli,
-            "plan_id":     plan_id,
-        })
-        return sonuc
+            return SonucYonetici.hata(e, "NbAlgoritma.plan_kaydet")
 
     # ──────────────────────────────────────────────────────────
-    #  ADIM 3 = Atama Döngüsü
+    #  ADIM 2 = Atama Döngüsü
     # ──────────────────────────────────────────────────────────
 
-    def plan_olustur(self, birim_id: str, yil: int,
-                     ay: int) -> SonucYonetici:
+    def plan_olustur(self, birim_id: str, yil: int, ay: int,
+                     motor: str | None = None,
+                     sure_butcesi_sn: float | None = None,
+                     tohum: int = VARSAYILAN_TOHUM,
+                     kaydet: bool = True) -> SonucYonetici:
         """
         Ana giriş noktası.
-        1. Hazırlık (_hazirla)
+        motor None ise NB_BirimAyar.PlanMotoru kullanılır; 'cozucu' için
+        atama NbCozucu'ya bırakılır (sure_butcesi_sn None → CozucuSureSn).
+        kaydet=False → hiçbir şey yazılmaz; veri["kayit"] daha sonra
+        plan_kaydet() ile yazılır (toplu üretimde işçi süreçler için).
+
+        1. Hazırlık (_hazirla → PlanlamaBaglami; sonrasında okuma sorgusu yok)
         2. SayaÇlar
         3. Gün döngüsü ââ€ ' slot döngüsü ââ€ ' grup döngüsü ââ€ ' kişi seÇ
+        4. Dengeleme (bellekte)
+        5. Kayıt (_plani_kaydet = tek transaction, toplu yazım)
         """
         try:
             h = self._hazirla(birim_id, yil, ay)
@@ -515,22 +218,27 @@ def plan_olustur(self, birim_id: str, yil: int,
                 return SonucYonetici.hata(
                     ValueError(h.get("hata","Hazırlık başarısız")))
 
-            slot_sayisi = h["slot_sayisi"]
-            gruplar     = h["gruplar"]
-            personeller = h["personeller"]
-            gonulluler  = h["gonulluler"]
-            hedef_map   = h["hedef_map"]
-            izin_map    = h["izin_map"]
-            resmi_set   = h["resmi_set"]
-            dini_set    = h["dini_set"]
-            plan_id     = h["plan_id"]
-            ayar        = h["ayar"]
-            hafta_sonu_calisma = h["hafta_sonu_calisma"]
-            resmi_tatil_calisma = h["resmi_tatil_calisma"]
-            dini_bayram_calisma = h["dini_bayram_calisma"]
-            ardisik_gun_izinli = h["ardisik_gun_izinli"]
+            baglam      = h["baglam"]
             plan_id     = h["plan_id"]
-            ayar        = h["ayar"]
+            if (motor or baglam.plan_motoru) == "cozucu":
+                return self._cozucu_ile_olustur(
+                    h,
+                    sure_butcesi_sn if sure_butcesi_sn is not None
+                    else baglam.cozucu_sure_sn,
+                    tohum, kaydet)
+
+            slot_sayisi = baglam.slot_sayisi
+            gruplar     = baglam.gruplar
+            personeller = baglam.personeller
+            gonulluler  = baglam.gonulluler
+            hedef_map   = baglam.hedef_map
+            resmi_set   = baglam.resmi_set
+            dini_set    = baglam.dini_set
+            hafta_sonu_calisma = baglam.hafta_sonu_calisma
+            resmi_tatil_calisma = baglam.resmi_tatil_calisma
+            dini_bayram_calisma = baglam.dini_bayram_calisma
+            ardisik_gun_izinli = baglam.ardisik_gun_izinli
+            izinli_mi   = baglam.izinli_mi
 
             # ── SayaÇlar ──────────────────────────────────────
             # Sıralama: az saat ââ€ ' az nöbet ââ€ ' az hafta sonu
@@ -544,24 +252,14 @@ def plan_olustur(self, birim_id: str, yil: int,
             gun_sure_sayac: dict[str, dict] = {p: {} for p in personeller + gonulluler}
 
             eklenen:  list[dict] = []
+            # Plan satırları bellekte birikir; en sonda _plani_kaydet ile yazılır
+            plan_satirlari: list[dict] = []
             uyarilar: list[str]  = []
             # FM Gönüllülerin fazla mesai saati (hedef üstü kısım)
             fm_saat_sayac: dict[str, int] = {p: 0 for p in gonulluler}
 
             # Önceki ay bakiyesi (alacak/verecek) — NB_MesaiHesap.DevireGidenDakika
-            prev_yil = yil - 1 if ay == 1 else yil
-            prev_ay  = 12      if ay == 1 else ay - 1
-            try:
-                mh_rows = self._r.get("NB_MesaiHesap").get_all() or []
-                devir_map: dict[str, int] = {
-                    str(r.get("PersonelID", "")): int(r.get("DevireGidenDakika", 0))
-                    for r in mh_rows
-                    if str(r.get("BirimID", "")) == str(birim_id)
-                    and int(r.get("Yil", 0)) == prev_yil
-                    and int(r.get("Ay",  0)) == prev_ay
-                }
-            except Exception:
-                devir_map = {}
+            devir_map = baglam.devir_map
 
             # Bakiye sayacı (negatif = eksik, pozitif = fazla)
             bakiye_sayac: dict[str, int] = {
@@ -580,7 +278,7 @@ def plan_olustur(self, birim_id: str, yil: int,
             # Birim bazlı günlük max süre = NB_BirimAyar.MaxGunlukSureDakika
             # 720dk = 12s ââ€ ' personel günde sadece 1 vardiya (gündüz VEYA gece)
             # 1440dk = 24s ââ€ ' personel aynı günde 2 vardiya tutabilir (gündüz + gece)
-            BIRIM_MAX_GUN_DK = int(ayar.get("MaxGunlukSureDakika", 720))
+            BIRIM_MAX_GUN_DK = baglam.birim_max_gun_dk
             logger.info(
                 f"[Birim] MaxGunlukSureDakika={BIRIM_MAX_GUN_DK}dk "
                 f"({'24 saat = gündüz+gece izinli' if BIRIM_MAX_GUN_DK >= 1440 else '12 saat = tek vardiya'})"
@@ -608,7 +306,7 @@ def _atanabilir(pid: str, tarih_str: str,
                             eklenecek_dk: int = 0,
                             gunluk_limit_dk: int | None = None) -> bool:
                 # İzin günü
-                if tarih_str in izin_map.get(pid, set()):
+                if izinli_mi(pid, gun):
                     return False
                 son = son_nobet.get(pid)
                 if son:
@@ -635,19 +333,13 @@ def _atanabilir(pid: str, tarih_str: str,
                     return False
                 return True
 
-            # FM Gönüllü max saat = NB_BirimAyar'dan oku, varsayılan 60s
-            try:
-                a_rows = self._r.get("NB_BirimAyar").get_all() or []
-                ayar_r = next((r for r in a_rows
-                               if str(r.get("BirimID","")) == str(birim_id)), None)
-                FM_MAX_DK = int((ayar_r or {}).get("FmMaxSaat", 60)) * 60
-            except Exception:
-                FM_MAX_DK = 3600  # 60 saat
+            # FM Gönüllü max saat = NB_BirimAyar.FmMaxSaat, varsayılan 60s
+            FM_MAX_DK = baglam.fm_max_dk
 
             def _atanabilir_fm(pid: str, tarih_str: str,
                                gun: date, grup_id: str = "") -> bool:
                 # İzin günü
-                if tarih_str in izin_map.get(pid, set()):
+                if izinli_mi(pid, gun):
                     return False
                 son = son_nobet.get(pid)
                 if son:
@@ -664,10 +356,10 @@ def _atanabilir_fm(pid: str, tarih_str: str,
                     return False
                 return True
 
-            # Kayıt ekleme
+            # Kayıt ekleme (bellekte)
             def _ekle(pid: str, vardiya: dict,
                       tarih_str: str, is_hw: bool, grup_id: str = ""):
-                self._r.get("NB_PlanSatir").insert({
+                plan_satirlari.append({
                     "SatirID":     _yeni_id(),
                     "PlanID":      plan_id,
                     "PersonelID":  pid,
@@ -691,22 +383,11 @@ def _ekle(pid: str, vardiya: dict,
                 son_nobet[pid] = (tarih_str, grup_id)
                 eklenen.append(pid)
 
-            vardiya_meta: dict[str, tuple[int, str]] = {}
-            for grup in gruplar:
-                g_id = str(grup.get("GrupID", ""))
-                for v in (grup.get("ana") or []):
-                    v_id = str(v.get("VardiyaID", ""))
-                    if not v_id:
-                        continue
-                    vardiya_meta[v_id] = (int(v.get("SureDakika", 0)), g_id)
+            vardiya_meta = baglam.vardiya_meta
 
             def _minimum_atama_dengele() -> None:
                 """Hedefi olan zorunlu personelin sıfır nöbet kalmasını önlemeye çalış."""
-                satirlar = [
-                    r for r in (self._r.get("NB_PlanSatir").get_all() or [])
-                    if str(r.get("PlanID", "")) == str(plan_id)
-                    and str(r.get("Durum", "aktif")) == "aktif"
-                ]
+                satirlar = plan_satirlari
                 if not satirlar:
                     return
 
@@ -788,7 +469,7 @@ def _eksik_pidler() -> list[str]:
                                 ):
                                     continue
 
-                                self._r.get("NB_PlanSatir").update(satir_id, {
+                                satir.update({
                                     "PersonelID": hedef_pid,
                                     "Kaynak": "algoritma_dengeleme",
                                     "updated_at": _simdi(),
@@ -814,7 +495,6 @@ def _eksik_pidler() -> list[str]:
                                     hs_sayac[hedef_pid] = hs_sayac.get(hedef_pid, 0) + 1
 
                                 son_nobet[hedef_pid] = (tarih_str, f"{grup_id}_{vardiya_id}")
-                                satir["PersonelID"] = hedef_pid
                                 tasinmis_satirlar.add(satir_id)
                                 degisim_oldu = True
                                 logger.info(
@@ -840,10 +520,7 @@ def _eksik_pidler() -> list[str]:
             #   08:00-20:00 ââ€ ' 4 slot ââ€ ' 4 farklı kişi
             #   20:00-08:00 ââ€ ' 4 slot ââ€ ' 4 farklı kişi
             # Bu yapıda "grup" sadece görsel başlık, her vardiya kendi slotu.
-            ay_son = monthrange(yil, ay)[1]
-            gunler = [date(yil, ay, g) for g in range(1, ay_son + 1)]
-
-            for gun in gunler:
+            for gun in baglam.gunler:
                 tarih_str = gun.isoformat()
 
                 # Birim tatil/hafta sonu Çalışma politikası
@@ -987,6 +664,8 @@ def _eksik_pidler() -> list[str]:
 
             _minimum_atama_dengele()
 
+            kayit = self._kaydet_veya_beklet(h, plan_satirlari, kaydet)
+
             # ── Ï–zet ──────────────────────────────────────────
             for pid in personeller + gonulluler:
                 dk   = saat_sayac[pid]
@@ -1008,9 +687,61 @@ def _eksik_pidler() -> list[str]:
 
             return SonucYonetici.tamam(
                 mesaj=ozet,
-                veri={"uyarilar": uyarilar, "PlanID": plan_id})
+                veri={"uyarilar": uyarilar, "PlanID": plan_id,
+                      "motor": "acgozlu",
+                      "metrikler": adalet_metrikleri(baglam, plan_satirlari),
+                      **kayit})
 
         except Exception as e:
             logger.error(f"plan_olustur: {e}", exc_info=True)
             return SonucYonetici.hata(e, "NbAlgoritma.plan_olustur")
 
+    # ──────────────────────────────────────────────────────────
+    #  ADIM 2b = Çözücü motoru
+    # ──────────────────────────────────────────────────────────
+
+    def _cozucu_ile_olustur(self, h: dict, sure_butcesi_sn: float | None,
+                            tohum: int, kaydet: bool = True) -> SonucYonetici:
+        """Atamayı NbCozucu ile yapar; kayıt ve özet açgözlü yol ile aynı."""
+        baglam  = h["baglam"]
+        plan_id = h["plan_id"]
+        sonuc = NbCozucu(baglam, tohum=tohum, sure_butcesi_sn=sure_butcesi_sn).coz()
+
+        simdi = _simdi()
+        plan_satirlari = [
+            {
+                "SatirID":     _yeni_id(),
+                "PlanID":      plan_id,
+                "PersonelID":  pid,
+                "VardiyaID":   vardiya_id,
+                "NobetTarihi": tarih_str,
+                "Kaynak":      "algoritma_cozucu",
+                "NobetTuru":   "normal",
+                "Durum":       "aktif",
+                "created_at":  simdi,
+            }
+            for tarih_str, vardiya_id, pid in sonuc.atamalar
+        ]
+        uyarilar = [
+            f"{tarih_str} | slot {slot_no+1} | '{vardiya_adi}' doldurulamadı = boş"
+            for tarih_str, slot_no, vardiya_adi in sonuc.bos_slotlar
+        ]
+
+        kayit = self._kaydet_veya_beklet(h, plan_satirlari, kaydet)
+
+        ozet = (
+            f"{len(plan_satirlari)} nöbet ataması yapıldı"
+            + (f"  |  {len(uyarilar)} uyarı" if uyarilar else ""))
+        logger.info(
+            f"Çözücü: {baglam.birim_id} {baglam.yil}/{baglam.ay:02d} = {ozet}")
+        return SonucYonetici.tamam(
+            mesaj=ozet,
+            veri={"uyarilar": uyarilar, "PlanID": plan_id,
+                  "motor": "cozucu",
+                  "metrikler": adalet_metrikleri(baglam, plan_satirlari),
+                  "cozucu": {"maliyet": round(sonuc.maliyet, 2),
+                             "iterasyon": sonuc.iterasyon,
+                             "sure_sn": round(sonuc.sure_sn, 2),
+                             "tohum": tohum},
+                  **kayit})
+
@@ -0,0 +1,450 @@
+# -*- coding: utf-8 -*-
+"""
+nb_cozucu.py — Nöbet planı için global arama motoru (NbAlgoritma alternatifi)
+
+NB_BirimAyar.PlanMotoru = 'cozucu' olan birimlerde NbAlgoritma.plan_olustur
+atamayı bu motora bırakır. Sert kurallar açgözlü döngüyle aynıdır:
+  - İzin günü atama yok
+  - Aynı gün aynı vardiyaya iki kez girilmez
+  - Ardışık gün yasak (ArdisikGunIzinli açık değilse)
+  - Günlük max süre (MaxGunlukSureDakika; 24s grup paketinde grup süresi)
+  - Aylık üst sınır: hedef + tolerans; FM gönüllüsüne ek olarak FmMaxSaat
+
+Yöntem:
+  1. Kurulum — slotlar gün sırasıyla, en düşük maliyet artışlı uygun kişiye
+     verilir (aday maskesi ve maliyetler NumPy ile vektörel).
+  2. Yerel arama — tavlama benzetimi (simulated annealing): yeniden atama,
+     boşaltma, iki atamanın takası ve boş slota "yer açarak" atama (kişinin
+     çakışan komşu nöbetleri boşaltılır). Her hamlenin maliyet farkı
+     yalnızca etkilenen kişiler üzerinden hesaplanır (artımlı skor).
+
+Maliyet (küçük = iyi):
+  BOS_SLOT_AGIRLIK × boş slot
+  + Σ (100 × (saat + devir − hedef) / hedef)²       (yüzde cinsinden sapma²)
+  + HAFTASONU_AGIRLIK × Σ hafta_sonu_nöbeti²
+  + SIFIR_NOBET_AGIRLIK × hedefi olup hiç nöbeti olmayan kişi
+
+Sapma hedefe oranla ölçülür; mutlak saat kullanılsaydı hedefi yüksek
+kişiler (ör. emzirme/sendika hedefi düşük olanlara göre) her zaman
+öncelik kazanır, nöbetsiz kalan sayısı artardı.
+
+Tekrarlanabilirlik: aynı bağlam + aynı tohum + aynı iterasyon sayısı aynı
+sonucu verir. Sıcaklık iterasyona bağlıdır; süre bütçesi yalnızca üst
+sınırdır (bütçe dolarsa arama erken biter).
+"""
+from __future__ import annotations
+
+import math
+import random
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from core.hata_yonetici import logger
+from core.services.nobet.nb_planlama_baglami import HAFTASONU, PlanlamaBaglami
+
+
+BOS_SLOT_AGIRLIK     = 100_000.0
+HAFTASONU_AGIRLIK    = 50.0
+SIFIR_NOBET_AGIRLIK  = 500.0
+TOLERANS_DK          = 7 * 60
+VARSAYILAN_ITERASYON = 200_000
+VARSAYILAN_TOHUM     = 0
+
+_SICAKLIK_BAS = 200.0
+_SICAKLIK_SON = 0.1
+
+
+@dataclass
+class CozucuSonucu:
+    atamalar: list[tuple[str, str, str]]     # (NobetTarihi, VardiyaID, PersonelID)
+    bos_slotlar: list[tuple[str, int, str]]  # (NobetTarihi, slot_no, VardiyaAdi)
+    maliyet: float
+    iterasyon: int
+    sure_sn: float
+
+
+# ──────────────────────────────────────────────────────────────
+#  Adalet metrikleri (her iki motor için ortak)
+# ──────────────────────────────────────────────────────────────
+
+def adalet_metrikleri(baglam: PlanlamaBaglami, satirlar) -> dict:
+    """
+    Plan satırlarından (dict: PersonelID, VardiyaID, NobetTarihi) adalet
+    göstergeleri. Hedefi olan zorunlu personel üzerinden hesaplanır.
+
+      sapma_*_saat : |çalışma + devir − hedef| (saat)
+      jain         : Jain adalet indeksi, çalışma/hedef oranı (1 = tam eşit)
+      gini         : çalışma/hedef oranının Gini katsayısı (0 = tam eşit)
+      hafta_sonu_* : kişi başı hafta sonu nöbeti dağılımı
+      sifir_nobet  : hedefi olduğu halde hiç nöbeti olmayan kişi sayısı
+    """
+    kisiler = [p for p in baglam.personeller if baglam.hedef_map.get(p, 0) > 0]
+    if not kisiler:
+        return {}
+    sira = {p: i for i, p in enumerate(kisiler)}
+    dk = np.zeros(len(kisiler))
+    hs = np.zeros(len(kisiler))
+    adet = np.zeros(len(kisiler))
+    for s in satirlar:
+        i = sira.get(str(s.get("PersonelID", "")))
+        meta = baglam.vardiya_meta.get(str(s.get("VardiyaID", "")))
+        if i is None or meta is None:
+            continue
+        dk[i] += meta[0]
+        adet[i] += 1
+        tarih = str(s.get("NobetTarihi", ""))
+        gun = int(tarih[8:10]) if len(tarih) >= 10 else 0
+        if gun and baglam.gunler[gun - 1].weekday() in HAFTASONU:
+            hs[i] += 1
+
+    hedef = np.array([baglam.hedef_map[p] for p in kisiler], dtype=float)
+    devir = np.array([baglam.devir_map.get(p, 0) for p in kisiler], dtype=float)
+    sapma = np.abs(dk + devir - hedef) / 60.0
+    oran = dk / hedef
+    kare_toplam = float(np.sum(oran ** 2))
+    jain = float(np.sum(oran) ** 2 / (len(oran) * kare_toplam)) if kare_toplam else 0.0
+    sirali = np.sort(oran)
+    n = len(sirali)
+    toplam = float(np.sum(sirali))
+    gini = (float(np.sum((2 * np.arange(1, n + 1) - n - 1) * sirali)) / (n * toplam)
+            if toplam else 0.0)
+    return {
+        "kisi":             n,
+        "sapma_ort_saat":   round(float(np.mean(sapma)), 2),
+        "sapma_maks_saat":  round(float(np.max(sapma)), 2),
+        "sapma_std_saat":   round(float(np.std(sapma)), 2),
+        "jain":             round(jain, 4),
+        "gini":             round(gini, 4),
+        "hafta_sonu_min":   int(np.min(hs)),
+        "hafta_sonu_maks":  int(np.max(hs)),
+        "hafta_sonu_std":   round(float(np.std(hs)), 2),
+        "sifir_nobet":      int(np.sum(adet == 0)),
+    }
+
+
+# ──────────────────────────────────────────────────────────────
+#  Çözücü
+# ──────────────────────────────────────────────────────────────
+
+class NbCozucu:
+    """
+    Kullanım:
+        sonuc = NbCozucu(baglam, tohum=0, sure_butcesi_sn=10).coz()
+        sonuc.atamalar  → [(tarih, vardiya_id, personel_id), ...]
+    """
+
+    def __init__(self, baglam: PlanlamaBaglami, tohum: int = VARSAYILAN_TOHUM,
+                 sure_butcesi_sn: float | None = None,
+                 maks_iterasyon: int = VARSAYILAN_ITERASYON):
+        self.b = baglam
+        self.tohum = tohum
+        self.sure_butcesi_sn = sure_butcesi_sn
+        self.maks_iterasyon = int(maks_iterasyon)
+        self._kur()
+
+    # ════════════════ MODEL ════════════════
+
+    def _kur(self) -> None:
+        b = self.b
+        self.kisiler = list(dict.fromkeys(b.personeller))
+        gonullu = set(b.gonulluler)
+        P, D = len(self.kisiler), len(b.gunler)
+
+        self.hedef = [b.hedef_map.get(p, 0) for p in self.kisiler]
+        self.devir = [b.devir_map.get(p, 0) for p in self.kisiler]
+        self.tavan = []
+        for p, h in zip(self.kisiler, self.hedef):
+            ust = h + min(TOLERANS_DK, h) if h > 0 else 0
+            self.tavan.append(ust + (b.fm_max_dk if p in gonullu else 0))
+
+        self.izin = [[b.izinli_mi(p, g) for g in b.gunler] for p in self.kisiler]
+
+        # Slotlar: gün → slot_no → grup → ana vardiya (açgözlü döngüyle aynı sıra)
+        self.s_gun, self.s_dk, self.s_anahtar, self.s_limit = [], [], [], []
+        self.s_hs, self.s_vardiya, self.s_slot_no = [], [], []
+        anahtar_id: dict[tuple, int] = {}
+        for d, gun in enumerate(b.gunler):
+            tarih = gun.isoformat()
+            if tarih in b.dini_set and not b.dini_bayram_calisma:
+                continue
+            if tarih in b.resmi_set and not b.resmi_tatil_calisma:
+                continue
+            is_hw = gun.weekday() in HAFTASONU
+            if is_hw and not b.hafta_sonu_calisma:
+                continue
+            for slot_no in range(b.slot_sayisi):
+                for grup in b.gruplar:
+                    vardiyalar = grup["ana"]
+                    toplam = grup["toplam_dk"]
+                    grup_adi = str(grup.get("GrupAdi", "")).strip().lower()
+                    mod_24s = (len(vardiyalar) > 1 and toplam >= 1440
+                               and (b.birim_max_gun_dk >= 1440 or "24 saat" in grup_adi))
+                    limit = max(b.birim_max_gun_dk, toplam) if mod_24s else b.birim_max_gun_dk
+                    for v in vardiyalar:
+                        a = anahtar_id.setdefault(
+                            (d, grup["GrupID"], v["VardiyaID"]), len(anahtar_id))
+                        self.s_gun.append(d)
+                        self.s_dk.append(int(v.get("SureDakika", 0)))
+                        self.s_anahtar.append(a)
+                        self.s_limit.append(limit)
+                        self.s_hs.append(is_hw)
+                        self.s_vardiya.append(v)
+                        self.s_slot_no.append(slot_no)
+        S = len(self.s_gun)
+
+        # Durum
+        self.x = [-1] * S                       # slot → kişi indeksi
+        self.gun_dk = [[0] * D for _ in range(P)]
+        self.gun_adet = [[0] * D for _ in range(P)]
+        self.anahtar_kisi: list[set] = [set() for _ in range(len(anahtar_id))]
+        self.saat = [0] * P
+        self.hs = [0] * P
+        self.adet = [0] * P
+        self.bos = S
+
+        # Gün başına aday kişiler (izinsiz ve tavanı olan)
+        self.gun_adaylari = [
+            [p for p in range(P) if self.tavan[p] > 0 and not self.izin[p][d]]
+            for d in range(D)
+        ]
+
+    # ════════════════ MALİYET ════════════════
+
+    def _kisi_maliyet(self, p: int, saat: int, hs: int, adet: int) -> float:
+        h = self.hedef[p]
+        if h <= 0:
+            return HAFTASONU_AGIRLIK * hs * hs
+        sapma = 100.0 * (saat + self.devir[p] - h) / h
+        m = sapma * sapma + HAFTASONU_AGIRLIK * hs * hs
+        if adet == 0:
+            m += SIFIR_NOBET_AGIRLIK
+        return m
+
+    def toplam_maliyet(self) -> float:
+        return BOS_SLOT_AGIRLIK * self.bos + sum(
+            self._kisi_maliyet(p, self.saat[p], self.hs[p], self.adet[p])
+            for p in range(len(self.kisiler)))
+
+    # ════════════════ KISITLAR ════════════════
+
+    def _uygun(self, p: int, s: int, haric: int = -1) -> bool:
+        """p, s slotunu alabilir mi? haric: p'nin aynı anda bıraktığı slot."""
+        d = self.s_gun[s]
+        if self.izin[p][d]:
+            return False
+        dk = self.s_dk[s]
+        h_gun = self.s_gun[haric] if haric >= 0 else -1
+        h_dk = self.s_dk[haric] if haric >= 0 else 0
+
+        if p in self.anahtar_kisi[self.s_anahtar[s]] and not (
+                haric >= 0 and self.s_anahtar[haric] == self.s_anahtar[s]):
+            return False
+        gun_dk = self.gun_dk[p][d] - (h_dk if h_gun == d else 0)
+        if gun_dk + dk > self.s_limit[s]:
+            return False
+        if not self.b.ardisik_gun_izinli:
+            for nd in (d - 1, d + 1):
+                if 0 <= nd < len(self.b.gunler):
+                    if self.gun_adet[p][nd] - (1 if h_gun == nd else 0) > 0:
+                        return False
+        return self.saat[p] - h_dk + dk <= self.tavan[p]
+
+    # ════════════════ DURUM GÜNCELLEME ════════════════
+
+    def _ata(self, s: int, p: int) -> None:
+        d, dk = self.s_gun[s], self.s_dk[s]
+        self.x[s] = p
+        self.gun_dk[p][d] += dk
+        self.gun_adet[p][d] += 1
+        self.anahtar_kisi[self.s_anahtar[s]].add(p)
+        self.saat[p] += dk
+        self.hs[p] += self.s_hs[s]
+        self.adet[p] += 1
+        self.bos -= 1
+
+    def _bosalt(self, s: int) -> None:
+        p = self.x[s]
+        d, dk = self.s_gun[s], self.s_dk[s]
+        self.x[s] = -1
+        self.gun_dk[p][d] -= dk
+        self.gun_adet[p][d] -= 1
+        self.anahtar_kisi[self.s_anahtar[s]].discard(p)
+        self.saat[p] -= dk
+        self.hs[p] -= self.s_hs[s]
+        self.adet[p] -= 1
+        self.bos += 1
+
+    def _fark(self, p: int, d_saat: int, d_hs: int, d_adet: int) -> float:
+        return (self._kisi_maliyet(p, self.saat[p] + d_saat, self.hs[p] + d_hs,
+                                   self.adet[p] + d_adet)
+                - self._kisi_maliyet(p, self.saat[p], self.hs[p], self.adet[p]))
+
+    # ════════════════ 1. KURULUM (vektörel) ════════════════
+
+    def _kurulum(self) -> None:
+        P, D = len(self.kisiler), len(self.b.gunler)
+        if not P:
+            return
+        izin = np.array(self.izin, dtype=bool).reshape(P, D)
+        tavan = np.array(self.tavan)
+        hedef = np.array(self.hedef)
+        devir = np.array(self.devir)
+        saat = np.zeros(P, dtype=np.int64)
+        hs = np.zeros(P, dtype=np.int64)
+        adet = np.zeros(P, dtype=np.int64)
+        gun_dk = np.zeros((P, D), dtype=np.int64)
+        gun_adet = np.zeros((P, D), dtype=np.int64)
+        anahtar = np.zeros((P, len(self.anahtar_kisi)), dtype=bool)
+        sifir_ceza = np.where(hedef > 0, SIFIR_NOBET_AGIRLIK, 0.0)
+        bolen = np.where(hedef > 0, hedef, 1)
+
+        def _maliyet(s_, h_, a_):
+            sapma = np.where(hedef > 0, 100.0 * (s_ + devir - hedef) / bolen, 0.0)
+            return sapma * sapma + HAFTASONU_AGIRLIK * h_ * h_ + np.where(a_ == 0, sifir_ceza, 0.0)
+
+        ardisik = self.b.ardisik_gun_izinli
+        for s in range(len(self.s_gun)):
+            d, dk, a, hw = self.s_gun[s], self.s_dk[s], self.s_anahtar[s], int(self.s_hs[s])
+            uygun = (~izin[:, d] & ~anahtar[:, a]
+                     & (gun_dk[:, d] + dk <= self.s_limit[s])
+                     & (saat + dk <= tavan))
+            if not ardisik:
+                if d > 0:
+                    uygun &= gun_adet[:, d - 1] == 0
+                if d + 1 < D:
+                    uygun &= gun_adet[:, d + 1] == 0
+            if not uygun.any():
+                continue
+            fark = _maliyet(saat + dk, hs + hw, adet + 1) - _maliyet(saat, hs, adet)
+            fark[~uygun] = np.inf
+            p = int(np.argmin(fark))
+            saat[p] += dk
+            hs[p] += hw
+            adet[p] += 1
+            gun_dk[p, d] += dk
+            gun_adet[p, d] += 1
+            anahtar[p, a] = True
+            self._ata(s, p)
+
+    # ════════════════ 2. YEREL ARAMA ════════════════
+
+    def _arama(self) -> int:
+        rnd = random.Random(self.tohum)
+        S = len(self.x)
+        if not S or not self.kisiler:
+            return 0
+        bas = time.perf_counter()
+        oran = _SICAKLIK_SON / _SICAKLIK_BAS
+        it = 0
+        while it < self.maks_iterasyon:
+            if (self.sure_butcesi_sn is not None and it % 1000 == 0
+                    and time.perf_counter() - bas >= self.sure_butcesi_sn):
+                break
+            T = _SICAKLIK_BAS * oran ** (it / self.maks_iterasyon)
+            it += 1
+
+            s = rnd.randrange(S)
+            eski = self.x[s]
+            if eski >= 0 and rnd.random() < 0.3:
+                self._takas_dene(rnd, s, T)
+                continue
+            if eski < 0 and rnd.random() < 0.5:
+                self._yer_ac_dene(rnd, s, T)
+                continue
+
+            adaylar = self.gun_adaylari[self.s_gun[s]]
+            if not adaylar:
+                continue
+            yeni = -1 if (eski >= 0 and rnd.random() < 0.02) else rnd.choice(adaylar)
+            if yeni == eski or (yeni >= 0 and not self._uygun(yeni, s)):
+                continue
+
+            dk, hw = self.s_dk[s], int(self.s_hs[s])
+            delta = 0.0
+            if eski >= 0:
+                delta += self._fark(eski, -dk, -hw, -1)
+            if yeni >= 0:
+                delta += self._fark(yeni, dk, hw, 1)
+            if eski < 0:
+                delta -= BOS_SLOT_AGIRLIK
+            if yeni < 0:
+                delta += BOS_SLOT_AGIRLIK
+            if delta <= 0 or rnd.random() < math.exp(-delta / T):
+                if eski >= 0:
+                    self._bosalt(s)
+                if yeni >= 0:
+                    self._ata(s, yeni)
+        return it
+
+    def _takas_dene(self, rnd: random.Random, s1: int, T: float) -> None:
+        s2 = rnd.randrange(len(self.x))
+        p1, p2 = self.x[s1], self.x[s2]
+        if p2 < 0 or p1 == p2:
+            return
+        if not (self._uygun(p1, s2, haric=s1) and self._uygun(p2, s1, haric=s2)):
+            return
+        d_dk = self.s_dk[s2] - self.s_dk[s1]
+        d_hs = int(self.s_hs[s2]) - int(self.s_hs[s1])
+        delta = self._fark(p1, d_dk, d_hs, 0) + self._fark(p2, -d_dk, -d_hs, 0)
+        if delta <= 0 or rnd.random() < math.exp(-delta / T):
+            self._bosalt(s1)
+            self._bosalt(s2)
+            self._ata(s1, p2)
+            self._ata(s2, p1)
+
+    def _yer_ac_dene(self, rnd: random.Random, s: int, T: float) -> None:
+        """Boş s slotuna rastgele bir aday; çakışan kendi nöbetleri boşaltılır."""
+        adaylar = self.gun_adaylari[self.s_gun[s]]
+        if not adaylar:
+            return
+        p = rnd.choice(adaylar)
+        d = self.s_gun[s]
+        komsu = {d} if self.b.ardisik_gun_izinli else {d - 1, d, d + 1}
+        cikan = [t for t, q in enumerate(self.x) if q == p and self.s_gun[t] in komsu]
+        if not cikan:
+            return
+        onceki = self._kisi_maliyet(p, self.saat[p], self.hs[p], self.adet[p])
+        for t in cikan:
+            self._bosalt(t)
+        if self._uygun(p, s):
+            self._ata(s, p)
+            delta = (self._kisi_maliyet(p, self.saat[p], self.hs[p], self.adet[p]) - onceki
+                     + BOS_SLOT_AGIRLIK * (len(cikan) - 1))
+            if delta <= 0 or rnd.random() < math.exp(-delta / T):
+                return
+            self._bosalt(s)
+        for t in cikan:
+            self._ata(t, p)
+
+    # ════════════════ GİRİŞ ════════════════
+
+    def coz(self) -> CozucuSonucu:
+        bas = time.perf_counter()
+        self._kurulum()
+        kurulum_maliyet = self.toplam_maliyet()
+        iterasyon = self._arama()
+        maliyet = self.toplam_maliyet()
+        sure = time.perf_counter() - bas
+
+        atamalar, bos_slotlar = [], []
+        for s, p in enumerate(self.x):
+            tarih = self.b.gunler[self.s_gun[s]].isoformat()
+            v = self.s_vardiya[s]
+            if p >= 0:
+                atamalar.append((tarih, str(v["VardiyaID"]), self.kisiler[p]))
+            else:
+                bos_slotlar.append((tarih, self.s_slot_no[s], str(v.get("VardiyaAdi", ""))))
+
+        logger.info(
+            f"[Çözücü] {len(atamalar)} atama, {len(bos_slotlar)} boş slot | "
+            f"maliyet {kurulum_maliyet:.1f} → {maliyet:.1f} | "
+            f"{iterasyon} iterasyon, {sure:.2f}s (tohum={self.tohum})")
+        return CozucuSonucu(
+            atamalar=atamalar,
+            bos_slotlar=bos_slotlar,
+            maliyet=maliyet,
+            iterasyon=iterasyon,
+            sure_sn=sure,
+        )
@@ -16,11 +16,21 @@
 from datetime import date
 from typing import Optional
 
+import pandas as pd
+
 from core.hata_yonetici import SonucYonetici, logger
+from core.services.nobet.nb_ozet_service import NbOzetService
 from database.repository_registry import RepositoryRegistry
 
 GUNLUK_HEDEF_DAKIKA = 420   # 7 saat × 60
 
+# Otomatik hedefte HedefTipi → günlük dakika (tanımsız tip → 420)
+HEDEF_TIPI_DK = {
+    "normal": 420, "rapor": 420, "yillik": 420, "idari": 420,
+    "emzirme": 330, "sendika": 372, "sua": 0,
+}
+ONAY_DURUMLARI = {"onaylandı", "onaylandi", "onaylı", "approved"}
+
 
 def _yeni_id() -> str:
     return str(uuid.uuid4())
@@ -30,6 +40,13 @@ def _simdi() -> str:
     return date.today().isoformat()
 
 
+def _int_veya_none(deger) -> Optional[int]:
+    try:
+        return int(deger)
+    except (TypeError, ValueError):
+        return None
+
+
 class NbMesaiService:
     """
     NB_MesaiHesap CRUD ve fazla mesai hesaplama.
@@ -38,6 +55,7 @@ class NbMesaiService:
     Kullanım:
         svc = NbMesaiService(registry)
         svc.mesai_hesapla(birim_id, plan_id, yil, ay)
+        svc.toplu_mesai_hesapla(yil, ay)          # tüm birimler, tek geçiş
         svc.odenen_guncelle(hesap_id, odenen_dakika)
     """
 
@@ -280,196 +298,315 @@ def mesai_hesapla(self, birim_id: str, plan_id: str,
           ToplamFazla    = FazlaDakika + DevirDakika
           OdenenDakika   = kullanıcı girer (mevcut korunur)
           DevireGiden    = ToplamFazla − OdenenDakika
+
+        Hesap _mesai_tablosu'nda tüm personel için tek seferde (pandas) yapılır.
         """
         try:
-            # Plan satırları (sadece Durum='aktif' — iptal edilmişler hariç)
-            ps_rows = self._r.get("NB_PlanSatir").get_all() or []
-            aktif_satirlar = [
-                r for r in ps_rows
-                if str(r.get("PlanID", "")) == str(plan_id)
-                and r.get("Durum") == "aktif"
-            ]
+            param = self._ay_kural_parametreleri(yil, ay)
+            if isinstance(param, SonucYonetici):
+                return param
+            tablo = self._mesai_tablosu({str(birim_id): str(plan_id)}, yil, ay, param)
+            sonuclar = self._hesaplari_yaz(tablo, yil, ay, param)
+            return SonucYonetici.tamam(
+                mesaj=self._mesai_ozeti(sonuclar), veri=sonuclar)
+        except Exception as e:
+            return SonucYonetici.hata(e, "NbMesaiService.mesai_hesapla")
 
-            # Vardiya süre haritası
-            v_rows = self._r.get("NB_Vardiya").get_all() or []
-            v_sure = {
-                str(v["VardiyaID"]): int(v.get("SureDakika", GUNLUK_HEDEF_DAKIKA))
-                for v in v_rows
-            }
+    def toplu_mesai_hesapla(self, yil: int, ay: int) -> SonucYonetici:
+        """
+        O ayın planı olan tüm birimler için mesai_hesapla (birim başına en
+        yüksek versiyonlu plan). Okuma, hesap ve yazım tek geçiştir.
+        Döner: veri = {birim_id: [hesap, ...]}
+        """
+        try:
+            planlar = (self._r.get("NB_Plan").query("PlanID", "BirimID", "Versiyon")
+                       .where(Yil=int(yil), Ay=int(ay)).all())
+            plan_map: dict[str, str] = {}
+            versiyon: dict[str, int] = {}
+            for p in planlar:
+                bid = str(p.get("BirimID", ""))
+                v = int(p.get("Versiyon", 1) or 1)
+                if bid and (bid not in versiyon or v > versiyon[bid]):
+                    plan_map[bid], versiyon[bid] = str(p["PlanID"]), v
+            if not plan_map:
+                return SonucYonetici.tamam("Bu ay için plan yok", veri={})
+
+            param = self._ay_kural_parametreleri(yil, ay)
+            if isinstance(param, SonucYonetici):
+                return param
+            tablo = self._mesai_tablosu(plan_map, yil, ay, param)
+            sonuclar = self._hesaplari_yaz(tablo, yil, ay, param)
+
+            birim_sonuc: dict[str, list[dict]] = {bid: [] for bid in plan_map}
+            for r in sonuclar:
+                birim_sonuc[r["BirimID"]].append(r)
+            return SonucYonetici.tamam(
+                mesaj=f"{len(plan_map)} birim | " + self._mesai_ozeti(sonuclar),
+                veri=birim_sonuc)
+        except Exception as e:
+            return SonucYonetici.hata(e, "NbMesaiService.toplu_mesai_hesapla")
 
-            # Resmi + dini bayram günleri hedef dışı ekstra mesaiye yazılır.
-            bayram_tarihleri = set(self._tatil_listesi_getir(yil, ay))
-
-            # Personel bazlı çalışılan dakika
-            calisan: dict[str, int] = {}
-            bayram_ekstra: dict[str, int] = {}
-            for r in aktif_satirlar:
-                pid  = str(r.get("PersonelID", ""))
-                vsid = str(r.get("VardiyaID", ""))
-                sure_dk = v_sure.get(vsid, GUNLUK_HEDEF_DAKIKA)
-                calisan[pid] = calisan.get(pid, 0) + sure_dk
-
-                tarih = str(r.get("NobetTarihi", "") or "")[:10]
-                if tarih in bayram_tarihleri:
-                    bayram_ekstra[pid] = bayram_ekstra.get(pid, 0) + sure_dk
-
-            # Önceki ayın devir haritası
-            prev_yil = yil - 1 if ay == 1 else yil
-            prev_ay  = 12      if ay == 1 else ay - 1
-            prev_rows = self._r.get("NB_MesaiHesap").get_all() or []
-            devir_map: dict[str, int] = {
-                str(r.get("PersonelID", "")): int(r.get("DevireGidenDakika", 0))
-                for r in prev_rows
-                if str(r.get("BirimID", "")) == str(birim_id)
-                and int(r.get("Yil", 0)) == prev_yil
-                and int(r.get("Ay",  0)) == prev_ay
-            }
+    def _ay_kural_parametreleri(self, yil: int, ay: int):
+        """Ayın kurum-genel kural parametreleri (hata → SonucYonetici)."""
+        kural_sonuc = self.gecerli_kural(f"{yil:04d}-{ay:02d}-01")
+        if not kural_sonuc.basarili:
+            return kural_sonuc
+        return self._kural_parametreleri(kural_sonuc.veri)
 
-            # Personel tercih/hedef haritası (aynı aydaki en güncel kayıt baz alınır)
-            t_rows = self._r.get("NB_PersonelTercih").get_all() or []
-            tercih_rows = [
-                r for r in t_rows
-                if str(r.get("BirimID", "")) == str(birim_id)
-                and int(r.get("Yil", 0)) == yil
-                and int(r.get("Ay", 0)) == ay
-            ]
-            tercih_rows.sort(
-                key=lambda r: (
-                    str(r.get("updated_at", "")),
-                    str(r.get("created_at", "")),
-                    str(r.get("TercihID", "")),
-                )
-            )
+    @staticmethod
+    def _mesai_ozeti(sonuclar: list[dict]) -> str:
+        toplam_calisan = sum(r["CalisDakika"]       for r in sonuclar)
+        toplam_fazla   = sum(r["ToplamFazlaDakika"] for r in sonuclar)
+        toplam_odenen  = sum(r["OdenenDakika"]      for r in sonuclar)
+        return (f"{len(sonuclar)} personel hesaplandı | "
+                f"Toplam çalışılan: {toplam_calisan // 60}s "
+                f"{toplam_calisan % 60}dk | "
+                f"Fazla: {toplam_fazla // 60}s | "
+                f"Ödenen: {toplam_odenen // 60}s")
+
+    # ── Kolon bazlı hesap ─────────────────────────────────────
+
+    def _mesai_tablosu(self, plan_map: dict[str, str], yil: int, ay: int,
+                       param: dict) -> pd.DataFrame:
+        """
+        plan_map {BirimID: PlanID} için (BirimID, PersonelID) başına tek satır:
+        CalisDakika, BayramDakika, HedefDakika, DevirDakika, FazlaDakika,
+        ToplamFazlaDakika, OdenenDakika, DevireGidenDakika, BildirimDakika, HesapID.
 
-            hedef_map: dict[str, int] = {}
-            for r in tercih_rows:
-                pid = str(r.get("PersonelID", ""))
-                if not pid:
-                    continue
-                hedef_raw = r.get("HedefDakika")
-                if hedef_raw is None:
-                    continue
-                try:
-                    hedef_map[pid] = int(hedef_raw)
-                except (TypeError, ValueError):
-                    continue
+        Her kaynak tablo tüm birimler için bir kez okunur; kişi başı döngü yok.
+        """
+        anahtar = ["BirimID", "PersonelID"]
+        bidler = list(plan_map)
+        plan_birim = {p: b for b, p in plan_map.items()}
+
+        # ── Plan satırları × vardiya süresi × bayram ──────────
+        satirlar = pd.DataFrame(
+            (self._r.get("NB_PlanSatir")
+             .query("PlanID", "PersonelID", "VardiyaID", "NobetTarihi")
+             .where(PlanID=list(plan_birim), Durum="aktif").all()),
+            columns=["PlanID", "PersonelID", "VardiyaID", "NobetTarihi"])
+        satirlar["BirimID"] = satirlar["PlanID"].astype(str).map(plan_birim)
+        satirlar["PersonelID"] = satirlar["PersonelID"].astype(str)
+        satirlar["VardiyaID"] = satirlar["VardiyaID"].astype(str)
+
+        v_rows = (self._r.get("NB_Vardiya").query("VardiyaID", "SureDakika")
+                  .where(VardiyaID=satirlar["VardiyaID"].unique().tolist()).all())
+        v_sure = {str(v["VardiyaID"]): int(v.get("SureDakika", GUNLUK_HEDEF_DAKIKA))
+                  for v in v_rows}
+        satirlar["Sure"] = (satirlar["VardiyaID"].map(v_sure)
+                            .fillna(GUNLUK_HEDEF_DAKIKA).astype("int64"))
+
+        # Resmi + dini bayram günleri hedef dışı ekstra mesaiye yazılır.
+        bayram = set(self._tatil_listesi_getir(yil, ay))
+        tarih = satirlar["NobetTarihi"].fillna("").astype(str).str[:10]
+        satirlar["Bayram"] = satirlar["Sure"].where(tarih.isin(bayram), 0)
+
+        calis = satirlar.groupby(anahtar)[["Sure", "Bayram"]].sum().rename(
+            columns={"Sure": "CalisDakika", "Bayram": "BayramDakika"})
+
+        # ── Önceki ayın devri ─────────────────────────────────
+        prev_yil = yil - 1 if ay == 1 else yil
+        prev_ay  = 12      if ay == 1 else ay - 1
+        devir = pd.DataFrame(
+            (self._r.get("NB_MesaiHesap")
+             .query("BirimID", "PersonelID", "DevireGidenDakika")
+             .where(BirimID=bidler, Yil=prev_yil, Ay=prev_ay).all()),
+            columns=["BirimID", "PersonelID", "DevireGidenDakika"])
+        devir = self._anahtarla(devir).drop_duplicates(anahtar, keep="last")
+        devir = devir.set_index(anahtar)["DevireGidenDakika"].rename("DevirDakika")
+
+        # ── Tercih: elle hedef (en güncel kayıt) + hedef tipi (ilk kayıt) ──
+        tercih = pd.DataFrame(
+            (self._r.get("NB_PersonelTercih")
+             .query("TercihID", "BirimID", "PersonelID", "HedefDakika",
+                    "HedefTipi", "created_at", "updated_at")
+             .where(BirimID=bidler, Yil=yil, Ay=ay).all()),
+            columns=["TercihID", "BirimID", "PersonelID", "HedefDakika",
+                     "HedefTipi", "created_at", "updated_at"])
+        tercih = self._anahtarla(tercih)
+        tercih = tercih[tercih["PersonelID"] != ""]
+        hedef_tipi = (tercih.drop_duplicates(anahtar, keep="first")
+                      .set_index(anahtar)["HedefTipi"].astype(str).str.lower())
+        elle = tercih.assign(Hedef=tercih["HedefDakika"].map(_int_veya_none))
+        elle = elle.dropna(subset=["Hedef"])
+        for kol in ("updated_at", "created_at", "TercihID"):
+            elle[kol] = elle[kol].fillna("").astype(str)
+        elle_hedef = (elle.sort_values(["updated_at", "created_at", "TercihID"],
+                                       kind="stable")
+                      .drop_duplicates(anahtar, keep="last")
+                      .set_index(anahtar)["Hedef"].astype("int64"))
+
+        # ── Birime aktif bağlı personel ───────────────────────
+        bp = pd.DataFrame(
+            (self._r.get("NB_BirimPersonel").query("BirimID", "PersonelID", "Aktif")
+             .where(BirimID=bidler).all()),
+            columns=["BirimID", "PersonelID", "Aktif"])
+        bp = self._anahtarla(bp)
+        bp = bp[(bp["PersonelID"].str.strip() != "")
+                & ~bp["Aktif"].fillna(1).astype(str).str.strip()
+                   .isin(("0", "False", "false"))]
+
+        # ── Tüm (birim, personel) çiftleri ────────────────────
+        tablo = pd.DataFrame(index=pd.MultiIndex.from_frame(pd.concat([
+            calis.index.to_frame(index=False),
+            devir.index.to_frame(index=False),
+            elle_hedef.index.to_frame(index=False),
+            bp[anahtar],
+        ], ignore_index=True).drop_duplicates()))
+        tablo = tablo.join(calis).join(devir).join(elle_hedef.rename("ElleHedef"))
+        tablo = tablo.join(hedef_tipi.rename("HedefTipi"))
+        for kol in ("CalisDakika", "BayramDakika", "DevirDakika"):
+            tablo[kol] = tablo[kol].fillna(0).astype("int64")
+
+        # ── Hedef: sabit → elle → otomatik ────────────────────
+        sabit = int(param.get("sabit_hedef_dakika", 0) or 0)
+        if sabit > 0:
+            hedef = pd.Series(sabit, index=tablo.index, dtype="int64")
+        else:
+            oto_pid = tablo.index[tablo["ElleHedef"].isna()]
+            oto = self._otomatik_hedefler(oto_pid, tablo.loc[oto_pid, "HedefTipi"], yil, ay)
+            hedef = tablo["ElleHedef"].fillna(oto).astype("int64")
+        tablo["HedefDakika"] = hedef
+
+        # ── Fazla / devir / kapanış / bildirim ────────────────
+        fazla  = tablo["CalisDakika"] - tablo["HedefDakika"] + tablo["BayramDakika"]
+        toplam = fazla + tablo["DevirDakika"]
+        tablo["FazlaDakika"] = fazla
+        tablo["ToplamFazlaDakika"] = toplam
+
+        mevcut = pd.DataFrame(
+            (self._r.get("NB_MesaiHesap")
+             .query("HesapID", "BirimID", "PersonelID", "PlanID", "OdenenDakika")
+             .where(BirimID=bidler, Yil=yil, Ay=ay, PlanID=list(plan_birim)).all()),
+            columns=["HesapID", "BirimID", "PersonelID", "PlanID", "OdenenDakika"])
+        mevcut = self._anahtarla(mevcut)
+        # Başka planın hesabı bu birimin hesabı sayılmaz
+        mevcut = mevcut[mevcut["PlanID"].astype(str)
+                        == mevcut["BirimID"].map(plan_map)]
+        mevcut = mevcut.drop_duplicates(anahtar, keep="last").set_index(anahtar)
+        tablo = tablo.join(mevcut[["HesapID", "OdenenDakika"]])
+        mevcut_odenen = tablo["OdenenDakika"].fillna(0).astype("int64").clip(lower=0)
+
+        if param.get("kapanis_politikasi") in ("tam_odeme_sifirla", "izinle_sifirla"):
+            odenen = toplam.where(toplam > 0, mevcut_odenen)
+        else:
+            odenen = mevcut_odenen
+        devire = toplam - odenen
+        if not bool(param.get("negatif_devir_izinli", True)):
+            devire = devire.clip(lower=0)
+        tablo["OdenenDakika"] = odenen
+        tablo["DevireGidenDakika"] = devire
 
-            # Birime aktif bağlı personeller (çalışma/tercih/devir kaydı olmasa da)
-            bp_rows = self._r.get("NB_BirimPersonel").get_all() or []
-            aktif_birim_pid = {
-                str(r.get("PersonelID", ""))
-                for r in bp_rows
-                if str(r.get("BirimID", "")) == str(birim_id)
-                and str(r.get("Aktif", 1)).strip() not in ("0", "False", "false")
-                and str(r.get("PersonelID", "")).strip()
-            }
+        esik = int(param.get("bildirim_esik_dakika", 0) or 0)
+        aday = toplam if param.get("bildirim_temeli") == "net_bakiye" else fazla
+        tablo["BildirimDakika"] = aday.where((aday > 0) & (aday > esik), 0)
 
-            # Mevcut hesap kayıtları (OdenenDakika korumak için)
-            mevcut_rows = self._r.get("NB_MesaiHesap").get_all() or []
-            mevcut_map  = {
-                str(r.get("PersonelID", "")): dict(r)
-                for r in mevcut_rows
-                if str(r.get("BirimID", "")) == str(birim_id)
-                and int(r.get("Yil", 0)) == yil
-                and int(r.get("Ay",  0)) == ay
-                and str(r.get("PlanID", "")) == str(plan_id)
-            }
+        tablo = tablo.reset_index()
+        tablo["PlanID"] = tablo["BirimID"].map(plan_map)
+        return tablo.sort_values(anahtar, kind="stable")
 
-            # Kurum-genel kural parametreleri
-            kural_sonuc = self.gecerli_kural(f"{yil:04d}-{ay:02d}-01")
-            if not kural_sonuc.basarili:
-                return kural_sonuc
-            kural = kural_sonuc.veri
-            kural_param = self._kural_parametreleri(kural)
-            sabit_hedef_dk = int(kural_param.get("sabit_hedef_dakika", 0) or 0)
-
-            # Hedefi tanımlı veya birime aktif bağlı olup bu ay çalışması/deviri
-            # olmayan personel de fazla mesai listesinde görünmeli.
-            tum_pid = (
-                set(calisan.keys())
-                | set(devir_map.keys())
-                | set(hedef_map.keys())
-                | aktif_birim_pid
-            )
-            sonuclar: list[dict] = []
-
-            for pid in tum_pid:
-                calisan_dk = calisan.get(pid, 0)
-
-                hedef_tercih = hedef_map.get(pid)
-                if sabit_hedef_dk > 0:
-                    hedef_dk = sabit_hedef_dk
-                elif hedef_tercih is not None:
-                    # Kişiye ait ay hedefi açıkça girildiyse doğrudan kullan.
-                    hedef_dk = int(hedef_tercih)
-                else:
-                    hedef_dk = self._otomatik_hedef(pid, yil, ay, birim_id)
-
-                bayram_dk = bayram_ekstra.get(pid, 0)
-                fazla_dk  = (calisan_dk - hedef_dk) + bayram_dk
-                devir_dk  = devir_map.get(pid, 0)
-                toplam_dk = fazla_dk + devir_dk
-
-                # Mevcut OdenenDakika'yı koru veya politika gereği otomatik kapat.
-                mevcut = mevcut_map.get(pid)
-                odenen_dk = int(mevcut.get("OdenenDakika", 0)) if mevcut else 0
-                odenen_dk, devire_dk = self._kural_kapanis_hesapla(
-                    toplam_dk=toplam_dk,
-                    mevcut_odenen=odenen_dk,
-                    param=kural_param,
-                )
-                bildirim_dk = self._kural_bildirim_dakika(
-                    fazla_dk=fazla_dk,
-                    toplam_dk=toplam_dk,
-                    param=kural_param,
-                )
-
-                veri = {
-                    "PersonelID":         pid,
-                    "BirimID":            str(birim_id),
-                    "PlanID":             str(plan_id),
-                    "Yil":                yil,
-                    "Ay":                 ay,
-                    "CalisDakika":        calisan_dk,
-                    "HedefDakika":        hedef_dk,
-                    "FazlaDakika":        fazla_dk,
-                    "DevirDakika":        devir_dk,
-                    "ToplamFazlaDakika":  toplam_dk,
-                    "OdenenDakika":       odenen_dk,
-                    "DevireGidenDakika":  devire_dk,
-                    "HesapDurumu":        "hesaplandi",
-                    "HesapTarihi":        _simdi(),
-                    "updated_at":         _simdi(),
-                }
-
-                if mevcut:
-                    self._r.get("NB_MesaiHesap").update(
-                        mevcut["HesapID"], veri)
-                else:
-                    veri["HesapID"]    = _yeni_id()
-                    veri["created_at"] = _simdi()
-                    self._r.get("NB_MesaiHesap").insert(veri)
-
-                sonuclar.append({
-                    **veri,
-                    "BildirimDakika": bildirim_dk,
-                    "KuralKapanis": str(kural_param.get("kapanis_politikasi", "devret")),
-                    "KuralTemel": str(kural_param.get("bildirim_temeli", "donem_farki")),
-                })
-
-            toplam_calisan = sum(r["CalisDakika"]       for r in sonuclar)
-            toplam_fazla   = sum(r["ToplamFazlaDakika"] for r in sonuclar)
-            toplam_odenen  = sum(r["OdenenDakika"]      for r in sonuclar)
+    @staticmethod
+    def _anahtarla(df: pd.DataFrame) -> pd.DataFrame:
+        df = df.copy()
+        df["BirimID"] = df["BirimID"].fillna("").astype(str)
+        df["PersonelID"] = df["PersonelID"].fillna("").astype(str)
+        return df
+
+    def _otomatik_hedefler(self, index: pd.MultiIndex, hedef_tipi: pd.Series,
+                           yil: int, ay: int) -> pd.Series:
+        """
+        (İş Günü − İzin İş Günü) × günlük_dakika, tüm kişiler için birlikte.
+        HedefTipi'ne göre günlük dakika HEDEF_TIPI_DK'dan gelir (yoksa 420).
+        """
+        if len(index) == 0:
+            return pd.Series(dtype="int64", index=index)
+        from calendar import monthrange
+        from core.is_takvimi import is_takvimi_al
+
+        takvim = is_takvimi_al(self._r)
+        ay_bas = f"{yil:04d}-{ay:02d}-01"
+        ay_bit = f"{yil:04d}-{ay:02d}-{monthrange(yil, ay)[1]:02d}"
+
+        pidler = sorted(set(index.get_level_values("PersonelID")))
+        izin = pd.DataFrame(
+            (self._r.get("Izin_Giris")
+             .query("Personelid", "BaslamaTarihi", "BitisTarihi", "Durum")
+             .where(Personelid=pidler)
+             .overlaps("BaslamaTarihi", "BitisTarihi", ay_bas, ay_bit).all()),
+            columns=["Personelid", "BaslamaTarihi", "BitisTarihi", "Durum"])
+        izin = izin[izin["Durum"].fillna("").astype(str).str.strip().str.lower()
+                    .isin(ONAY_DURUMLARI)]
+        bas = izin["BaslamaTarihi"].fillna("").astype(str)
+        bit = izin["BitisTarihi"].fillna("").astype(str)
+        dolu = (bas != "") & (bit != "")
+        izin, bas, bit = izin[dolu], bas[dolu], bit[dolu]
+        if len(izin):
+            # Ay sınırına kırp (ISO metin karşılaştırması) → iş günü, kişi başı topla
+            gun = takvim.is_gunu_dizi([max(b, ay_bas) for b in bas],
+                                      [min(b, ay_bit) for b in bit])
+            izin_gun = (pd.Series(gun, index=izin["Personelid"].astype(str).to_numpy())
+                        .groupby(level=0).sum())
+        else:
+            izin_gun = pd.Series(dtype="int64")
+
+        kisi_izin = pd.Series(index.get_level_values("PersonelID"), index=index)
+        net_gun = (takvim.ay_is_gunu(yil, ay)
+                   - kisi_izin.map(izin_gun).fillna(0).astype("int64")).clip(lower=0)
+        gun_dk = hedef_tipi.reindex(index).fillna("normal").map(HEDEF_TIPI_DK).fillna(420)
+        return (net_gun * gun_dk).astype("int64")
+
+    def _hesaplari_yaz(self, tablo: pd.DataFrame, yil: int, ay: int,
+                       param: dict) -> list[dict]:
+        """NB_MesaiHesap'a tek transaction'da toplu yazar; sonuç satırlarını döner."""
+        simdi = _simdi()
+        eklenecek, guncellenecek, sonuclar = [], [], []
+        kapanis = str(param.get("kapanis_politikasi", "devret"))
+        temel = str(param.get("bildirim_temeli", "donem_farki"))
+        for r in tablo.itertuples(index=False):
+            veri = {
+                "PersonelID":         r.PersonelID,
+                "BirimID":            r.BirimID,
+                "PlanID":             r.PlanID,
+                "Yil":                yil,
+                "Ay":                 ay,
+                "CalisDakika":        int(r.CalisDakika),
+                "HedefDakika":        int(r.HedefDakika),
+                "FazlaDakika":        int(r.FazlaDakika),
+                "DevirDakika":        int(r.DevirDakika),
+                "ToplamFazlaDakika":  int(r.ToplamFazlaDakika),
+                "OdenenDakika":       int(r.OdenenDakika),
+                "DevireGidenDakika":  int(r.DevireGidenDakika),
+                "HesapDurumu":        "hesaplandi",
+                "HesapTarihi":        simdi,
+                "updated_at":         simdi,
+            }
+            if isinstance(r.HesapID, str) and r.HesapID:
+                veri["HesapID"] = r.HesapID
+                guncellenecek.append(veri)
+            else:
+                veri["HesapID"]    = _yeni_id()
+                veri["created_at"] = simdi
+                eklenecek.append(veri)
+            sonuclar.append({
+                **veri,
+                "BildirimDakika": int(r.BildirimDakika),
+                "KuralKapanis": kapanis,
+                "KuralTemel": temel,
+            })
 
-            return SonucYonetici.tamam(
-                mesaj=(f"{len(sonuclar)} personel hesaplandı | "
-                       f"Toplam çalışılan: {toplam_calisan // 60}s "
-                       f"{toplam_calisan % 60}dk | "
-                       f"Fazla: {toplam_fazla // 60}s | "
-                       f"Ödenen: {toplam_odenen // 60}s"),
-                veri=sonuclar)
-        except Exception as e:
-            return SonucYonetici.hata(e, "NbMesaiService.mesai_hesapla")
+        repo = self._r.get("NB_MesaiHesap")
+        ozet = NbOzetService(self._r)
+        with self._r.db.transaction():
+            ozet.gerekirse_doldur()
+            if guncellenecek:
+                repo.upsert_many(guncellenecek)
+            if eklenecek:
+                repo.insert_many(eklenecek)
+            # Personel ay özeti: planların nöbet kolonları + mesai kolonları
+            for plan_id in sorted({str(s["PlanID"]) for s in sonuclar}):
+                ozet.plan_ozeti_yaz(plan_id)
+            ozet.mesai_ozeti_yaz(sonuclar)
+        return sonuclar
 
     # ──────────────────────────────────────────────────────────
     #  Ödenen Güncelleme
@@ -482,9 +619,7 @@ def odenen_guncelle(self, hesap_id: str,
         DevireGidenDakika otomatik yeniden hesaplanır.
         """
         try:
-            rows  = self._r.get("NB_MesaiHesap").get_all() or []
-            kayit = next(
-                (r for r in rows if r.get("HesapID") == hesap_id), None)
+            kayit = self._r.get("NB_MesaiHesap").get_by_id(hesap_id)
             if not kayit:
                 return SonucYonetici.hata(
                     ValueError(f"Hesap bulunamadı: {hesap_id}"))
@@ -500,11 +635,14 @@ def odenen_guncelle(self, hesap_id: str,
                 param={**param, "kapanis_politikasi": "devret"},
             )
 
-            self._r.get("NB_MesaiHesap").update(hesap_id, {
+            degisen = {
                 "OdenenDakika":      odenen_dk,
                 "DevireGidenDakika": devire_dk,
                 "updated_at":        _simdi(),
-            })
+            }
+            with self._r.db.transaction():
+                self._r.get("NB_MesaiHesap").update(hesap_id, degisen)
+                NbOzetService(self._r).mesai_ozeti_yaz([{**kayit, **degisen}])
             return SonucYonetici.tamam(
                 f"Ödenen güncellendi: {odenen_dk} dk "
                 f"(devir: {devire_dk} dk)")
@@ -519,37 +657,38 @@ def toplu_odenen_guncelle(self, birim_id: str, yil: int, ay: int,
         odenen_map: {personel_id: odenen_dakika}
         """
         try:
-            rows = self._r.get("NB_MesaiHesap").get_all() or []
+            rows = (self._r.get("NB_MesaiHesap").query()
+                    .where(BirimID=str(birim_id), Yil=yil, Ay=ay,
+                           PlanID=str(plan_id))
+                    .all())
             kural_sonuc = self.gecerli_kural()
             if not kural_sonuc.basarili:
                 return kural_sonuc
             param = self._kural_parametreleri(kural_sonuc.veri)
-            guncellenen = 0
-            for r in rows:
-                if (str(r.get("BirimID", "")) != str(birim_id)
-                        or int(r.get("Yil", 0)) != yil
-                        or int(r.get("Ay",  0)) != ay
-                        or str(r.get("PlanID", "")) != str(plan_id)):
-                    continue
-                pid = str(r.get("PersonelID", ""))
-                if pid not in odenen_map:
-                    continue
-                odenen  = odenen_map[pid]
-                toplam  = int(r.get("ToplamFazlaDakika", 0))
-                odenen_dk, devire_dk = self._kural_kapanis_hesapla(
-                    toplam_dk=toplam,
-                    mevcut_odenen=int(odenen),
-                    param={**param, "kapanis_politikasi": "devret"},
-                )
-                self._r.get("NB_MesaiHesap").update(r["HesapID"], {
-                    "OdenenDakika":      odenen_dk,
-                    "DevireGidenDakika": devire_dk,
-                    "updated_at":        _simdi(),
-                })
-                guncellenen += 1
+            guncellenen = []
+            with self._r.db.transaction():
+                for r in rows:
+                    pid = str(r.get("PersonelID", ""))
+                    if pid not in odenen_map:
+                        continue
+                    odenen  = odenen_map[pid]
+                    toplam  = int(r.get("ToplamFazlaDakika", 0))
+                    odenen_dk, devire_dk = self._kural_kapanis_hesapla(
+                        toplam_dk=toplam,
+                        mevcut_odenen=int(odenen),
+                        param={**param, "kapanis_politikasi": "devret"},
+                    )
+                    degisen = {
+                        "OdenenDakika":      odenen_dk,
+                        "DevireGidenDakika": devire_dk,
+                        "updated_at":        _simdi(),
+                    }
+                    self._r.get("NB_MesaiHesap").update(r["HesapID"], degisen)
+                    guncellenen.append({**r, **degisen})
+                NbOzetService(self._r).mesai_ozeti_yaz(guncellenen)
             return SonucYonetici.tamam(
-                f"{guncellenen} kayıt güncellendi",
-                veri={"guncellenen": guncellenen})
+                f"{len(guncellenen)} kayıt güncellendi",
+                veri={"guncellenen": len(guncellenen)})
         except Exception as e:
             return SonucYonetici.hata(e, "NbMesaiService.toplu_odenen_guncelle")
 
@@ -561,14 +700,10 @@ def get_hesaplar(self, birim_id: str, plan_id: str,
                      yil: int, ay: int) -> SonucYonetici:
         """Birim/plan bazlı tüm mesai hesaplarını döner."""
         try:
-            rows = self._r.get("NB_MesaiHesap").get_all() or []
-            ilgili = [
-                dict(r) for r in rows
-                if str(r.get("BirimID", "")) == str(birim_id)
-                and str(r.get("PlanID", ""))  == str(plan_id)
-                and int(r.get("Yil", 0)) == yil
-                and int(r.get("Ay",  0)) == ay
-            ]
+            ilgili = (self._r.get("NB_MesaiHesap").query()
+                      .where(BirimID=str(birim_id), PlanID=str(plan_id),
+                             Yil=yil, Ay=ay)
+                      .all())
             return SonucYonetici.tamam(veri=ilgili)
         except Exception as e:
             return SonucYonetici.hata(e, "NbMesaiService.get_hesaplar")
@@ -621,17 +756,11 @@ def get_personel_hesap(self, personel_id: str, birim_id: str,
                            yil: int, ay: int) -> SonucYonetici:
         """Tek personelin mesai kaydını döner. Yoksa None."""
         try:
-            rows = self._r.get("NB_MesaiHesap").get_all() or []
-            kayit = next(
-                (r for r in rows
-                 if str(r.get("PersonelID", "")) == str(personel_id)
-                 and str(r.get("BirimID", ""))   == str(birim_id)
-                 and str(r.get("PlanID", ""))     == str(plan_id)
-                 and int(r.get("Yil", 0)) == yil
-                 and int(r.get("Ay",  0)) == ay),
-                None
-            )
-            return SonucYonetici.tamam(veri=dict(kayit) if kayit else None)
+            kayit = (self._r.get("NB_MesaiHesap").query()
+                     .where(PersonelID=str(personel_id), BirimID=str(birim_id),
+                            PlanID=str(plan_id), Yil=yil, Ay=ay)
+                     .first())
+            return SonucYonetici.tamam(veri=kayit)
         except Exception as e:
             return SonucYonetici.hata(e, "NbMesaiService.get_personel_hesap")
 
@@ -667,90 +796,13 @@ def _fmt(dk: int) -> str:
     #  Yardımcılar
     # ──────────────────────────────────────────────────────────
 
-    def _otomatik_hedef(self, personel_id: str,
-                        yil: int, ay: int,
-                        birim_id: str = "") -> int:
-        """
-        (İş Günü − İzin İş Günü) × günlük_dakika.
-        HedefTipi'ne göre günlük dakika değişir:
-          normal/rapor/yillik/idari → 420dk
-          emzirme  → 330dk
-          sendika  → 372dk
-          sua      → 0dk
-        """
-        HEDEF_TIPI_DK = {
-            "normal": 420, "rapor": 420, "yillik": 420, "idari": 420,
-            "emzirme": 330, "sendika": 372, "sua": 0,
-        }
-        try:
-            from core.hesaplamalar import ay_is_gunu
-            tatiller  = self._tatil_listesi_getir(yil, ay)
-            is_gunu   = ay_is_gunu(yil, ay, tatil_listesi=tatiller)
-            izin_gun  = self._izin_is_gunu(personel_id, yil, ay, tatiller)
-            net_gun   = max(0, is_gunu - izin_gun)
-            # HedefTipi oku
-            hedef_tipi = "normal"
-            if birim_id:
-                try:
-                    t_rows = self._r.get("NB_PersonelTercih").get_all() or []
-                    k = next(
-                        (r for r in t_rows
-                         if str(r.get("PersonelID","")) == str(personel_id)
-                         and str(r.get("BirimID","")) == str(birim_id)
-                         and int(r.get("Yil",0)) == yil
-                         and int(r.get("Ay",0)) == ay),
-                        None)
-                    if k:
-                        hedef_tipi = str(k.get("HedefTipi","normal")).lower()
-                except Exception:
-                    pass
-            gun_dk = HEDEF_TIPI_DK.get(hedef_tipi, 420)
-            return net_gun * gun_dk
-        except Exception:
-            return 20 * GUNLUK_HEDEF_DAKIKA
-
-    def _izin_is_gunu(self, personel_id: str, yil: int,
-                      ay: int, tatiller: list[str]) -> int:
-        """Personelin o aydaki onaylı izin iş günü sayısı."""
-        from calendar import monthrange
-        from datetime import date, timedelta
-        try:
-            onay_durumlari = {
-                "onaylandı", "onaylandi", "onaylı", "approved"
-            }
-            rows   = self._r.get("Izin_Giris").get_all() or []
-            ay_bas = f"{yil:04d}-{ay:02d}-01"
-            ay_bit = f"{yil:04d}-{ay:02d}-{monthrange(yil, ay)[1]:02d}"
-            sayi   = 0
-            for r in rows:
-                durum = str(r.get("Durum", "")).strip().lower()
-                if (str(r.get("Personelid", "")) != str(personel_id)
-                        or durum not in onay_durumlari):
-                    continue
-                bas = str(r.get("BaslamaTarihi", "") or "")
-                bit = str(r.get("BitisTarihi",   "") or "")
-                if not bas or not bit:
-                    continue
-                bas = max(bas, ay_bas)
-                bit = min(bit, ay_bit)
-                if bas > bit:
-                    continue
-                cur = date.fromisoformat(bas)
-                son = date.fromisoformat(bit)
-                while cur <= son:
-                    if cur.weekday() < 5 and cur.isoformat() not in tatiller:
-                        sayi += 1
-                    cur += timedelta(days=1)
-            return sayi
-        except Exception:
-            return 0
-
     def _tatil_listesi_getir(self, yil: int, ay: int) -> list[str]:
         """O aya ait tatil tarihlerini döner."""
         try:
-            rows   = self._r.get("Tatiller").get_all() or []
             ay_bas = f"{yil:04d}-{ay:02d}-01"
             ay_bit = f"{yil:04d}-{ay:02d}-31"
+            rows   = (self._r.get("Tatiller").query()
+                      .between("Tarih", ay_bas, ay_bit).all())
             return [
                 str(r.get("Tarih", ""))
                 for r in rows
@@ -0,0 +1,296 @@
+"""
+nb_ozet_service.py — NB_PersonelAyOzet (personel × birim × ay özeti)
+
+Personel profil paneli ve raporlar kişinin geçmişini tüm NB_PlanSatir /
+NB_MesaiHesap tablosunu taramadan buradan okur.
+
+Güncelleme noktaları:
+  - NbPlanService.onayla        → plan_ozeti_yaz (nöbet kolonları; durumla aynı transaction)
+  - NbPlanService.onay_geri_al  → plan_durumu_yaz (durumla aynı transaction)
+  - NbMesaiService mesai hesabı → planın nöbet kolonları + mesai kolonları
+  - NbMesaiService ödenen girişi → mesai kolonları
+
+Nöbet ve mesai kolonları ayrı yazılır (upsert_many kısmi günceller);
+biri diğerini ezmez. Tablo boşken ilk okuma / yazım mevcut onaylı
+planlardan ve NB_MesaiHesap'tan özeti bir kez geriye dönük doldurur.
+"""
+from __future__ import annotations
+
+from datetime import date
+from typing import Iterable
+
+from core.hata_yonetici import SonucYonetici, logger
+from database.repository_registry import RepositoryRegistry
+
+OZET_TABLOSU = "NB_PersonelAyOzet"
+
+NOBET_KOLONLARI = (
+    "NobetSayisi", "NobetDakika", "HaftasonuSayisi",
+    "GunduzSayisi", "GeceSayisi",
+)
+MESAI_KOLONLARI = (
+    "CalisDakika", "HedefDakika", "FazlaDakika", "DevirDakika",
+    "ToplamFazlaDakika", "OdenenDakika", "DevireGidenDakika",
+)
+ONAYLI_PLAN_DURUMLARI = ("onaylandi", "yururlukte")
+
+HAFTASONU = {5, 6}
+VARSAYILAN_BAS_SAAT = "08:00"
+
+
+# ══════════════════════════════════════════════════════════════
+#  Nöbet istatistiği (özet tablosu ve personel_nobet_ozeti ortak)
+# ══════════════════════════════════════════════════════════════
+
+def nobet_istatistikleri(satirlar: Iterable[dict],
+                         v_map: dict[str, dict]) -> dict[str, dict]:
+    """
+    Aktif plan satırlarından personel başına nöbet istatistiği.
+    v_map: {VardiyaID: {SureDakika, BasSaat}}
+    Gece: BasSaat 20:00 ve sonrası veya 06:00 öncesi.
+    Dönen: {PersonelID: {NobetSayisi, NobetDakika, HaftasonuSayisi,
+                         GunduzSayisi, GeceSayisi}}
+    """
+    ozet: dict[str, dict] = {}
+    for s in satirlar:
+        pid = str(s.get("PersonelID", "") or "")
+        if not pid:
+            continue
+        vardiya = v_map.get(str(s.get("VardiyaID", "")))
+        bas = (str(vardiya.get("BasSaat", VARSAYILAN_BAS_SAAT))
+               if vardiya else VARSAYILAN_BAS_SAAT)
+        k = ozet.get(pid)
+        if k is None:
+            k = ozet[pid] = dict.fromkeys(NOBET_KOLONLARI, 0)
+        try:
+            if date.fromisoformat(str(s.get("NobetTarihi", ""))).weekday() in HAFTASONU:
+                k["HaftasonuSayisi"] += 1
+        except ValueError:
+            pass
+        try:
+            saat = int(bas.split(":")[0])
+            if saat >= 20 or saat < 6:
+                k["GeceSayisi"] += 1
+            else:
+                k["GunduzSayisi"] += 1
+        except ValueError:
+            pass
+        k["NobetSayisi"] += 1
+        k["NobetDakika"] += int((vardiya or {}).get("SureDakika", 0) or 0)
+    return ozet
+
+
+class NbOzetService:
+    """
+    NB_PersonelAyOzet bakımı ve okuması.
+
+    Kullanım:
+        svc = NbOzetService(registry)
+        svc.plan_ozetini_guncelle(plan_id)
+        svc.personel_ozeti(personel_id, ay_sayisi=24)
+    """
+
+    def __init__(self, registry: RepositoryRegistry):
+        if not registry:
+            raise ValueError("RepositoryRegistry boş olamaz")
+        self._r = registry
+
+    # ──────────────────────────────────────────────────────────
+    #  Yazım
+    # ──────────────────────────────────────────────────────────
+
+    def plan_ozetini_guncelle(self, plan_id: str) -> SonucYonetici:
+        """Planın aktif satırlarından nöbet kolonlarını yeniden yazar."""
+        try:
+            with self._r.db.transaction():
+                self.gerekirse_doldur()
+                adet = self.plan_ozeti_yaz(plan_id)
+            return SonucYonetici.tamam(
+                f"Nöbet özeti güncellendi — {adet} personel", veri={"adet": adet})
+        except Exception as e:
+            return SonucYonetici.hata(e, "NbOzetService.plan_ozetini_guncelle")
+
+    def mesai_ozetini_guncelle(self, hesaplar: list[dict]) -> SonucYonetici:
+        """NB_MesaiHesap satırlarının mesai kolonlarını özete yazar."""
+        try:
+            with self._r.db.transaction():
+                self.gerekirse_doldur()
+                adet = self.mesai_ozeti_yaz(hesaplar)
+            return SonucYonetici.tamam(
+                f"Mesai özeti güncellendi — {adet} kayıt", veri={"adet": adet})
+        except Exception as e:
+            return SonucYonetici.hata(e, "NbOzetService.mesai_ozetini_guncelle")
+
+    def plan_durumu_guncelle(self, plan_id: str, durum: str) -> SonucYonetici:
+        """Plana ait özet satırlarının PlanDurum'unu günceller (sayımlar korunur)."""
+        try:
+            adet = self.plan_durumu_yaz(plan_id, durum)
+            return SonucYonetici.tamam(veri={"adet": adet})
+        except Exception as e:
+            return SonucYonetici.hata(e, "NbOzetService.plan_durumu_guncelle")
+
+    def plan_ozeti_yaz(self, plan_id: str) -> int:
+        """
+        plan_ozetini_guncelle'nin hata yutmayan hali; çağıranın
+        transaction'ı içinde kullanılır. Planın birim/ayında artık
+        nöbeti olmayan personelin nöbet kolonları sıfırlanır.
+        """
+        plan = self._r.get("NB_Plan").get_by_id(str(plan_id))
+        if not plan:
+            return 0
+        satirlar = (self._r.get("NB_PlanSatir")
+                    .query("PersonelID", "VardiyaID", "NobetTarihi")
+                    .where(PlanID=str(plan_id), Durum="aktif")
+                    .all())
+        istat = nobet_istatistikleri(satirlar, self._vardiya_map(
+            {str(s.get("VardiyaID", "")) for s in satirlar}))
+
+        bid = str(plan.get("BirimID", ""))
+        yil, ay = int(plan.get("Yil", 0)), int(plan.get("Ay", 0))
+        repo = self._r.get(OZET_TABLOSU)
+        eski = set(repo.query().where(BirimID=bid, Yil=yil, Ay=ay)
+                   .column("PersonelID"))
+        bos = dict.fromkeys(NOBET_KOLONLARI, 0)
+        rows = [
+            {
+                "PersonelID": pid, "BirimID": bid, "Yil": yil, "Ay": ay,
+                "PlanID":     str(plan_id),
+                "PlanDurum":  str(plan.get("Durum", "taslak")),
+                **istat.get(pid, bos),
+            }
+            for pid in sorted(set(istat) | eski)
+        ]
+        repo.upsert_many(rows)
+        return len(istat)
+
+    def plan_durumu_yaz(self, plan_id: str, durum: str) -> int:
+        """plan_durumu_guncelle'nin hata yutmayan hali (transaction içi)."""
+        repo = self._r.get(OZET_TABLOSU)
+        anahtarlar = (repo.query("PersonelID", "BirimID", "Yil", "Ay")
+                      .where(PlanID=str(plan_id)).all())
+        repo.upsert_many([{**a, "PlanDurum": durum} for a in anahtarlar])
+        return len(anahtarlar)
+
+    def mesai_ozeti_yaz(self, hesaplar: list[dict]) -> int:
+        """mesai_ozetini_guncelle'nin hata yutmayan hali (transaction içi)."""
+        rows = []
+        for h in hesaplar:
+            pid = str(h.get("PersonelID", "") or "")
+            if not pid:
+                continue
+            rows.append({
+                "PersonelID":  pid,
+                "BirimID":     str(h.get("BirimID", "")),
+                "Yil":         int(h.get("Yil", 0)),
+                "Ay":          int(h.get("Ay", 0)),
+                "PlanID":      str(h.get("PlanID", "")),
+                **{k: int(h.get(k, 0) or 0) for k in MESAI_KOLONLARI},
+                "HesapDurumu": str(h.get("HesapDurumu") or "hesaplandi"),
+            })
+        self._r.get(OZET_TABLOSU).upsert_many(rows)
+        return len(rows)
+
+    def gerekirse_doldur(self) -> bool:
+        """Özet boş, kaynak tablolar doluysa yeniden_olustur(); doldurduysa True."""
+        if self._r.get(OZET_TABLOSU).query().exists():
+            return False
+        if not (self._r.get("NB_MesaiHesap").query().exists()
+                or self._r.get("NB_Plan").query()
+                       .where(Durum=list(ONAYLI_PLAN_DURUMLARI)).exists()):
+            return False
+        sonuc = self.yeniden_olustur()
+        if not sonuc.basarili:
+            raise RuntimeError(sonuc.mesaj)
+        return True
+
+    def yeniden_olustur(self) -> SonucYonetici:
+        """
+        Özeti baştan kurar. Birim/ay başına onaylı ya da mesaisi hesaplanmış
+        en yüksek versiyonlu plan alınır; mesai kolonları kişinin o aydaki
+        (öncelikle o plana ait) en son hesabından gelir.
+        """
+        try:
+            hesaplar = self._r.get("NB_MesaiHesap").get_all() or []
+            hesapli_planlar = {str(h.get("PlanID", "")) for h in hesaplar}
+
+            secilen: dict[tuple, dict] = {}
+            for p in self._r.get("NB_Plan").get_all() or []:
+                if (p.get("Durum") not in ONAYLI_PLAN_DURUMLARI
+                        and str(p.get("PlanID", "")) not in hesapli_planlar):
+                    continue
+                anahtar = (str(p.get("BirimID", "")),
+                           int(p.get("Yil", 0)), int(p.get("Ay", 0)))
+                mevcut = secilen.get(anahtar)
+                if mevcut is None or _plan_sirasi(p) > _plan_sirasi(mevcut):
+                    secilen[anahtar] = p
+            plan_idler = {str(p["PlanID"]) for p in secilen.values()}
+
+            son_hesap: dict[tuple, dict] = {}
+            for h in hesaplar:
+                anahtar = (str(h.get("PersonelID", "")), str(h.get("BirimID", "")),
+                           int(h.get("Yil", 0)), int(h.get("Ay", 0)))
+                mevcut = son_hesap.get(anahtar)
+                if mevcut is None or (_hesap_sirasi(h, plan_idler)
+                                      > _hesap_sirasi(mevcut, plan_idler)):
+                    son_hesap[anahtar] = h
+
+            with self._r.db.transaction():
+                self._r.db.execute(f"DELETE FROM {OZET_TABLOSU}")
+                self._r.onbellek_temizle(OZET_TABLOSU)
+                for pid in sorted(plan_idler):
+                    self.plan_ozeti_yaz(pid)
+                adet = self.mesai_ozeti_yaz(list(son_hesap.values()))
+
+            logger.info(f"{OZET_TABLOSU} yeniden oluşturuldu: "
+                        f"{len(plan_idler)} plan, {adet} mesai hesabı")
+            return SonucYonetici.tamam(
+                f"Özet yeniden oluşturuldu — {len(plan_idler)} plan",
+                veri={"plan": len(plan_idler), "mesai": adet})
+        except Exception as e:
+            return SonucYonetici.hata(e, "NbOzetService.yeniden_olustur")
+
+    # ──────────────────────────────────────────────────────────
+    #  Okuma
+    # ──────────────────────────────────────────────────────────
+
+    def personel_ozeti(self, personel_id: str, ay_sayisi: int = 24,
+                       sadece_mesai: bool = False) -> SonucYonetici:
+        """
+        Personelin en yeni ay_sayisi özet satırı (Yil, Ay azalan).
+        sadece_mesai: yalnızca mesai hesabı olan satırlar.
+        """
+        try:
+            self.gerekirse_doldur()
+            q = self._r.get(OZET_TABLOSU).query().where(PersonelID=str(personel_id))
+            if sadece_mesai:
+                q = q.where_not(HesapDurumu=None)
+            rows = (q.order_by("Yil", desc=True).order_by("Ay", desc=True)
+                    .order_by("BirimID").limit(ay_sayisi).all())
+            return SonucYonetici.tamam(veri=rows)
+        except Exception as e:
+            return SonucYonetici.hata(e, "NbOzetService.personel_ozeti")
+
+    def _vardiya_map(self, vardiya_idler: set[str]) -> dict[str, dict]:
+        if not vardiya_idler:
+            return {}
+        return {
+            str(v["VardiyaID"]): v
+            for v in (self._r.get("NB_Vardiya")
+                      .query("VardiyaID", "SureDakika", "BasSaat")
+                      .where(VardiyaID=sorted(vardiya_idler)).all())
+        }
+
+
+def _plan_sirasi(plan: dict) -> tuple:
+    try:
+        versiyon = int(plan.get("Versiyon", 0) or 0)
+    except (TypeError, ValueError):
+        versiyon = 0
+    return (versiyon, str(plan.get("updated_at", "") or ""),
+            str(plan.get("PlanID", "")))
+
+
+def _hesap_sirasi(hesap: dict, plan_idler: set[str]) -> tuple:
+    return (str(hesap.get("PlanID", "")) in plan_idler,
+            str(hesap.get("updated_at", "") or ""),
+            str(hesap.get("HesapID", "")))
@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+"""
+nb_plan_indeksi.py — Açık plan için bellek içi kısıt indeksi
+
+Manuel düzenlemede (satir_ekle) her kontrol için NB_PlanSatir, Izin_Giris,
+NB_BirimAyar, NB_VardiyaGrubu ve NB_Vardiya'yı yeniden sorgulamak yerine
+plan bir kez indekslenir, sonraki düzenlemeler indekse artımlı işlenir:
+
+  gun_normal   : tarih → aktif normal (fazla_mesai dışı) satır sayısı
+  kisi_gun     : (personel, tarih) → o günkü plan satırları
+  kisi_dakika  : personel → plandaki toplam nöbet dakikası
+  nobetler     : (personel, tarih) → tüm planlardaki aktif satır sayısı
+                 (ay başından bir gün önce dahil; üst üste kontrolü)
+  izinler      : personel → [(bas, bit, tip)] iptal/red dışı izinler
+
+Tazelik: kurulurken ilgili tabloların nesli (database/table_cache.py)
+saklanır. NbPlanService kendi yazımını indekse işleyip nesli yalnızca
+kendi artışı kadar ilerletir; başka bir yazım (otomatik plan, sync pull,
+izin girişi ...) nesli değiştirdiği için indeks bir sonraki erişimde
+yeniden kurulur.
+
+    indeks = plan_indeksi_al(registry, plan_id, kurucu)
+    indeks.kapasite_kontrol(tarih)
+"""
+from __future__ import annotations
+
+import os
+import threading
+from collections import Counter, OrderedDict
+from datetime import date, timedelta
+from typing import Callable, Optional
+
+from database.table_cache import onbellek_al
+
+# Tazeliği izlenen tablolar
+IZLENEN_TABLOLAR = (
+    "NB_PlanSatir", "Izin_Giris", "NB_BirimAyar", "NB_VardiyaGrubu", "NB_Vardiya",
+)
+MAKS_INDEKS = 8     # aynı anda sıcak tutulan plan sayısı
+
+
+class PlanKisitIndeksi:
+    """Tek planın kısıt kontrolü için sayaçlar; satır ekle/çıkar O(1)."""
+
+    def __init__(self, plan: dict, slot_kapasitesi: int, max_gun_dk: int,
+                 vardiya_sure: dict[str, int], nesil: dict[str, int]):
+        self.plan_id  = str(plan["PlanID"])
+        self.birim_id = str(plan.get("BirimID", ""))
+        yil, ay = int(plan["Yil"]), int(plan["Ay"])
+        self.ay_bas = date(yil, ay, 1)
+        self.ay_bit = (date(yil, ay + 1, 1) if ay < 12
+                       else date(yil + 1, 1, 1)) - timedelta(days=1)
+        self._aralik_bas = (self.ay_bas - timedelta(days=1)).isoformat()
+        self._aralik_bit = self.ay_bit.isoformat()
+
+        self.slot_kapasitesi = slot_kapasitesi
+        self.max_gun_dk      = max_gun_dk
+        self.vardiya_sure    = vardiya_sure
+        self.nesil           = dict(nesil)
+
+        # Bu planın aktif satırları: SatirID → (personel, tarih, vardiya, normal)
+        self._plan_satir: dict[str, tuple[str, str, str, bool]] = {}
+        self.gun_normal: Counter = Counter()
+        self.kisi_gun: dict[tuple[str, str], list[str]] = {}
+        self.kisi_dakika: Counter = Counter()
+        # Aralıktaki tüm planların aktif satırları: SatirID → (personel, tarih)
+        self._tum_satir: dict[str, tuple[str, str]] = {}
+        self.nobetler: Counter = Counter()
+        self.izinler: dict[str, list[tuple[date, date, str]]] = {}
+
+    # ── Kurulum ─────────────────────────────────────────────
+
+    @classmethod
+    def kur(cls, registry, plan: dict, slot_kapasitesi: int,
+            max_gun_dk: int) -> "PlanKisitIndeksi":
+        """Planı ve çevresini (izinler, komşu planlar) toplu okuyarak indeksler."""
+        onbellek = onbellek_al(registry.db)
+        # Nesil okumalardan önce alınır: kurulum sırasındaki yazım kaçmasın
+        nesil = {t: onbellek.nesil(t) for t in IZLENEN_TABLOLAR}
+
+        v_sure = {}
+        for v in registry.get("NB_Vardiya").query("VardiyaID", "SureDakika").all():
+            try:
+                v_sure[str(v["VardiyaID"])] = int(v.get("SureDakika") or 0)
+            except (TypeError, ValueError):
+                v_sure[str(v["VardiyaID"])] = 0
+
+        ix = cls(plan, slot_kapasitesi, max_gun_dk, v_sure, nesil)
+
+        for r in (registry.get("NB_PlanSatir")
+                  .query("SatirID", "PlanID", "PersonelID", "VardiyaID",
+                         "NobetTarihi", "NobetTuru", "Durum")
+                  .where(Durum="aktif")
+                  .between("NobetTarihi", ix._aralik_bas, ix._aralik_bit)
+                  .all()):
+            ix.satir_ekle(r)
+
+        for izin in (registry.get("Izin_Giris")
+                     .query("Personelid", "IzinTipi", "BaslamaTarihi",
+                            "BitisTarihi", "Durum")
+                     .overlaps("BaslamaTarihi", "BitisTarihi",
+                               ix.ay_bas.isoformat(), ix.ay_bit.isoformat())
+                     .all()):
+            if str(izin.get("Durum", "")).lower() in ("iptal", "reddedildi"):
+                continue
+            try:
+                bas = date.fromisoformat(str(izin.get("BaslamaTarihi", "")))
+                bit = date.fromisoformat(str(izin.get("BitisTarihi", "")))
+            except ValueError:
+                continue
+            ix.izinler.setdefault(str(izin.get("Personelid", "")), []).append(
+                (bas, bit, str(izin.get("IzinTipi", ""))))
+        return ix
+
+    # ── Artımlı güncelleme ──────────────────────────────────
+
+    def satir_ekle(self, satir: dict) -> None:
+        """Aktif satırı sayaçlara işler (plan / aralık dışıysa ilgili kısım atlanır)."""
+        if str(satir.get("Durum", "aktif")) != "aktif":
+            return
+        sid   = str(satir["SatirID"])
+        pid   = str(satir.get("PersonelID", ""))
+        tarih = str(satir.get("NobetTarihi", ""))
+        if sid in self._tum_satir or sid in self._plan_satir:
+            return
+        if self._aralik_bas <= tarih <= self._aralik_bit:
+            self._tum_satir[sid] = (pid, tarih)
+            self.nobetler[(pid, tarih)] += 1
+        if str(satir.get("PlanID", "")) != self.plan_id:
+            return
+        vid    = str(satir.get("VardiyaID", ""))
+        normal = str(satir.get("NobetTuru", "normal")) != "fazla_mesai"
+        self._plan_satir[sid] = (pid, tarih, vid, normal)
+        if normal:
+            self.gun_normal[tarih] += 1
+        self.kisi_gun.setdefault((pid, tarih), []).append(sid)
+        self.kisi_dakika[pid] += self.vardiya_sure.get(vid, 0)
+
+    def satir_cikar(self, satir_id: str) -> None:
+        """Satırı (iptal / değiştirildi) sayaçlardan düşer; bilinmiyorsa yok sayar."""
+        sid = str(satir_id)
+        kayit = self._tum_satir.pop(sid, None)
+        if kayit:
+            self.nobetler[kayit] -= 1
+            if self.nobetler[kayit] <= 0:
+                del self.nobetler[kayit]
+        kayit = self._plan_satir.pop(sid, None)
+        if not kayit:
+            return
+        pid, tarih, vid, normal = kayit
+        if normal:
+            self.gun_normal[tarih] -= 1
+            if self.gun_normal[tarih] <= 0:
+                del self.gun_normal[tarih]
+        gunluk = self.kisi_gun.get((pid, tarih), [])
+        if sid in gunluk:
+            gunluk.remove(sid)
+        if not gunluk:
+            self.kisi_gun.pop((pid, tarih), None)
+        self.kisi_dakika[pid] -= self.vardiya_sure.get(vid, 0)
+
+    def guncel_mi(self, onbellek) -> bool:
+        return all(onbellek.nesil(t) == n for t, n in self.nesil.items())
+
+    def nesil_ilerlet(self, artis: dict[str, int]) -> None:
+        """
+        Kendi yazımı indekse işlendikten sonra çağrılır: saklanan nesil
+        yalnızca bu yazımın artışı kadar ilerler. Arada başka bir yazım
+        olduysa nesil tutmaz ve indeks sonraki erişimde yeniden kurulur.
+        """
+        for t, n in artis.items():
+            if t in self.nesil:
+                self.nesil[t] += n
+
+    # ── Kontroller (NbPlanService ile aynı mesajlar) ────────
+
+    def kapsar(self, tarih: str) -> bool:
+        """tarih planın ayında mı (dışındaysa çağıran veritabanına sorar)."""
+        return self.ay_bas.isoformat() <= str(tarih) <= self._aralik_bit
+
+    def kapasite_kontrol(self, tarih: str) -> Optional[str]:
+        if self.slot_kapasitesi <= 0:
+            return None
+        adet = self.gun_normal.get(tarih, 0)
+        if adet >= self.slot_kapasitesi:
+            return (f"{tarih} için günlük slot kapasitesi dolu "
+                    f"({adet}/{self.slot_kapasitesi}).")
+        return None
+
+    def ayni_gun_kontrol(self, personel_id: str, tarih: str,
+                         yeni_vardiya_id: str) -> Optional[str]:
+        gunluk = self.kisi_gun.get((personel_id, tarih))
+        if not gunluk:
+            return None
+        if self.max_gun_dk < 1440:
+            return (
+                f"{personel_id} {tarih} tarihinde zaten bir nöbeti var "
+                f"(bu birim tek vardiya/gün izni veriyor)."
+            )
+        mevcut_toplam_dk = sum(
+            self.vardiya_sure.get(self._plan_satir[sid][2], 0) for sid in gunluk)
+        yeni_dk = self.vardiya_sure.get(str(yeni_vardiya_id), 0)
+        if mevcut_toplam_dk + yeni_dk > self.max_gun_dk:
+            return (
+                f"{personel_id} {tarih} tarihinde zaten {mevcut_toplam_dk} dk nöbeti var; "
+                f"toplam {mevcut_toplam_dk + yeni_dk} dk > maksimum {self.max_gun_dk} dk."
+            )
+        return None
+
+    def kisit_kontrol(self, personel_id: str, tarih: str) -> Optional[str]:
+        """İzin ve üst üste nöbet kontrolü (fazla_mesai ayrımı çağıranda)."""
+        tarih_obj = date.fromisoformat(tarih)
+        for bas, bit, tip in self.izinler.get(personel_id, ()):
+            if bas <= tarih_obj <= bit:
+                return f"{personel_id} bu tarihte izinli ({tip})"
+        dun = (tarih_obj - timedelta(days=1)).isoformat()
+        if self.nobetler.get((personel_id, dun), 0) > 0:
+            return f"{personel_id} dün de nöbet tuttu (üst üste yasak)"
+        return None
+
+
+# ══════════════════════════════════════════════════════════════
+#  Paylaşılan indeksler
+# ══════════════════════════════════════════════════════════════
+
+_indeksler: "OrderedDict[tuple, PlanKisitIndeksi]" = OrderedDict()
+_indeks_kilidi = threading.Lock()
+
+
+def _db_anahtari(db):
+    yol = getattr(db, "db_path", None)
+    return os.path.abspath(yol) if yol and yol != ":memory:" else id(db)
+
+
+def plan_indeksi_al(registry, plan_id: str,
+                    kurucu: Callable[[], PlanKisitIndeksi]) -> PlanKisitIndeksi:
+    """Taze indeksi döner; yoksa / bayatsa kurucu() ile yeniden kurar."""
+    anahtar = (_db_anahtari(registry.db), str(plan_id))
+    onbellek = onbellek_al(registry.db)
+    with _indeks_kilidi:
+        ix = _indeksler.get(anahtar)
+        if ix is not None and ix.guncel_mi(onbellek):
+            _indeksler.move_to_end(anahtar)
+            return ix
+    ix = kurucu()
+    with _indeks_kilidi:
+        _indeksler[anahtar] = ix
+        _indeksler.move_to_end(anahtar)
+        while len(_indeksler) > MAKS_INDEKS:
+            _indeksler.popitem(last=False)
+    return ix
+
+
+def plan_indeksi_birak(registry, plan_id: Optional[str] = None) -> None:
+    """Planın (None → db'nin tüm planlarının) indeksini düşürür (sayfa kapanınca)."""
+    db_anahtari = _db_anahtari(registry.db)
+    with _indeks_kilidi:
+        for anahtar in [a for a in _indeksler
+                        if a[0] == db_anahtari
+                        and (plan_id is None or a[1] == str(plan_id))]:
+            del _indeksler[anahtar]
+
+
+def satir_yazimi(registry, yaz: Callable, degisiklik: Callable[[PlanKisitIndeksi], None]):
+    """
+    NB_PlanSatir yazımını çalıştırır ve yazımdan önce taze olan indekslere
+    değişikliği işler; bayat indeksler dokunulmadan bırakılır (yeniden kurulur).
+
+    İndeksin nesli güncel değerle eşitlenmez; doğrulandığı değer bu thread'in
+    yazım sırasındaki kendi artışı kadar ilerletilir. Kontrol ile yazım
+    arasında (veya yazım sırasında) başka bir thread / bağlantı tabloya
+    yazdıysa nesil tutmaz ve indeks bayat sayılır.
+    """
+    db_anahtari = _db_anahtari(registry.db)
+    onbellek = onbellek_al(registry.db)
+    with _indeks_kilidi:
+        taze = [ix for a, ix in _indeksler.items()
+                if a[0] == db_anahtari and ix.guncel_mi(onbellek)]
+    once = {t: onbellek.yerel_artis(t) for t in IZLENEN_TABLOLAR}
+    sonuc = yaz()
+    artis = {t: onbellek.yerel_artis(t) - n for t, n in once.items()}
+    with _indeks_kilidi:
+        for ix in taze:
+            degisiklik(ix)
+            ix.nesil_ilerlet(artis)
+    return sonuc
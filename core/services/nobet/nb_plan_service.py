@@ -7,6 +7,9 @@
   - Plan versiyonlama: aynı ay/birim için birden fazla versiyon olabilir
   - Onay akışı: taslak → onaylandi → yururlukte
   - Kısıt katmanları: izin, üst üste, hedef dakika, max nöbet gün
+  - Manuel düzenleme kontrolleri plan kısıt indeksinden (nb_plan_indeksi)
+    yapılır; satır yazımları indekse artımlı işlenir
+  - Onay / onay geri alma personel ay özetini (nb_ozet_service) günceller
 """
 from __future__ import annotations
 
@@ -15,6 +18,10 @@
 from typing import Optional
 
 from core.hata_yonetici import SonucYonetici, logger
+from core.services.nobet.nb_ozet_service import NbOzetService
+from core.services.nobet.nb_plan_indeksi import (
+    PlanKisitIndeksi, plan_indeksi_al, plan_indeksi_birak, satir_yazimi,
+)
 from database.repository_registry import RepositoryRegistry
 
 REVIZYON_NOTU_ISARETI = "[REVIZYON_MODU]"
@@ -55,13 +62,9 @@ def get_plan(self, birim_id: str, yil: int,
         Yoksa None.
         """
         try:
-            rows = self._r.get("NB_Plan").get_all() or []
-            ilgili = [
-                r for r in rows
-                if str(r.get("BirimID", "")) == str(birim_id)
-                and int(r.get("Yil", 0)) == yil
-                and int(r.get("Ay",  0)) == ay
-            ]
+            ilgili = (self._r.get("NB_Plan").query()
+                      .where(BirimID=str(birim_id), Yil=int(yil), Ay=int(ay))
+                      .all())
             if not ilgili:
                 return SonucYonetici.tamam(veri=None)
             return SonucYonetici.tamam(
@@ -77,12 +80,10 @@ def get_satirlar(self, plan_id: str,
         sadece_aktif=True → Durum='aktif' olanlar (iptal edilmişler hariç)
         """
         try:
-            rows = self._r.get("NB_PlanSatir").get_all() or []
-            rows = [r for r in rows
-                    if str(r.get("PlanID", "")) == str(plan_id)]
+            q = self._r.get("NB_PlanSatir").query().where(PlanID=str(plan_id))
             if sadece_aktif:
-                rows = [r for r in rows if r.get("Durum") == "aktif"]
-            return SonucYonetici.tamam(veri=[dict(r) for r in rows])
+                q.where(Durum="aktif")
+            return SonucYonetici.tamam(veri=q.all())
         except Exception as e:
             return SonucYonetici.hata(e, "NbPlanService.get_satirlar")
 
@@ -144,15 +145,15 @@ def plan_al_veya_olustur(self, birim_id: str, yil: int,
                             "Değişiklik için önce onayı geri alın."))
                 # temizle=True ise mevcut aktif satırları iptal et
                 if temizle:
-                    ps_rows = self._r.get("NB_PlanSatir").get_all() or []
+                    aktif_idler = (self._r.get("NB_PlanSatir").query()
+                                   .where(PlanID=mevcut["PlanID"], Durum="aktif")
+                                   .column("SatirID"))
                     iptal_n = 0
-                    for s in ps_rows:
-                        if (str(s.get("PlanID", "")) == mevcut["PlanID"]
-                                and s.get("Durum") == "aktif"):
-                            self._r.get("NB_PlanSatir").update(
-                                s["SatirID"],
-                                {"Durum": "iptal", "updated_at": _simdi()})
-                            iptal_n += 1
+                    for satir_id in aktif_idler:
+                        self._r.get("NB_PlanSatir").update(
+                            satir_id,
+                            {"Durum": "iptal", "updated_at": _simdi()})
+                        iptal_n += 1
                     if iptal_n:
                         logger.info(f"Eski taslak temizlendi: {iptal_n} satır iptal")
                 return SonucYonetici.tamam(
@@ -186,13 +187,9 @@ def taslak_temizle(self, birim_id: str,
                 "onaylandi", "onaylandı", "onaylı", "yururlukte", "yürürlükte"
             }
 
-            plan_rows = self._r.get("NB_Plan").get_all() or []
-            donem_planlari = [
-                p for p in plan_rows
-                if str(p.get("BirimID", "")) == str(birim_id)
-                and int(p.get("Yil", 0)) == int(yil)
-                and int(p.get("Ay", 0)) == int(ay)
-            ]
+            donem_planlari = (self._r.get("NB_Plan").query()
+                              .where(BirimID=str(birim_id), Yil=int(yil), Ay=int(ay))
+                              .all())
             if not donem_planlari:
                 return SonucYonetici.tamam(
                     "Temizlenecek plan yok",
@@ -210,22 +207,20 @@ def taslak_temizle(self, birim_id: str,
                 )
 
             plan_id_set = {str(p.get("PlanID", "")) for p in taslak_planlar if p.get("PlanID")}
-            satir_rows = self._r.get("NB_PlanSatir").get_all() or []
-            mesai_rows = self._r.get("NB_MesaiHesap").get_all() or []
+            hesap_idler = (self._r.get("NB_MesaiHesap").query()
+                           .where(PlanID=list(plan_id_set)).column("HesapID"))
+            satir_idler = (self._r.get("NB_PlanSatir").query()
+                           .where(PlanID=list(plan_id_set)).column("SatirID"))
 
             silinen_mesai = 0
-            for r in mesai_rows:
-                if str(r.get("PlanID", "")) in plan_id_set:
-                    hid = r.get("HesapID")
-                    if hid and self._r.get("NB_MesaiHesap").delete(hid):
-                        silinen_mesai += 1
+            for hid in hesap_idler:
+                if hid and self._r.get("NB_MesaiHesap").delete(hid):
+                    silinen_mesai += 1
 
             silinen_satir = 0
-            for r in satir_rows:
-                if str(r.get("PlanID", "")) in plan_id_set:
-                    sid = r.get("SatirID")
-                    if sid and self._r.get("NB_PlanSatir").delete(sid):
-                        silinen_satir += 1
+            for sid in satir_idler:
+                if sid and self._r.get("NB_PlanSatir").delete(sid):
+                    silinen_satir += 1
 
             silinen_plan = 0
             for p in taslak_planlar:
@@ -295,9 +290,7 @@ def satir_ekle(self, plan_id: str,
                                "nobet_tarihi zorunlu"))
 
             # Plan durumu kontrolü
-            plan_rows = self._r.get("NB_Plan").get_all() or []
-            plan = next((r for r in plan_rows
-                         if r.get("PlanID") == plan_id), None)
+            plan = self._r.get("NB_Plan").get_by_id(plan_id)
             if not plan:
                 return SonucYonetici.hata(
                     ValueError(f"Plan bulunamadı: {plan_id}"))
@@ -308,38 +301,17 @@ def satir_ekle(self, plan_id: str,
                             "Onaylı plana sadece 'fazla_mesai' türünde "
                             "satır eklenebilir."))
 
-            # Normal nöbetler için günlük slot kapasitesi aşılmasın.
-            # Bu kontrol kisit_atla ile bypass edilmez.
-            if nobet_turu != "fazla_mesai":
-                gunluk_kapasite = self._gunluk_slot_kapasitesi(
-                    str(plan.get("BirimID", "")))
-                if gunluk_kapasite > 0:
-                    gunluk_adet = self._gunluk_aktif_normal_satir_sayisi(
-                        plan_id, nobet_tarihi)
-                    if gunluk_adet >= gunluk_kapasite:
-                        return SonucYonetici.uyari(
-                            f"{nobet_tarihi} için günlük slot kapasitesi dolu "
-                            f"({gunluk_adet}/{gunluk_kapasite}).",
-                            "NbPlanService.satir_ekle",
-                        )
-
-            # Aynı gün aynı personel kontrolü — kisit_atla ile bypass edilmez.
+            # Slot kapasitesi + aynı gün kontrolü kisit_atla ile bypass
+            # edilmez; izin / üst üste kontrolü kisit_atla=True ise atlanır.
             # MaxGunlukSureDakika'ya göre denetim:
             # - 1440+ dk (24 saat) → 2 vardiya izni (toplam süresi kontrol et)
             # - < 1440 dk (12 saat) → 1 vardiya sınırı
-            birim_id = str(plan.get("BirimID", ""))
-            ayni_gun_kontrolu = self._ayni_gun_ayni_personel(
-                plan_id, personel_id, nobet_tarihi, vardiya_id, birim_id)
-            if ayni_gun_kontrolu:
-                return SonucYonetici.uyari(ayni_gun_kontrolu, "NbPlanService.satir_ekle")
-
-            # Kısıt kontrolü — kisit_atla=True ise atla
-            if not kisit_atla:
-                kisit = self._kisit_kontrol(
-                    personel_id, nobet_tarihi, vardiya_id, nobet_turu)
-                if kisit:
-                    return SonucYonetici.uyari(kisit, "NbPlanService.satir_ekle")
-            elif kisit_atla:
+            mesaj = self._satir_on_kontrol(
+                plan, personel_id, vardiya_id, nobet_tarihi,
+                nobet_turu, kisit_atla)
+            if mesaj:
+                return SonucYonetici.uyari(mesaj, "NbPlanService.satir_ekle")
+            if kisit_atla:
                 logger.warning(
                     f"[Override] Kısıt atlandı: {personel_id} "
                     f"/ {nobet_tarihi} / {kaynak}")
@@ -357,13 +329,44 @@ def satir_ekle(self, plan_id: str,
                 "created_at":   _simdi(),
                 "created_by":   olusturan_id,
             }
-            self._r.get("NB_PlanSatir").insert(satir)
+            satir_yazimi(
+                self._r,
+                lambda: self._r.get("NB_PlanSatir").insert(satir),
+                lambda ix: ix.satir_ekle(satir))
             return SonucYonetici.tamam(
                 f"Satır eklendi: {personel_id} / {nobet_tarihi}",
                 veri=satir)
         except Exception as e:
             return SonucYonetici.hata(e, "NbPlanService.satir_ekle")
 
+    def satir_kontrol(self, plan_id: str,
+                      personel_id: str,
+                      vardiya_id: str,
+                      nobet_tarihi: str,
+                      nobet_turu: str = "normal",
+                      kisit_atla: bool = False) -> SonucYonetici:
+        """
+        satir_ekle kontrollerini yazmadan çalıştırır (düzenleme önizlemesi).
+        Sorun varsa uyari, yoksa tamam döner.
+        """
+        try:
+            plan = self._r.get("NB_Plan").get_by_id(plan_id)
+            if not plan:
+                return SonucYonetici.hata(
+                    ValueError(f"Plan bulunamadı: {plan_id}"))
+            mesaj = self._satir_on_kontrol(
+                plan, str(personel_id).strip(), str(vardiya_id).strip(),
+                str(nobet_tarihi).strip(), nobet_turu, kisit_atla)
+            if mesaj:
+                return SonucYonetici.uyari(mesaj, "NbPlanService.satir_kontrol")
+            return SonucYonetici.tamam()
+        except Exception as e:
+            return SonucYonetici.hata(e, "NbPlanService.satir_kontrol")
+
+    def indeks_birak(self, plan_id: Optional[str] = None) -> None:
+        """Plan sayfası kapanınca kısıt indeksini bellekten düşürür."""
+        plan_indeksi_birak(self._r, plan_id)
+
     def satir_iptal(self, satir_id: str,
                     neden: str = "") -> SonucYonetici:
         """
@@ -371,11 +374,14 @@ def satir_iptal(self, satir_id: str,
         Denetim izi korunur.
         """
         try:
-            self._r.get("NB_PlanSatir").update(satir_id, {
-                "Durum":      "iptal",
-                "Notlar":     neden,
-                "updated_at": _simdi(),
-            })
+            satir_yazimi(
+                self._r,
+                lambda: self._r.get("NB_PlanSatir").update(satir_id, {
+                    "Durum":      "iptal",
+                    "Notlar":     neden,
+                    "updated_at": _simdi(),
+                }),
+                lambda ix: ix.satir_cikar(satir_id))
             return SonucYonetici.tamam("Satır iptal edildi")
         except Exception as e:
             return SonucYonetici.hata(e, "NbPlanService.satir_iptal")
@@ -389,20 +395,11 @@ def satir_degistir(self, eski_satir_id: str,
         OncekiSatirID zinciri korunur — tam denetim izi.
         """
         try:
-            rows = self._r.get("NB_PlanSatir").get_all() or []
-            eski = next(
-                (r for r in rows if r.get("SatirID") == eski_satir_id), None)
+            eski = self._r.get("NB_PlanSatir").get_by_id(eski_satir_id)
             if not eski:
                 return SonucYonetici.hata(
                     ValueError(f"Satır bulunamadı: {eski_satir_id}"))
 
-            # Eski satırı iptal et
-            self._r.get("NB_PlanSatir").update(eski_satir_id, {
-                "Durum":      "degistirildi",
-                "Notlar":     neden,
-                "updated_at": _simdi(),
-            })
-
             # Yeni satır — OncekiSatirID ile zincir
             yeni = {
                 "SatirID":      _yeni_id(),
@@ -418,7 +415,22 @@ def satir_degistir(self, eski_satir_id: str,
                 "created_at":   _simdi(),
                 "created_by":   olusturan_id,
             }
-            self._r.get("NB_PlanSatir").insert(yeni)
+
+            def _yaz():
+                # Eski satırı iptal et, yeni satırı ekle — tek transaction
+                with self._r.db.transaction():
+                    self._r.get("NB_PlanSatir").update(eski_satir_id, {
+                        "Durum":      "degistirildi",
+                        "Notlar":     neden,
+                        "updated_at": _simdi(),
+                    })
+                    self._r.get("NB_PlanSatir").insert(yeni)
+
+            def _indekse_isle(ix: PlanKisitIndeksi) -> None:
+                ix.satir_cikar(eski_satir_id)
+                ix.satir_ekle(yeni)
+
+            satir_yazimi(self._r, _yaz, _indekse_isle)
             logger.info(f"Nöbet değişimi: {eski_satir_id} → {yeni['SatirID']}")
             return SonucYonetici.tamam(
                 "Nöbet değişimi yapıldı", veri=yeni)
@@ -450,28 +462,34 @@ def onayla(self, birim_id: str, yil: int, ay: int,
 
             plan_id = plan["PlanID"]
 
-            # İptal satırları fiziksel sil
-            tum_satirlar = self._r.get("NB_PlanSatir").get_all() or []
-            silinen = 0
-            for s in tum_satirlar:
-                if (str(s.get("PlanID","")) == plan_id
-                        and str(s.get("Durum","")) == "iptal"):
+            # İptal satırların silinmesi, durum ve personel ay özeti tek
+            # transaction'da: özet yazılamazsa plan onaylanmış görünmez
+            ozet = NbOzetService(self._r)
+            with self._r.db.transaction():
+                iptal_idler = (self._r.get("NB_PlanSatir").query()
+                               .where(PlanID=str(plan_id), Durum="iptal")
+                               .column("SatirID"))
+                silinen = 0
+                for satir_id in iptal_idler:
                     try:
-                        self._r.get("NB_PlanSatir").delete(s["SatirID"])
+                        self._r.get("NB_PlanSatir").delete(satir_id)
                         silinen += 1
                     except Exception:
                         pass
+
+                self._r.get("NB_Plan").update(plan_id, {
+                    "Durum":       "onaylandi",
+                    "OnaylayanID": onaylayan_id,
+                    "OnayTarihi":  _simdi(),
+                    "updated_at":  _simdi(),
+                })
+
+                # Profil paneli / raporlar buradan okur
+                ozet.gerekirse_doldur()
+                ozet.plan_ozeti_yaz(plan_id)
             if silinen:
                 logger.info(f"Onay öncesi {silinen} iptal satır silindi: {plan_id}")
 
-            # Planı onayla
-            self._r.get("NB_Plan").update(plan_id, {
-                "Durum":       "onaylandi",
-                "OnaylayanID": onaylayan_id,
-                "OnayTarihi":  _simdi(),
-                "updated_at":  _simdi(),
-            })
-
             # Aktif satır sayısı
             satirlar = self.get_satirlar(plan_id)
             adet = len(satirlar.veri or [])
@@ -513,11 +531,13 @@ def onay_geri_al(self, birim_id: str, yil: int,
             else:
                 yeni_not = mevcut_not
 
-            self._r.get("NB_Plan").update(plan["PlanID"], {
-                "Durum":      "taslak",
-                "Notlar":     yeni_not,
-                "updated_at": _simdi(),
-            })
+            with self._r.db.transaction():
+                self._r.get("NB_Plan").update(plan["PlanID"], {
+                    "Durum":      "taslak",
+                    "Notlar":     yeni_not,
+                    "updated_at": _simdi(),
+                })
+                NbOzetService(self._r).plan_durumu_yaz(plan["PlanID"], "taslak")
 
             satirlar = self.get_satirlar(plan["PlanID"])
             adet = len(satirlar.veri or [])
@@ -535,6 +555,56 @@ def onay_geri_al(self, birim_id: str, yil: int,
     #  Kısıt Kontrolü
     # ──────────────────────────────────────────────────────────
 
+    def _plan_indeksi(self, plan: dict,
+                      tarih: str) -> Optional[PlanKisitIndeksi]:
+        """Planın kısıt indeksi; tarih plan ayında değilse None (sorgu yolu)."""
+        try:
+            if (date.fromisoformat(tarih).replace(day=1)
+                    != date(int(plan["Yil"]), int(plan["Ay"]), 1)):
+                return None
+            birim_id = str(plan.get("BirimID", ""))
+            return plan_indeksi_al(
+                self._r, plan["PlanID"],
+                lambda: PlanKisitIndeksi.kur(
+                    self._r, plan,
+                    self._gunluk_slot_kapasitesi(birim_id),
+                    self._max_gunluk_dakika(birim_id)))
+        except Exception as e:
+            logger.warning(f"Plan kısıt indeksi kullanılamadı: {e}")
+            return None
+
+    def _satir_on_kontrol(self, plan: dict, personel_id: str,
+                          vardiya_id: str, tarih: str,
+                          nobet_turu: str, kisit_atla: bool) -> Optional[str]:
+        """
+        Slot kapasitesi (normal nöbet), aynı gün aynı personel ve
+        kisit_atla değilse izin / üst üste kontrolü. Sorun yoksa None.
+        """
+        normal  = nobet_turu != "fazla_mesai"
+        indeks  = self._plan_indeksi(plan, tarih)
+        plan_id = str(plan["PlanID"])
+
+        if indeks is None:
+            if normal:
+                kapasite = self._gunluk_slot_kapasitesi(str(plan.get("BirimID", "")))
+                if kapasite > 0:
+                    adet = self._gunluk_aktif_normal_satir_sayisi(plan_id, tarih)
+                    if adet >= kapasite:
+                        return (f"{tarih} için günlük slot kapasitesi dolu "
+                                f"({adet}/{kapasite}).")
+            mesaj = self._ayni_gun_ayni_personel(
+                plan_id, personel_id, tarih, vardiya_id,
+                str(plan.get("BirimID", "")))
+            if mesaj or kisit_atla:
+                return mesaj
+            return self._kisit_kontrol(personel_id, tarih, vardiya_id, nobet_turu)
+
+        mesaj = (indeks.kapasite_kontrol(tarih) if normal else None) \
+            or indeks.ayni_gun_kontrol(personel_id, tarih, vardiya_id)
+        if mesaj or kisit_atla or not normal:
+            return mesaj
+        return indeks.kisit_kontrol(personel_id, tarih)
+
     def _kisit_kontrol(self, personel_id: str, tarih: str,
                        vardiya_id: str,
                        nobet_turu: str = "normal") -> Optional[str]:
@@ -551,10 +621,11 @@ def _kisit_kontrol(self, personel_id: str, tarih: str,
             return f"Geçersiz tarih: {tarih}"
 
         # 1. İzin/rapor kontrolü
-        izin_rows = self._r.get("Izin_Giris").get_all() or []
+        izin_rows = (self._r.get("Izin_Giris").query()
+                     .where(Personelid=str(personel_id))
+                     .overlaps("BaslamaTarihi", "BitisTarihi", tarih, tarih)
+                     .all())
         for izin in izin_rows:
-            if str(izin.get("Personelid", "")) != str(personel_id):
-                continue
             if str(izin.get("Durum", "")).lower() in ("iptal", "reddedildi"):
                 continue
             try:
@@ -570,11 +641,10 @@ def _kisit_kontrol(self, personel_id: str, tarih: str,
 
         # 2. Üst üste nöbet kontrolü
         dun = (tarih_obj - timedelta(days=1)).isoformat()
-        ps_rows = self._r.get("NB_PlanSatir").get_all() or []
-        if any(str(r.get("PersonelID", "")) == str(personel_id)
-               and str(r.get("NobetTarihi", "")) == dun
-               and r.get("Durum") == "aktif"
-               for r in ps_rows):
+        if (self._r.get("NB_PlanSatir").query()
+                .where(PersonelID=str(personel_id), NobetTarihi=dun,
+                       Durum="aktif")
+                .exists()):
             return f"{personel_id} dün de nöbet tuttu (üst üste yasak)"
 
         return None
@@ -582,24 +652,23 @@ def _kisit_kontrol(self, personel_id: str, tarih: str,
     def _gunluk_slot_kapasitesi(self, birim_id: str) -> int:
         """Birim için günlük normal nöbet kapasitesini döner."""
         try:
-            ayar_rows = self._r.get("NB_BirimAyar").get_all() or []
-            ayar = next(
-                (r for r in ayar_rows if str(r.get("BirimID", "")) == str(birim_id)),
-                None,
-            )
+            ayar = (self._r.get("NB_BirimAyar").query()
+                    .where(BirimID=str(birim_id)).first())
             slot_sayisi = int((ayar or {}).get("GunlukSlotSayisi", 4) or 4)
         except Exception:
             slot_sayisi = 4
 
         try:
-            grup_rows = self._r.get("NB_VardiyaGrubu").get_all() or []
+            grup_rows = (self._r.get("NB_VardiyaGrubu")
+                         .query("GrupID", "Aktif")
+                         .where(BirimID=str(birim_id)).all())
             aktif_grup_idleri = {
                 str(r.get("GrupID", ""))
                 for r in grup_rows
-                if str(r.get("BirimID", "")) == str(birim_id)
-                and int(r.get("Aktif", 1))
+                if int(r.get("Aktif", 1))
             }
-            v_rows = self._r.get("NB_Vardiya").get_all() or []
+            v_rows = (self._r.get("NB_Vardiya").query()
+                      .where(GrupID=list(aktif_grup_idleri)).all())
             aktif_ana_vardiya_sayisi = sum(
                 1
                 for v in v_rows
@@ -614,18 +683,20 @@ def _gunluk_slot_kapasitesi(self, birim_id: str) -> int:
             return 0
         return slot_sayisi * aktif_ana_vardiya_sayisi
 
+    def _max_gunluk_dakika(self, birim_id: str) -> int:
+        """Birimin MaxGunlukSureDakika ayarı (yoksa 720)."""
+        ayar = (self._r.get("NB_BirimAyar").query()
+                .where(BirimID=str(birim_id)).first())
+        return int((ayar or {}).get("MaxGunlukSureDakika", 720) or 720)
+
     def _gunluk_aktif_normal_satir_sayisi(self, plan_id: str, tarih: str) -> int:
         """Belirli gün için aktif ve normal nöbet satırlarını sayar."""
         try:
-            rows = self._r.get("NB_PlanSatir").get_all() or []
-            return sum(
-                1
-                for r in rows
-                if str(r.get("PlanID", "")) == str(plan_id)
-                and str(r.get("NobetTarihi", "")) == str(tarih)
-                and str(r.get("Durum", "")) == "aktif"
-                and str(r.get("NobetTuru", "normal")) != "fazla_mesai"
-            )
+            return (self._r.get("NB_PlanSatir").query()
+                    .where(PlanID=str(plan_id), NobetTarihi=str(tarih),
+                           Durum="aktif")
+                    .where_not(NobetTuru="fazla_mesai")
+                    .count())
         except Exception:
             return 0
 
@@ -638,23 +709,14 @@ def _ayni_gun_ayni_personel(self, plan_id: str, personel_id: str, tarih: str,
           - < 1440 dk (12h): sadece 1 vardiya/gün
         """
         try:
-            # Birim ayarlarından MaxGunlukSureDakika oku
-            ayar_rows = self._r.get("NB_BirimAyar").get_all() or []
-            ayar = next(
-                (r for r in ayar_rows if str(r.get("BirimID", "")) == str(birim_id)),
-                None,
-            )
-            max_gun_dk = int((ayar or {}).get("MaxGunlukSureDakika", 720) or 720)
+            max_gun_dk = self._max_gunluk_dakika(birim_id)
             
             # O gün aynı personelle varolan aktif nöbetleri getir
-            ps_rows = self._r.get("NB_PlanSatir").get_all() or []
-            ayni_gun_satir = [
-                r for r in ps_rows
-                if str(r.get("PlanID", "")) == str(plan_id)
-                and str(r.get("PersonelID", "")) == str(personel_id)
-                and str(r.get("NobetTarihi", "")) == str(tarih)
-                and str(r.get("Durum", "")) == "aktif"
-            ]
+            ayni_gun_satir = (self._r.get("NB_PlanSatir").query()
+                              .where(PlanID=str(plan_id),
+                                     PersonelID=str(personel_id),
+                                     NobetTarihi=str(tarih), Durum="aktif")
+                              .all())
             
             if not ayni_gun_satir:
                 return None  # İlk vardiya, denetim geçer
@@ -668,7 +730,9 @@ def _ayni_gun_ayni_personel(self, plan_id: str, personel_id: str, tarih: str,
             
             # MaxGunlukSureDakika >= 1440 (24 saat): 2. vardiyayı kontrol et
             # Çakışan vardiya grubunda yoksa izin ver, varsa kontrol süresi
-            v_rows = self._r.get("NB_Vardiya").get_all() or []
+            v_ids = [str(r.get("VardiyaID", "")) for r in ayni_gun_satir]
+            v_rows = (self._r.get("NB_Vardiya").query()
+                      .where(VardiyaID=v_ids + [str(yeni_vardiya_id)]).all())
             v_map = {str(v["VardiyaID"]): v for v in v_rows}
             
             yeni_v = v_map.get(str(yeni_vardiya_id), {})
@@ -697,7 +761,10 @@ def _izin_map_getir(self, yil: int, ay: int) -> dict[str, set[str]]:
                   if ay < 12 else date(yil, 12, 31))
         izin_map: dict[str, set[str]] = {}
         try:
-            for izin in (self._r.get("Izin_Giris").get_all() or []):
+            izin_rows = (self._r.get("Izin_Giris").query()
+                         .overlaps("BaslamaTarihi", "BitisTarihi", ay_bas, ay_bit)
+                         .all())
+            for izin in izin_rows:
                 pid = str(izin.get("Personelid", ""))
                 if str(izin.get("Durum", "")).lower() in (
                         "iptal", "reddedildi"):
@@ -720,9 +787,10 @@ def _izin_map_getir(self, yil: int, ay: int) -> dict[str, set[str]]:
     def _dini_bayram_set_getir(self, yil: int, ay: int) -> set[str]:
         """O aya ait dini bayram tarihlerini döner."""
         try:
-            rows   = self._r.get("Tatiller").get_all() or []
             ay_bas = f"{yil:04d}-{ay:02d}-01"
             ay_bit = f"{yil:04d}-{ay:02d}-31"
+            rows   = (self._r.get("Tatiller").query()
+                      .between("Tarih", ay_bas, ay_bit).all())
             return {
                 str(r.get("Tarih", ""))
                 for r in rows
@@ -0,0 +1,386 @@
+# -*- coding: utf-8 -*-
+"""
+nb_planlama_baglami.py — Nöbet planlaması için tek seferlik veri görüntüsü
+
+NbAlgoritma bir plan üretirken ihtiyaç duyduğu tüm salt okunur veriyi
+burada bir kez okur; atama döngüsü ve dengeleme adımları veritabanına
+dönmeden bu nesneyi kullanır.
+
+Toplanan veriler (her biri tek sorgu):
+  - Birim ayarı (slot, çalışma politikaları, günlük max süre, FM max saat,
+    plan motoru)
+  - Vardiya grupları + ana vardiyalar, vardiya_meta
+  - Tatiller (resmi / dini / hedef hesabı için birleşik küme)
+  - Personel listesi, FM gönüllüleri, hedef tipleri (NB_PersonelTercih)
+  - Onaylı izinler → kişi başına gün bit kümesi (bit g-1 = ayın g. günü)
+  - Önceki ay devir bakiyeleri (NB_MesaiHesap.DevireGidenDakika)
+
+Hedef hesabı (Excel NETWORKDAYS mantığı) bit işlemleriyle yapılır:
+  izin_is = popcount(izin_bitleri & is_gunu_maskesi)
+"""
+from __future__ import annotations
+
+from calendar import monthrange
+from dataclasses import dataclass, field
+from datetime import date
+
+from core.hata_yonetici import logger
+from core.is_takvimi import listeden_takvim
+from database.repository_registry import RepositoryRegistry
+
+
+# ──────────────────────────────────────────────────────────────
+#  Sabitler
+# ──────────────────────────────────────────────────────────────
+
+ONAY_DURUMLAR    = {"Onaylandı", "onaylandi", "onaylı", "approved"}
+GUNLUK_DK        = 420   # 7 saat × 60 dk
+VARSAYILAN_SLOT  = 4
+VARSAYILAN_COZUCU_SN = 10
+PLAN_MOTORLARI   = ("acgozlu", "cozucu")   # NB_BirimAyar.PlanMotoru
+HAFTASONU        = {5, 6}   # Cumartesi, Pazar
+
+# Hedef tipi → günlük çalışma saati
+# Emzirme: günde 1.5 saat erken çıkış → 7 - 1.5 = 5.5s
+# Sendika: günde 0.8 saat erken çıkış → 7 - 0.8 = 6.2s
+GUNLUK_SAAT = {
+    "normal":    7.0,
+    "emzirme":   5.5,
+    "sendika":   6.2,
+    "sua":       0.0,   # Şua izninde nöbet tutulmaz
+    "rapor":     7.0,   # Raporlu = normal hedef ama izin günleri düşülür
+    "yillik":    7.0,
+    "idari":     7.0,
+}
+
+
+def _bool_ayar(deger, varsayilan: int = 1) -> bool:
+    if deger is None:
+        return bool(varsayilan)
+    if isinstance(deger, bool):
+        return deger
+    if isinstance(deger, (int, float)):
+        return int(deger) != 0
+    return str(deger).strip().lower() in ("1", "true", "evet", "yes")
+
+
+class PlanlamaHatasi(ValueError):
+    """Plan üretimine başlanamayacak veri eksikliği (mesaj kullanıcıya gösterilir)."""
+
+
+# ──────────────────────────────────────────────────────────────
+#  Bağlam
+# ──────────────────────────────────────────────────────────────
+
+@dataclass
+class PlanlamaBaglami:
+    birim_id: str
+    yil: int
+    ay: int
+    gunler: list[date]
+
+    # ── Birim ayarı ──
+    ayar: dict
+    slot_sayisi: int
+    hafta_sonu_calisma: bool
+    resmi_tatil_calisma: bool
+    dini_bayram_calisma: bool
+    ardisik_gun_izinli: bool
+    birim_max_gun_dk: int
+    fm_max_dk: int
+    plan_motoru: str                              # acgozlu | cozucu
+    cozucu_sure_sn: int
+
+    # ── Vardiyalar ──
+    gruplar: list[dict]
+    vardiya_meta: dict[str, tuple[int, str]]      # VardiyaID → (SureDakika, GrupID)
+
+    # ── Takvim ──
+    tatil_set: set[str]                           # Resmi + DiniBayram (hedef hesabı)
+    resmi_set: set[str]                           # Resmi + Idari
+    dini_set: set[str]                            # DiniBayram
+    is_gunu_maskesi: int                          # hafta içi ve tatil olmayan günler
+
+    # ── Personel ──
+    personeller: list[str]
+    gonulluler: list[str]
+    izin_bitleri: dict[str, int]                  # pid → onaylı izin günleri
+    izin_kayit_bitleri: dict[str, list[int]]      # pid → izin kaydı başına gün bitleri
+    hedef_tipi_map: dict[str, str]
+    devir_map: dict[str, int]
+    hedef_map: dict[str, int] = field(default_factory=dict)
+
+    # ══════════════════════════════════════════════════════════
+    #  Sorgular (atama döngüsünde kullanılır)
+    # ══════════════════════════════════════════════════════════
+
+    @staticmethod
+    def gun_biti(gun: date) -> int:
+        return 1 << (gun.day - 1)
+
+    def izinli_mi(self, pid: str, gun: date) -> bool:
+        return bool(self.izin_bitleri.get(pid, 0) & (1 << (gun.day - 1)))
+
+    @property
+    def ay_is_gunu(self) -> int:
+        return self.is_gunu_maskesi.bit_count()
+
+    def hedef_hesapla(self, pid: str) -> int:
+        """
+        Excel formülü:
+          1. ay_is   = NETWORKDAYS(ay_bas, ay_bit, tatiller)
+          2. izin_is = NETWORKDAYS(max(izin_bas,ay_bas), min(izin_bit,ay_bit), tatiller)
+          3. hedef   = (ay_is - izin_is) × günlük_dk
+
+        Günlük dakika HedefTipi'ne göre değişir (bkz. GUNLUK_SAAT).
+        İzin kayıtları ayrı ayrı sayılır (çakışan kayıtlar iki kez düşülür).
+        """
+        hedef_tipi = self.hedef_tipi_map.get(pid, "normal")
+        if hedef_tipi == "sua":
+            return 0
+        gunluk_dk = round(GUNLUK_SAAT.get(hedef_tipi, 7.0) * 60)
+        ay_is = self.ay_is_gunu
+        izin_is = sum(
+            (bitler & self.is_gunu_maskesi).bit_count()
+            for bitler in self.izin_kayit_bitleri.get(pid, ())
+        )
+        hedef = max(0, ay_is - izin_is) * gunluk_dk
+        logger.debug(
+            f"[Hedef] {pid} ({hedef_tipi}): ay_is={ay_is} izin_is={izin_is} "
+            f"net={ay_is - izin_is} → {hedef // 60}s")
+        return hedef
+
+    # ══════════════════════════════════════════════════════════
+    #  Kurulum
+    # ══════════════════════════════════════════════════════════
+
+    @classmethod
+    def olustur(cls, registry: RepositoryRegistry, birim_id: str,
+                yil: int, ay: int) -> "PlanlamaBaglami":
+        """
+        Tüm planlama verisini okur. Planlama yapılamayacak durumlarda
+        (aktif grup / personel yok, okuma hatası) PlanlamaHatasi fırlatır.
+        """
+        r = registry
+        birim_id = str(birim_id)
+        ay_son = monthrange(yil, ay)[1]
+        ay_bas = date(yil, ay, 1)
+        ay_bit = date(yil, ay, ay_son)
+        gunler = [date(yil, ay, g) for g in range(1, ay_son + 1)]
+
+        # ── Birim ayarı ───────────────────────────────────────
+        try:
+            ayar = r.get("NB_BirimAyar").query().where(BirimID=birim_id).first()
+            if ayar is None:
+                ayar = {"GunlukSlotSayisi": VARSAYILAN_SLOT,
+                        "OtomatikBolunme": 1}
+        except Exception as e:
+            raise PlanlamaHatasi(f"Birim ayarı okunamadı: {e}") from e
+
+        try:
+            fm_max_dk = int(ayar.get("FmMaxSaat", 60)) * 60
+        except (TypeError, ValueError):
+            fm_max_dk = 3600  # 60 saat
+
+        plan_motoru = str(ayar.get("PlanMotoru") or "acgozlu").strip().lower()
+        if plan_motoru not in PLAN_MOTORLARI:
+            logger.warning(f"Bilinmeyen PlanMotoru '{plan_motoru}', açgözlü kullanılacak")
+            plan_motoru = "acgozlu"
+
+        # ── Vardiya grupları ──────────────────────────────────
+        try:
+            g_rows = r.get("NB_VardiyaGrubu").query().where(BirimID=birim_id).all()
+            v_rows = (r.get("NB_Vardiya").query()
+                      .where(GrupID=[g["GrupID"] for g in g_rows]).all())
+        except Exception as e:
+            raise PlanlamaHatasi(f"Vardiya grupları okunamadı: {e}") from e
+
+        aktif_gruplar = sorted(
+            [g for g in g_rows if int(g.get("Aktif", 1))],
+            key=lambda g: int(g.get("Sira", 1)))
+        if not aktif_gruplar:
+            raise PlanlamaHatasi("Bu birime ait aktif vardiya grubu yok")
+
+        gruplar = []
+        vardiya_meta: dict[str, tuple[int, str]] = {}
+        for g in aktif_gruplar:
+            gid = g["GrupID"]
+            ana = sorted(
+                [v for v in v_rows
+                 if str(v.get("GrupID", "")) == gid
+                 and str(v.get("Rol", "ana")) == "ana"
+                 and int(v.get("Aktif", 1))],
+                key=lambda v: int(v.get("Sira", 1)))
+            if not ana:
+                continue
+            gruplar.append({
+                "GrupID":    gid,
+                "GrupAdi":   g.get("GrupAdi", ""),
+                "ana":       ana,
+                "toplam_dk": sum(int(v.get("SureDakika", 0)) for v in ana),
+            })
+            for v in ana:
+                v_id = str(v.get("VardiyaID", ""))
+                if v_id:
+                    vardiya_meta[v_id] = (int(v.get("SureDakika", 0)), str(gid))
+
+        if not gruplar:
+            raise PlanlamaHatasi("Hiçbir grupta ana rolünde aktif vardiya yok")
+
+        # ── Tatiller ──────────────────────────────────────────
+        tatil_set: set[str] = set()
+        resmi_set: set[str] = set()
+        dini_set: set[str] = set()
+        try:
+            bas_s, bit_s = ay_bas.isoformat(), f"{yil:04d}-{ay:02d}-31"
+            for t in r.get("Tatiller").query().between("Tarih", bas_s, bit_s).all():
+                tarih = str(t.get("Tarih", ""))
+                if not (bas_s <= tarih <= bit_s):
+                    continue
+                turu = str(t.get("TatilTuru", "Resmi"))
+                if turu in ("Resmi", "DiniBayram"):
+                    tatil_set.add(tarih)
+                if turu in ("Resmi", "Idari"):
+                    resmi_set.add(tarih)
+                if turu == "DiniBayram":
+                    dini_set.add(tarih)
+        except Exception as e:
+            logger.warning(f"PlanlamaBaglami tatiller: {e}")
+
+        is_gunu_maskesi = listeden_takvim(sorted(tatil_set)).ay_maskesi(yil, ay)
+
+        # ── Personel listesi (NB_BirimPersonel → GorevYeri fallback) ──
+        try:
+            pid_listesi = []
+            try:
+                bp_rows = (r.get("NB_BirimPersonel")
+                           .query("PersonelID", "Aktif")
+                           .where(BirimID=birim_id).all())
+                pid_listesi = [
+                    str(p.get("PersonelID", ""))
+                    for p in bp_rows
+                    if int(p.get("Aktif", 1)) and str(p.get("PersonelID", ""))
+                ]
+            except Exception:
+                pass
+
+            if not pid_listesi:
+                p_rows = r.get("Personel").query("KimlikNo", "GorevYeri").all()
+                birim_row = (r.get("NB_Birim").query("BirimAdi")
+                             .where(BirimID=birim_id).first())
+                birim_adi = (birim_row or {}).get("BirimAdi", "")
+                pid_listesi = [
+                    str(p["KimlikNo"]) for p in p_rows
+                    if str(p.get("GorevYeri", "")).strip() == birim_adi
+                ]
+
+            if not pid_listesi:
+                raise PlanlamaHatasi("Bu birime atanmış personel bulunamadı")
+
+            # Herkes nöbet tutar; FM Gönüllü manuel ekleme için işaretlenir
+            fm_gonullu_set = {
+                str(pid) for pid in (
+                    r.get("NB_PersonelTercih").query()
+                    .where(BirimID=birim_id, Yil=yil, Ay=ay,
+                           NobetTercihi="fazla_mesai_gonullu")
+                    .column("PersonelID"))
+            }
+            personeller = [pid for pid in pid_listesi if pid]
+            gonulluler = [pid for pid in pid_listesi if pid in fm_gonullu_set]
+            if not personeller:
+                raise PlanlamaHatasi("Birime atanmış aktif personel yok")
+        except PlanlamaHatasi:
+            raise
+        except Exception as e:
+            raise PlanlamaHatasi(f"Personel listesi okunamadı: {e}") from e
+
+        # ── Hedef tipleri (kişi başına ilk tercih kaydı) ─────
+        hedef_tipi_map: dict[str, str] = {}
+        try:
+            for t in (r.get("NB_PersonelTercih").query("PersonelID", "HedefTipi")
+                      .where(PersonelID=personeller, Yil=yil, Ay=ay).all()):
+                hedef_tipi_map.setdefault(
+                    str(t.get("PersonelID", "")),
+                    str(t.get("HedefTipi", "normal") or "normal").lower())
+        except Exception as e:
+            logger.warning(f"PlanlamaBaglami hedef tipleri: {e}")
+
+        # ── Onaylı izinler → gün bitleri ──────────────────────
+        izin_bitleri: dict[str, int] = {}
+        izin_kayit_bitleri: dict[str, list[int]] = {}
+        try:
+            rows = (r.get("Izin_Giris")
+                    .query("Personelid", "Durum", "BaslamaTarihi", "BitisTarihi")
+                    .where_trimmed(Durum=list(ONAY_DURUMLAR))
+                    .overlaps("BaslamaTarihi", "BitisTarihi", ay_bas, ay_bit)
+                    .all())
+            for i in rows:
+                pid = str(i.get("Personelid", "")).strip()
+                if not pid or str(i.get("Durum", "")).strip() not in ONAY_DURUMLAR:
+                    continue
+                try:
+                    bas = max(date.fromisoformat(str(i.get("BaslamaTarihi", ""))), ay_bas)
+                    bit = min(date.fromisoformat(str(i.get("BitisTarihi", ""))), ay_bit)
+                except ValueError:
+                    continue
+                if bas > bit:
+                    continue
+                # bas..bit günlerinin bitleri
+                bitler = ((1 << (bit.day - bas.day + 1)) - 1) << (bas.day - 1)
+                izin_bitleri[pid] = izin_bitleri.get(pid, 0) | bitler
+                izin_kayit_bitleri.setdefault(pid, []).append(bitler)
+        except Exception as e:
+            logger.warning(f"PlanlamaBaglami izinler: {e}")
+
+        # ── Önceki ay devir bakiyesi ──────────────────────────
+        prev_yil = yil - 1 if ay == 1 else yil
+        prev_ay = 12 if ay == 1 else ay - 1
+        try:
+            devir_map = {
+                str(m.get("PersonelID", "")): int(m.get("DevireGidenDakika", 0))
+                for m in (r.get("NB_MesaiHesap")
+                          .query("PersonelID", "DevireGidenDakika")
+                          .where(BirimID=birim_id, Yil=prev_yil, Ay=prev_ay)
+                          .all())
+            }
+        except Exception:
+            devir_map = {}
+
+        baglam = cls(
+            birim_id=birim_id,
+            yil=yil,
+            ay=ay,
+            gunler=gunler,
+            ayar=ayar,
+            slot_sayisi=int(ayar.get("GunlukSlotSayisi", VARSAYILAN_SLOT)),
+            hafta_sonu_calisma=_bool_ayar(ayar.get("HaftasonuCalismaVar"), 1),
+            resmi_tatil_calisma=_bool_ayar(ayar.get("ResmiTatilCalismaVar"), 1),
+            dini_bayram_calisma=_bool_ayar(
+                ayar.get("DiniBayramCalismaVar", ayar.get("DiniBayramAtama", 0)), 0),
+            ardisik_gun_izinli=_bool_ayar(ayar.get("ArdisikGunIzinli"), 0),
+            birim_max_gun_dk=int(ayar.get("MaxGunlukSureDakika", 720)),
+            fm_max_dk=fm_max_dk,
+            plan_motoru=plan_motoru,
+            cozucu_sure_sn=int(ayar.get("CozucuSureSn") or VARSAYILAN_COZUCU_SN),
+            gruplar=gruplar,
+            vardiya_meta=vardiya_meta,
+            tatil_set=tatil_set,
+            resmi_set=resmi_set,
+            dini_set=dini_set,
+            is_gunu_maskesi=is_gunu_maskesi,
+            personeller=personeller,
+            gonulluler=gonulluler,
+            izin_bitleri=izin_bitleri,
+            izin_kayit_bitleri=izin_kayit_bitleri,
+            hedef_tipi_map=hedef_tipi_map,
+            devir_map=devir_map,
+        )
+
+        # ── Hedef haritası (izin düşülmüş, kişiye özel) ──────
+        for pid in personeller + gonulluler:
+            try:
+                baglam.hedef_map[pid] = baglam.hedef_hesapla(pid)
+            except Exception as e:
+                logger.warning(f"hedef_hesapla({pid}): {e}")
+                baglam.hedef_map[pid] = 20 * GUNLUK_DK
+        return baglam
@@ -16,7 +16,7 @@
 import json
 import uuid
 from calendar import monthrange
-from datetime import date, timedelta
+from datetime import date
 from typing import Optional
 
 from core.hata_yonetici import SonucYonetici, logger
@@ -331,11 +331,11 @@ def _hesapla_hedef_dakika(self, personel_id: str,
         Emzirme izninde günlük 90 dakika düşülür.
         """
         try:
-            from core.hesaplamalar import ay_is_gunu
+            from core.is_takvimi import is_takvimi_al
 
-            tatiller = self._tatil_listesi_getir(yil, ay)
-            is_gunu  = ay_is_gunu(yil, ay, tatil_listesi=tatiller)
-            izin_gun = self._izin_is_gunu(personel_id, yil, ay, tatiller)
+            takvim   = is_takvimi_al(self._r)
+            is_gunu  = takvim.ay_is_gunu(yil, ay)
+            izin_gun = self._izin_is_gunu(personel_id, yil, ay, takvim)
             net_gun  = max(0, is_gunu - izin_gun)
 
             hedef = net_gun * GUNLUK_HEDEF_DAKIKA
@@ -353,13 +353,17 @@ def _hesapla_hedef_dakika(self, personel_id: str,
             return GUNLUK_HEDEF_DAKIKA * 20  # Varsayılan: 20 iş günü
 
     def _izin_is_gunu(self, personel_id: str, yil: int,
-                      ay: int, tatiller: list[str]) -> int:
-        """Personelin o aydaki izin iş günü sayısı."""
+                      ay: int, tatiller) -> int:
+        """
+        Personelin o aydaki izin iş günü sayısı.
+        tatiller: tarih listesi veya IsTakvimi.
+        """
+        from core.is_takvimi import IsTakvimi, listeden_takvim
         try:
             rows    = self._r.get("Izin_Giris").get_all() or []
             ay_bas  = f"{yil:04d}-{ay:02d}-01"
             ay_bit  = f"{yil:04d}-{ay:02d}-{monthrange(yil, ay)[1]:02d}"
-            sayi    = 0
+            baslar, bitler = [], []
             for r in rows:
                 if (str(r.get("Personelid", "")) != str(personel_id)
                         or str(r.get("Durum", "")).lower() not in
@@ -369,36 +373,14 @@ def _izin_is_gunu(self, personel_id: str, yil: int,
                 bit = str(r.get("BitisTarihi",   "") or "")
                 if not bas or not bit:
                     continue
-                bas = max(bas, ay_bas)
-                bit = min(bit, ay_bit)
-                if bas > bit:
-                    continue
-                # İzin aralığındaki iş günlerini say
-                cur = date.fromisoformat(bas)
-                son = date.fromisoformat(bit)
-                while cur <= son:
-                    if cur.weekday() < 5 and cur.isoformat() not in tatiller:
-                        sayi += 1
-                    cur += timedelta(days=1)
-            return sayi
+                baslar.append(bas)
+                bitler.append(bit)
+            # İzin aralıklarının ay içindeki iş günleri (vektörel)
+            takvim = tatiller if isinstance(tatiller, IsTakvimi) else listeden_takvim(tatiller)
+            return takvim.kesisim_is_gunu(baslar, bitler, ay_bas, ay_bit)
         except Exception:
             return 0
 
-    def _tatil_listesi_getir(self, yil: int, ay: int) -> list[str]:
-        """O aya ait tatil tarihlerini döner."""
-        try:
-            rows   = self._r.get("Tatiller").get_all() or []
-            ay_bas = f"{yil:04d}-{ay:02d}-01"
-            ay_bit = f"{yil:04d}-{ay:02d}-31"
-            return [
-                str(r.get("Tarih", ""))
-                for r in rows
-                if ay_bas <= str(r.get("Tarih", "")) <= ay_bit
-                and str(r.get("TatilTuru", "Resmi")) in ("Resmi", "DiniBayram")
-            ]
-        except Exception:
-            return []
-
     def _birim_adi_bul(self, birim_id: str) -> Optional[str]:
         """BirimID → BirimAdi dönüşümü."""
         try:
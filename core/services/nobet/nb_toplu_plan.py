@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+nb_toplu_plan.py — Birden çok birimin planını paralel üretme
+
+Ay başında her NB_Birim için plan birbirinden bağımsız hesaplanır.
+NbTopluPlan hesaplamayı ProcessPoolExecutor'a dağıtır, kaydı çağıran
+süreçte sırayla yapar:
+
+  İşçi süreç (birim başına)            Çağıran (QThread vb.)
+  ─────────────────────────            ─────────────────────
+  kendi SQLiteManager'ı                as_completed sırasıyla
+  okuma_anlik_goruntusu() içinde  ──▶  NbAlgoritma.plan_kaydet
+  plan_olustur(kaydet=False)           (tek yazıcı, birim başına
+                                        tek transaction) → ilerleme()
+
+İşçiler veritabanına yazmaz; böylece yazıcı kilidi için yarışmazlar ve
+bir birimin hatası diğerlerini etkilemez. Süreçler "spawn" ile açılır
+(fork edilen süreç üst sürecin SQLite bağlantılarını devralmasın).
+
+Kullanım:
+    sonuc = NbTopluPlan(registry).olustur(2026, 3, ilerleme=cb)
+    sonuc.veri → {birim_id: SonucYonetici, ...}
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Optional
+
+from core.hata_yonetici import SonucYonetici, logger
+from database.repository_registry import RepositoryRegistry
+
+# (birim_id, tamamlanan, toplam, birimin sonucu)
+IlerlemeCb = Callable[[str, int, int, SonucYonetici], None]
+
+
+def _birim_plani_hesapla(db_path: str, birim_id: str,
+                         yil: int, ay: int) -> SonucYonetici:
+    """İşçi süreç girişi: planı kendi bağlantısıyla hesaplar, yazmaz."""
+    from core.services.nobet.nb_algoritma import NbAlgoritma
+    from database.sqlite_manager import SQLiteManager
+
+    db = SQLiteManager(db_path=db_path)
+    try:
+        with db.okuma_anlik_goruntusu():
+            return NbAlgoritma(RepositoryRegistry(db)).plan_olustur(
+                birim_id, yil, ay, kaydet=False)
+    except Exception as e:
+        return SonucYonetici.hata(e, "NbTopluPlan._birim_plani_hesapla")
+    finally:
+        db.close()
+
+
+class NbTopluPlan:
+
+    def __init__(self, registry: RepositoryRegistry):
+        self._r = registry
+
+    def aktif_birimler(self) -> list[str]:
+        rows = self._r.get("NB_Birim").get_all() or []
+        return [str(r["BirimID"]) for r in rows
+                if int(r.get("Aktif", 1)) == 1
+                and not int(r.get("is_deleted", 0))]
+
+    def olustur(self, yil: int, ay: int,
+                birim_idler: Optional[list[str]] = None,
+                ilerleme: Optional[IlerlemeCb] = None,
+                max_isci: Optional[int] = None) -> SonucYonetici:
+        """
+        birim_idler None → tüm aktif birimler.
+        Bir birimin hatası diğerlerini durdurmaz; birim sonuçları
+        veri içinde döner. Mesaj: "x/y birim planlandı".
+        """
+        try:
+            from core.services.nobet.nb_algoritma import NbAlgoritma
+
+            bidler = list(dict.fromkeys(
+                birim_idler if birim_idler is not None else self.aktif_birimler()))
+            if not bidler:
+                return SonucYonetici.tamam("Planlanacak birim yok", veri={})
+
+            algoritma = NbAlgoritma(self._r)
+            sonuclar: dict[str, SonucYonetici] = {}
+
+            def _tamamla(bid: str, hesap: SonucYonetici) -> None:
+                if hesap.basarili:
+                    kayit = algoritma.plan_kaydet(hesap.veri.pop("kayit"))
+                    sonuc = hesap if kayit.basarili else kayit
+                else:
+                    sonuc = hesap
+                sonuclar[bid] = sonuc
+                if ilerleme:
+                    ilerleme(bid, len(sonuclar), len(bidler), sonuc)
+
+            db_path = self._r.db.db_path
+            isci = max(1, min(len(bidler), max_isci or os.cpu_count() or 1))
+            if isci == 1:
+                # Tek birimde süreç açma maliyetine gerek yok
+                for bid in bidler:
+                    _tamamla(bid, algoritma.plan_olustur(bid, yil, ay, kaydet=False))
+            else:
+                with ProcessPoolExecutor(
+                        max_workers=isci,
+                        mp_context=multiprocessing.get_context("spawn")) as havuz:
+                    isler = {
+                        havuz.submit(_birim_plani_hesapla, db_path, bid, yil, ay): bid
+                        for bid in bidler
+                    }
+                    for fut in as_completed(isler):
+                        bid = isler[fut]
+                        try:
+                            hesap = fut.result()
+                        except Exception as e:
+                            hesap = SonucYonetici.hata(e, "NbTopluPlan.olustur")
+                        _tamamla(bid, hesap)
+
+            basarili = sum(1 for s in sonuclar.values() if s.basarili)
+            ozet = f"{basarili}/{len(bidler)} birim planlandı"
+            logger.info(f"Toplu plan {yil}/{ay:02d}: {ozet} ({isci} işçi)")
+            return SonucYonetici.tamam(ozet, veri=sonuclar)
+        except Exception as e:
+            return SonucYonetici.hata(e, "NbTopluPlan.olustur")
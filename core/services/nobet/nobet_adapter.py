@@ -17,6 +17,7 @@
 from core.services.nobet.nb_vardiya_service import NbVardiyaService
 from core.services.nobet.nb_plan_service    import NbPlanService
 from core.services.nobet.nb_mesai_service   import NbMesaiService
+from core.services.nobet.nb_ozet_service    import NbOzetService, nobet_istatistikleri
 from database.repository_registry import RepositoryRegistry
 
 
@@ -36,6 +37,7 @@ def __init__(self, registry: RepositoryRegistry):
         self.vardiya  = NbVardiyaService(registry)
         self.plan     = NbPlanService(registry)
         self.mesai    = NbMesaiService(registry)
+        self.ozet     = NbOzetService(registry)
 
     # ──────────────────────────────────────────────────────────
     #  Birim
@@ -492,11 +494,11 @@ def _kisi_hedef_saat(self, personel_id: str, yil: int,
         if otomatik:
             # Tabloyu atla — her zaman güncel izin verisinden hesapla
             try:
-                from core.hesaplamalar import ay_is_gunu
-                tatiller = self.tercih._tatil_listesi_getir(yil, ay)
-                is_gunu  = ay_is_gunu(yil, ay, tatil_listesi=tatiller)
+                from core.is_takvimi import is_takvimi_al
+                takvim   = is_takvimi_al(self._r)
+                is_gunu  = takvim.ay_is_gunu(yil, ay)
                 izin_gun = self.tercih._izin_is_gunu(
-                    personel_id, yil, ay, tatiller)
+                    personel_id, yil, ay, takvim)
                 net_gun  = max(0, is_gunu - izin_gun)
                 return round(net_gun * 7.0, 2)
             except Exception:
@@ -531,6 +533,24 @@ def otomatik_plan_olustur(self, yil: int, ay: int,
         except Exception as e:
             return SonucYonetici.hata(e, "NobetAdapter.otomatik_plan_olustur")
 
+    def toplu_otomatik_plan_olustur(self, yil: int, ay: int,
+                                    birimler: Optional[list[str]] = None,
+                                    ilerleme=None) -> SonucYonetici:
+        """
+        Birden çok birimi paralel planlar (NbTopluPlan).
+        birimler None → tüm aktif birimler. ilerleme(birim_id, n, toplam, sonuc)
+        her birim kaydedildikçe çağrıldığı thread'de çağrılır.
+        """
+        try:
+            from core.services.nobet.nb_toplu_plan import NbTopluPlan
+            bidler = None
+            if birimler is not None:
+                bidler = [b for b in (self._birim_id_coz(x) for x in birimler) if b]
+            return NbTopluPlan(self._r).olustur(
+                yil, ay, birim_idler=bidler, ilerleme=ilerleme)
+        except Exception as e:
+            return SonucYonetici.hata(e, "NobetAdapter.toplu_otomatik_plan_olustur")
+
     # ──────────────────────────────────────────────────────────
     #  Fazla Mesai
     # ──────────────────────────────────────────────────────────
@@ -545,84 +565,41 @@ def personel_nobet_ozeti(self, yil: int, ay: int,
         try:
             bid = self._birim_id_coz(birim) if birim else ""
 
-            # Plan satırları
-            ps_rows = self._r.get("NB_PlanSatir").get_all() or []
-            # Onaylı planları bul (taslak satırlar özete girmez)
-            pl_rows = self._r.get("NB_Plan").get_all() or []
-            plan_ids = {
-                r["PlanID"] for r in pl_rows
-                if int(r.get("Yil", 0)) == yil
-                and int(r.get("Ay",  0)) == ay
-                and (not bid or str(r.get("BirimID","")) == bid)
-                and r.get("Durum") in ("onaylandi", "yururlukte", "taslak")
-            }
             # Taslak planlar dahil ama sadece aktif satırlar
-            ilgili = [
-                r for r in ps_rows
-                if r.get("PlanID") in plan_ids
-                and r.get("Durum") == "aktif"
-            ]
-
-            # Vardiya süre haritası
-            v_rows = self._r.get("NB_Vardiya").get_all() or []
-            v_sure = {
-                str(v["VardiyaID"]): int(v.get("SureDakika", 0))
-                for v in v_rows
-            }
-            v_bas = {
-                str(v["VardiyaID"]): str(v.get("BasSaat","08:00"))
-                for v in v_rows
+            q = (self._r.get("NB_Plan").query()
+                 .where(Yil=int(yil), Ay=int(ay),
+                        Durum=["onaylandi", "yururlukte", "taslak"]))
+            if bid:
+                q = q.where(BirimID=bid)
+            plan_ids = q.column("PlanID")
+            ilgili = (self._r.get("NB_PlanSatir")
+                      .query("PersonelID", "VardiyaID", "NobetTarihi")
+                      .where(PlanID=plan_ids, Durum="aktif")
+                      .all())
+
+            istat = nobet_istatistikleri(
+                ilgili, self._vardiya_map_getir(
+                    {str(r.get("VardiyaID", "")) for r in ilgili}))
+            p_ad = {
+                str(p["KimlikNo"]): p.get("AdSoyad", "")
+                for p in (self._r.get("Personel").query("KimlikNo", "AdSoyad")
+                          .where(KimlikNo=sorted(istat)).all())
+            } if istat else {}
+
+            ozet = {
+                pid: {
+                    "PersonelID":      pid,
+                    "AdSoyad":         p_ad.get(pid, ""),
+                    "NobetSayisi":     k["NobetSayisi"],
+                    "ToplamSaat":      round(k["NobetDakika"] / 60, 2),
+                    "ToplamDakika":    k["NobetDakika"],
+                    "HaftasonuSayisi": k["HaftasonuSayisi"],
+                    "GunduzSayisi":    k["GunduzSayisi"],
+                    "GeceSayisi":      k["GeceSayisi"],
+                }
+                for pid, k in istat.items()
             }
 
-            # Personel adları
-            p_rows = self._r.get("Personel").get_all() or []
-            p_ad   = {str(p["KimlikNo"]): p.get("AdSoyad","") for p in p_rows}
-
-            # Hafta sonu set
-            from datetime import date
-            HAFTASONU = {5, 6}
-
-            # Personel bazlı istatistik
-            ozet: dict[str, dict] = {}
-            for s in ilgili:
-                pid = str(s.get("PersonelID",""))
-                vid = str(s.get("VardiyaID",""))
-                tarih_str = str(s.get("NobetTarihi",""))
-                dk  = v_sure.get(vid, 0)
-                bas = v_bas.get(vid, "08:00")
-
-                if pid not in ozet:
-                    ozet[pid] = {
-                        "PersonelID":     pid,
-                        "AdSoyad":        p_ad.get(pid, ""),
-                        "NobetSayisi":    0,
-                        "ToplamSaat":     0.0,
-                        "ToplamDakika":   0,
-                        "HaftasonuSayisi":0,
-                        "GunduzSayisi":   0,
-                        "GeceSayisi":     0,
-                    }
-                try:
-                    gun = date.fromisoformat(tarih_str)
-                    if gun.weekday() in HAFTASONU:
-                        ozet[pid]["HaftasonuSayisi"] += 1
-                except Exception:
-                    pass
-
-                try:
-                    saat = int(bas.split(":")[0])
-                    if saat >= 20 or saat < 6:
-                        ozet[pid]["GeceSayisi"] += 1
-                    else:
-                        ozet[pid]["GunduzSayisi"] += 1
-                except Exception:
-                    pass
-
-                ozet[pid]["NobetSayisi"]  += 1
-                ozet[pid]["ToplamDakika"] += dk
-                ozet[pid]["ToplamSaat"]   = round(
-                    ozet[pid]["ToplamDakika"] / 60, 2)
-
             return SonucYonetici.tamam(
                 veri=sorted(ozet.values(),
                             key=lambda r: r.get("AdSoyad","")))
@@ -746,6 +723,11 @@ def _izin_map_getir(self, yil: int, ay: int) -> dict[str, set[str]]:
     def _dini_bayram_set_getir(self, yil: int, ay: int) -> set[str]:
         return self.plan._dini_bayram_set_getir(yil, ay)
 
+    def gunluk_slot_kapasitesi(self, birim: str) -> int:
+        """Birimin günlük beklenen nöbet sayısı (slot × aktif ana vardiya); 0 → tanımsız."""
+        bid = self._birim_id_coz(birim)
+        return self.plan._gunluk_slot_kapasitesi(bid) if bid else 0
+
     def personel_max_nobet_gunu(self, personel_id: str,
                                 yil: int, ay: int) -> SonucYonetici:
         """İş günü hesabı — UI özet sayfası için."""
@@ -799,6 +781,18 @@ def _birim_id_coz(self, birim: str) -> str:
             return ""
         return sonuc.veri or ""
 
+    def _birim_adi_haritasi(self) -> dict[str, str]:
+        return {str(r.get("BirimID","")): str(r.get("BirimAdi",""))
+                for r in (self._r.get("NB_Birim").get_all() or [])}
+
+    def _vardiya_map_getir(self, vardiya_idler: set[str]) -> dict[str, dict]:
+        """Yalnızca verilen vardiyalar: {VardiyaID: satır}."""
+        if not vardiya_idler:
+            return {}
+        return {str(v["VardiyaID"]): v
+                for v in (self._r.get("NB_Vardiya").query()
+                          .where(VardiyaID=sorted(vardiya_idler)).all())}
+
     def _birim_adi_bul(self, birim_id: str) -> str:
         try:
             rows = self._r.get("NB_Birim").get_all() or []
@@ -835,21 +829,24 @@ def get_personel_nobet_gecmisi(self, personel_id: str) -> SonucYonetici:
                        SureDakika, PlanDurum}]
         """
         try:
-            plan_rows    = self._r.get("NB_Plan").get_all() or []
-            satir_rows   = self._r.get("NB_PlanSatir").get_all() or []
-            vardiya_rows = self._r.get("NB_Vardiya").get_all() or []
-            birim_rows   = self._r.get("NB_Birim").get_all() or []
-
-            plan_map    = {str(r.get("PlanID","")): dict(r) for r in plan_rows}
-            vardiya_map = {str(r.get("VardiyaID","")): dict(r) for r in vardiya_rows}
-            birim_map   = {str(r.get("BirimID","")): str(r.get("BirimAdi","")) for r in birim_rows}
+            satir_rows = (self._r.get("NB_PlanSatir")
+                          .query("PlanID", "VardiyaID", "NobetTarihi")
+                          .where(PersonelID=str(personel_id), Durum="aktif")
+                          .order_by("NobetTarihi", desc=True)
+                          .limit(60)
+                          .all())
+            plan_idler = sorted({str(r.get("PlanID", "")) for r in satir_rows})
+            plan_map = {
+                str(r.get("PlanID", "")): r
+                for r in (self._r.get("NB_Plan").query("PlanID", "BirimID", "Durum")
+                          .where(PlanID=plan_idler).all())
+            } if plan_idler else {}
+            vardiya_map = self._vardiya_map_getir(
+                {str(r.get("VardiyaID", "")) for r in satir_rows})
+            birim_map = self._birim_adi_haritasi()
 
             sonuc = []
             for satir in satir_rows:
-                if str(satir.get("PersonelID","")) != str(personel_id):
-                    continue
-                if str(satir.get("Durum","aktif")) != "aktif":
-                    continue
                 plan    = plan_map.get(str(satir.get("PlanID","")), {})
                 vardiya = vardiya_map.get(str(satir.get("VardiyaID","")), {})
                 sure_dk = int(vardiya.get("SureDakika",0) or 0)
@@ -861,40 +858,28 @@ def get_personel_nobet_gecmisi(self, personel_id: str) -> SonucYonetici:
                     "SureDakika":  sure_dk,
                     "PlanDurum":   str(plan.get("Durum","taslak")).title(),
                 })
-            sonuc.sort(key=lambda r: str(r.get("NobetTarihi","")), reverse=True)
-            return SonucYonetici.tamam(veri=sonuc[:60])
+            return SonucYonetici.tamam(veri=sonuc)
         except Exception as e:
             return SonucYonetici.hata(e, "NobetAdapter.get_personel_nobet_gecmisi")
 
     def get_personel_mesai_ozeti(self, personel_id: str) -> SonucYonetici:
         """
         Bir personelin mesai hesap özetini döner (son 24 dönem).
+        NB_PersonelAyOzet'ten okunur (birim/ay başına en son hesap).
         Dönen liste: [{Donem, BirimAdi, CalisDakika, HedefDakika, FazlaDakika,
                        DevirDakika, ToplamFazlaDakika, OdenenDakika,
                        DevireGidenDakika, Yil, Ay}]
         """
         try:
-            mesai_rows = self._r.get("NB_MesaiHesap").get_all() or []
-            birim_rows = self._r.get("NB_Birim").get_all() or []
-            birim_map  = {str(r.get("BirimID","")): str(r.get("BirimAdi","")) for r in birim_rows}
-
-            ilgili = [
-                dict(r) for r in mesai_rows
-                if str(r.get("PersonelID","")) == str(personel_id)
-            ]
-            ilgili.sort(
-                key=lambda r: (
-                    int(r.get("Yil",0) or 0),
-                    int(r.get("Ay",0) or 0),
-                    str(r.get("updated_at","")),
-                    str(r.get("HesapID","")),
-                ),
-                reverse=True,
-            )
-            sonuc = []
-            for row in ilgili[:24]:
+            sonuc = self.ozet.personel_ozeti(personel_id, ay_sayisi=24,
+                                             sadece_mesai=True)
+            if not sonuc.basarili:
+                return sonuc
+            birim_map = self._birim_adi_haritasi()
+            rows = []
+            for row in sonuc.veri or []:
                 row["BirimAdi"] = birim_map.get(str(row.get("BirimID","")), "")
-                sonuc.append(row)
-            return SonucYonetici.tamam(veri=sonuc)
+                rows.append(row)
+            return SonucYonetici.tamam(veri=rows)
         except Exception as e:
             return SonucYonetici.hata(e, "NobetAdapter.get_personel_mesai_ozeti")
@@ -5,7 +5,7 @@
 - TC Kimlik No doğrulama (resmi T.C. algoritması)
 - Personel kaydı (INSERT/UPDATE/DELETE)
 """
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 from database.base_repository import BaseRepository
 
 from core.hata_yonetici import SonucYonetici, logger
@@ -188,6 +188,36 @@ def ekle(self, veri: Dict) -> SonucYonetici:
             return SonucYonetici.tamam(f"Personel {tc} eklendi")
         except Exception as e:
             return SonucYonetici.hata(e, "PersonelService.ekle")
+
+    def toplu_ekle(self, kayitlar: List[Dict]) -> SonucYonetici:
+        """
+        Çok sayıda personeli tek transaction'da ekler (Excel içe aktarma).
+        Geçersiz TC'li veya yazılamayan satır diğerlerini etkilemez.
+
+        Returns:
+            SonucYonetici — veri: {kayitlar indeksi: hata mesajı}
+            (yalnızca eklenemeyen satırlar)
+        """
+        try:
+            hatalar: Dict[int, str] = {}
+            yazilacak: List[int] = []
+            for i, veri in enumerate(kayitlar):
+                tc = str(veri.get("KimlikNo") or veri.get("TC") or "").strip()
+                if self._validate_tc(tc):
+                    yazilacak.append(i)
+                else:
+                    hatalar[i] = f"Geçersiz TC Kimlik No: {tc}"
+
+            repo_hatalari = self._r.get("Personel").insert_many_raporlu(
+                [kayitlar[i] for i in yazilacak]
+            )
+            for j, exc in repo_hatalari.items():
+                hatalar[yazilacak[j]] = str(exc)
+            return SonucYonetici.tamam(
+                f"{len(kayitlar) - len(hatalar)} personel eklendi", veri=hatalar
+            )
+        except Exception as e:
+            return SonucYonetici.hata(e, "PersonelService.toplu_ekle")
     
     def guncelle(self, tc: str, veri: Dict) -> SonucYonetici:
         """
@@ -75,6 +75,20 @@ def rke_ekle(self, veri: dict) -> SonucYonetici:
         except Exception as e:
             return SonucYonetici.hata(e, "RkeService.rke_ekle")
 
+    def toplu_rke_ekle(self, kayitlar: list[dict]) -> SonucYonetici:
+        """
+        Çok sayıda RKE ekipmanını tek transaction'da ekler (Excel içe aktarma).
+        veri: {kayitlar indeksi: hata mesajı} — yalnızca eklenemeyenler.
+        """
+        try:
+            hatalar = self._r.get("RKE_List").insert_many_raporlu(kayitlar)
+            return SonucYonetici.tamam(
+                f"{len(kayitlar) - len(hatalar)} RKE eklendi",
+                veri={i: str(exc) for i, exc in hatalar.items()},
+            )
+        except Exception as e:
+            return SonucYonetici.hata(e, "RkeService.toplu_rke_ekle")
+
     def rke_guncelle(self, ekipman_no: str, veri: dict) -> SonucYonetici:
         """RKE kaydını güncelle."""
         try:
@@ -131,6 +145,26 @@ def muayene_ekle(self, veri: dict) -> SonucYonetici:
         except Exception as e:
             return SonucYonetici.hata(e, "RkeService.muayene_ekle")
 
+    def toplu_muayene_ekle(self, kayitlar: list[dict]) -> SonucYonetici:
+        """
+        Çok sayıda muayene kaydını tek transaction'da ekler (Excel içe
+        aktarma); RKE_List, eklenen kayıtlar sırasıyla muayene_ekle'deki
+        gibi güncellenir.
+        veri: {kayitlar indeksi: hata mesajı} — yalnızca eklenemeyenler.
+        """
+        try:
+            with self._r.db.transaction():
+                hatalar = self._r.get("RKE_Muayene").insert_many_raporlu(kayitlar)
+                for i, veri in enumerate(kayitlar):
+                    if i not in hatalar:
+                        self._rke_listini_guncelle(veri)
+            return SonucYonetici.tamam(
+                f"{len(kayitlar) - len(hatalar)} muayene eklendi",
+                veri={i: str(exc) for i, exc in hatalar.items()},
+            )
+        except Exception as e:
+            return SonucYonetici.hata(e, "RkeService.toplu_muayene_ekle")
+
     def muayene_guncelle(self, kayit_no: str, veri: dict) -> SonucYonetici:
         """Muayene kaydını güncelle; RKE_List'i de güncelle."""
         try:
@@ -38,12 +38,10 @@ def get_saglik_kayitlari(self, personel_id: Optional[str] = None) -> SonucYoneti
             personel_id: Belirtilirse sadece o personelin kayıtları döner.
         """
         try:
-            tum = self._r.get("Personel_Saglik_Takip").get_all() or []
+            q = self._r.get("Personel_Saglik_Takip").query()
             if personel_id is not None:
-                tum = [
-                    r for r in tum
-                    if str(r.get("Personelid", "")).strip() == str(personel_id).strip()
-                ]
+                q.where(Personelid=str(personel_id).strip())
+            tum = q.all()
             return SonucYonetici.tamam(veri=tum)
         except Exception as e:
             return SonucYonetici.hata(e, "SaglikService.get_saglik_kayitlari")
@@ -141,14 +139,12 @@ def get_dokumanlar(self, personel_id: str, belge_turu: Optional[str] = None) ->
             belge_turu: Opsiyonel filtre ("RaporDosya" vb.)
         """
         try:
-            tum = self._r.get("Dokumanlar").get_all() or []
-            result = [
-                r for r in tum
-                if str(r.get("EntityId", "")).strip() == str(personel_id).strip()
-                   and str(r.get("EntityType", "")).strip() == "Personel_Saglik"
-            ]
+            q = (self._r.get("Dokumanlar").query()
+                 .where(EntityType="Personel_Saglik",
+                        EntityId=str(personel_id).strip()))
             if belge_turu:
-                result = [r for r in result if str(r.get("BelgeTuru", "")) == belge_turu]
+                q.where(BelgeTuru=belge_turu)
+            result = q.all()
             return SonucYonetici.tamam(veri=result)
         except Exception as e:
             return SonucYonetici.hata(e, f"SaglikService.get_dokumanlar({personel_id})")
@@ -229,11 +225,9 @@ def get_ekran_yukleme_verisi(self) -> SonucYonetici:
 
     def get_personel_saglik_kayitlari_detay(self, personel_id: str) -> SonucYonetici:
         try:
-            all_rows = self._r.get("Personel_Saglik_Takip").get_all() or []
-            records = [
-                r for r in all_rows
-                if str(r.get("Personelid", "")).strip() == str(personel_id).strip()
-            ]
+            records = (self._r.get("Personel_Saglik_Takip").query()
+                       .where(Personelid=str(personel_id).strip())
+                       .all())
             records.sort(key=lambda x: str(x.get("MuayeneTarihi", "")), reverse=True)
             docs = self._r.get("Dokumanlar").get_where({
                 "EntityType": "personel",
@@ -6,6 +6,7 @@
 from datetime import datetime
 
 from core.hata_yonetici import SonucYonetici, logger
+from database.table_cache import onbellek_al
 
 
 
@@ -14,6 +15,10 @@ class SettingsService:
     def __init__(self, db):
         self._db = db
 
+    def _onbellek_temizle(self, tablo: str) -> None:
+        """Ham SQL yazımından sonra cacheable tablonun önbelleğini boşaltır."""
+        onbellek_al(self._db).gecersiz_kil(tablo)
+
     # ══════════════════ SABİTLER ══════════════════
 
     def get_sabitler(self) -> SonucYonetici:
@@ -40,6 +45,7 @@ def add_sabit(self, kod: str, menu_eleman: str, aciklama: str) -> SonucYonetici:
                 "VALUES (?, ?, ?, ?, 'dirty', ?)",
                 (rowid, kod, menu_eleman, aciklama or "", datetime.now().isoformat())
             )
+            self._onbellek_temizle("Sabitler")
             logger.info(f"Sabit eklendi: {menu_eleman} ({kod})")
             return SonucYonetici.tamam(
                 f"Sabit başarıyla eklendi: {menu_eleman}",
@@ -76,6 +82,7 @@ def update_sabit(self, rowid: str, kod: str, menu_eleman: str, aciklama: str) ->
                 "sync_status='dirty', updated_at=? WHERE Rowid=?",
                 (kod, menu_eleman, aciklama or "", datetime.now().isoformat(), rowid)
             )
+            self._onbellek_temizle("Sabitler")
             logger.info(f"Sabit güncellendi: {rowid}")
             return SonucYonetici.tamam("Sabit başarıyla güncellendi.")
         except Exception as e:
@@ -84,6 +91,7 @@ def update_sabit(self, rowid: str, kod: str, menu_eleman: str, aciklama: str) ->
     def delete_sabit(self, rowid: str) -> SonucYonetici:
         try:
             self._db.execute("DELETE FROM Sabitler WHERE Rowid=?", (rowid,))
+            self._onbellek_temizle("Sabitler")
             logger.info(f"Sabit silindi: {rowid}")
             return SonucYonetici.tamam("Sabit başarıyla silindi.")
         except Exception as e:
@@ -128,6 +136,7 @@ def add_tatil(self, tarih: str, resmi_tatil: str) -> SonucYonetici:
                 "VALUES (?, ?, 'dirty', ?)",
                 (tarih, resmi_tatil, datetime.now().isoformat())
             )
+            self._onbellek_temizle("Tatiller")
             logger.info(f"Tatil eklendi: {tarih} ({resmi_tatil})")
             return SonucYonetici.tamam(f"Tatil başarıyla eklendi: {resmi_tatil}")
         except Exception as e:
@@ -145,6 +154,7 @@ def update_tatil(self, tarih: str, resmi_tatil: str) -> SonucYonetici:
                 "WHERE Tarih=?",
                 (resmi_tatil, datetime.now().isoformat(), tarih)
             )
+            self._onbellek_temizle("Tatiller")
             logger.info(f"Tatil güncellendi: {tarih}")
             return SonucYonetici.tamam("Tatil başarıyla güncellendi.")
         except Exception as e:
@@ -153,6 +163,7 @@ def update_tatil(self, tarih: str, resmi_tatil: str) -> SonucYonetici:
     def delete_tatil(self, tarih: str) -> SonucYonetici:
         try:
             self._db.execute("DELETE FROM Tatiller WHERE Tarih=?", (tarih,))
+            self._onbellek_temizle("Tatiller")
             logger.info(f"Tatil silindi: {tarih}")
             return SonucYonetici.tamam("Tatil başarıyla silindi.")
         except Exception as e:
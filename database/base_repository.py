@@ -1,15 +1,26 @@
 from datetime import datetime
 from core.logger import logger
 from core.date_utils import looks_like_date_column, normalize_date_fields
+from database.query import Query
+from database.row import satirlara_donustur
 
 
 class BaseRepository:
-    def __init__(self, db, table_name, pk, columns, has_sync=True, date_fields=None):
+    def __init__(self, db, table_name, pk, columns, has_sync=True, date_fields=None,
+                 trim_fields=None):
         self.db = db
         self.table = table_name
         self.columns = columns
         self.has_sync = has_sync
         self.date_fields = set(date_fields or [c for c in columns if looks_like_date_column(c)])
+        # Yazımda baş/son boşluğu atılan anahtar kolonlar (table_config "trim_fields");
+        # sorgular bu kolonlarda indeksli kesin eşitlik (where) kullanabilir
+        self.trim_fields = set(trim_fields or ())
+        # "cacheable" tablolarda RepositoryRegistry atar (database/table_cache.py)
+        self.onbellek = None
+        # Tüm tablolarda atanır: yazım tablonun neslini artırır (türetilmiş
+        # önbellekler — plan kısıt indeksi vb. — tazeliği buradan izler)
+        self.nesil_sayaci = None
 
         # PK: string veya list (composite)
         if isinstance(pk, list):
@@ -49,11 +60,44 @@ def _resolve_pk_params(self, pk_value):
         else:
             return [pk_value]
 
+    # ════════════════ ÖNBELLEK ════════════════
+
+    def _satirlar(self, sql: str, params=()) -> list:
+        """
+        SELECT sonucunu (sqlite3.Row listesi) döner; cacheable tablolarda
+        önce önbelleğe bakar. Açık transaction varken önbellek atlanır
+        (commit edilmemiş veri önbelleğe girmesin).
+        """
+        if self.onbellek is None or getattr(self.db, "_tx_derinlik", 0):
+            return self.db.execute(sql, params).fetchall()
+        return self.onbellek.oku(
+            self.table, (sql, tuple(params)),
+            lambda: self.db.execute(sql, params).fetchall(),
+        )
+
+    def _degisti(self) -> None:
+        """Yazımdan sonra önbelleği hemen ve transaction bitiminde boşaltır."""
+        sayac = self.onbellek or self.nesil_sayaci
+        if sayac is None:
+            return
+        sayac.gecersiz_kil(self.table)
+        tx_sonrasi = getattr(self.db, "tx_sonrasi", None)
+        if tx_sonrasi is not None:
+            tx_sonrasi(lambda: sayac.gecersiz_kil(self.table))
+
     # ════════════════ CRUD ════════════════
 
-    def insert(self, data: dict):
-        data = normalize_date_fields(data, self.date_fields)
-        now = datetime.now().isoformat()
+    def _kirp(self, data: dict) -> dict:
+        """trim_fields kolonlarındaki metin değerlerin baş/son boşluğunu atar."""
+        for col in self.trim_fields:
+            deger = data.get(col)
+            if isinstance(deger, str):
+                data[col] = deger.strip()
+        return data
+
+    def _yazim_hazirla(self, data: dict, now: str) -> dict:
+        """insert / insert_many / upsert_many için ortak normalizasyon."""
+        data = self._kirp(normalize_date_fields(data, self.date_fields))
 
         if "updated_at" in self.columns and not data.get("updated_at"):
             data["updated_at"] = now
@@ -64,20 +108,171 @@ def insert(self, data: dict):
             if "sync_status" not in data:
                 data["sync_status"] = "dirty"
             # else: data'da zaten var (clean veya dirty), onu koru
+        return data
 
+    def _insert_sql(self) -> str:
         cols = ", ".join(self.columns)
         placeholders = ", ".join(["?"] * len(self.columns))
-        values = [data.get(col) for col in self.columns]
-
-        sql = f"""
+        return f"""
         INSERT OR REPLACE INTO {self.table}
         ({cols})
         VALUES ({placeholders})
         """
-        self.db.execute(sql, values)
+
+    def insert(self, data: dict):
+        data = self._yazim_hazirla(data, datetime.now().isoformat())
+        values = [data.get(col) for col in self.columns]
+        self.db.execute(self._insert_sql(), values)
+        self._degisti()
+
+    def insert_many(self, rows) -> int:
+        """
+        insert() ile aynı semantik (INSERT OR REPLACE), tek hazırlanmış
+        ifade + executemany, tek transaction. Yazılan satır sayısını döner.
+
+        Hata olursa hiçbir satır yazılmaz (transaction geri alınır).
+        """
+        now = datetime.now().isoformat()
+        params = [
+            [d.get(col) for col in self.columns]
+            for d in (self._yazim_hazirla(r, now) for r in rows)
+        ]
+        if not params:
+            return 0
+        with self.db.transaction():
+            self.db.executemany(self._insert_sql(), params)
+        self._degisti()
+        return len(params)
+
+    def insert_many_raporlu(self, rows, parca: int = 500) -> dict[int, Exception]:
+        """
+        insert_many gibi yazar (INSERT OR REPLACE, tek transaction), ancak
+        hatalı bir satır diğerlerini düşürmez: satırlar parca'lık dilimler
+        halinde kendi SAVEPOINT'lerinde executemany ile yazılır; hata veren
+        dilim geri alınıp satır satır (her biri kendi SAVEPOINT'inde)
+        yeniden denenir.
+
+        Döner: {rows içindeki indeks: hata} — yalnızca yazılamayan satırlar.
+        """
+        now = datetime.now().isoformat()
+        hatalar: dict[int, Exception] = {}
+        params: list[tuple[int, list]] = []
+        for i, r in enumerate(rows):
+            try:
+                d = self._yazim_hazirla(r, now)
+                params.append((i, [d.get(col) for col in self.columns]))
+            except Exception as exc:
+                hatalar[i] = exc
+        if not params:
+            return hatalar
+
+        sql = self._insert_sql()
+        parca = max(int(parca), 1)
+        with self.db.transaction():
+            for bas in range(0, len(params), parca):
+                dilim = params[bas:bas + parca]
+                try:
+                    with self.db.transaction():
+                        self.db.executemany(sql, [p for _, p in dilim])
+                except Exception:
+                    # Dilim geri alındı — hatalı satırları ayırmak için tek tek
+                    for i, p in dilim:
+                        try:
+                            with self.db.transaction():
+                                self.db.execute(sql, p)
+                        except Exception as exc:
+                            hatalar[i] = exc
+        self._degisti()
+        return hatalar
+
+    def upsert_many(self, rows, conflict_cols=None) -> dict:
+        """
+        INSERT ... ON CONFLICT(conflict_cols) DO UPDATE ile toplu yazım.
+
+        - conflict_cols verilmezse PK kolonları kullanılır (UNIQUE/PK olmalı).
+        - Çakışmada yalnızca satırda bulunan kolonlar güncellenir
+          (update() gibi kısmi; satırda olmayan kolon korunur). Aynı kolon
+          kümesine sahip ardışık satırlar tek executemany ile yazılır.
+        - has_sync ise sync_status='dirty' olur (satırda açıkça verilmemişse).
+        - Tek transaction; {"eklenen": n, "guncellenen": m} döner.
+        """
+        rows = list(rows)
+        if not rows:
+            return {"eklenen": 0, "guncellenen": 0}
+
+        conflict = list(conflict_cols or self.pk_list)
+        for c in conflict:
+            if c not in self.columns:
+                raise ValueError(f"{self.table}: bilinmeyen conflict kolonu '{c}'")
+
+        now = datetime.now().isoformat()
+        hazir = [self._yazim_hazirla(r, now) for r in rows]
+
+        # Ardışık aynı biçimli satırlar → (kolonlar, parametreler); sıra korunur
+        gruplar: list[tuple[list[str], list[list]]] = []
+        for d in hazir:
+            kolonlar = [c for c in self.columns if c in d or c in conflict]
+            if not gruplar or gruplar[-1][0] != kolonlar:
+                gruplar.append((kolonlar, []))
+            gruplar[-1][1].append([d.get(c) for c in kolonlar])
+
+        with self.db.transaction():
+            eklenen = self._yeni_anahtar_sayisi(conflict, hazir)
+            for kolonlar, params in gruplar:
+                self.db.executemany(self._upsert_sql(kolonlar, conflict), params)
+        self._degisti()
+        return {"eklenen": eklenen, "guncellenen": len(hazir) - eklenen}
+
+    def _upsert_sql(self, kolonlar: list[str], conflict: list[str]) -> str:
+        guncellenecek = [c for c in kolonlar if c not in conflict]
+        if guncellenecek:
+            set_sql = ", ".join(f"{c}=excluded.{c}" for c in guncellenecek)
+            cakisma = f"DO UPDATE SET {set_sql}"
+        else:
+            cakisma = "DO NOTHING"
+        return f"""
+        INSERT INTO {self.table}
+        ({", ".join(kolonlar)})
+        VALUES ({", ".join(["?"] * len(kolonlar))})
+        ON CONFLICT({", ".join(conflict)}) {cakisma}
+        """
+
+    def _yeni_anahtar_sayisi(self, conflict: list[str], hazir: list[dict]) -> int:
+        """
+        Yazımdan önce: tabloda henüz olmayan farklı conflict anahtarı sayısı.
+        NULL içeren anahtar çakışmaz, her satırı yeni kayıttır. Tablo
+        taranmaz; yalnızca gelen anahtarlar (dilimler halinde) sorgulanır.
+        """
+        anahtarlar = set()
+        null_anahtar = 0
+        for d in hazir:
+            k = tuple(d.get(c) for c in conflict)
+            if any(v is None for v in k):
+                null_anahtar += 1
+            else:
+                anahtarlar.add(k)
+        if not anahtarlar:
+            return null_anahtar
+
+        liste = list(anahtarlar)
+        n = len(conflict)
+        parca = max(1, 900 // n)   # SQLITE_MAX_VARIABLE_NUMBER sınırının altında
+        sol = conflict[0] if n == 1 else f"({', '.join(conflict)})"
+        mevcut = 0
+        for bas in range(0, len(liste), parca):
+            dilim = liste[bas:bas + parca]
+            if n == 1:
+                sag = ", ".join("?" * len(dilim))
+            else:
+                satir = f"({', '.join('?' * n)})"
+                sag = "VALUES " + ", ".join([satir] * len(dilim))
+            sql = f"SELECT COUNT(*) FROM {self.table} WHERE {sol} IN ({sag})"
+            mevcut += int(self.db.execute(
+                sql, [v for k in dilim for v in k]).fetchone()[0])
+        return len(liste) - mevcut + null_anahtar
 
     def update(self, pk_value, data: dict):
-        data = normalize_date_fields(data, self.date_fields)
+        data = self._kirp(normalize_date_fields(data, self.date_fields))
         now = datetime.now().isoformat()
 
         if "updated_at" in self.columns:
@@ -105,13 +300,13 @@ def update(self, pk_value, data: dict):
         WHERE {self._pk_where()}
         """
         self.db.execute(sql, values + where_vals)
+        self._degisti()
 
     def get_by_id(self, pk_value):
         sql = f"SELECT * FROM {self.table} WHERE {self._pk_where()}"
         params = self._resolve_pk_params(pk_value)
-        cur = self.db.execute(sql, params)
-        row = cur.fetchone()
-        return dict(row) if row else None
+        rows = self._satirlar(sql, params)
+        return dict(rows[0]) if rows else None
 
     def get_by_pk(self, pk_value):
         """
@@ -125,9 +320,26 @@ def get_by_pk(self, pk_value):
         """
         return self.get_by_id(pk_value)
 
-    def get_all(self):
-        cur = self.db.execute(f"SELECT * FROM {self.table}")
-        return [dict(r) for r in cur.fetchall()]
+    def get_all(self, compact: bool = False):
+        """
+        Tüm kayıtlar. compact=True → dict yerine paylaşılan kolon indeksli
+        Satir listesi (database/row.py); büyük salt okuma listeleri için.
+        """
+        rows = self._satirlar(f"SELECT * FROM {self.table}")
+        if compact:
+            return satirlara_donustur(rows)
+        return [dict(r) for r in rows]
+
+    def query(self, *columns) -> Query:
+        """
+        Zincirlenebilir, parametreli SELECT başlatır (bkz. database/query.py).
+        Filtre SQLite'ta çalışır; get_all() + Python filtresinin yerine kullanılır.
+
+        Örnek:
+            repo.query().where(PlanID=plan_id, Durum="aktif").all()
+            repo.query("PersonelID").where(BirimID=bid).column("PersonelID")
+        """
+        return Query(self, columns)
 
     def get_by_kod(self, kod_degeri: str, kolum: str = "Kod") -> list:
         """
@@ -140,8 +352,7 @@ def get_by_kod(self, kod_degeri: str, kolum: str = "Kod") -> list:
         """
         sql = f"SELECT * FROM {self.table} WHERE {kolum} = ?"
         try:
-            cur = self.db.execute(sql, (kod_degeri,))
-            return [dict(r) for r in cur.fetchall()]
+            return [dict(r) for r in self._satirlar(sql, (kod_degeri,))]
         except Exception as exc:
             logger.error(
                 f"BaseRepository.get_by_kod hatası — "
@@ -155,15 +366,12 @@ def get_where(self, kosullar: dict) -> list:
 
         Örnek:
             repo.get_where({"Durum": "aktif", "Tur": "A"})
+            repo.get_where({"Durum": ["aktif", "pasif"]})   # IN
         """
         if not kosullar:
             return self.get_all()
-        where  = " AND ".join(f"{k}=?" for k in kosullar)
-        values = list(kosullar.values())
-        sql    = f"SELECT * FROM {self.table} WHERE {where}"
         try:
-            cur = self.db.execute(sql, values)
-            return [dict(r) for r in cur.fetchall()]
+            return self.query().where(**kosullar).all()
         except Exception as exc:
             logger.error(
                 f"BaseRepository.get_where hatası — "
@@ -204,6 +412,7 @@ def delete(self, pk_value):
                 """
                 self.db.execute(sql, where_vals)
                 logger.info(f"BaseRepository.delete: {self.table} → hard delete (no sync)")
+            self._degisti()
             
             return True
         except Exception as exc:
@@ -213,6 +422,25 @@ def delete(self, pk_value):
             )
             return False
 
+    def delete_many(self, pk_values) -> int:
+        """
+        delete() ile aynı semantik (sync'li tabloda soft delete), tek
+        hazırlanmış ifade + executemany, tek transaction. Satır sayısını döner.
+
+        Hata olursa hiçbir satır silinmez (transaction geri alınır).
+        """
+        params = [self._resolve_pk_params(pk) for pk in pk_values]
+        if not params:
+            return 0
+        if self.has_sync and "sync_status" in self.columns:
+            sql = f"UPDATE {self.table} SET sync_status='deleted' WHERE {self._pk_where()}"
+        else:
+            sql = f"DELETE FROM {self.table} WHERE {self._pk_where()}"
+        with self.db.transaction():
+            self.db.executemany(sql, params)
+        self._degisti()
+        return len(params)
+
     # ════════════════ SYNC ════════════════
 
     def get_dirty(self):
@@ -232,3 +460,4 @@ def mark_clean(self, pk_value):
         WHERE {self._pk_where()}
         """
         self.db.execute(sql, where_vals)
+        self._degisti()
@@ -0,0 +1,207 @@
+# database/connection_pool.py
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Thread farkında SQLite bağlantı havuzu
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+"""
+Aynı veritabanı dosyasını kullanan tüm SQLiteManager örnekleri tek bir
+havuzu paylaşır:
+
+  - Tek yazıcı bağlantı  — tüm yazmalar yazma_kilidi (RLock) ile sıraya girer.
+  - Thread başına okuyucu — mode=ro + query_only; WAL sayesinde yazıcı
+                            transaction'ı sürerken okumalar beklemez.
+                            threading.local'da tutulur: thread bitince
+                            bağlantı kapanır, aynı ident'i alan yeni thread
+                            eskisinin bağlantısını (ve açık anlık görüntüsünü)
+                            devralmaz.
+
+PRAGMA ayarları yalnızca burada uygulanır. Kilit ve transaction derinliği
+havuzdadır; böylece UI'nin ve worker'ların açtığı SQLiteManager'lar
+birbirinin transaction'ını commit edemez, "database is locked" yarışı
+süreç içinde oluşmaz (süreçler arası bekleme busy_timeout ile yapılır).
+
+Kullanım (doğrudan gerekmez — SQLiteManager üzerinden):
+    havuz = havuz_al(DB_PATH)
+    havuz.okuyucu().execute("SELECT ...")
+    with havuz.yazma_kilidi:
+        havuz.yazici.execute("UPDATE ...")
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import weakref
+from pathlib import Path
+
+from core.logger import logger
+
+
+BUSY_TIMEOUT_SN = 30
+
+# Tüm bağlantılara uygulanan ayarlar
+ORTAK_PRAGMALAR = (
+    "PRAGMA synchronous=NORMAL",        # WAL ile güvenli, fsync sayısı azalır
+    "PRAGMA cache_size=-16000",         # ~16 MB sayfa önbelleği (bağlantı başına)
+    "PRAGMA mmap_size=268435456",       # 256 MB bellek eşlemeli okuma
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+def _pragmalari_uygula(conn: sqlite3.Connection, salt_okunur: bool) -> None:
+    if not salt_okunur:
+        conn.execute("PRAGMA journal_mode=WAL")
+    for pragma in ORTAK_PRAGMALAR:
+        conn.execute(pragma)
+    if salt_okunur:
+        conn.execute("PRAGMA query_only=ON")
+
+
+class _OkuyucuKaydi:
+    """Thread-local okuyucu kaydı; ömrü thread'e bağlıdır."""
+    __slots__ = ("conn", "sonlandir", "__weakref__")
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.sonlandir = None
+
+
+class BaglantiHavuzu:
+    """Bir veritabanı dosyası için yazıcı + thread başına okuyucu bağlantılar."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.yazma_kilidi = threading.RLock()
+        # transaction() derinliği ve transaction'ı açan thread
+        self.tx_derinlik = 0
+        self.yazan_thread: int | None = None
+        # En dış transaction bitince çalışacak çağrılar (bkz. SQLiteManager.tx_sonrasi)
+        self.tx_sonrasi_cagrilar: list = []
+
+        self.yazici = sqlite3.connect(
+            db_path, check_same_thread=False, timeout=BUSY_TIMEOUT_SN
+        )
+        self.yazici.row_factory = sqlite3.Row
+        _pragmalari_uygula(self.yazici, salt_okunur=False)
+
+        # Thread'in okuyucusu _yerel.kayit'ta; _okuyucular kapat() için tüm
+        # açık okuyucuları tutar (anahtar: kayıt nesnesinin id'si)
+        self._yerel = threading.local()
+        self._okuyucular: dict[int, sqlite3.Connection] = {}
+        self._okuyucu_kilidi = threading.Lock()
+        # :memory: vb. dosyasız veritabanında ayrı okuyucu açılamaz
+        self._okuyucu_destekli = db_path != ":memory:" and not str(db_path).startswith("file:")
+        self._kullanici = 0
+
+    # ════════════════ OKUYUCULAR ════════════════
+
+    def _okuyucu_ac(self) -> sqlite3.Connection:
+        uri = Path(self.db_path).resolve().as_uri() + "?mode=ro"
+        conn = sqlite3.connect(
+            uri, uri=True, check_same_thread=False, timeout=BUSY_TIMEOUT_SN
+        )
+        conn.row_factory = sqlite3.Row
+        _pragmalari_uygula(conn, salt_okunur=True)
+        return conn
+
+    def okuyucu(self) -> sqlite3.Connection:
+        """
+        Çağıran thread'in salt okunur bağlantısı (ilk çağrıda açılır).
+        Okuyucu açılamazsa yazıcı bağlantı döner.
+        """
+        if not self._okuyucu_destekli:
+            return self.yazici
+        kayit = getattr(self._yerel, "kayit", None)
+        if kayit is not None:
+            return kayit.conn
+        try:
+            conn = self._okuyucu_ac()
+        except sqlite3.Error as exc:
+            logger.warning(f"Salt okunur bağlantı açılamadı, yazıcı kullanılacak: {exc}")
+            self._okuyucu_destekli = False
+            return self.yazici
+        kayit = _OkuyucuKaydi(conn)
+        anahtar = id(kayit)
+        with self._okuyucu_kilidi:
+            self._okuyucular[anahtar] = conn
+        # okuyucu_birak çağrılmadan biten thread'in yerel kaydı silinince
+        # bağlantı kapanır (kayıt yalnızca thread-local'da tutulur)
+        kayit.sonlandir = weakref.finalize(kayit, self._okuyucu_kapat, anahtar)
+        self._yerel.kayit = kayit
+        return conn
+
+    def _okuyucu_kapat(self, anahtar: int) -> None:
+        with self._okuyucu_kilidi:
+            conn = self._okuyucular.pop(anahtar, None)
+        if conn is not None:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+    def okuyucu_birak(self) -> None:
+        """Çağıran thread'in okuyucu bağlantısını kapatır."""
+        kayit = getattr(self._yerel, "kayit", None)
+        if kayit is not None:
+            del self._yerel.kayit
+            kayit.sonlandir()
+
+    def yazan_bu_thread_mi(self) -> bool:
+        return self.tx_derinlik > 0 and self.yazan_thread == threading.get_ident()
+
+    # ════════════════ YAŞAM DÖNGÜSÜ ════════════════
+
+    def kapat(self) -> None:
+        with self._okuyucu_kilidi:
+            okuyucular = list(self._okuyucular.values())
+            self._okuyucular.clear()
+        for conn in okuyucular:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        with self.yazma_kilidi:
+            self.yazici.close()
+
+
+# ════════════════ HAVUZ KAYDI ════════════════
+
+_havuzlar: dict[str, BaglantiHavuzu] = {}
+_havuz_kilidi = threading.Lock()
+
+
+def _anahtar(db_path: str) -> str:
+    if db_path == ":memory:" or str(db_path).startswith("file:"):
+        return str(db_path)
+    return os.path.normcase(os.path.abspath(db_path))
+
+
+def havuz_al(db_path: str) -> BaglantiHavuzu:
+    """db_path için paylaşılan havuzu döner (yoksa açar); kullanıcı sayısını artırır."""
+    anahtar = _anahtar(db_path)
+    with _havuz_kilidi:
+        havuz = _havuzlar.get(anahtar)
+        # :memory: her açılışta ayrı veritabanıdır, paylaşılmaz
+        if havuz is None or anahtar == ":memory:":
+            logger.info("SQLite bağlantı havuzu açılıyor")
+            havuz = BaglantiHavuzu(db_path)
+            if anahtar != ":memory:":
+                _havuzlar[anahtar] = havuz
+        havuz._kullanici += 1
+        return havuz
+
+
+def havuz_birak(havuz: BaglantiHavuzu) -> None:
+    """
+    Bir kullanıcıyı düşer ve çağıran thread'in okuyucusunu kapatır.
+    Son kullanıcı bıraktığında havuz tamamen kapanır.
+    """
+    havuz.okuyucu_birak()
+    with _havuz_kilidi:
+        havuz._kullanici -= 1
+        if havuz._kullanici > 0:
+            return
+        anahtar = _anahtar(havuz.db_path)
+        if _havuzlar.get(anahtar) is havuz:
+            del _havuzlar[anahtar]
+    logger.info("SQLite bağlantı havuzu kapatılıyor")
+    havuz.kapat()
@@ -1,9 +1,41 @@
+import threading
 import time
 from core.di import get_cloud_adapter
 from core.logger import logger
 from database.table_config import TABLES
 
 
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+
+    rate     : saniyede eklenen token (sürekli hız)
+    capacity : biriktirilebilecek en fazla token (anlık patlama)
+
+    acquire() token yoksa gereken süre kadar bekler; paralel sync'te tüm
+    thread'ler aynı kovayı paylaşır, toplam istek hızı kotayı aşmaz.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, n: int = 1):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= n:
+                    self._tokens -= n
+                    return
+                wait = (n - self._tokens) / self.rate
+            time.sleep(wait)
+
+
 class GSheetManager:
     """
     Google Sheets access layer.
@@ -14,10 +46,16 @@ class GSheetManager:
     """
 
     BATCH_SIZE = 50
-    RATE_LIMIT_DELAY = 1.1
+    RATE_LIMIT_DELAY = 1.1      # ortalama istek aralığı (sn) → token hızı
+    RATE_LIMIT_BURST = 5
+
+    # Sheets kotası kullanıcı/proje başına: tüm örnekler aynı kovayı paylaşır
+    _limiter = TokenBucket(rate=1 / RATE_LIMIT_DELAY, capacity=RATE_LIMIT_BURST)
 
-    def __init__(self, cloud_adapter=None):
+    def __init__(self, cloud_adapter=None, rate_limiter=None):
         self._cloud = cloud_adapter or get_cloud_adapter()
+        if rate_limiter is not None:
+            self._limiter = rate_limiter
 
     def get_worksheet(self, table_name: str):
         ws = self._cloud.get_worksheet(table_name)
@@ -31,9 +69,9 @@ def get_worksheet(self, table_name: str):
     # READ + CACHE
     # ===================================================
 
-    def read_all(self, table_name: str) -> tuple:
+    def read_all(self, table_name: str, ws=None) -> tuple:
         """
-        Read full table once.
+        Read full table once (ws verilirse yeniden açılmaz).
 
         Returns:
             (rows, pk_index, ws)
@@ -46,9 +84,10 @@ def read_all(self, table_name: str) -> tuple:
         pk = cfg["pk"]
         pk_cols = pk if isinstance(pk, list) else [pk]
 
-        ws = self.get_worksheet(table_name)
+        ws = ws or self.get_worksheet(table_name)
 
         logger.info(f"GSheets: {table_name} okunuyor (tek sefer)")
+        self._limiter.acquire()
         records = ws.get_all_records()
 
         rows = []
@@ -67,6 +106,28 @@ def read_all(self, table_name: str) -> tuple:
         logger.info(f"GSheets: {table_name} -> {len(rows)} kayit, {len(pk_index)} indexed")
         return rows, pk_index, ws
 
+    @staticmethod
+    def remote_surum(ws) -> str:
+        """
+        Kayıtları okumadan remote değişiklik belirteci: spreadsheet'in Drive
+        modifiedTime'ı + sayfa id. Spreadsheet'teki herhangi bir yazımda
+        değişir (aynı dosyadaki diğer sayfalar dahil — bu durumda tablo
+        gereksiz yere okunur, ama değişiklik kaçmaz).
+
+        Belirlenemezse "" döner; çağıran tam okumaya düşer.
+        """
+        try:
+            sh = ws.spreadsheet
+            zaman = sh.get_lastUpdateTime()
+        except Exception as e:
+            logger.debug(f"GSheets: remote sürüm alınamadı: {e}")
+            return ""
+        return f"{zaman}|{getattr(ws, 'id', '')}" if zaman else ""
+
+    def throttle(self):
+        """Doğrudan worksheet çağrısı yapacaklar için paylaşılan limiter'ı bekle."""
+        self._limiter.acquire()
+
     # ===================================================
     # BATCH WRITE
     # ===================================================
@@ -99,14 +160,12 @@ def batch_update(self, table_name: str, ws, pk_index: dict, updates: list[dict])
         total = len(batch_cells)
         for i in range(0, total, self.BATCH_SIZE):
             chunk = batch_cells[i:i + self.BATCH_SIZE]
+            self._limiter.acquire()
             ws.batch_update(chunk)
 
             sent = min(i + self.BATCH_SIZE, total)
             logger.info(f"GSheets guncellendi ({table_name}): {sent}/{total}")
 
-            if sent < total:
-                time.sleep(self.RATE_LIMIT_DELAY)
-
     def batch_append(self, table_name: str, ws, new_rows: list[dict]):
         if not new_rows:
             return
@@ -123,14 +182,12 @@ def batch_append(self, table_name: str, ws, new_rows: list[dict]):
         total = len(all_values)
         for i in range(0, total, self.BATCH_SIZE):
             chunk = all_values[i:i + self.BATCH_SIZE]
+            self._limiter.acquire()
             ws.append_rows(chunk)
 
             sent = min(i + self.BATCH_SIZE, total)
             logger.info(f"GSheets eklendi ({table_name}): {sent}/{total}")
 
-            if sent < total:
-                time.sleep(self.RATE_LIMIT_DELAY)
-
     # ===================================================
     # SINGLE OPS (backward compatibility)
     # ===================================================
@@ -145,6 +202,7 @@ def append(self, table_name: str, data: dict):
         ws = self.get_worksheet(table_name)
 
         row = [data.get(col, "") for col in cfg["columns"]]
+        self._limiter.acquire()
         ws.append_row(row)
         logger.info(f"GSheets eklendi ({table_name}): {data.get(cfg['pk'])}")
 
@@ -12,7 +12,11 @@ class MigrationManager:
     v1: Tüm tablolar — güncel şema (temiz kurulum)
     """
 
-    CURRENT_VERSION = 9
+    CURRENT_VERSION = 15
+
+    # table_config "indexes" kaynaklı indeksler bu önekle adlandırılır;
+    # yalnızca bu önekli indeksler otomatik silinebilir.
+    INDEX_PREFIX = "ix_"
 
     def __init__(self, db_path):
         self.db_path = db_path
@@ -99,6 +103,8 @@ def run_migrations(self):
         current = self.get_schema_version()
         if current >= self.CURRENT_VERSION:
             logger.info(f"Sema guncel (v{current})")
+            # table_config'teki indeks değişiklikleri versiyon artırmadan uygulanır
+            self._indeksleri_esitle_conn()
             return True
 
         backup_path = self.backup_database()
@@ -119,6 +125,168 @@ def run_migrations(self):
             logger.error(f"Migration hatasi: {e} | Yedek: {backup_path}")
             raise
 
+    def _migrate_to_v15(self):
+        """
+        v15: table_config "trim_fields" kolonlarındaki mevcut değerlerin
+        baş/son boşluğu atılır (yeni yazımlar BaseRepository'de kırpılır).
+        Böylece bu anahtar kolonlarda indeksli kesin eşitlik eski
+        str(x).strip() karşılaştırmalarıyla aynı satırları bulur.
+        Kırpılınca PK çakışan satırlar (UPDATE OR IGNORE) olduğu gibi kalır.
+        """
+        from database.table_config import TABLES
+
+        bosluk = "' ' || char(9, 10, 11, 12, 13)"
+        conn = self.connect()
+        cur  = conn.cursor()
+        try:
+            for tablo, cfg in TABLES.items():
+                kolonlar = cfg.get("trim_fields") or []
+                if not kolonlar:
+                    continue
+                cur.execute(f"PRAGMA table_info({tablo})")
+                mevcut = {r[1] for r in cur.fetchall()}
+                for kolon in kolonlar:
+                    if kolon not in mevcut:
+                        continue
+                    cur.execute(
+                        f"UPDATE OR IGNORE {tablo} SET {kolon} = TRIM({kolon}, {bosluk}) "
+                        f"WHERE typeof({kolon}) = 'text' "
+                        f"AND {kolon} <> TRIM({kolon}, {bosluk})"
+                    )
+                    if cur.rowcount:
+                        logger.info(f"v15: {tablo}.{kolon} — {cur.rowcount} değer kırpıldı")
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _migrate_to_v14(self):
+        """
+        v14: Sync_Durum.RemoteSurum — worksheet kayıtları okunmadan önce
+        karşılaştırılan remote değişiklik belirteci (Drive modifiedTime).
+        """
+        conn = self.connect()
+        cur  = conn.cursor()
+        try:
+            try:
+                cur.execute("ALTER TABLE Sync_Durum ADD COLUMN RemoteSurum TEXT")
+                logger.info("v14: Sync_Durum.RemoteSurum kolonu eklendi")
+            except Exception as e:
+                if "duplicate column" in str(e).lower():
+                    logger.info("v14: RemoteSurum zaten var, atlandı")
+                else:
+                    raise
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _migrate_to_v13(self):
+        """
+        v13: NB_PersonelAyOzet — personel × birim × ay nöbet/mesai özeti.
+        NbOzetService plan onayı ve mesai hesabında günceller; boş tablo
+        ilk kullanımda mevcut planlardan / NB_MesaiHesap'tan doldurulur.
+        """
+        conn = self.connect()
+        cur  = conn.cursor()
+        try:
+            cur.execute("""
+            CREATE TABLE IF NOT EXISTS NB_PersonelAyOzet (
+                PersonelID        TEXT NOT NULL,
+                BirimID           TEXT NOT NULL,
+                Yil               INTEGER NOT NULL,
+                Ay                INTEGER NOT NULL CHECK(Ay BETWEEN 1 AND 12),
+                PlanID            TEXT,
+                PlanDurum         TEXT,
+                NobetSayisi       INTEGER NOT NULL DEFAULT 0,
+                NobetDakika       INTEGER NOT NULL DEFAULT 0,
+                HaftasonuSayisi   INTEGER NOT NULL DEFAULT 0,
+                GunduzSayisi      INTEGER NOT NULL DEFAULT 0,
+                GeceSayisi        INTEGER NOT NULL DEFAULT 0,
+                CalisDakika       INTEGER NOT NULL DEFAULT 0,
+                HedefDakika       INTEGER NOT NULL DEFAULT 0,
+                FazlaDakika       INTEGER NOT NULL DEFAULT 0,
+                DevirDakika       INTEGER NOT NULL DEFAULT 0,
+                ToplamFazlaDakika INTEGER NOT NULL DEFAULT 0,
+                OdenenDakika      INTEGER NOT NULL DEFAULT 0,
+                DevireGidenDakika INTEGER NOT NULL DEFAULT 0,
+                HesapDurumu       TEXT,
+                updated_at        TEXT,
+                PRIMARY KEY (PersonelID, BirimID, Yil, Ay)
+            )
+            """)
+            # table_config indeksleri (BirimID/Yil/Ay, PlanID)
+            self._indeksleri_esitle(cur)
+            conn.commit()
+            logger.info("v13: NB_PersonelAyOzet tablosu oluşturuldu")
+        finally:
+            conn.close()
+
+    def _migrate_to_v12(self):
+        """
+        v12: NB_BirimAyar'a PlanMotoru + CozucuSureSn kolonları eklendi.
+        PlanMotoru: 'acgozlu' (gün gün açgözlü atama) | 'cozucu' (NbCozucu).
+        CozucuSureSn: çözücünün plan başına arama süresi üst sınırı.
+        """
+        conn = self.connect()
+        cur  = conn.cursor()
+        try:
+            for kolon, tanim in (
+                ("PlanMotoru",   "TEXT NOT NULL DEFAULT 'acgozlu'"),
+                ("CozucuSureSn", "INTEGER NOT NULL DEFAULT 10"),
+            ):
+                try:
+                    cur.execute(f"ALTER TABLE NB_BirimAyar ADD COLUMN {kolon} {tanim}")
+                    logger.info(f"v12: NB_BirimAyar.{kolon} kolonu eklendi")
+                except Exception as e:
+                    if "duplicate column" in str(e).lower():
+                        logger.info(f"v12: {kolon} zaten var, atlandı")
+                    else:
+                        raise
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _migrate_to_v11(self):
+        """
+        v11: Delta sync durum tabloları (Sync_Durum, Sync_SatirHash).
+        Bkz. database/sync_state.py
+        """
+        conn = self.connect()
+        cur  = conn.cursor()
+        try:
+            self._sync_durum_tablolari(cur)
+            conn.commit()
+            logger.info("v11: Sync durum tablolari olusturuldu")
+        finally:
+            conn.close()
+
+    def _sync_durum_tablolari(self, cur):
+        """Sync_Durum / Sync_SatirHash tablolarını oluşturur. İdempotent."""
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS Sync_Durum (
+            TabloAdi    TEXT PRIMARY KEY,
+            TabloHash   TEXT,
+            Watermark   TEXT,
+            SatirSayisi INTEGER,
+            SonSync     TEXT,
+            RemoteSurum TEXT
+        )
+        """)
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS Sync_SatirHash (
+            TabloAdi    TEXT NOT NULL,
+            PkKey       TEXT NOT NULL,
+            SatirHash   TEXT NOT NULL,
+            PRIMARY KEY (TabloAdi, PkKey)
+        )
+        """)
+
+    def _migrate_to_v10(self):
+        """
+        v10: table_config "indexes" bölümünden ikincil indeksler +
+        sync tablolarında sync_status='dirty' kısmi indeksi.
+        """
+        self._indeksleri_esitle_conn()
+
     def _migrate_to_v6(self):
         """
         v6: NB_BirimAyar'a birim bazlı çalışma günü anahtarları eklendi.
@@ -434,6 +602,75 @@ def _migrate_to_v2(self):
         finally:
             conn.close()
 
+    # ════════════════════════════════════════════════════════
+    #  ŞEMA TANIMLI İNDEKSLER (v10)
+    # ════════════════════════════════════════════════════════
+
+    def _indeksleri_esitle_conn(self):
+        conn = self.connect()
+        cur  = conn.cursor()
+        try:
+            self._indeksleri_esitle(cur)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _istenen_indeksler(self, cur) -> dict:
+        """
+        table_config'ten beklenen indeksler: {ad: CREATE INDEX sql}.
+        Tabloda olmayan kolonlara ait tanımlar atlanır.
+        """
+        from database.table_config import TABLES
+
+        istenen = {}
+        for tablo, cfg in TABLES.items():
+            cur.execute(f"PRAGMA table_info({tablo})")
+            mevcut = {r[1] for r in cur.fetchall()}
+            if not mevcut:
+                continue
+
+            for kolonlar in cfg.get("indexes", []):
+                if not all(k in mevcut for k in kolonlar):
+                    logger.warning(f"Indeks atlandı: {tablo}{tuple(kolonlar)} — kolon yok")
+                    continue
+                ad = f"{self.INDEX_PREFIX}{tablo}_{'_'.join(kolonlar)}".lower()
+                istenen[ad] = (
+                    f"CREATE INDEX IF NOT EXISTS {ad} "
+                    f"ON {tablo}({', '.join(kolonlar)})"
+                )
+
+            # get_dirty() her sync turunda çağrılır; kirli satır az olduğundan
+            # kısmi indeks tam tablo taramasını ortadan kaldırır.
+            if "sync_status" in mevcut:
+                ad = f"{self.INDEX_PREFIX}{tablo}_dirty".lower()
+                istenen[ad] = (
+                    f"CREATE INDEX IF NOT EXISTS {ad} "
+                    f"ON {tablo}(sync_status) WHERE sync_status='dirty'"
+                )
+        return istenen
+
+    def _indeksleri_esitle(self, cur):
+        """
+        Veritabanındaki ix_ önekli indeksleri table_config ile eşitler.
+        İdempotent: eksikleri oluşturur, tanımdan çıkarılanları siler.
+        """
+        istenen = self._istenen_indeksler(cur)
+
+        cur.execute(
+            "SELECT name FROM sqlite_master WHERE type='index' AND name LIKE ?",
+            (f"{self.INDEX_PREFIX}%",)
+        )
+        mevcut = {r[0] for r in cur.fetchall()}
+
+        for ad in sorted(mevcut - set(istenen)):
+            cur.execute(f"DROP INDEX IF EXISTS {ad}")
+            logger.info(f"Indeks silindi: {ad}")
+
+        for ad, sql in istenen.items():
+            cur.execute(sql)
+            if ad not in mevcut:
+                logger.info(f"Indeks olusturuldu: {ad}")
+
     # ════════════════════════════════════════════════════════
     #  NÖBET MODÜLÜ — TABLO OLUŞTURMA (v2)
     # ════════════════════════════════════════════════════════
@@ -1587,6 +1824,7 @@ def reset_database(self):
             "Dis_Alan_Katsayi_Protokol",
             "Users", "Roles", "Permissions",
             "UserRoles", "RolePermissions", "AuthAudit",
+            "Sync_Durum", "Sync_SatirHash",
             "schema_version",
         ]
 
@@ -1596,6 +1834,8 @@ def reset_database(self):
         self.create_tables(cur)
         self._seed_initial_data(cur)
         self._seed_auth_data(cur)
+        self._sync_durum_tablolari(cur)
+        self._indeksleri_esitle(cur)
 
         cur.execute("""
             CREATE TABLE IF NOT EXISTS schema_version (
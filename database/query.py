@@ -0,0 +1,247 @@
+# database/query.py
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Parametreli SELECT oluşturucu (predicate push-down)
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+"""
+BaseRepository.query() ile elde edilen zincirlenebilir sorgu nesnesi.
+
+get_all() + Python filtresi yerine filtreyi SQLite'a iter:
+
+    repo = registry.get("NB_PlanSatir")
+    satirlar = (
+        repo.query()
+            .where(PlanID=plan_id, Durum="aktif")
+            .between("NobetTarihi", "2026-03-01", "2026-03-31")
+            .order_by("NobetTarihi")
+            .all()
+    )
+
+    # Projeksiyon + IN
+    pidler = (
+        registry.get("NB_BirimPersonel")
+            .query("PersonelID")
+            .where(BirimID=birim_id, Aktif=1)
+            .column("PersonelID")
+    )
+
+Kurallar:
+  - where(kolon=deger)         → kolon = ?
+  - where(kolon=[a, b])        → kolon IN (?, ?)   (boş liste → hiç satır)
+  - where(kolon=None)          → kolon IS NULL
+  - where_not(...)             → yukarıdakilerin tersi (NULL da "farklı" sayılır)
+  - where_trimmed / where_not_trimmed → aynısı, iki taraf da boşluklardan
+                                  arındırılarak (TRIM(kolon) = ?); eski
+                                  str(x).strip() karşılaştırmalarının birebir
+                                  karşılığı. Kolon indeksini kullanamaz;
+                                  yalnızca Durum / Kod gibi serbest metin
+                                  kolonları için. Anahtar kolonlar
+                                  (table_config "trim_fields") yazımda
+                                  kırpılır, onlarda where() kullanılır.
+  - between(kolon, bas, bit)   → bas <= kolon <= bit (uçlar opsiyonel)
+  - less_than / greater_than   → kolon < ? / kolon > ?
+  - overlaps(bas_k, bit_k, bas, bit) → tarih aralığı kesişimi
+  - Tarih kolonlarına verilen date / 'dd.mm.yyyy' değerleri ISO'ya çevrilir.
+  - Kolon adları repository kolonlarıyla doğrulanır (SQL enjeksiyonu yok).
+  - compact() → all() ile aynı satırlar, Satir (tuple tabanlı) olarak.
+"""
+from __future__ import annotations
+
+from datetime import date
+
+from core.date_utils import to_db_date
+from database.row import Satir, satirlara_donustur
+
+
+# sync_status / updated_at bazı repository'lerde columns listesinde yok
+_EK_KOLONLAR = ("sync_status", "updated_at")
+
+# str.strip() ile aynı karakterler (SQLite TRIM varsayılanı yalnızca boşluk)
+_BOSLUKLAR = "' ' || char(9, 10, 11, 12, 13)"
+
+
+class Query:
+    """BaseRepository üzerinde tek tabloya parametreli SELECT."""
+
+    def __init__(self, repo, columns=None):
+        self._repo = repo
+        self._secim: list[str] = [self._kolon(c) for c in (columns or ())]
+        self._kosullar: list[str] = []
+        self._params: list = []
+        self._siralama: list[str] = []
+        self._limit: int | None = None
+        self._offset: int | None = None
+
+    # ════════════════ YARDIMCILAR ════════════════
+
+    def _kolon(self, kolon: str) -> str:
+        if kolon in self._repo.columns or kolon in _EK_KOLONLAR:
+            return kolon
+        raise ValueError(f"{self._repo.table}: bilinmeyen kolon '{kolon}'")
+
+    def _deger(self, kolon: str, deger, kirp: bool = False):
+        """Tarih kolonlarında ISO formatına normalize eder."""
+        if kolon in self._repo.date_fields or isinstance(deger, date):
+            return to_db_date(deger)
+        if kirp:
+            return str(deger).strip()
+        return deger
+
+    def _kosul(self, kolon: str, deger, ters: bool = False, kirp: bool = False) -> None:
+        kolon = self._kolon(kolon)
+        if deger is None:
+            self._kosullar.append(f"{kolon} IS {'NOT ' if ters else ''}NULL")
+            return
+        ifade = f"TRIM({kolon}, {_BOSLUKLAR})" if kirp else kolon
+        if isinstance(deger, (list, tuple, set, frozenset)):
+            degerler = [self._deger(kolon, d, kirp) for d in deger]
+            if not degerler:
+                # Boş IN → hiç satır (ters: filtre yok)
+                if not ters:
+                    self._kosullar.append("0")
+                return
+            ph = ", ".join("?" * len(degerler))
+            if ters:
+                # NOT IN NULL'ı elerdi; Python'daki gibi "farklı" sayılır
+                self._kosullar.append(f"({ifade} IS NULL OR {ifade} NOT IN ({ph}))")
+            else:
+                self._kosullar.append(f"{ifade} IN ({ph})")
+            self._params.extend(degerler)
+            return
+        # IS NOT: NULL değerli satırlar da "eşit değil" sayılır (Python ile aynı)
+        self._kosullar.append(f"{ifade} {'IS NOT' if ters else '='} ?")
+        self._params.append(self._deger(kolon, deger, kirp))
+
+    # ════════════════ FİLTRELER ════════════════
+
+    def where(self, **kosullar) -> "Query":
+        """Eşitlik / IN / IS NULL koşulları (AND ile bağlanır)."""
+        for kolon, deger in kosullar.items():
+            self._kosul(kolon, deger)
+        return self
+
+    def where_in(self, kolon: str, degerler) -> "Query":
+        """kolon IN (...) — where(kolon=[...]) ile aynı."""
+        self._kosul(kolon, list(degerler))
+        return self
+
+    def where_not(self, **kosullar) -> "Query":
+        """Eşitsizlik / NOT IN / IS NOT NULL koşulları."""
+        for kolon, deger in kosullar.items():
+            self._kosul(kolon, deger, ters=True)
+        return self
+
+    def where_trimmed(self, **kosullar) -> "Query":
+        """
+        where() gibi, ancak kolon ve değer boşluklardan arındırılarak
+        karşılaştırılır (str(x).strip() == str(y).strip()). Elle girilmiş,
+        baş-son boşluk taşıyabilen serbest metin kolonları için; indeks
+        kullanılamaz. Anahtar kolonlar "trim_fields" ile yazımda kırpılır.
+        """
+        for kolon, deger in kosullar.items():
+            self._kosul(kolon, deger, kirp=True)
+        return self
+
+    def where_not_trimmed(self, **kosullar) -> "Query":
+        """where_not() gibi, boşluklardan arındırılarak."""
+        for kolon, deger in kosullar.items():
+            self._kosul(kolon, deger, ters=True, kirp=True)
+        return self
+
+    def between(self, kolon: str, bas=None, bit=None) -> "Query":
+        """bas <= kolon <= bit. None olan uç uygulanmaz."""
+        kolon = self._kolon(kolon)
+        if bas is not None:
+            self._kosullar.append(f"{kolon} >= ?")
+            self._params.append(self._deger(kolon, bas))
+        if bit is not None:
+            self._kosullar.append(f"{kolon} <= ?")
+            self._params.append(self._deger(kolon, bit))
+        return self
+
+    def less_than(self, kolon: str, deger) -> "Query":
+        kolon = self._kolon(kolon)
+        self._kosullar.append(f"{kolon} < ?")
+        self._params.append(self._deger(kolon, deger))
+        return self
+
+    def greater_than(self, kolon: str, deger) -> "Query":
+        kolon = self._kolon(kolon)
+        self._kosullar.append(f"{kolon} > ?")
+        self._params.append(self._deger(kolon, deger))
+        return self
+
+    def overlaps(self, bas_kolon: str, bit_kolon: str, bas, bit) -> "Query":
+        """
+        [bas_kolon, bit_kolon] aralığı [bas, bit] ile kesişen satırlar.
+        Örnek: o aya taşan izinler →
+            .overlaps("BaslamaTarihi", "BitisTarihi", ay_bas, ay_bit)
+        """
+        self.between(bas_kolon, bit=bit)
+        self.between(bit_kolon, bas=bas)
+        return self
+
+    # ════════════════ SIRALAMA / SAYFALAMA ════════════════
+
+    def order_by(self, kolon: str, desc: bool = False) -> "Query":
+        self._siralama.append(f"{self._kolon(kolon)}{' DESC' if desc else ''}")
+        return self
+
+    def limit(self, n: int, offset: int | None = None) -> "Query":
+        self._limit = int(n)
+        self._offset = int(offset) if offset is not None else None
+        return self
+
+    # ════════════════ DERLEME ════════════════
+
+    def to_sql(self, secim: str | None = None) -> tuple[str, list]:
+        """(sql, params) çiftini döner."""
+        kolonlar = secim or (", ".join(self._secim) if self._secim else "*")
+        sql = f"SELECT {kolonlar} FROM {self._repo.table}"
+        if self._kosullar:
+            sql += " WHERE " + " AND ".join(self._kosullar)
+        params = list(self._params)
+        if self._siralama and secim is None:
+            sql += " ORDER BY " + ", ".join(self._siralama)
+        if self._limit is not None and secim is None:
+            sql += " LIMIT ?"
+            params.append(self._limit)
+            if self._offset is not None:
+                sql += " OFFSET ?"
+                params.append(self._offset)
+        return sql, params
+
+    # ════════════════ ÇALIŞTIRMA ════════════════
+
+    # Çalıştırma repo._satirlar() üzerinden: cacheable tablolarda önbellek kullanılır
+
+    def all(self) -> list[dict]:
+        sql, params = self.to_sql()
+        return [dict(r) for r in self._repo._satirlar(sql, params)]
+
+    def compact(self) -> list[Satir]:
+        """all() ile aynı satırlar; dict yerine kompakt Satir listesi."""
+        sql, params = self.to_sql()
+        return satirlara_donustur(self._repo._satirlar(sql, params))
+
+    def first(self) -> dict | None:
+        if self._limit is None:
+            self._limit = 1
+        sql, params = self.to_sql()
+        rows = self._repo._satirlar(sql, params)
+        return dict(rows[0]) if rows else None
+
+    def column(self, kolon: str) -> list:
+        """Tek kolonun değerlerini liste olarak döner."""
+        kolon = self._kolon(kolon)
+        self._secim = [kolon]
+        sql, params = self.to_sql()
+        return [r[0] for r in self._repo._satirlar(sql, params)]
+
+    def count(self) -> int:
+        sql, params = self.to_sql(secim="COUNT(*)")
+        rows = self._repo._satirlar(sql, params)
+        return int(rows[0][0]) if rows else 0
+
+    def exists(self) -> bool:
+        sql, params = self.to_sql(secim="1")
+        return bool(self._repo._satirlar(sql + " LIMIT 1", params))
@@ -30,6 +30,7 @@ def __init__(self, db, table_name: str = "Dokumanlar"):
             columns=config.get("columns", []),
             has_sync=False,  # Local-only
             date_fields=config.get("date_fields", []),
+            trim_fields=config.get("trim_fields", []),
         )
 
     def get_by_entity(self, entity_type: str, entity_id: str) -> List[Dict[str, Any]]:
@@ -1,4 +1,5 @@
 from database.base_repository import BaseRepository
+from database.table_cache import onbellek_al
 from database.table_config import TABLES
 
 
@@ -6,6 +7,8 @@ class RepositoryRegistry:
     def __init__(self, db):
         self.db = db
         self._repos = {}
+        # "cacheable" tablolar için paylaşılan read-through önbellek
+        self.onbellek = onbellek_al(db)
 
     def get(self, table_name):
         """
@@ -48,11 +51,24 @@ def get(self, table_name):
                     pk=cfg["pk"],
                     columns=cfg["columns"] + extra_cols,
                     has_sync=has_sync,
-                    date_fields=cfg.get("date_fields")
+                    date_fields=cfg.get("date_fields"),
+                    trim_fields=cfg.get("trim_fields"),
                 )
 
+            self._repos[table_name].nesil_sayaci = self.onbellek
+            if TABLES.get(table_name, {}).get("cacheable"):
+                self._repos[table_name].onbellek = self.onbellek
+
         return self._repos[table_name]
 
+    def onbellek_temizle(self, table_name=None):
+        """Repository dışından (ham SQL / sync) yazılan tablonun önbelleğini boşaltır."""
+        self.onbellek.gecersiz_kil(table_name)
+
+    def onbellek_istatistik(self) -> dict:
+        """Tanılama: tablo başına isabet / ıskalama / saklı sorgu sayısı."""
+        return self.onbellek.istatistik()
+
     def all_syncable(self):
         """
         Sadece senkronize edilebilir tabloların repository'lerini döner
@@ -0,0 +1,133 @@
+# database/row.py
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Kompakt, tuple tabanlı sonuç satırı
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+"""
+Büyük okuma sonuçları (Izin_Giris, NB_PlanSatir, Dozimetre_Olcum ...) için
+dict yerine kullanılabilen satır tipi.
+
+  - Değerler tek tuple'da; kolon adı → sıra eşlemesi (KolonIndeksi) aynı
+    sorgudan gelen tüm satırlarca paylaşılır. Satır başına anahtar
+    kopyası ve dict hash tablosu yoktur.
+  - Okuma arayüzü dict ile aynı: row["Kolon"], row.get("Kolon", ""),
+    keys() / values() / items(), "Kolon" in row, dict(row).
+  - Yeni anahtar atanabilir (row["_ek"] = ...) — ek alanlar yalnızca
+    ihtiyaç olduğunda açılan küçük bir dict'te tutulur.
+
+Kullanım (opt-in):
+    rows = repo.get_all(compact=True)
+    rows = repo.query().where(PlanID=pid).compact()
+    model.set_data(rows)              # BaseTableModel doğrudan tüketir
+"""
+from __future__ import annotations
+
+
+class KolonIndeksi:
+    """Kolon adı → tuple sırası; bir sonuç kümesindeki tüm satırlarca paylaşılır."""
+
+    __slots__ = ("kolonlar", "sira")
+
+    def __init__(self, kolonlar):
+        self.kolonlar: tuple = tuple(kolonlar)
+        self.sira: dict[str, int] = {k: i for i, k in enumerate(self.kolonlar)}
+
+
+class Satir:
+    """dict okuma arayüzüne sahip, tuple tabanlı satır."""
+
+    __slots__ = ("_indeks", "_degerler", "_ek")
+
+    def __init__(self, indeks: KolonIndeksi, degerler: tuple):
+        self._indeks = indeks
+        self._degerler = degerler
+        self._ek: dict | None = None
+
+    # ════════════════ OKUMA ════════════════
+
+    def __getitem__(self, anahtar):
+        if isinstance(anahtar, int):
+            return self._degerler[anahtar]
+        i = self._indeks.sira.get(anahtar)
+        if i is not None:
+            return self._degerler[i]
+        if self._ek is not None and anahtar in self._ek:
+            return self._ek[anahtar]
+        raise KeyError(anahtar)
+
+    def get(self, anahtar, varsayilan=None):
+        i = self._indeks.sira.get(anahtar)
+        if i is not None:
+            return self._degerler[i]
+        if self._ek is not None:
+            return self._ek.get(anahtar, varsayilan)
+        return varsayilan
+
+    def __contains__(self, anahtar) -> bool:
+        return anahtar in self._indeks.sira or (
+            self._ek is not None and anahtar in self._ek
+        )
+
+    def keys(self):
+        if self._ek is None:
+            return list(self._indeks.kolonlar)
+        return list(self._indeks.kolonlar) + [k for k in self._ek if k not in self._indeks.sira]
+
+    def values(self):
+        return [self[k] for k in self.keys()]
+
+    def items(self):
+        return [(k, self[k]) for k in self.keys()]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def to_dict(self) -> dict:
+        d = dict(zip(self._indeks.kolonlar, self._degerler))
+        if self._ek:
+            d.update(self._ek)
+        return d
+
+    copy = to_dict
+
+    def __eq__(self, diger) -> bool:
+        if isinstance(diger, (Satir, dict)):
+            return self.to_dict() == dict(diger)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Satir({self.to_dict()!r})"
+
+    # ════════════════ YAZMA ════════════════
+
+    def __setitem__(self, anahtar, deger) -> None:
+        i = self._indeks.sira.get(anahtar)
+        if i is not None:
+            # Nadir yol: mevcut kolonu değiştir (tuple yeniden kurulur)
+            degerler = list(self._degerler)
+            degerler[i] = deger
+            self._degerler = tuple(degerler)
+            return
+        if self._ek is None:
+            self._ek = {}
+        self._ek[anahtar] = deger
+
+    def setdefault(self, anahtar, varsayilan=None):
+        if anahtar not in self:
+            self[anahtar] = varsayilan
+        return self[anahtar]
+
+
+def satirlara_donustur(rows, kolonlar=None) -> list[Satir]:
+    """
+    sqlite3.Row / tuple listesini Satir listesine çevirir.
+    kolonlar verilmezse ilk satırın keys()'inden alınır (sqlite3.Row).
+    """
+    if not rows:
+        return []
+    indeks = KolonIndeksi(kolonlar if kolonlar is not None else rows[0].keys())
+    return [Satir(indeks, tuple(r)) for r in rows]
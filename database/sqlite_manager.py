@@ -1,9 +1,11 @@
 import sqlite3
-import time
+import threading
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime
 from core.paths import DB_PATH
 from core.logger import logger
+from database.connection_pool import havuz_al, havuz_birak
 
 
 @dataclass(frozen=True)
@@ -15,40 +17,163 @@ class DbUser:
     must_change_password: bool
 
 
+_YAZMA_KOMUTLARI = (
+    "INSERT", "UPDATE", "DELETE", "CREATE", "DROP", "ALTER", "REPLACE", "BEGIN", "COMMIT", "ROLLBACK"
+)
+
+
 class SQLiteManager:
+    """
+    Veritabanı erişim noktası. Bağlantılar database/connection_pool.py'deki
+    paylaşılan havuzdan gelir:
+
+      - self.conn  → tek yazıcı bağlantı (tüm SQLiteManager'larda ortak)
+      - SELECT     → çağıran thread'in salt okunur bağlantısı
+
+    check_same_thread geriye uyumluluk için kabul edilir; havuz
+    bağlantıları thread'ler arası güvenle paylaşılır.
+    """
+
     def __init__(self, db_path=None, check_same_thread=False):
         self.db_path = db_path or DB_PATH
-        logger.info("SQLite baglantisi aciliyor")
-        self.conn = sqlite3.connect(self.db_path, check_same_thread=check_same_thread, timeout=30)
-        # WAL mode enable et (concurrent write access icin)
-        self.conn.execute("PRAGMA journal_mode=WAL")
-        self.conn.row_factory = sqlite3.Row
+        self._havuz = havuz_al(self.db_path)
+        self.conn = self._havuz.yazici
+        # Yazma kilidi havuzda: aynı yazıcıyı paylaşan thread'ler
+        # birbirinin transaction'ını commit edemez
+        self._yazma_kilidi = self._havuz.yazma_kilidi
+        self._kapali = False
+
+    @property
+    def _tx_derinlik(self) -> int:
+        return self._havuz.tx_derinlik
+
+    @_tx_derinlik.setter
+    def _tx_derinlik(self, deger: int) -> None:
+        self._havuz.tx_derinlik = deger
+
+    @staticmethod
+    def _okuma_mi(stripped: str) -> bool:
+        if stripped.startswith("SELECT"):
+            return True
+        return stripped.startswith("PRAGMA") and "=" not in stripped
 
     def execute(self, query, params=()) -> sqlite3.Cursor:
-        # Yalnızca yazma işlemlerinde commit yap — SELECT'te gereksiz I/O yükü engellenir
         stripped = query.strip().upper()
-        is_write = any(stripped.startswith(k) for k in (
-            "INSERT", "UPDATE", "DELETE", "CREATE", "DROP", "ALTER", "REPLACE", "BEGIN", "COMMIT", "ROLLBACK"
-        ))
-        for attempt in range(5):
-            try:
-                cur = self.conn.cursor()
-                cur.execute(query, params)
-                if is_write:
-                    self.conn.commit()
-                return cur
-            except sqlite3.OperationalError as exc:
-                if "database is locked" in str(exc).lower() and attempt < 4:
-                    time.sleep(0.1 * (attempt + 1))
-                    continue
-                raise
-        # Tüm denemeler tükendiyse (teorik olarak ulaşılmaz)
-        raise sqlite3.OperationalError("Database execution failed after 5 attempts")
+
+        # Okuma: thread'in salt okunur bağlantısı — yazıcıyı beklemez.
+        # Aynı thread transaction içindeyse kendi yazdıklarını görmesi için yazıcı.
+        if self._okuma_mi(stripped) and not self._havuz.yazan_bu_thread_mi():
+            return self._havuz.okuyucu().execute(query, params)
+
+        # Yalnızca yazma işlemlerinde commit yap — SELECT'te gereksiz I/O yükü engellenir
+        is_write = stripped.startswith(_YAZMA_KOMUTLARI)
+        with self._yazma_kilidi:
+            cur = self.conn.cursor()
+            cur.execute(query, params)
+            # transaction() içindeyken commit en dış blokta yapılır
+            if is_write and self._tx_derinlik == 0:
+                self.conn.commit()
+            return cur
 
     def executemany(self, query, params_list):
-        cur = self.conn.cursor()
-        cur.executemany(query, params_list)
-        self.conn.commit()
+        with self._yazma_kilidi:
+            cur = self.conn.cursor()
+            cur.executemany(query, params_list)
+            if self._tx_derinlik == 0:
+                self.conn.commit()
+            return cur
+
+    # -- Transaction -------------------------------------------------------
+
+    @contextmanager
+    def transaction(self):
+        """
+        İç içe kullanılabilir transaction.
+
+            with db.transaction():
+                repo.insert(a)            # ara commit yok
+                with db.transaction():    # SAVEPOINT
+                    repo.insert(b)
+
+        En dış blok BEGIN/COMMIT, iç bloklar SAVEPOINT/RELEASE kullanır.
+        Blokta exception olursa yalnızca o seviye geri alınır ve exception
+        yukarı iletilir. Blok süresince diğer thread'lerin yazmaları bekler.
+        """
+        with self._yazma_kilidi:
+            seviye = self._tx_derinlik
+            sp = f"sp_{seviye}"
+            en_dis = seviye == 0 and not self.conn.in_transaction
+            self.conn.execute("BEGIN" if en_dis else f"SAVEPOINT {sp}")
+            if seviye == 0:
+                self._havuz.yazan_thread = threading.get_ident()
+            self._tx_derinlik += 1
+            try:
+                yield self
+            except BaseException:
+                self._tx_derinlik -= 1
+                if seviye == 0:
+                    self._havuz.yazan_thread = None
+                if en_dis:
+                    self.conn.rollback()
+                else:
+                    self.conn.execute(f"ROLLBACK TO {sp}")
+                    self.conn.execute(f"RELEASE {sp}")
+                if seviye == 0:
+                    self._tx_sonrasi_calistir()
+                raise
+            else:
+                self._tx_derinlik -= 1
+                if seviye == 0:
+                    self._havuz.yazan_thread = None
+                if en_dis:
+                    self.conn.commit()
+                else:
+                    self.conn.execute(f"RELEASE {sp}")
+                if seviye == 0:
+                    self._tx_sonrasi_calistir()
+
+    def tx_sonrasi(self, fn) -> None:
+        """
+        fn'i en dış transaction bittiğinde (commit veya rollback) çalıştırır;
+        açık transaction yoksa hemen çalıştırır. Önbellek geçersiz kılma gibi
+        "diğer thread'ler yeni durumu görmeden önce" yapılması gerekenler için.
+        """
+        with self._yazma_kilidi:
+            if self._tx_derinlik > 0:
+                self._havuz.tx_sonrasi_cagrilar.append(fn)
+                return
+        fn()
+
+    def _tx_sonrasi_calistir(self) -> None:
+        cagrilar = self._havuz.tx_sonrasi_cagrilar
+        self._havuz.tx_sonrasi_cagrilar = []
+        for fn in cagrilar:
+            try:
+                fn()
+            except Exception as exc:
+                logger.error(f"tx_sonrasi çağrısı hatası: {exc}")
+
+    @contextmanager
+    def okuma_anlik_goruntusu(self):
+        """
+        Blok boyunca bu thread'in SELECT'leri tek bir anlık görüntüyü görür
+        (okuyucu bağlantıda açık okuma transaction'ı; WAL'da yazıcıyı
+        bekletmez). Birden çok tabloyu tutarlı okumak gereken hesaplar için:
+
+            with db.okuma_anlik_goruntusu():
+                baglam = PlanlamaBaglami.olustur(registry, birim_id, yil, ay)
+
+        Ayrı okuyucu yoksa (:memory:) veya zaten açıksa etkisizdir.
+        """
+        conn = self._havuz.okuyucu()
+        if conn is self.conn or conn.in_transaction:
+            yield self
+            return
+        conn.execute("BEGIN")
+        try:
+            yield self
+        finally:
+            conn.rollback()
 
     # -- Auth/RBAC helpers -------------------------------------------------
 
@@ -375,5 +500,11 @@ def delete_user(self, user_id: int) -> None:
         self.execute("DELETE FROM Users WHERE UserId = ?", (user_id,))
 
     def close(self):
-        logger.info("SQLite baglantisi kapatiliyor")
-        self.conn.close()
+        """
+        Bu yöneticiyi havuzdan düşer ve çağıran thread'in okuyucusunu kapatır.
+        Yazıcı bağlantı, havuzu kullanan son yönetici kapanınca kapanır.
+        """
+        if self._kapali:
+            return
+        self._kapali = True
+        havuz_birak(self._havuz)
@@ -1,3 +1,7 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 from core.logger import (
     logger, 
     log_sync_start, 
@@ -6,6 +10,7 @@
     log_sync_complete
 )
 from database.gsheet_manager import GSheetManager
+from database.sync_state import SyncDurumDeposu, satir_hash, tablo_hash
 from database.table_config import TABLES
 from core.date_utils import looks_like_date_column, normalize_date_fields
 from core.config import AppConfig
@@ -51,28 +56,63 @@ class SyncService:
 
     Her tablo için akış:
     ────────────────────
-    1. Google Sheets'i TEK SEFER oku (read_all)
-    2. Local dirty kayıtları topla
+    1. Ön kontrol: remote sürüm (Drive modifiedTime) + local watermark
+       önceki turla aynıysa ve dirty kayıt yoksa tablo OKUNMADAN atlanır
+    2. Google Sheets'i TEK SEFER oku (read_all). Remote tablo hash'i önceki
+       turla aynıysa ve local değişmediyse tablo atlanır (delta sync)
     3. PUSH: dirty kayıtları toplu gönder (batch_update + batch_append)
-    4. PULL: remote'ta olup local'de olmayanları toplu ekle
-    5. PULL: remote'taki güncellemeleri local'e yansıt (clean kayıtlar için)
+    4. PULL: local tablo tek sorguda PK map'ine alınır; yalnızca satır
+       hash'i önceki turdan farklı olan remote kayıtlar local ile karşılaştırılır
+    5. PULL: tüm yeni/değişen satırlar tek transaction'da executemany ile yazılır
     6. Bir sonraki tabloya geç
 
     API çağrı sayısı:
     ESKİ → tablo başına: 1 + (dirty × 3) = onlarca istek
     YENİ → tablo başına: 1 okuma + 1-2 yazma = 2-3 istek
+
+    Paralel mod (ayarlar.json sync_workers / AppConfig.SYNC_WORKERS > 1):
+    ─────────────────────────────────────────
+    Tablolar bir thread havuzunda eşzamanlı işlenir. Sheets çağrıları
+    GSheetManager'ın paylaşılan token bucket'ı ile kotada tutulur; tüm
+    SQLite erişimi tek bir yazıcı thread'e (_db) sıralanır.
     """
 
-    def __init__(self, db, registry):
+    def __init__(self, db, registry, gsheet=None):
         self.db = db
         self.registry = registry
-        self.gsheet = GSheetManager()
+        # gsheet: test için GSheetManager(cloud_adapter=<sahte adapter>) verilebilir
+        self.gsheet = gsheet or GSheetManager()
+        self.sync_durum = SyncDurumDeposu(db)
+        self._iptal = threading.Event()
+        self._yazici = None          # paralel modda tek thread'li SQLite executor
+        self._yazici_tid = None
+
+    # ═══════════════════════════════════════════════
+
+    def iptal_et(self):
+        """Henüz başlamamış tabloları atlat (kapanış dialogu için)."""
+        self._iptal.set()
+
+    def _yazici_baslat(self):
+        self._yazici_tid = threading.get_ident()
+
+    def _db(self, fn, *args):
+        """
+        SQLite işini çalıştırır. Paralel modda tek yazıcı thread'e gönderilir
+        ve sonucu beklenir; sıralı modda doğrudan çağrılır.
+        """
+        if self._yazici is None or threading.get_ident() == self._yazici_tid:
+            return fn(*args)
+        return self._yazici.submit(fn, *args).result()
 
     # ═══════════════════════════════════════════════
 
-    def sync_all(self):
+    def sync_all(self, workers=None, ilerleme=None):
         """
-        Tüm senkronize edilebilir tabloları sırayla işler.
+        Tüm senkronize edilebilir tabloları işler.
+
+        workers  : eşzamanlı tablo sayısı (None → AppConfig.get_sync_workers(), 1 → sıralı)
+        ilerleme : callable(table_name, tamamlanan, toplam) — her tablo bitiminde
         """
         if not AppConfig.is_online_mode():
             logger.info("Offline mod: sync_all atlandi")
@@ -86,44 +126,58 @@ def sync_all(self):
         total = len(syncable)
         success = 0
         failures = []
+        iptal = 0
+        workers = max(1, int(workers or AppConfig.get_sync_workers()))
+        self._iptal.clear()
+        t0 = time.perf_counter()
 
-        logger.info(f"Toplam {total} tablo senkronize edilecek")
+        logger.info(f"Toplam {total} tablo senkronize edilecek (workers={workers})")
 
-        for i, (table_name, cfg) in enumerate(syncable, 1):
-            try:
-                logger.info(f"[{i}/{total}] {table_name} sync başladı")
-                log_sync_start(table_name)
-                
-                self.sync_table(table_name)
-                
+        def sonuc_isle(table_name, sonuc, tamamlanan):
+            nonlocal success, iptal
+            if sonuc is None:
                 success += 1
-                logger.info(f"[{i}/{total}] {table_name} sync başarılı ✓")
-                
-            except Exception as e:
-                error_type = type(e).__name__
-                error_msg = str(e)
-                failure = {
-                    "event": "SYNC_TABLE_FAILED",
-                    "table": table_name,
-                    "step": "sync_table",
-                    "error_type": error_type,
-                    "error_msg": error_msg[:200],
-                    "table_index": i,
-                    "table_total": total,
-                }
-                 
-                logger.error(f"[{i}/{total}] {table_name} sync hatası: {error_type}")
-                log_sync_error(table_name, "sync_table", e)
-                 
-                failures.append(failure)
-                 
-                # Bir tablo hata alırsa diğerlerine devam et
-                continue
+            elif sonuc == "iptal":
+                iptal += 1
+            else:
+                failures.append(sonuc)
+            if ilerleme:
+                ilerleme(table_name, tamamlanan, total)
+
+        if workers == 1:
+            for i, (table_name, _cfg) in enumerate(syncable, 1):
+                sonuc_isle(table_name, self._tablo_calistir(table_name, i, total), i)
+        else:
+            with ThreadPoolExecutor(
+                max_workers=1,
+                thread_name_prefix="sync-db",
+                initializer=self._yazici_baslat,
+            ) as yazici:
+                self._yazici = yazici
+                try:
+                    with ThreadPoolExecutor(
+                        max_workers=workers, thread_name_prefix="sync"
+                    ) as havuz:
+                        futures = {
+                            havuz.submit(self._tablo_calistir, table_name, i, total): table_name
+                            for i, (table_name, _cfg) in enumerate(syncable, 1)
+                        }
+                        for tamamlanan, fut in enumerate(as_completed(futures), 1):
+                            sonuc_isle(futures[fut], fut.result(), tamamlanan)
+                finally:
+                    self._yazici = None
+                    self._yazici_tid = None
 
         # Özet log
         logger.info("=" * 60)
-        logger.info(f"SYNC ÖZETİ: {success}/{total} tablo başarılı")
+        logger.info(
+            f"SYNC ÖZETİ: {success}/{total} tablo başarılı "
+            f"({time.perf_counter() - t0:.2f} sn)"
+        )
+        if iptal:
+            logger.warning(f"İptal nedeniyle atlanan tablolar: {iptal}")
         if failures:
+            failures.sort(key=lambda f: f["table_index"])
             logger.error(f"Başarısız tablolar: {len(failures)}")
             for fail in failures:
                 logger.error(
@@ -138,6 +192,39 @@ def sync_all(self):
                 successful_tables=success,
             )
 
+    def _tablo_calistir(self, table_name, i, total):
+        """
+        sync_all için tek tablo. Başarıda None, iptalde "iptal",
+        hatada failure dict döner (exception yukarı taşınmaz).
+        """
+        if self._iptal.is_set():
+            return "iptal"
+        try:
+            logger.info(f"[{i}/{total}] {table_name} sync başladı")
+            log_sync_start(table_name)
+
+            self.sync_table(table_name)
+
+            logger.info(f"[{i}/{total}] {table_name} sync başarılı ✓")
+            return None
+
+        except Exception as e:
+            error_type = type(e).__name__
+            error_msg = str(e)
+            logger.error(f"[{i}/{total}] {table_name} sync hatası: {error_type}")
+            log_sync_error(table_name, "sync_table", e)
+
+            # Bir tablo hata alırsa diğerlerine devam et
+            return {
+                "event": "SYNC_TABLE_FAILED",
+                "table": table_name,
+                "step": "sync_table",
+                "error_type": error_type,
+                "error_msg": error_msg[:200],
+                "table_index": i,
+                "table_total": total,
+            }
+
     # ═══════════════════════════════════════════════
 
     def sync_table(self, table_name: str):
@@ -155,7 +242,8 @@ def sync_table(self, table_name: str):
             log_sync_step(table_name, "pull_only_mode")
             self._pull_replace(table_name, cfg)
             return
-        
+
+        t_baslangic = time.perf_counter()
         repo = self.registry.get(table_name)
         cfg = TABLES[table_name]
         pk = cfg["pk"]  # string veya list
@@ -169,18 +257,62 @@ def make_key(data):
 
         try:
             # ──────────────────────────────────────────
-            # 1️⃣  Google Sheets'i TEK SEFER oku
+            # 1️⃣  Ön kontrol: kayıtları okumadan değişiklik var mı?
+            # ──────────────────────────────────────────
+            ws = self.gsheet.get_worksheet(table_name)
+            # Okumadan ÖNCE alınır: okuma sırasında gelen remote yazım
+            # sonraki turda farklı sürüm olarak görünür
+            remote_surum = self.gsheet.remote_surum(ws)
+
+            log_sync_step(table_name, "check_dirty")
+            dirty_rows, durum, watermark = self._db(lambda: (
+                repo.get_dirty(),
+                self.sync_durum.tablo_durumu(table_name),
+                self.sync_durum.yerel_watermark(table_name),
+            ))
+            logger.info(f"  Local dirty: {len(dirty_rows)}")
+
+            yerel_ayni = bool(durum) and durum.get("Watermark") == watermark
+            if (yerel_ayni and not dirty_rows and remote_surum
+                    and durum.get("RemoteSurum") == remote_surum):
+                log_sync_step(table_name, "unchanged_skip")
+                logger.info(
+                    f"  {table_name} remote sürüm aynı, okunmadan atlandı "
+                    f"({time.perf_counter() - t_baslangic:.3f} sn)"
+                )
+                log_sync_complete(table_name, {'pushed': 0, 'pulled': 0})
+                return
+
+            # ──────────────────────────────────────────
+            # 2️⃣  Google Sheets'i TEK SEFER oku
             # ──────────────────────────────────────────
             log_sync_step(table_name, "read_remote")
-            remote_rows, pk_index, ws = self.gsheet.read_all(table_name)
+            remote_rows, pk_index, ws = self.gsheet.read_all(table_name, ws)
             log_sync_step(table_name, "read_remote_complete", len(remote_rows))
 
+            kolonlar = cfg["columns"]
+            remote_rows = [normalize_date_fields(r, repo.date_fields) for r in remote_rows]
+            remote_hashler = [satir_hash(r, kolonlar) for r in remote_rows]
+            remote_tablo_hash = tablo_hash(remote_hashler)
+
+            # Delta kontrolü: içerik aynı (ör. aynı dosyadaki başka sayfa
+            # yazıldı) → tabloyu atla, yeni sürümü kaydet
+            if yerel_ayni and not dirty_rows and durum.get("TabloHash") == remote_tablo_hash:
+                self._db(self.sync_durum.remote_surum_kaydet, table_name, remote_surum)
+                log_sync_step(table_name, "unchanged_skip")
+                logger.info(
+                    f"  {table_name} değişiklik yok, atlandı "
+                    f"({time.perf_counter() - t_baslangic:.3f} sn)"
+                )
+                log_sync_complete(table_name, {'pushed': 0, 'pulled': 0})
+                return
+
             # ──────────────────────────────────────────
-            # 2️⃣  PUSH: Local → Google Sheets
+            # 3️⃣  PUSH: Local → Google Sheets
             # ──────────────────────────────────────────
-            log_sync_step(table_name, "check_dirty")
-            dirty_rows = repo.get_dirty()
-            logger.info(f"  Local dirty: {len(dirty_rows)}")
+
+            # Local watermark değiştiyse önceki hash'lere güvenilmez → tam diff
+            onceki_hashler = self._db(self.sync_durum.satir_hashleri, table_name) if yerel_ayni else {}
 
             to_update = []
             to_append = []
@@ -202,63 +334,91 @@ def make_key(data):
                 self.gsheet.batch_append(table_name, ws, to_append)
                 logger.info(f"  PUSH yeni ekleme: {len(to_append)}")
 
-            # Dirty → clean
-            just_pushed_keys = set()
-            for row in dirty_rows:
-                pk_val = {col: row.get(col) for col in pk_cols} if len(pk_cols) > 1 else row.get(pk_cols[0])
-                repo.mark_clean(pk_val)
-                just_pushed_keys.add(make_key(row))  # PULL'da stale remote ile ezilmesin
+            # Dirty → clean (tek transaction)
+            just_pushed_keys = {make_key(row) for row in dirty_rows}  # PULL'da stale remote ile ezilmesin
+            if dirty_rows and repo.has_sync:
+                self._db(
+                    self._toplu_yaz,
+                    f"UPDATE {table_name} SET sync_status='clean' "
+                    f"WHERE {' AND '.join(f'{c}=?' for c in pk_cols)}",
+                    [[row.get(c) for c in pk_cols] for row in dirty_rows],
+                )
+                self.registry.onbellek_temizle(table_name)
 
             # ──────────────────────────────────────────
-            # 3️⃣  PULL: Google Sheets → Local
+            # 4️⃣  PULL: Google Sheets → Local
             # ──────────────────────────────────────────
             log_sync_step(table_name, "pull_remote")
+            t_pull = time.perf_counter()
+
+            # Local tablo tek sorguda: {pk_key: satır}
+            local_map = {make_key(r): r for r in self._db(lambda: repo.query().all())}
+            karsilastir = [c for c in kolonlar if c not in ("sync_status", "updated_at")]
+            yeni_hashler: dict = {}
+            atlanan = 0
+
+            def norm(val):
+                return "" if val is None else str(val).strip()
+
+            # Aynı PK remote'ta birden fazla varsa son satır kazanır
+            # (eski akıştaki ardışık INSERT OR REPLACE ile aynı sonuç)
+            yazilacak: dict = {}
             new_count = 0
             updated_count = 0
 
-            for remote in remote_rows:
+            for remote, r_hash in zip(remote_rows, remote_hashler):
                 key = make_key(remote)
                 if not key or key == "|".join([""] * len(pk_cols)):
                     continue
 
                 # Az önce push edilmiş kayıt: remote henüz güncel değil, atla
+                # (hash saklanmaz → sonraki turda yeniden karşılaştırılır)
                 if key in just_pushed_keys:
                     continue
 
-                pk_val = {col: remote.get(col) for col in pk_cols} if len(pk_cols) > 1 else remote.get(pk_cols[0])
-                local = repo.get_by_id(pk_val)
+                yeni_hashler[key] = r_hash
+                local = local_map.get(key)
 
-                if not local:
+                # Önceki turdan beri remote satır değişmemiş ve local'de mevcut
+                if local is not None and onceki_hashler.get(key) == r_hash:
+                    atlanan += 1
+                    continue
+
+                if local is None:
                     # Yeni kayıt → ekle
-                    remote["sync_status"] = "clean"
-                    repo.insert(remote)
-                    new_count += 1
-                else:
-                    # 🔧 FIX: Mevcut kayıt var
-                    # Local'de dirty değilse (yani kullanıcı değiştirmemişse),
-                    # Google Sheets'teki güncellemeleri al
-                    local_status = local.get("sync_status", "").strip()
-                    
-                    if local_status != "dirty":
-                        # Remote'taki verilerle local'i güncelle
-                        # (sync_status'u clean olarak koru)
-                        remote["sync_status"] = "clean"
-                        
-                        # Sadece değişen alanları güncelle
-                        has_changes = False
-                        for col in cfg["columns"]:
-                            if col in ["sync_status", "updated_at"]:
-                                continue
-                            remote_val = str(remote.get(col, "")).strip()
-                            local_val = str(local.get(col, "")).strip()
-                            if remote_val != local_val:
-                                has_changes = True
-                                break
-                        
-                        if has_changes:
-                            repo.insert(remote)  # INSERT OR REPLACE
-                            updated_count += 1
-                    # else: Local dirty → kullanıcı değiştirmiş, dokunma
+                    if key not in yazilacak:
+                        new_count += 1
+                    yazilacak[key] = remote
+                    continue
+
+                # Local dirty → kullanıcı değiştirmiş, dokunma
+                if norm(local.get("sync_status")) == "dirty":
+                    continue
+
+                # Local'de dirty değilse Google Sheets'teki güncellemeleri al
+                if any(norm(remote.get(c)) != norm(local.get(c)) for c in karsilastir):
+                    if key not in yazilacak:
+                        updated_count += 1
+                    yazilacak[key] = remote
+
+            if yazilacak:
+                self._db(self._pull_yaz, repo, list(yazilacak.values()))
+
+            logger.info(
+                f"  PULL {table_name}: {len(remote_rows)} remote / {len(local_map)} local, "
+                f"{atlanan} hash ile atlandı, {len(yazilacak)} yazıldı "
+                f"({time.perf_counter() - t_pull:.3f} sn)"
+            )
+
+            # Push yapıldıysa remote değişti; tablo hash'i ve sürüm bir
+            # sonraki okumada tazelenir
+            self._db(lambda: self.sync_durum.kaydet(
+                table_name,
+                "" if just_pushed_keys else remote_tablo_hash,
+                self.sync_durum.yerel_watermark(table_name),
+                yeni_hashler,
+                "" if just_pushed_keys else remote_surum,
+            ))
 
             if new_count:
                 log_sync_step(table_name, "pull_new", new_count)
@@ -274,12 +434,29 @@ def make_key(data):
                 'pulled': new_count + updated_count
             }
             log_sync_complete(table_name, stats)
-            logger.info(f"  {table_name} sync tamamlandı ✓")
+            logger.info(
+                f"  {table_name} sync tamamlandı ✓ "
+                f"({time.perf_counter() - t_baslangic:.3f} sn)"
+            )
             
         except Exception as e:
             log_sync_error(table_name, "sync_table", e)
             raise  # Hatayı yukarı ilet
 
+    # ═══════════════════════════════════════════════
+
+    def _toplu_yaz(self, sql: str, params_list: list):
+        """Tek transaction içinde executemany; hata olursa tamamı geri alınır."""
+        with self.db.transaction():
+            self.db.executemany(sql, params_list)
+
+    def _pull_yaz(self, repo, rows: list[dict]):
+        """
+        Pull edilen satırları repo.insert_many() ile toplu yazar
+        (INSERT OR REPLACE, tek transaction); sync_status='clean'.
+        """
+        repo.insert_many({**row, "sync_status": "clean"} for row in rows)
+
     def _pull_replace(self, table_name, cfg):
         """
         Pull-only modda çalışan tablolar için özel sync mantığı.
@@ -316,10 +493,36 @@ def _pull_replace(self, table_name, cfg):
                 logger.warning(f"  {table_name} worksheet bulunamadı, atlanıyor")
                 return
 
+            # Ön kontrol: remote sürüm ve local tablo önceki turla aynıysa okunmaz
+            remote_surum = self.gsheet.remote_surum(ws)
+            durum, watermark = self._db(lambda: (
+                self.sync_durum.tablo_durumu(table_name),
+                self.sync_durum.yerel_watermark(table_name),
+            ))
+            yerel_ayni = bool(durum) and durum.get("Watermark") == watermark
+            if yerel_ayni and remote_surum and durum.get("RemoteSurum") == remote_surum:
+                log_sync_step(table_name, "pull_only_unchanged_skip")
+                logger.info(f"  {table_name} remote sürüm aynı, okunmadan atlandı")
+                log_sync_complete(table_name, {'pushed': 0, 'pulled': 0})
+                return
+
+            self.gsheet.throttle()
             records = ws.get_all_records()
             log_sync_step(table_name, "pull_only_read", len(records))
             logger.info(f"  Google Sheets'ten {len(records)} kayıt okundu")
 
+            # Delta kontrolü: Sheets içeriği ve local tablo önceki turla aynıysa
+            # DELETE + INSERT yapılmaz
+            remote_tablo_hash = tablo_hash(
+                satir_hash(normalize_date_fields(r, date_fields), columns) for r in records
+            )
+            if yerel_ayni and durum.get("TabloHash") == remote_tablo_hash:
+                self._db(self.sync_durum.remote_surum_kaydet, table_name, remote_surum)
+                log_sync_step(table_name, "pull_only_unchanged_skip")
+                logger.info(f"  {table_name} değişiklik yok, atlandı")
+                log_sync_complete(table_name, {'pushed': 0, 'pulled': 0})
+                return
+
             # ── 2. Boş PK filtresi + aynı tarihe düşen tatilleri birleştir ──
             #
             # Örnek: 23.04.2023 hem "Ramazan Bayramı 3.gün" hem
@@ -391,46 +594,54 @@ def _pull_replace(self, table_name, cfg):
             # ── 3-4. Local tabloyu temizle ve kayıtları yaz (TRANSACTION) ──
             # Birleştirme sonrası artık duplicate PK kalmaz,
             # yine de OR REPLACE bırakıyoruz ek güvence olarak.
-            inserted = 0
             failed_rows = []
             cols_str = ", ".join(columns)
             placeholders = ", ".join(["?"] * len(columns))
             sql = f"INSERT OR REPLACE INTO {table_name} ({cols_str}) VALUES ({placeholders})"
 
-            try:
-                # Transaction başlat: DELETE + ALL INSERTs atomik işlem
-                self.db.conn.execute("BEGIN")
-                
-                # DELETE FROM {table_name}
-                self.db.conn.execute(f"DELETE FROM {table_name}")
-                logger.info(f"  Local {table_name} tablosu temizlendi (transaction içinde)")
-                
-                # INSERT ALL rows
-                for row in valid_records:
-                    values = [row.get(col, "") for col in columns]
-                    try:
-                        self.db.conn.execute(sql, values)
-                        inserted += 1
-                    except Exception as row_error:
-                        row_preview = {c: row.get(c) for c in columns}
-                        failed_rows.append({"error": str(row_error), "data": row_preview})
-                        logger.error(
-                            f"  [{table_name}] INSERT hatası: "
-                            f"{type(row_error).__name__}: {row_error} | Veri: {row_preview}"
+            def yerine_yaz():
+                inserted = 0
+                try:
+                    # Transaction: DELETE + ALL INSERTs atomik işlem
+                    with self.db.transaction():
+                        self.db.conn.execute(f"DELETE FROM {table_name}")
+                        logger.info(f"  Local {table_name} tablosu temizlendi (transaction içinde)")
+
+                        # INSERT ALL rows
+                        for row in valid_records:
+                            values = [row.get(col, "") for col in columns]
+                            try:
+                                self.db.conn.execute(sql, values)
+                                inserted += 1
+                            except Exception as row_error:
+                                row_preview = {c: row.get(c) for c in columns}
+                                failed_rows.append({"error": str(row_error), "data": row_preview})
+                                logger.error(
+                                    f"  [{table_name}] INSERT hatası: "
+                                    f"{type(row_error).__name__}: {row_error} | Veri: {row_preview}"
+                                )
+                                # Devam et, transaction'da kalış
+
+                        self.sync_durum.kaydet(
+                            table_name, remote_tablo_hash,
+                            self.sync_durum.yerel_watermark(table_name),
+                            remote_surum=remote_surum,
                         )
-                        # Devam et, transaction'da kalış
-                
-                # Transaction commit (DELETE ve tüm başarılı INSERTs kalıcı)
-                self.db.conn.commit()
-                logger.info(f"[{table_name}] Transaction commit: {inserted} kayıt yazıldı")
-                
-            except Exception as txn_error:
-                # Transaction rollback: DELETE ve kısmi INSERTs geri alındı
-                self.db.conn.rollback()
-                logger.error(
-                    f"[{table_name}] Transaction rollback nedeni: {type(txn_error).__name__}: {txn_error}"
-                )
-                raise
+                    # Blok sonunda commit (DELETE ve tüm başarılı INSERTs kalıcı)
+                    logger.info(f"[{table_name}] Transaction commit: {inserted} kayıt yazıldı")
+
+                except Exception as txn_error:
+                    # transaction() rollback yaptı: DELETE ve kısmi INSERTs geri alındı
+                    logger.error(
+                        f"[{table_name}] Transaction rollback nedeni: {type(txn_error).__name__}: {txn_error}"
+                    )
+                    raise
+
+                return inserted
+
+            # Paralel modda yazıcı thread'de çalışır
+            inserted = self._db(yerine_yaz)
+            self.registry.onbellek_temizle(table_name)
 
             # ── 5. Özet rapor ──
             total_skipped = len(skipped_rows) + len(failed_rows)
@@ -0,0 +1,128 @@
+# database/sync_state.py
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Delta sync durumu (tablo watermark + PK başına içerik hash'i)
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+"""
+SyncService'in bir önceki başarılı turda gördüğü durumu saklar.
+
+  Sync_Durum      — tablo başına: remote sürüm belirteci, remote tablo
+                    hash'i + local watermark
+  Sync_SatirHash  — tablo + PK başına: remote satırın içerik hash'i
+
+Akış:
+  - Remote sürüm (Drive modifiedTime) aynı, local watermark aynı ve dirty
+    kayıt yoksa worksheet kayıtları hiç okunmadan tablo atlanır.
+  - Remote tablo hash'i aynı, local watermark aynı ve dirty kayıt yoksa
+    tablo hiç diff edilmeden atlanır.
+  - Aksi halde yalnızca hash'i değişen / yeni PK'lar local ile karşılaştırılır.
+
+Tablolar MigrationManager v11 ile oluşturulur (RemoteSurum: v14); table_config'te yer almaz
+(sync edilmez).
+"""
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime
+
+
+_AYRAC = "\x1f"
+
+
+def satir_hash(row: dict, kolonlar) -> str:
+    """Satır içeriğinin kolon sırasına bağlı hash'i (None == "")."""
+    parcalar = []
+    for c in kolonlar:
+        v = row.get(c)
+        parcalar.append("" if v is None else str(v).strip())
+    return hashlib.sha1(_AYRAC.join(parcalar).encode("utf-8")).hexdigest()
+
+
+def tablo_hash(satir_hashleri) -> str:
+    """Satır hash'lerinin (okuma sırasıyla) birleşik hash'i."""
+    h = hashlib.sha1()
+    for sh in satir_hashleri:
+        h.update(sh.encode("ascii"))
+    return h.hexdigest()
+
+
+class SyncDurumDeposu:
+    """Sync_Durum / Sync_SatirHash tabloları için erişim katmanı."""
+
+    def __init__(self, db):
+        self.db = db
+
+    # ════════════════ OKUMA ════════════════
+
+    def tablo_durumu(self, tablo: str) -> dict | None:
+        cur = self.db.execute(
+            "SELECT TabloHash, Watermark, SatirSayisi, SonSync, RemoteSurum "
+            "FROM Sync_Durum WHERE TabloAdi=?",
+            (tablo,)
+        )
+        row = cur.fetchone()
+        return dict(row) if row else None
+
+    def satir_hashleri(self, tablo: str) -> dict[str, str]:
+        cur = self.db.execute(
+            "SELECT PkKey, SatirHash FROM Sync_SatirHash WHERE TabloAdi=?",
+            (tablo,)
+        )
+        return {r[0]: r[1] for r in cur.fetchall()}
+
+    def yerel_watermark(self, tablo: str) -> str:
+        """
+        Local tablonun ucuz parmak izi: satır sayısı + MAX(updated_at).
+        sync_status değiştirmeden yapılan yazımları (ör. pull) da yakalar.
+        """
+        try:
+            row = self.db.execute(
+                f"SELECT COUNT(*), MAX(updated_at) FROM {tablo}"
+            ).fetchone()
+        except Exception:
+            row = self.db.execute(f"SELECT COUNT(*), NULL FROM {tablo}").fetchone()
+        return f"{row[0]}|{row[1] or ''}"
+
+    # ════════════════ YAZMA ════════════════
+
+    def kaydet(self, tablo: str, tablo_hash_: str, watermark: str,
+               satir_hashleri: dict[str, str] | None = None,
+               remote_surum: str = "") -> None:
+        """
+        Başarılı turun durumunu tek transaction'da yazar.
+        satir_hashleri None ise mevcut satır hash'lerine dokunulmaz.
+        remote_surum boşsa sonraki tur okumadan atlayamaz.
+        """
+        with self.db.transaction():
+            self.db.execute(
+                "INSERT OR REPLACE INTO Sync_Durum "
+                "(TabloAdi, TabloHash, Watermark, SatirSayisi, SonSync, RemoteSurum) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    tablo, tablo_hash_, watermark,
+                    len(satir_hashleri) if satir_hashleri is not None else None,
+                    datetime.now().isoformat(), remote_surum,
+                )
+            )
+            if satir_hashleri is not None:
+                self.db.execute("DELETE FROM Sync_SatirHash WHERE TabloAdi=?", (tablo,))
+                self.db.executemany(
+                    "INSERT INTO Sync_SatirHash (TabloAdi, PkKey, SatirHash) "
+                    "VALUES (?, ?, ?)",
+                    [(tablo, k, h) for k, h in satir_hashleri.items()]
+                )
+
+    def remote_surum_kaydet(self, tablo: str, remote_surum: str) -> None:
+        """İçerik aynı çıktığında yalnızca sürüm belirtecini tazeler."""
+        self.db.execute(
+            "UPDATE Sync_Durum SET RemoteSurum=?, SonSync=? WHERE TabloAdi=?",
+            (remote_surum, datetime.now().isoformat(), tablo)
+        )
+
+    def sifirla(self, tablo: str | None = None) -> None:
+        """Durumu siler; sonraki tur tam karşılaştırma yapar."""
+        if tablo is None:
+            self.db.execute("DELETE FROM Sync_SatirHash")
+            self.db.execute("DELETE FROM Sync_Durum")
+        else:
+            self.db.execute("DELETE FROM Sync_SatirHash WHERE TabloAdi=?", (tablo,))
+            self.db.execute("DELETE FROM Sync_Durum WHERE TabloAdi=?", (tablo,))
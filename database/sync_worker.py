@@ -23,6 +23,7 @@ class SyncWorker(QThread):
     def __init__(self, parent=None):
         super().__init__(parent)
         self._running = True
+        self._sync_service = None
 
     # -----------------------------------------------------
 
@@ -52,6 +53,7 @@ def run(self):
                 db=db,
                 registry=registry
             )
+            self._sync_service = sync_service
 
             # 📁 DOSYA SYNC — DB sync'ten önce çalışır.
             # Offline kaydedilen dosyaları Drive'a yükler,
@@ -74,7 +76,9 @@ def run(self):
             # 🔁 TÜM TABLOLAR - Hata takibi ile
             try:
                 logger.info("Tüm tabloların senkronizasyonu başlıyor...")
-                sync_service.sync_all()
+                sync_service.sync_all(
+                    ilerleme=lambda tablo, i, n: self.progress.emit(tablo, i, n)
+                )
                 logger.info("✓ Tüm tablolar başarıyla senkronize edildi")
 
             except SyncBatchError as sync_error:
@@ -104,6 +108,7 @@ def run(self):
             self.error.emit(short_msg, detail_msg)
 
         finally:
+            self._sync_service = None
             if db:
                 db.close()
 
@@ -114,6 +119,9 @@ def stop(self):
         Thread güvenli şekilde durdurulur
         """
         self._running = False
+        # Başlamamış tablolar atlanır; süren tablolar bitince thread sonlanır
+        if self._sync_service is not None:
+            self._sync_service.iptal_et()
         self.quit()
         self.wait()
 
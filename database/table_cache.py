@@ -0,0 +1,108 @@
+# database/table_cache.py
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Referans tabloları için read-through sorgu önbelleği
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+"""
+table_config'te "cacheable": True işaretli tabloların (Sabitler, Tatiller,
+NB_Birim ...) SELECT sonuçlarını (sql, params) anahtarıyla saklar.
+
+  - Okuma: BaseRepository (get_all, get_by_id, query() ...) önce önbelleğe bakar.
+  - Geçersiz kılma: BaseRepository yazımları, SyncService pull'u ve
+    ham SQL ile yazan servisler gecersiz_kil(tablo) çağırır.
+  - Aynı veritabanı dosyasını kullanan tüm registry'ler tek önbelleği
+    paylaşır (worker'ın yazdığı UI'de de geçersiz olur).
+  - Nesil sayacı cacheable olmayan tablolarda da artar (repository
+    yazımları); türetilmiş önbellekler nesil(tablo) ile tazelik denetler.
+
+Satırlar sqlite3.Row olarak saklanır (değiştirilemez); çağıranlar her
+seferinde dict(r) ile kendi kopyasını üretir.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from collections import defaultdict
+
+
+class TabloOnbellegi:
+    """Tablo → {(sql, params): satırlar} önbelleği; isabet/ıskalama sayaçlı."""
+
+    def __init__(self):
+        self._veri: dict[str, dict[tuple, list]] = defaultdict(dict)
+        # Tablo başına nesil: yükleme sürerken gelen geçersiz kılma,
+        # eski sonucun önbelleğe yazılmasını engeller
+        self._nesil: dict[str, int] = defaultdict(int)
+        # Thread başına nesil artışları: yazan thread kendi artışını ayırt eder
+        self._yerel = threading.local()
+        self._kilit = threading.Lock()
+        self.isabet: dict[str, int] = defaultdict(int)
+        self.iskalama: dict[str, int] = defaultdict(int)
+
+    def oku(self, tablo: str, anahtar: tuple, yukle) -> list:
+        """Önbellekte varsa döner, yoksa yukle() sonucunu saklayıp döner."""
+        with self._kilit:
+            satirlar = self._veri[tablo].get(anahtar)
+            if satirlar is not None:
+                self.isabet[tablo] += 1
+                return satirlar
+            self.iskalama[tablo] += 1
+            nesil = self._nesil[tablo]
+
+        satirlar = yukle()
+
+        with self._kilit:
+            if self._nesil[tablo] == nesil:
+                self._veri[tablo][anahtar] = satirlar
+        return satirlar
+
+    def gecersiz_kil(self, tablo: str | None = None) -> None:
+        """Tablonun (None → tümünün) önbelleğini boşaltır."""
+        with self._kilit:
+            tablolar = [tablo] if tablo else list(self._veri)
+            for t in tablolar:
+                self._veri.pop(t, None)
+                self._nesil[t] += 1
+        artis = self._yerel.__dict__.setdefault("artis", defaultdict(int))
+        for t in tablolar:
+            artis[t] += 1
+
+    def nesil(self, tablo: str) -> int:
+        """Tablonun geçersiz kılma sayacı; türetilmiş önbellekler tazelik için karşılaştırır."""
+        with self._kilit:
+            return self._nesil[tablo]
+
+    def yerel_artis(self, tablo: str) -> int:
+        """
+        Bu thread'in tablo neslini şimdiye kadar kaç kez artırdığı. Bir yazımın
+        öncesi/sonrası farkı, o yazımın kendi artışıdır (başka thread'lerinki
+        karışmaz).
+        """
+        return self._yerel.__dict__.get("artis", {}).get(tablo, 0)
+
+    def istatistik(self) -> dict[str, dict]:
+        """Tanılama: {tablo: {"isabet", "iskalama", "sorgu"}}."""
+        with self._kilit:
+            tablolar = set(self.isabet) | set(self.iskalama) | set(self._veri)
+            return {
+                t: {
+                    "isabet":   self.isabet.get(t, 0),
+                    "iskalama": self.iskalama.get(t, 0),
+                    "sorgu":    len(self._veri.get(t, {})),
+                }
+                for t in sorted(tablolar)
+            }
+
+
+_onbellekler: dict = {}
+_onbellek_kilidi = threading.Lock()
+
+
+def onbellek_al(db) -> TabloOnbellegi:
+    """db'nin dosyası için paylaşılan önbellek (dosyasız db → örneğe özel)."""
+    yol = getattr(db, "db_path", None)
+    anahtar = os.path.abspath(yol) if yol and yol != ":memory:" else id(db)
+    with _onbellek_kilidi:
+        onbellek = _onbellekler.get(anahtar)
+        if onbellek is None:
+            onbellek = _onbellekler[anahtar] = TabloOnbellegi()
+        return onbellek
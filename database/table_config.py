@@ -30,6 +30,17 @@
             "IzinTipi","BaslamaTarihi","Gun","BitisTarihi","Durum"
         ],
         "date_fields": ["BaslamaTarihi", "BitisTarihi"],
+        # Yazımda (insert/update/sync pull) baş-son boşluğu atılan anahtar
+        # kolonlar; mevcut veri v15'te bir kez kırpılır. Sorgular bu kolonlarda
+        # indeksi kullanan kesin eşitlik (where) ile arar.
+        "trim_fields": ["Personelid"],
+        # İkincil indeksler — MigrationManager._indeksleri_esitle() oluşturur/siler.
+        # Her eleman bir kolon listesi (sıra önemli). sync_status='dirty'
+        # kısmi indeksi sync kolonu olan her tablo için otomatik eklenir.
+        "indexes": [
+            ["Personelid", "BaslamaTarihi"],
+            ["BaslamaTarihi"],
+        ],
     },
 
     "Izin_Bilgi": {
@@ -48,7 +59,12 @@
             "Personelid","AdSoyad","Birim","CalismaKosulu",
             "AitYil","Donem","AylikGun","KullanilanIzin",
             "FiiliCalismaSaat"
-        ]
+        ],
+        "trim_fields": ["Personelid", "AitYil", "Donem"],
+        # PK Personelid ile başlıyor; dönem bazlı sorgular için ayrı indeks
+        "indexes": [
+            ["AitYil", "Donem"],
+        ],
     },
 
     # ─────────────── CİHAZ VT ───────────────
@@ -95,6 +111,9 @@
             "IliskiliBelgeTipi",
         ],
         "date_fields": ["YuklenmeTarihi"],
+        "trim_fields": ["EntityType", "EntityId"],
+        # (EntityType, EntityId) aramaları PK indeksinin ön ekiyle karşılanır;
+        # ayrı indeks tanımlanmadı.
     },
 
 
@@ -173,6 +192,7 @@
     # ─────────────── SABİT VT ───────────────
 
     "Sabitler": {
+        "cacheable": True,
         "pk": "Rowid",
         "sync_mode": "pull_only",  # Read-only table
         "columns": [
@@ -181,6 +201,7 @@
     },
 
     "Tatiller": {
+        "cacheable": True,
         "pk": "Tarih",
         "sync_mode": "pull_only",  # Read-only table
         "columns": [
@@ -224,6 +245,9 @@
             "Rapor"
         ],
         "date_fields": ["FMuayeneTarihi", "SMuayeneTarihi"],
+        "indexes": [
+            ["EkipmanNo"],
+        ],
     },
 
     "Personel_Saglik_Takip": {
@@ -242,6 +266,10 @@
             "DermatolojiMuayeneTarihi", "DahiliyeMuayeneTarihi",
             "GozMuayeneTarihi", "GoruntulemeMuayeneTarihi"
         ],
+        "trim_fields": ["Personelid"],
+        "indexes": [
+            ["Personelid"],
+        ],
     },
     
 "Dis_Alan_Calisma": {
@@ -268,7 +296,13 @@
         "KaydedenKullanici",
     ],
     "date_fields": ["TutanakTarihi", "KayitTarihi"],
+    "trim_fields": ["TutanakNo"],
     "sync": False,
+    # TCKimlik aramaları PK ön ekiyle karşılanır
+    "indexes": [
+        ["TutanakNo"],
+        ["DonemYil", "DonemAy"],
+    ],
 },
  
 "Dis_Alan_Izin_Ozet": {
@@ -321,6 +355,7 @@
 
 
     "Dis_Alan_Katsayi_Protokol": {
+        "cacheable": True,
         "pk": ["AnaBilimDali", "Birim", "GecerlilikBaslangic"],
         "columns": [
             "AnaBilimDali",           # TEXT, PK
@@ -348,6 +383,7 @@
     # ═══════════════════════════════════════════════════
 
     "NB_Birim": {
+        "cacheable": True,
         "pk": "BirimID",
         "columns": [
             "BirimID", "BirimKodu", "BirimAdi", "BirimTipi",
@@ -358,6 +394,7 @@
     },
 
     "NB_BirimAyar": {
+        "cacheable": True,
         "pk": "AyarID",
         "columns": [
             "AyarID", "BirimID",
@@ -368,12 +405,14 @@
             "ArdisikGunIzinli",
             "GeserlilikBaslangic", "GeserlilikBitis",
             "FmMaxSaat", "MaxGunlukSureDakika",
+            "PlanMotoru", "CozucuSureSn",
             "created_at", "updated_at",
         ],
         "sync": False,
     },
 
     "NB_VardiyaGrubu": {
+        "cacheable": True,
         "pk": "GrupID",
         "columns": [
             "GrupID", "BirimID", "GrupAdi", "GrupTuru",
@@ -383,6 +422,7 @@
     },
 
     "NB_Vardiya": {
+        "cacheable": True,
         "pk": "VardiyaID",
         "columns": [
             "VardiyaID", "GrupID", "BirimID",
@@ -443,6 +483,27 @@
         "sync": False,
     },
 
+    "NB_PersonelAyOzet": {
+        # Personel × birim × ay özeti — NbOzetService günceller
+        "pk": ["PersonelID", "BirimID", "Yil", "Ay"],
+        "columns": [
+            "PersonelID", "BirimID", "Yil", "Ay",
+            "PlanID", "PlanDurum",
+            "NobetSayisi", "NobetDakika", "HaftasonuSayisi",
+            "GunduzSayisi", "GeceSayisi",
+            "CalisDakika", "HedefDakika", "FazlaDakika",
+            "DevirDakika", "ToplamFazlaDakika",
+            "OdenenDakika", "DevireGidenDakika",
+            "HesapDurumu", "updated_at",
+        ],
+        "sync": False,
+        # PersonelID aramaları PK ön ekiyle karşılanır
+        "indexes": [
+            ["BirimID", "Yil", "Ay"],
+            ["PlanID"],
+        ],
+    },
+
     "NB_MesaiKural": {
         "pk": "KuralID",
         "columns": [
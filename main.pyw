@@ -1,6 +1,7 @@
 import sys
 import os
 import shutil
+import multiprocessing
 
 # Proje kök dizinini Python path'e ekle
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -148,5 +149,7 @@ def _cleanup_temp():
 
 
 if __name__ == "__main__":
+    # Paketlenmiş exe'de ProcessPoolExecutor (spawn) işçileri için
+    multiprocessing.freeze_support()
     main()
 
@@ -0,0 +1,21 @@
+# tests/conftest.py
+"""Ortak fixture'lar: geçici, şeması kurulu SQLite veritabanı."""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def db(tmp_path):
+    """MigrationManager ile kurulmuş boş veritabanı (SQLiteManager)."""
+    from database.migrations import MigrationManager
+    from database.sqlite_manager import SQLiteManager
+
+    yol = str(tmp_path / "test.db")
+    MigrationManager(yol).run_migrations()
+    db = SQLiteManager(db_path=yol)
+    yield db
+    db.close()
@@ -0,0 +1,102 @@
+# tests/sahte_gsheet.py
+"""
+GSheetManager için yerel sahte worksheet / cloud adapter.
+
+SahteWorksheet gspread.Worksheet'in SyncService'in kullandığı kısmını
+taklit eder: get_all_records / batch_update / append_rows / append_row ve
+spreadsheet.get_lastUpdateTime() (her yazımda değişen Drive modifiedTime).
+"""
+from __future__ import annotations
+
+
+class SahteSpreadsheet:
+    def __init__(self):
+        self.surum = 0
+
+    def degisti(self):
+        self.surum += 1
+
+    def get_lastUpdateTime(self) -> str:
+        return f"2026-01-01T00:00:{self.surum:02d}Z"
+
+
+class SahteWorksheet:
+    """Başlık satırı + veri satırları; satır numaraları Sheets gibi 1 tabanlı."""
+
+    def __init__(self, kolonlar: list[str], satirlar: list[dict] = (),
+                 spreadsheet: SahteSpreadsheet | None = None, id: int = 0):
+        self.kolonlar = list(kolonlar)
+        self.veri = [[r.get(c, "") for c in self.kolonlar] for r in satirlar]
+        self.spreadsheet = spreadsheet or SahteSpreadsheet()
+        self.id = id
+        self.okuma = 0
+        self.yazim = 0
+
+    # ── gspread arayüzü ──
+    def get_all_records(self) -> list[dict]:
+        self.okuma += 1
+        return [dict(zip(self.kolonlar, satir)) for satir in self.veri]
+
+    def batch_update(self, parcalar: list[dict]):
+        for p in parcalar:
+            satir_no = int(p["range"].lstrip("A"))
+            self.veri[satir_no - 2] = list(p["values"][0])
+        self._yazildi()
+
+    def append_rows(self, satirlar: list[list]):
+        self.veri.extend(list(s) for s in satirlar)
+        self._yazildi()
+
+    def append_row(self, satir: list):
+        self.append_rows([satir])
+
+    # ── test yardımcıları ──
+    def duzenle(self, pk_kolon: str, pk, **degerler):
+        """Sheets'te elle yapılan düzenlemeyi taklit eder."""
+        i = self.kolonlar.index(pk_kolon)
+        for satir in self.veri:
+            if satir[i] == pk:
+                for k, v in degerler.items():
+                    satir[self.kolonlar.index(k)] = v
+        self._yazildi()
+
+    def kayit(self, pk_kolon: str, pk) -> dict | None:
+        i = self.kolonlar.index(pk_kolon)
+        for satir in self.veri:
+            if satir[i] == pk:
+                return dict(zip(self.kolonlar, satir))
+        return None
+
+    def _yazildi(self):
+        self.yazim += 1
+        self.spreadsheet.degisti()
+
+
+class SurumsuzWorksheet(SahteWorksheet):
+    """modifiedTime alınamayan worksheet (ön kontrol devre dışı)."""
+
+    @property
+    def spreadsheet(self):
+        raise AttributeError("spreadsheet yok")
+
+    @spreadsheet.setter
+    def spreadsheet(self, _):
+        pass
+
+    def _yazildi(self):
+        self.yazim += 1
+
+
+class SahteCloudAdapter:
+    mode = "online"
+
+    def __init__(self, sayfalar: dict[str, SahteWorksheet]):
+        self.sayfalar = sayfalar
+
+    def get_worksheet(self, table_name):
+        return self.sayfalar.get(table_name)
+
+
+class SinirsizLimiter:
+    def acquire(self, n: int = 1):
+        pass
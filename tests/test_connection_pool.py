@@ -0,0 +1,61 @@
+# tests/test_connection_pool.py
+"""BaglantiHavuzu — thread başına okuyucu bağlantıların ömrü."""
+import threading
+
+
+def _thread_icinde(fn):
+    sonuc = {}
+    t = threading.Thread(target=lambda: sonuc.setdefault("deger", fn()))
+    t.start()
+    t.join()
+    return sonuc.get("deger")
+
+
+def test_biten_thread_okuyucusu_kapanir(db):
+    havuz = db._havuz
+    db.execute("CREATE TABLE T (a INTEGER)")
+
+    for _ in range(5):
+        _thread_icinde(lambda: db.execute("SELECT COUNT(*) FROM T").fetchone()[0])
+
+    assert havuz._okuyucular == {}
+
+
+def test_yeni_thread_eski_anlik_goruntuyu_devralmaz(db):
+    db.execute("CREATE TABLE T (a INTEGER)")
+    db.execute("INSERT INTO T VALUES (1)")
+
+    def snapshot_acik_birak():
+        # okuma_anlik_goruntusu'nun açtığı okuma transaction'ı, kapanmadan
+        # biten thread'de kalır
+        conn = db._havuz.okuyucu()
+        conn.execute("BEGIN")
+        conn.execute("SELECT COUNT(*) FROM T").fetchone()
+        return threading.get_ident(), conn
+
+    eski_tid, eski_conn = _thread_icinde(snapshot_acik_birak)
+    db.execute("INSERT INTO T VALUES (2)")
+
+    def oku():
+        conn = db._havuz.okuyucu()
+        return threading.get_ident(), conn, db.execute("SELECT COUNT(*) FROM T").fetchone()[0]
+
+    for _ in range(20):
+        tid, conn, adet = _thread_icinde(oku)
+        assert conn is not eski_conn
+        assert adet == 2
+        if tid == eski_tid:
+            break
+
+
+def test_okuyucu_birak_ve_kapat(db):
+    havuz = db._havuz
+    db.execute("CREATE TABLE T (a INTEGER)")
+    ilk = havuz.okuyucu()
+    assert havuz.okuyucu() is ilk
+    assert len(havuz._okuyucular) == 1
+
+    havuz.okuyucu_birak()
+    assert havuz._okuyucular == {}
+    assert havuz.okuyucu() is not ilk
+    assert len(havuz._okuyucular) == 1
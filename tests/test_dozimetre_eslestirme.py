@@ -0,0 +1,37 @@
+# tests/test_dozimetre_eslestirme.py
+"""PersonelEslestirici — RADAT maskeli TC + kısmi isim eşleştirmesi."""
+from core.services.dozimetre_pdf_service import PersonelEslestirici
+
+PERSONEL = [
+    {"KimlikNo": "12345678901", "AdSoyad": "Zeynep Türkdönmez"},
+    {"KimlikNo": "12399999901", "AdSoyad": "Ahmet Yılmaz"},
+    {"KimlikNo": "98765432109", "AdSoyad": "İsmail Şahin"},
+]
+
+
+def test_maske_ve_isim_ile_eslesir():
+    e = PersonelEslestirici(PERSONEL)
+    p, skor = e.eslestir("123******01", "ZEYN** TÜRKDÖNM**")
+    assert p is PERSONEL[0]
+    assert skor == len("ZEYN") + len("TURKDONM")
+    # Aynı maskeye uyan iki kişi: isim skoru ayırır
+    assert e.eslestir("123******01", "AHM** YIL**")[0] is PERSONEL[1]
+    # Türkçe karakter normalizasyonu (İ/ı, Ş)
+    assert e.eslestir("98*******09", "ISMA** SAH**")[0] is PERSONEL[2]
+
+
+def test_isim_uyusmazsa_tek_aday_da_eslesmez():
+    e = PersonelEslestirici(PERSONEL)
+    assert e.eslestir("98*******09", "MEHM** KAYA**") == (None, 0)
+
+
+def test_maske_cozulemezse_yalnizca_isimle_eslesmez():
+    e = PersonelEslestirici(PERSONEL)
+    for maske in ("", "bozuk", "12345678901", None):
+        assert e.eslestir(maske, "ZEYN** TÜRKDÖNM**") == (None, 0)
+
+
+def test_adaylar_liste_sirasini_korur():
+    e = PersonelEslestirici(PERSONEL)
+    assert e.adaylar("123******01") == PERSONEL[:2]
+    assert e.adaylar("bozuk") == []
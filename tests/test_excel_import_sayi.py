@@ -0,0 +1,54 @@
+# tests/test_excel_import_sayi.py
+"""
+excel_import_service — sütun bazlı sayı dönüşümü (_sutun_float / _sutun_int)
+hücre bazlı _to_float / _to_int ile birebir aynı sonucu vermeli.
+"""
+import random
+
+import pandas as pd
+import pytest
+
+from core.services.excel_import_service import (
+    _ham_sutun, _sutun_float, _sutun_int, _to_float, _to_int,
+)
+
+# pd.to_numeric'in son basamakta saptığı bilinen değerler
+ORNEKLER = [
+    "0.30000000000000004", "45250.281404473644", "99999999999999999999",
+    "1e400", "-1e-400", "nan", "inf", "1_000", "٣", "12,5", " 7 ", "", "abc",
+    "-.5", "7.", "+3", "0", "-0.0", "1e5", "2.5E-3",
+]
+
+
+def _rastgele_degerler(n: int, tohum: int = 42) -> list[str]:
+    rnd = random.Random(tohum)
+    degerler = []
+    for _ in range(n):
+        tur = rnd.random()
+        if tur < 0.5:
+            # openpyxl / read_excel'in hesaplanmış hücreler için verdiği repr
+            degerler.append(repr(rnd.uniform(-1e6, 1e6) * 10 ** rnd.randint(-8, 8)))
+        elif tur < 0.7:
+            degerler.append(repr(rnd.random()))
+        elif tur < 0.9:
+            degerler.append(str(rnd.randint(-10 ** 20, 10 ** 20)))
+        else:
+            degerler.append(f"{rnd.uniform(0, 1000):.{rnd.randint(0, 6)}f}".replace(".", ","))
+    return degerler
+
+
+@pytest.mark.parametrize("degerler", [ORNEKLER, _rastgele_degerler(20_000)],
+                         ids=["ornekler", "rastgele"])
+def test_sutun_yolu_tekil_yolla_ayni(degerler):
+    s = _ham_sutun(pd.Series(degerler, dtype=object))
+
+    assert _sutun_float(s).tolist() == [_to_float(d) for d in s]
+
+    beklenen, girdi = [], []
+    for d in s:
+        try:
+            beklenen.append(_to_int(d))
+            girdi.append(d)
+        except OverflowError:   # int(float("inf")) — tekil yol da ayrıştıramaz
+            continue
+    assert _sutun_int(_ham_sutun(pd.Series(girdi, dtype=object))).tolist() == beklenen
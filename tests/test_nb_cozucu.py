@@ -0,0 +1,126 @@
+# tests/test_nb_cozucu.py
+"""
+NbCozucu — tekrarlanabilirlik ve sert kurallar.
+
+nb_sentetik ile kurulan birimde aynı bağlam + aynı tohum + aynı iterasyon
+sayısı iki kez çözülür; planların birebir aynı olması ve her atamanın sert
+kurallara (izin günü, ardışık gün, günlük max süre, aylık tavan + FM) uyması
+beklenir. Süre bütçesi iterasyon sınırından önce dolmayacak kadar geniştir.
+"""
+from __future__ import annotations
+
+import dataclasses
+from collections import defaultdict
+from datetime import date
+
+import pytest
+
+from benchmarks.nb_sentetik import SentetikAyar, veritabani_olustur
+from core.services.nobet.nb_cozucu import TOLERANS_DK, NbCozucu
+from core.services.nobet.nb_planlama_baglami import PlanlamaBaglami
+
+AYAR = SentetikAyar(birim_sayisi=1, personel=14, grup=2, yil=2026, ay=3,
+                    izin_yogunlugu=0.6, gecmis_izin=0, tatil_gunleri=(1, 15),
+                    tohum=11)
+TOHUM = 1234
+ITERASYON = 20_000
+SURE_SN = 120.0
+# Durum'u boşluklu girilmiş onaylı izin (Sheets / elle giriş)
+BOSLUKLU_IZIN = ("10000000013", "2026-03-20", "2026-03-22", "Onaylandı ")
+
+
+@pytest.fixture
+def baglam(tmp_path):
+    from database.repository_registry import RepositoryRegistry
+
+    db, birimler = veritabani_olustur(str(tmp_path / "cozucu.db"), AYAR)
+    pid, bas, bit, durum = BOSLUKLU_IZIN
+    db.execute("INSERT INTO Izin_Giris (Izinid, Personelid, IzinTipi, BaslamaTarihi, "
+               "Gun, BitisTarihi, Durum) VALUES ('boslukluizin', ?, 'Yıllık İzin', ?, 3, ?, ?)",
+               (pid, bas, bit, durum))
+    try:
+        yield PlanlamaBaglami.olustur(RepositoryRegistry(db), birimler[0].birim_id,
+                                      AYAR.yil, AYAR.ay)
+    finally:
+        db.close()
+
+
+def _coz(baglam: PlanlamaBaglami, tohum: int = TOHUM):
+    return NbCozucu(baglam, tohum=tohum, sure_butcesi_sn=SURE_SN,
+                    maks_iterasyon=ITERASYON).coz()
+
+
+def _kural_ihlalleri(baglam: PlanlamaBaglami, atamalar) -> list[str]:
+    ihlal = []
+    gun_dk: dict[tuple[str, str], int] = defaultdict(int)
+    ay_dk: dict[str, int] = defaultdict(int)
+    gunler: dict[str, set[date]] = defaultdict(set)
+    goruldu = set()
+    gonullu = set(baglam.gonulluler)
+
+    for tarih, vid, pid in atamalar:
+        gun = date.fromisoformat(tarih)
+        if baglam.izinli_mi(pid, gun):
+            ihlal.append(f"izin günü: {pid} {tarih}")
+        if (tarih, vid, pid) in goruldu:
+            ihlal.append(f"aynı vardiya iki kez: {pid} {tarih} {vid}")
+        goruldu.add((tarih, vid, pid))
+        dk = baglam.vardiya_meta[vid][0]
+        gun_dk[(pid, tarih)] += dk
+        ay_dk[pid] += dk
+        gunler[pid].add(gun)
+
+    for (pid, tarih), dk in gun_dk.items():
+        if dk > baglam.birim_max_gun_dk:
+            ihlal.append(f"günlük max: {pid} {tarih} {dk}dk")
+
+    if not baglam.ardisik_gun_izinli:
+        for pid, gs in gunler.items():
+            for g in gs:
+                if any(abs((g - h).days) == 1 for h in gs):
+                    ihlal.append(f"ardışık gün: {pid} {g}")
+
+    for pid, dk in ay_dk.items():
+        hedef = baglam.hedef_map.get(pid, 0)
+        tavan = hedef + min(TOLERANS_DK, hedef) if hedef > 0 else 0
+        if pid in gonullu:
+            tavan += baglam.fm_max_dk
+        if dk > tavan:
+            ihlal.append(f"aylık tavan: {pid} {dk}dk > {tavan}dk")
+    return ihlal
+
+
+def test_ayni_tohum_ayni_plan(baglam):
+    ilk, ikinci = _coz(baglam), _coz(baglam)
+
+    assert ilk.iterasyon == ikinci.iterasyon == ITERASYON
+    assert ilk.atamalar == ikinci.atamalar
+    assert ilk.bos_slotlar == ikinci.bos_slotlar
+    assert ilk.maliyet == ikinci.maliyet
+    assert ilk.atamalar
+    # Tohum gerçekten aramayı yönlendiriyor
+    assert _coz(baglam, tohum=TOHUM + 1).atamalar != ilk.atamalar
+
+
+@pytest.mark.parametrize("ardisik", [False, True])
+def test_sert_kurallar(baglam, ardisik):
+    baglam = dataclasses.replace(baglam, ardisik_gun_izinli=ardisik)
+    # Kurulum izin günlerini gerçekten atlamak zorunda kalmalı
+    assert any(baglam.izin_bitleri.values())
+    assert baglam.gonulluler
+
+    sonuc = _coz(baglam)
+
+    assert sonuc.atamalar
+    assert _kural_ihlalleri(baglam, sonuc.atamalar) == []
+
+
+def test_bosluklu_durumlu_onayli_izin(baglam):
+    pid, bas, bit, _ = BOSLUKLU_IZIN
+    gunler = [g for g in baglam.gunler
+              if date.fromisoformat(bas) <= g <= date.fromisoformat(bit)]
+    assert len(gunler) == 3
+    assert all(baglam.izinli_mi(pid, g) for g in gunler)
+
+    atanan = {t for t, _, p in _coz(baglam).atamalar if p == pid}
+    assert not atanan & {g.isoformat() for g in gunler}
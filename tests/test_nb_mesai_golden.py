@@ -0,0 +1,193 @@
+# tests/test_nb_mesai_golden.py
+"""
+NbMesaiService.mesai_hesapla / toplu_mesai_hesapla — altın çıktı testi.
+
+nb_sentetik ile tohumlanan veritabanında (2 birim, izinler, tatil günleri,
+önceki ay devirleri, emzirme/sendika tercihleri) deterministik bir plan
+kurulur; üstüne elle girilmiş bir hedef ve önceden girilmiş bir
+OdenenDakika eklenir. Sonuç, pandas'a geçişten önceki satır satır
+uygulamadan alınmış veri/nb_mesai_golden.json ile karşılaştırılır.
+
+Altın dosya yeniden üretilecekse (yalnızca hesap kuralı bilinçli olarak
+değiştiğinde):
+    python -m tests.test_nb_mesai_golden
+"""
+from __future__ import annotations
+
+import json
+import sys
+import uuid
+from calendar import monthrange
+from pathlib import Path
+
+import pytest
+
+from benchmarks.nb_sentetik import SentetikAyar, veritabani_olustur
+
+AYAR = SentetikAyar(birim_sayisi=2, personel=12, grup=3, yil=2026, ay=3,
+                    izin_yogunlugu=0.5, gecmis_izin=3, tatil_gunleri=(1, 15),
+                    tohum=7)
+# (personel, değer) — birim 1'in 4. ve 6. personeli (tercih kaydı yok)
+MANUEL_HEDEF = ("10000000003", 6000)
+MEVCUT_ODENEN = ("10000000005", 600)
+
+ALANLAR = ("CalisDakika", "HedefDakika", "FazlaDakika", "DevirDakika",
+           "ToplamFazlaDakika", "OdenenDakika", "DevireGidenDakika",
+           "HesapDurumu", "BildirimDakika", "KuralKapanis", "KuralTemel")
+DB_ALANLARI = ("CalisDakika", "HedefDakika", "FazlaDakika", "DevirDakika",
+               "ToplamFazlaDakika", "OdenenDakika", "DevireGidenDakika",
+               "HesapDurumu")
+
+ALTIN = Path(__file__).with_name("veri") / "nb_mesai_golden.json"
+
+
+def _id() -> str:
+    return str(uuid.uuid4())
+
+
+def tohumla(db_yolu: str):
+    """
+    Sentetik veri + plan. Döner: (db, planlar)
+    planlar = {BirimAdi: (BirimID, güncel PlanID)}
+    """
+    db, birimler = veritabani_olustur(db_yolu, AYAR)
+    yil, ay = AYAR.yil, AYAR.ay
+    gun_sayisi = monthrange(yil, ay)[1]
+    planlar = {}
+    with db.transaction():
+        for b in birimler:
+            vardiyalar = [r[0] for r in db.execute(
+                "SELECT v.VardiyaID FROM NB_Vardiya v "
+                "JOIN NB_VardiyaGrubu g ON g.GrupID = v.GrupID "
+                "WHERE v.BirimID=? ORDER BY g.Sira, v.Sira", (b.birim_id,)).fetchall()]
+            pidler = b.personel_idler
+
+            # Eski versiyon (toplu hesap en yüksek versiyonu seçmeli)
+            eski_plan = _id()
+            db.execute("INSERT INTO NB_Plan (PlanID, BirimID, Yil, Ay, Versiyon, Durum) "
+                       "VALUES (?, ?, ?, ?, 1, 'iptal')", (eski_plan, b.birim_id, yil, ay))
+            db.execute("INSERT INTO NB_PlanSatir (SatirID, PlanID, PersonelID, VardiyaID, "
+                       "NobetTarihi) VALUES (?, ?, ?, ?, ?)",
+                       (_id(), eski_plan, pidler[0], vardiyalar[0], f"{yil:04d}-{ay:02d}-02"))
+
+            plan_id = _id()
+            db.execute("INSERT INTO NB_Plan (PlanID, BirimID, Yil, Ay, Versiyon, Durum) "
+                       "VALUES (?, ?, ?, ?, 2, 'onaylandi')", (plan_id, b.birim_id, yil, ay))
+            satirlar = []
+            for gun in range(1, gun_sayisi + 1):
+                for k, vid in enumerate(vardiyalar[:2]):
+                    pid = pidler[(gun * 2 + k) % len(pidler)]
+                    # Her 7. satır iptal edilmiş (hesaba girmez)
+                    durum = "iptal" if (gun + k) % 7 == 0 else "aktif"
+                    satirlar.append((_id(), plan_id, pid, vid,
+                                     f"{yil:04d}-{ay:02d}-{gun:02d}", durum))
+            db.executemany("INSERT INTO NB_PlanSatir (SatirID, PlanID, PersonelID, "
+                           "VardiyaID, NobetTarihi, Durum) VALUES (?, ?, ?, ?, ?, ?)",
+                           satirlar)
+            planlar[b.birim_adi] = (b.birim_id, plan_id)
+
+        birim_id, plan_id = planlar["Benchmark Birimi"]
+        db.execute("INSERT INTO NB_PersonelTercih (TercihID, PersonelID, BirimID, Yil, Ay, "
+                   "NobetTercihi, HedefDakika, HedefTipi) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                   (_id(), MANUEL_HEDEF[0], birim_id, yil, ay, "zorunlu",
+                    MANUEL_HEDEF[1], "normal"))
+        db.execute("INSERT INTO NB_MesaiHesap (HesapID, PersonelID, BirimID, PlanID, "
+                   "Yil, Ay, OdenenDakika) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                   ("MEVCUT-HESAP", MEVCUT_ODENEN[0], birim_id, plan_id, yil, ay,
+                    MEVCUT_ODENEN[1]))
+    return db, planlar
+
+
+def _ozet(satirlar, alanlar) -> dict:
+    return {str(r["PersonelID"]): {a: r.get(a) for a in alanlar} for r in satirlar}
+
+
+def _db_ozeti(db, planlar) -> dict:
+    sonuc = {}
+    for adi, (birim_id, plan_id) in sorted(planlar.items()):
+        rows = db.execute("SELECT * FROM NB_MesaiHesap WHERE BirimID=? AND PlanID=? "
+                          "AND Yil=? AND Ay=?",
+                          (birim_id, plan_id, AYAR.yil, AYAR.ay)).fetchall()
+        sonuc[adi] = _ozet([dict(r) for r in rows], DB_ALANLARI)
+    return sonuc
+
+
+def _servis(db):
+    from core.services.nobet.nb_mesai_service import NbMesaiService
+    from database.repository_registry import RepositoryRegistry
+    return NbMesaiService(RepositoryRegistry(db))
+
+
+def birim_birim_hesapla(db, planlar) -> dict:
+    svc = _servis(db)
+    sonuc = {}
+    for adi, (birim_id, plan_id) in sorted(planlar.items()):
+        s = svc.mesai_hesapla(birim_id, plan_id, AYAR.yil, AYAR.ay)
+        assert s.basarili, s.mesaj
+        sonuc[adi] = _ozet(s.veri, ALANLAR)
+    return sonuc
+
+
+@pytest.fixture
+def tohumlu(tmp_path):
+    db, planlar = tohumla(str(tmp_path / "mesai.db"))
+    yield db, planlar
+    db.close()
+
+
+@pytest.fixture(scope="module")
+def altin():
+    return json.loads(ALTIN.read_text(encoding="utf-8"))
+
+
+def test_mesai_hesapla_altin_cikti(tohumlu, altin):
+    db, planlar = tohumlu
+    assert birim_birim_hesapla(db, planlar) == altin["sonuc"]
+    assert _db_ozeti(db, planlar) == altin["db"]
+
+    # Mevcut hesap kaydı yerinde güncellendi, ödenen korundu
+    row = db.execute("SELECT PersonelID, OdenenDakika FROM NB_MesaiHesap "
+                     "WHERE HesapID='MEVCUT-HESAP'").fetchone()
+    assert tuple(row) == MEVCUT_ODENEN
+
+
+def test_mesai_hesapla_tekrar_calisinca_ayni(tohumlu, altin):
+    db, planlar = tohumlu
+    birim_birim_hesapla(db, planlar)
+    assert birim_birim_hesapla(db, planlar) == altin["sonuc"]
+    assert _db_ozeti(db, planlar) == altin["db"]
+
+
+def test_toplu_mesai_hesapla_altin_cikti(tohumlu, altin):
+    db, planlar = tohumlu
+    s = _servis(db).toplu_mesai_hesapla(AYAR.yil, AYAR.ay)
+    assert s.basarili, s.mesaj
+
+    birim_adi = {bid: adi for adi, (bid, _) in planlar.items()}
+    assert set(s.veri) == set(birim_adi)
+    sonuc = {birim_adi[bid]: _ozet(rows, ALANLAR) for bid, rows in s.veri.items()}
+    assert sonuc == altin["sonuc"]
+    assert _db_ozeti(db, planlar) == altin["db"]
+
+
+def main() -> None:
+    """Altın dosyayı bu ağaçtaki uygulamayla yeniden üretir."""
+    import logging
+    import tempfile
+
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as klasor:
+        db, planlar = tohumla(str(Path(klasor) / "mesai.db"))
+        try:
+            veri = {"sonuc": birim_birim_hesapla(db, planlar),
+                    "db": _db_ozeti(db, planlar)}
+        finally:
+            db.close()
+    ALTIN.parent.mkdir(exist_ok=True)
+    ALTIN.write_text(json.dumps(veri, ensure_ascii=False, indent=1, sort_keys=True) + "\n",
+                     encoding="utf-8")
+    print(f"{ALTIN} yazıldı", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
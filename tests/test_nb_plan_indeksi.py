@@ -0,0 +1,82 @@
+# tests/test_nb_plan_indeksi.py
+"""satir_yazimi — indeks tazeliği ile eşzamanlı yazımlar."""
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from core.services.nobet.nb_plan_indeksi import (
+    IZLENEN_TABLOLAR, PlanKisitIndeksi, plan_indeksi_al, plan_indeksi_birak, satir_yazimi,
+)
+from database.table_cache import onbellek_al
+
+PLAN = {"PlanID": "P1", "BirimID": "B1", "Yil": 2026, "Ay": 3}
+
+
+@pytest.fixture
+def ortam(db):
+    registry = SimpleNamespace(db=db)
+    onbellek = onbellek_al(db)
+
+    def kurucu():
+        nesil = {t: onbellek.nesil(t) for t in IZLENEN_TABLOLAR}
+        return PlanKisitIndeksi(PLAN, 1, 720, {"V1": 720}, nesil)
+
+    ix = plan_indeksi_al(registry, "P1", kurucu)
+    yield registry, onbellek, ix, kurucu
+    plan_indeksi_birak(registry)
+
+
+def _isle(ix):
+    ix.satir_ekle({"SatirID": "S1", "PlanID": "P1", "PersonelID": "K1",
+                   "NobetTarihi": "2026-03-05", "VardiyaID": "V1"})
+
+
+def _baska_threadde_yaz(onbellek):
+    t = threading.Thread(target=onbellek.gecersiz_kil, args=("NB_PlanSatir",))
+    t.start()
+    t.join()
+
+
+def test_kendi_yazimi_indeksi_taze_birakir(ortam):
+    registry, onbellek, ix, kurucu = ortam
+
+    def yaz():
+        # Repository yazımı gibi: aynı yazım birden çok kez artırabilir
+        onbellek.gecersiz_kil("NB_PlanSatir")
+        onbellek.gecersiz_kil("NB_PlanSatir")
+        return "ok"
+
+    assert satir_yazimi(registry, yaz, _isle) == "ok"
+    assert ix.guncel_mi(onbellek)
+    assert ix.gun_normal["2026-03-05"] == 1
+    assert plan_indeksi_al(registry, "P1", kurucu) is ix
+
+
+def test_yazim_sirasinda_baska_yazim_indeksi_bayatlatir(ortam):
+    registry, onbellek, ix, kurucu = ortam
+
+    def yaz():
+        onbellek.gecersiz_kil("NB_PlanSatir")
+        _baska_threadde_yaz(onbellek)
+
+    satir_yazimi(registry, yaz, _isle)
+    assert not ix.guncel_mi(onbellek)
+    assert plan_indeksi_al(registry, "P1", kurucu) is not ix
+
+
+def test_kontrol_ile_yazim_arasindaki_yazim_kacmaz(ortam, monkeypatch):
+    registry, onbellek, ix, kurucu = ortam
+    asil = onbellek.yerel_artis
+
+    # Taze kontrolünden hemen sonra (yazımdan önce) başka thread yazar
+    def araya_gir(tablo):
+        if not araya_gir.oldu:
+            araya_gir.oldu = True
+            _baska_threadde_yaz(onbellek)
+        return asil(tablo)
+    araya_gir.oldu = False
+    monkeypatch.setattr(onbellek, "yerel_artis", araya_gir)
+
+    satir_yazimi(registry, lambda: onbellek.gecersiz_kil("NB_PlanSatir"), _isle)
+    assert not ix.guncel_mi(onbellek)
@@ -0,0 +1,94 @@
+# tests/test_nb_plan_onay.py
+"""NbPlanService.onayla / onay_geri_al — durum ve personel ay özeti atomik."""
+import uuid
+
+import pytest
+
+from benchmarks.nb_sentetik import SentetikAyar, veritabani_olustur
+
+AYAR = SentetikAyar(birim_sayisi=1, personel=4, grup=1, yil=2026, ay=3,
+                    izin_yogunlugu=0.0, gecmis_izin=0, tohum=3)
+
+
+@pytest.fixture
+def ortam(tmp_path):
+    from core.services.nobet.nb_plan_service import NbPlanService
+    from database.repository_registry import RepositoryRegistry
+
+    db, birimler = veritabani_olustur(str(tmp_path / "onay.db"), AYAR)
+    birim = birimler[0]
+    vid = db.execute("SELECT VardiyaID FROM NB_Vardiya WHERE BirimID=? LIMIT 1",
+                     (birim.birim_id,)).fetchone()[0]
+    plan_id = str(uuid.uuid4())
+    with db.transaction():
+        db.execute("INSERT INTO NB_Plan (PlanID, BirimID, Yil, Ay, Versiyon, Durum) "
+                   "VALUES (?, ?, ?, ?, 1, 'taslak')",
+                   (plan_id, birim.birim_id, AYAR.yil, AYAR.ay))
+        for gun, (pid, durum) in enumerate(
+                zip(birim.personel_idler, ("aktif", "aktif", "aktif", "iptal")), 2):
+            db.execute("INSERT INTO NB_PlanSatir (SatirID, PlanID, PersonelID, VardiyaID, "
+                       "NobetTarihi, Durum) VALUES (?, ?, ?, ?, ?, ?)",
+                       (str(uuid.uuid4()), plan_id, pid, vid,
+                        f"{AYAR.yil:04d}-{AYAR.ay:02d}-{gun:02d}", durum))
+    registry = RepositoryRegistry(db)
+    yield db, NbPlanService(registry), birim.birim_id, plan_id
+    db.close()
+
+
+def _durum(db, plan_id):
+    return db.execute("SELECT Durum FROM NB_Plan WHERE PlanID=?", (plan_id,)).fetchone()[0]
+
+
+def _ozet(db, plan_id):
+    return dict(db.execute("SELECT PersonelID, PlanDurum FROM NB_PersonelAyOzet "
+                           "WHERE PlanID=?", (plan_id,)).fetchall())
+
+
+def test_onay_ve_geri_alma_ozeti_gunceller(ortam):
+    db, svc, birim_id, plan_id = ortam
+
+    sonuc = svc.onayla(birim_id, AYAR.yil, AYAR.ay, "onaylayan")
+    assert sonuc.basarili, sonuc.mesaj
+    assert sonuc.veri["silinenIptal"] == 1
+    assert _durum(db, plan_id) == "onaylandi"
+    assert set(_ozet(db, plan_id).values()) == {"onaylandi"}
+    assert len(_ozet(db, plan_id)) == 3
+
+    assert svc.onay_geri_al(birim_id, AYAR.yil, AYAR.ay).basarili
+    assert _durum(db, plan_id) == "taslak"
+    assert set(_ozet(db, plan_id).values()) == {"taslak"}
+
+
+def test_ozet_yazilamazsa_onay_geri_alinir(ortam, monkeypatch):
+    from core.services.nobet.nb_ozet_service import NbOzetService
+
+    db, svc, birim_id, plan_id = ortam
+
+    def patla(self, plan_id):
+        raise RuntimeError("özet yazılamadı")
+
+    monkeypatch.setattr(NbOzetService, "plan_ozeti_yaz", patla)
+
+    sonuc = svc.onayla(birim_id, AYAR.yil, AYAR.ay, "onaylayan")
+    assert not sonuc.basarili
+    assert _durum(db, plan_id) == "taslak"
+    assert _ozet(db, plan_id) == {}
+    # İptal satır da silinmemiş olmalı
+    assert db.execute("SELECT COUNT(*) FROM NB_PlanSatir WHERE PlanID=?",
+                      (plan_id,)).fetchone()[0] == 4
+
+
+def test_durum_yazilamazsa_geri_alma_yapilmaz(ortam, monkeypatch):
+    from core.services.nobet.nb_ozet_service import NbOzetService
+
+    db, svc, birim_id, plan_id = ortam
+    assert svc.onayla(birim_id, AYAR.yil, AYAR.ay, "onaylayan").basarili
+
+    def patla(self, plan_id, durum):
+        raise RuntimeError("özet yazılamadı")
+
+    monkeypatch.setattr(NbOzetService, "plan_durumu_yaz", patla)
+
+    assert not svc.onay_geri_al(birim_id, AYAR.yil, AYAR.ay).basarili
+    assert _durum(db, plan_id) == "onaylandi"
+    assert set(_ozet(db, plan_id).values()) == {"onaylandi"}
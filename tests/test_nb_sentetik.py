@@ -0,0 +1,32 @@
+# tests/test_nb_sentetik.py
+"""nb_sentetik — aynı ayar + tohum aynı veritabanını (ID'ler dahil) üretir."""
+from benchmarks.nb_sentetik import SentetikAyar, veritabani_olustur
+
+AYAR = SentetikAyar(birim_sayisi=2, personel=5, grup=2, gecmis_izin=2, tohum=5)
+
+TABLOLAR = {
+    "NB_Birim":          "SELECT * FROM NB_Birim WHERE BirimKodu LIKE 'BENCH%'",
+    "NB_VardiyaGrubu":   "SELECT GrupID, BirimID, GrupAdi FROM NB_VardiyaGrubu",
+    "NB_Vardiya":        "SELECT VardiyaID, GrupID, BirimID, VardiyaAdi FROM NB_Vardiya",
+    "Izin_Giris":        "SELECT Izinid, Personelid, BaslamaTarihi, Gun FROM Izin_Giris",
+    "NB_PersonelTercih": "SELECT TercihID, PersonelID, BirimID FROM NB_PersonelTercih",
+    "NB_Plan":           "SELECT PlanID, BirimID, Yil, Ay FROM NB_Plan",
+    "NB_MesaiHesap":     "SELECT HesapID, PersonelID, DevireGidenDakika FROM NB_MesaiHesap",
+}
+
+
+def _icerik(yol: str) -> dict:
+    db, birimler = veritabani_olustur(yol, AYAR)
+    try:
+        icerik = {t: sorted(tuple(r) for r in db.execute(sql).fetchall())
+                  for t, sql in TABLOLAR.items()}
+        icerik["birimler"] = [(b.birim_id, b.personel_idler) for b in birimler]
+        return icerik
+    finally:
+        db.close()
+
+
+def test_ayni_tohum_ayni_veritabani(tmp_path):
+    ilk = _icerik(str(tmp_path / "a.db"))
+    assert ilk == _icerik(str(tmp_path / "b.db"))
+    assert all(ilk[t] for t in TABLOLAR)
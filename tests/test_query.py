@@ -0,0 +1,107 @@
+# tests/test_query.py
+"""
+Query — boşluklardan arındırılmış eşitlik (where_trimmed) ve anahtar
+kolonların yazımda kırpılması (table_config "trim_fields").
+"""
+import sqlite3
+
+import pytest
+
+
+@pytest.fixture
+def registry(db):
+    from database.repository_registry import RepositoryRegistry
+
+    return RepositoryRegistry(db)
+
+
+@pytest.fixture
+def repo(registry):
+    r = registry.get("Personel_Saglik_Takip")
+    r.insert_many([
+        {"KayitNo": "1", "Personelid": "12345678901", "Durum": "Aktif"},
+        {"KayitNo": "2", "Personelid": " 12345678901 ", "Durum": "Aktif\t"},
+        {"KayitNo": "3", "Personelid": "12345678901\n", "Durum": "Pasif"},
+        {"KayitNo": "4", "Personelid": "99999999999", "Durum": None},
+    ])
+    return r
+
+
+def _nolar(sorgu) -> list[str]:
+    return sorted(str(r["KayitNo"]) for r in sorgu.all())
+
+
+# ════════════════ where_trimmed (serbest metin) ════════════════
+
+def test_where_kesin_esitlik(repo):
+    assert _nolar(repo.query().where(Durum="Aktif")) == ["1"]
+
+
+def test_where_trimmed_strip_ile_ayni(repo):
+    assert _nolar(repo.query().where_trimmed(Durum=" Aktif")) == ["1", "2"]
+    assert _nolar(repo.query().where_trimmed(Durum=["Aktif", "Yok"])) == ["1", "2"]
+
+
+def test_where_not_trimmed_null_farkli_sayilir(repo):
+    assert _nolar(repo.query().where_not_trimmed(Durum="Aktif")) == ["3", "4"]
+    assert _nolar(repo.query().where_not_trimmed(Durum=["Aktif", "Pasif"])) == ["4"]
+
+
+# ════════════════ trim_fields (anahtar kolonlar) ════════════════
+
+def test_anahtar_kolon_yazimda_kirpilir(repo, db):
+    degerler = {r[0] for r in db.execute(
+        "SELECT Personelid FROM Personel_Saglik_Takip").fetchall()}
+    assert degerler == {"12345678901", "99999999999"}
+    # Serbest metin kolonu olduğu gibi kalır
+    assert db.execute("SELECT Durum FROM Personel_Saglik_Takip "
+                      "WHERE KayitNo='2'").fetchone()[0] == "Aktif\t"
+
+    repo.update("4", {"Personelid": " 55555555555\t"})
+    assert db.execute("SELECT Personelid FROM Personel_Saglik_Takip "
+                      "WHERE KayitNo='4'").fetchone()[0] == "55555555555"
+
+
+def test_servis_bosluklu_personelid(repo, registry):
+    from core.services.saglik_service import SaglikService
+
+    sonuc = SaglikService(registry).get_saglik_kayitlari(" 12345678901 ")
+    assert sonuc.basarili
+    assert sorted(str(r["KayitNo"]) for r in sonuc.veri) == ["1", "2", "3"]
+
+
+@pytest.mark.parametrize("tablo, kosul, indeks", [
+    ("Izin_Giris", {"Personelid": "1"}, "ix_izin_giris_personelid_baslamatarihi"),
+    ("Personel_Saglik_Takip", {"Personelid": "1"}, "ix_personel_saglik_takip_personelid"),
+    ("FHSZ_Puantaj", {"AitYil": "2026", "Donem": "1"}, "ix_fhsz_puantaj_aityil_donem"),
+    ("Dis_Alan_Calisma", {"TutanakNo": "T1"}, "ix_dis_alan_calisma_tutanakno"),
+])
+def test_anahtar_aramasi_indeks_kullanir(registry, db, tablo, kosul, indeks):
+    sorgu = registry.get(tablo).query().where(**kosul)
+    sql, params = sorgu.to_sql()
+    plan = " ".join(r[3] for r in db.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+    assert indeks in plan, plan
+
+
+def test_v15_mevcut_degerleri_kirpar(tmp_path):
+    from database.migrations import MigrationManager
+
+    yol = str(tmp_path / "eski.db")
+    mm = MigrationManager(yol)
+    mm.run_migrations()
+    conn = sqlite3.connect(yol)
+    conn.executemany(
+        "INSERT INTO Izin_Giris (Izinid, Personelid, Durum) VALUES (?, ?, ?)",
+        [("a", " 111 ", "Onaylandı "), ("b", "222\n", "Onaylandı"), ("c", 333, "")])
+    conn.execute("DELETE FROM schema_version WHERE version = 15")
+    conn.commit()
+    conn.close()
+
+    mm.run_migrations()
+
+    conn = sqlite3.connect(yol)
+    satirlar = dict(conn.execute("SELECT Izinid, Personelid FROM Izin_Giris"))
+    durum = conn.execute("SELECT Durum FROM Izin_Giris WHERE Izinid='a'").fetchone()[0]
+    conn.close()
+    assert satirlar == {"a": "111", "b": "222", "c": "333"}
+    assert durum == "Onaylandı "
@@ -0,0 +1,110 @@
+# tests/test_sync_service.py
+"""SyncService delta sync — sahte worksheet ile (Google erişimi yok)."""
+import pytest
+
+from database.gsheet_manager import GSheetManager
+from database.repository_registry import RepositoryRegistry
+from database.sync_service import SyncService
+from database.table_config import TABLES
+from tests.sahte_gsheet import SahteCloudAdapter, SahteWorksheet, SinirsizLimiter, SurumsuzWorksheet
+
+TABLO = "Ariza_Islem"
+KOLONLAR = TABLES[TABLO]["columns"]
+
+
+def _satir(i: int, **degerler) -> dict:
+    r = {c: "" for c in KOLONLAR}
+    r.update(Islemid=f"I{i}", Arizaid=f"A{i}", IslemYapan=f"Teknisyen {i}",
+             IslemTuru="Onarım", YeniDurum="Açık")
+    r.update(degerler)
+    return r
+
+
+def _servis(db, ws):
+    registry = RepositoryRegistry(db)
+    gsheet = GSheetManager(cloud_adapter=SahteCloudAdapter({TABLO: ws}),
+                           rate_limiter=SinirsizLimiter())
+    return SyncService(db, registry, gsheet=gsheet), registry.get(TABLO)
+
+
+@pytest.fixture
+def ws():
+    return SahteWorksheet(KOLONLAR, [_satir(i) for i in range(1, 6)])
+
+
+def test_ilk_tur_remote_kayitlari_ceker(db, ws):
+    svc, repo = _servis(db, ws)
+    svc.sync_table(TABLO)
+
+    assert ws.okuma == 1
+    assert sorted(r["Islemid"] for r in repo.get_all()) == [f"I{i}" for i in range(1, 6)]
+    assert repo.get_dirty() == []
+
+
+def test_degisiklik_yoksa_kayitlar_okunmaz(db, ws):
+    svc, _ = _servis(db, ws)
+    svc.sync_table(TABLO)
+    svc.sync_table(TABLO)
+    svc.sync_table(TABLO)
+
+    assert ws.okuma == 1
+    assert ws.yazim == 0
+
+
+def test_remote_duzenleme_cekilir(db, ws):
+    svc, repo = _servis(db, ws)
+    svc.sync_table(TABLO)
+
+    ws.duzenle("Islemid", "I3", YeniDurum="Kapalı")
+    svc.sync_table(TABLO)
+
+    assert ws.okuma == 2
+    assert repo.get_by_id("I3")["YeniDurum"] == "Kapalı"
+    assert repo.get_by_id("I3")["sync_status"] == "clean"
+
+    svc.sync_table(TABLO)
+    assert ws.okuma == 2
+
+
+def test_local_degisiklik_push_edilir(db, ws):
+    svc, repo = _servis(db, ws)
+    svc.sync_table(TABLO)
+
+    repo.update("I2", {"YeniDurum": "Beklemede"})
+    repo.insert(_satir(9, YeniDurum="Yeni"))
+    svc.sync_table(TABLO)
+
+    assert ws.kayit("Islemid", "I2")["YeniDurum"] == "Beklemede"
+    assert ws.kayit("Islemid", "I9")["YeniDurum"] == "Yeni"
+    assert repo.get_dirty() == []
+
+    # Push remote sürümü değiştirdi: bir kez okunur, sonra yine atlanır
+    okuma = ws.okuma
+    svc.sync_table(TABLO)
+    svc.sync_table(TABLO)
+    assert ws.okuma == okuma + 1
+
+
+def test_baska_sayfa_yazimi_icerik_hashi_ile_atlanir(db, ws):
+    svc, repo = _servis(db, ws)
+    svc.sync_table(TABLO)
+
+    # Aynı dosyada başka sayfa yazıldı: modifiedTime değişir, içerik aynı
+    ws.spreadsheet.degisti()
+    svc.sync_table(TABLO)
+    assert ws.okuma == 2
+
+    # Yeni sürüm kaydedildi → sonraki tur okumaz
+    svc.sync_table(TABLO)
+    assert ws.okuma == 2
+
+
+def test_surum_yoksa_her_tur_okunur_ama_yazilmaz(db):
+    ws = SurumsuzWorksheet(KOLONLAR, [_satir(i) for i in range(1, 4)])
+    svc, repo = _servis(db, ws)
+    svc.sync_table(TABLO)
+    svc.sync_table(TABLO)
+
+    assert ws.okuma == 2
+    assert ws.yazim == 0
+    assert len(repo.get_all()) == 3
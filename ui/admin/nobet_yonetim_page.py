@@ -970,6 +970,20 @@ def _build_tab_ayar(self) -> QWidget:
         self._spn_max_gun.setToolTip(
             "1 = tek vardiya/gün (720 dk), 2 = çift vardiya (1440 dk)")
         form_v.addRow("Günlük Maks. Vardiya:", self._spn_max_gun)
+
+        self._cmb_motor = QComboBox()
+        self._cmb_motor.addItem("Açgözlü (gün gün, hızlı)", "acgozlu")
+        self._cmb_motor.addItem("Çözücü (global arama)", "cozucu")
+        self._cmb_motor.setToolTip(
+            "Çözücü boş kalan slotları ve saat dengesini tüm ay üzerinden iyileştirir")
+        form_v.addRow("Plan Motoru:", self._cmb_motor)
+
+        self._spn_cozucu_sn = QSpinBox()
+        self._spn_cozucu_sn.setRange(1, 300)
+        self._spn_cozucu_sn.setSuffix(" sn")
+        self._spn_cozucu_sn.setValue(10)
+        self._spn_cozucu_sn.setToolTip("Çözücünün plan başına en fazla arama süresi")
+        form_v.addRow("Çözücü Süresi:", self._spn_cozucu_sn)
         lay.addWidget(grp_var)
 
         # Çalışma takvimi
@@ -1216,6 +1230,9 @@ def _birim_ayar_yukle(self, birim_id: str):
             self._chk_dini_bayram.setChecked(bool(int(dini)))
             self._chk_ardisik.setChecked(
                 bool(int(ayar.get("ArdisikGunIzinli", 0))))
+            idx = self._cmb_motor.findData(ayar.get("PlanMotoru") or "acgozlu")
+            self._cmb_motor.setCurrentIndex(max(idx, 0))
+            self._spn_cozucu_sn.setValue(int(ayar.get("CozucuSureSn") or 10))
         except Exception as e:
             logger.error(f"Birim ayar yükle: {e}")
 
@@ -1426,6 +1443,8 @@ def _birim_ayar_kaydet(self):
                 "ResmiTatilCalismaVar":  1 if self._chk_resmi_tatil.isChecked() else 0,
                 "DiniBayramCalismaVar":  1 if self._chk_dini_bayram.isChecked() else 0,
                 "ArdisikGunIzinli":      1 if self._chk_ardisik.isChecked() else 0,
+                "PlanMotoru":            self._cmb_motor.currentData(),
+                "CozucuSureSn":          self._spn_cozucu_sn.value(),
                 "updated_at":            _simdi(),
             }
             if ayar:
@@ -19,6 +19,9 @@ def _fg(self, key, row):
         return None
 
 Alt sınıflar sadece değişen şeyi override eder.
+
+Satırlar dict veya database.row.Satir (repo.get_all(compact=True),
+query().compact()) olabilir; model yalnızca row.get(key) ile okur.
 """
 from __future__ import annotations
 
@@ -32,6 +32,7 @@ def _get_servis(db):
     baslik="Toplu Cihaz İçe Aktarma",
     servis_fabrika=_get_servis,
     servis_metod="cihaz_ekle",
+    servis_toplu_metod="toplu_cihaz_ekle",
     tablo_adi="Cihazlar",
     normalize_fn=_normalize,
 
@@ -29,6 +29,7 @@ def _konfig(self) -> ImportKonfig:
     QHBoxLayout,
     QHeaderView,
     QLabel,
+    QProgressBar,
     QPushButton,
     QScrollArea,
     QSizePolicy,
@@ -39,11 +40,11 @@ def _konfig(self) -> ImportKonfig:
     QWidget,
 )
 
-import pandas as pd
 from core.hata_yonetici import bilgi_goster, hata_goster, uyari_goster
 
 from core.services.excel_import_service import (
 
+    EXCEL_PARCA_BOYUTU,
     ExcelImportService,
     ImportKonfig,
     ImportSonucu,
@@ -68,7 +69,9 @@ def _konfig(self) -> ImportKonfig:
 from PySide6.QtCore import QThread
 
 class _ImportThread(QThread):
-    bitti = Signal(object)   # ImportSonucu veya Exception
+    """fn(ilerleme) çalıştırır; ilerleme(okunan, toplam) sinyale aktarılır."""
+    bitti    = Signal(object)     # fn sonucu veya Exception
+    ilerleme = Signal(int, int)   # okunan, toplam (0 → bilinmiyor)
 
     def __init__(self, fn, parent=None):
         super().__init__(parent)
@@ -76,7 +79,7 @@ def __init__(self, fn, parent=None):
 
     def run(self):
         try:
-            self.bitti.emit(self._fn())
+            self.bitti.emit(self._fn(self.ilerleme.emit))
         except Exception as exc:
             self.bitti.emit(exc)
 
@@ -197,6 +200,9 @@ class BaseImportPage(QWidget):
     Alt sınıflar yalnızca _konfig() metodunu override eder.
     """
 
+    # Önizleme hazırlanırken dosyadan bir seferde okunan satır sayısı
+    PARCA_BOYUTU = EXCEL_PARCA_BOYUTU
+
     def __init__(self, db, kaydeden: str = "", parent=None):
         super().__init__(parent)
         self._db         = db
@@ -205,7 +211,8 @@ def __init__(self, db, kaydeden: str = "", parent=None):
         self._konfig_obj = self._konfig()
 
         # Durum değişkenleri
-        self._df: Optional[pd.DataFrame]       = None
+        self._dosya_yolu: str                   = ""
+        self._sutunlar: list[str]               = []    # Excel başlıkları
         self._harita: dict[str, str]            = {}
         self._manuel: dict[str, str]            = {}    # db_alan → elle girilen değer
         self._satirlar: list[SatirSonucu]       = []
@@ -258,6 +265,10 @@ def _kur_ui(self):
         self._btn_ileri.clicked.connect(self._ileri)
         nav.addWidget(self._btn_geri)
         nav.addStretch()
+        self._ilerleme = QProgressBar()
+        self._ilerleme.setFixedWidth(260)
+        self._ilerleme.setVisible(False)
+        nav.addWidget(self._ilerleme)
         nav.addWidget(self._btn_ileri)
         ana.addLayout(nav)
 
@@ -342,16 +353,20 @@ def _dosya_sec(self):
         if not yol:
             return
         try:
-            self._df = self._svc.excel_oku(yol)
-            satir = len(self._df)
-            sutun = len(self._df.columns)
+            # Yalnızca başlık okunur; satırlar önizlemede parça parça işlenir
+            sutunlar, tahmini = self._svc.excel_basligi(yol)
+            if not sutunlar:
+                raise ValueError("Dosyanın ilk satırında sütun başlığı bulunamadı.")
+            self._dosya_yolu = yol
+            self._sutunlar   = sutunlar
             self._dosya_bilgi.setText(
-                f"✔  {yol.split('/')[-1]}  —  {satir} satır, {sutun} sütun"
+                f"✔  {yol.split('/')[-1]}  —  ~{tahmini} satır, {len(sutunlar)} sütun"
             )
             self._btn_ileri.setEnabled(True)
         except ValueError as exc:
             hata_goster(self, str(exc))
-            self._df = None
+            self._dosya_yolu = ""
+            self._sutunlar   = []
             self._dosya_bilgi.setText("")
 
     # ------------------------------------------------------------------
@@ -390,8 +405,8 @@ def _adim2_olustur(self) -> QWidget:
         return w
 
     def _adim2_doldur(self):
-        """DataFrame yüklenince Adım 2 içeriğini DB alanları üzerinden inşa eder."""
-        if self._df is None:
+        """Dosya seçilince Adım 2 içeriğini DB alanları üzerinden inşa eder."""
+        if not self._sutunlar:
             return
 
         # Önceki içeriği temizle
@@ -407,7 +422,7 @@ def _adim2_doldur(self):
 
         # Excel sütun seçenekleri (tüm combolar için ortak liste)
         excel_secenekleri = [("", "— Eşleştirme Yok —")]
-        excel_secenekleri += [(s, s) for s in self._df.columns]
+        excel_secenekleri += [(s, s) for s in self._sutunlar]
         excel_secenekleri.append((self._ELLE_GIR, "✏  Elle Gir"))
 
         for at in tam_alanlar:
@@ -463,11 +478,11 @@ def _on_combo_changed(idx, _combo=combo, _edit=lineedit):
 
     def _otomatik_eslestir(self):
         """Motor otomatik eşleştirme önerisini yeni ters yapıda uygular."""
-        if self._df is None:
+        if not self._sutunlar:
             return
         # Motor hâlâ excel→db haritası döndürüyor, tersini al: db→excel
         harita_excel_db = self._svc.otomatik_eslestir(
-            self._df.columns.tolist(), self._konfig_obj
+            self._sutunlar, self._konfig_obj
         )
         harita_db_excel = {v: k for k, v in harita_excel_db.items()}
 
@@ -753,7 +768,7 @@ def _adima_git(self, adim: int):
         self._btn_ileri.setVisible(not son_adim)
 
         if adim == 0:
-            self._btn_ileri.setEnabled(self._df is not None)
+            self._btn_ileri.setEnabled(bool(self._dosya_yolu))
             self._btn_ileri.setText("İleri  ▶")
         elif adim == 1:
             self._btn_ileri.setEnabled(True)
@@ -771,7 +786,7 @@ def _ileri(self):
         mevcut = self._stack.currentIndex()
 
         if mevcut == 0:
-            if self._df is None:
+            if not self._dosya_yolu:
                 uyari_goster(self, "Lütfen önce bir dosya seçin.")
                 return
             self._adim2_doldur()
@@ -782,22 +797,47 @@ def _ileri(self):
                 return
             self._harita        = self._haritayi_oku()
             self._manuel        = self._manuel_degerleri_oku()
-            self._satirlar = self._svc.donustur(
-                self._df, self._harita, self._konfig_obj, self._manuel
-            )
-            self._satirlar = self._svc.duplicate_kontrol(
-                self._satirlar, self._konfig_obj, self._db
-            )
-            self._adim3_doldur()
-            self._adima_git(2)
+            self._btn_ileri.setEnabled(False)
+            self._btn_geri.setEnabled(False)
+            self._onizle_baslat()
 
         elif mevcut == 2:
             self._btn_ileri.setEnabled(False)
             self._btn_geri.setEnabled(False)
             self._yukle_baslat()
 
+    def _onizle_baslat(self):
+        """Dosyayı parça parça okuyup dönüştürür (arka planda, ilerlemeli)."""
+        def is_fn(ilerleme):
+            return self._svc.dosyadan_hazirla(
+                self._dosya_yolu, self._harita, self._konfig_obj, self._db,
+                self._manuel, parca_boyutu=self.PARCA_BOYUTU, ilerleme=ilerleme,
+            )
+        self._ilerleme.setRange(0, 0)
+        self._ilerleme.setVisible(True)
+        self._thread = _ImportThread(is_fn, parent=self)
+        self._thread.ilerleme.connect(self._ilerleme_guncelle)
+        self._thread.bitti.connect(self._onizle_bitti)
+        self._thread.start()
+
+    def _ilerleme_guncelle(self, okunan: int, toplam: int):
+        self._ilerleme.setRange(0, max(toplam, okunan, 1))
+        self._ilerleme.setValue(okunan)
+        self._ilerleme.setFormat(f"{okunan} satır okundu")
+
+    def _onizle_bitti(self, sonuc):
+        self._ilerleme.setVisible(False)
+        self._btn_ileri.setEnabled(True)
+        self._btn_geri.setEnabled(True)
+        if isinstance(sonuc, Exception):
+            hata_goster(self, str(sonuc), "Önizleme Hatası")
+            return
+        self._satirlar = sonuc
+        self._adim3_doldur()
+        self._adima_git(2)
+
     def _yukle_baslat(self):
-        def is_fn():
+        def is_fn(_ilerleme):
             return self._svc.yukle(
                 self._satirlar, self._konfig_obj, self._db, self._kaydeden
             )
@@ -820,7 +860,8 @@ def _yukle_bitti(self, sonuc):
     # ------------------------------------------------------------------
 
     def _sifirla(self):
-        self._df            = None
+        self._dosya_yolu    = ""
+        self._sutunlar      = []
         self._harita        = {}
         self._manuel        = {}
         self._satirlar      = []
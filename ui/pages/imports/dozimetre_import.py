@@ -15,6 +15,7 @@
     QProgressBar, QAbstractItemView,
 )
 from core.logger import logger
+from core.services.dozimetre_pdf_service import PersonelEslestirici
 from core.hata_yonetici import bilgi_goster, hata_goster, soru_sor
 from ui.components.base_table_model import BaseTableModel
 from ui.styles import DarkTheme
@@ -41,14 +42,6 @@ def _resolve_theme_color(color: str) -> str:
     }.get(color, color)
 
 # ─── Eşleştirme ────────────────────────────────────────────────
-def _match_tc(masked: str, real: str) -> bool:
-    m = re.match(r"^([0-9]+)(\*+)([0-9]+)$", masked)
-    if not m:
-        return False
-    prefix, stars, suffix = m.group(1), m.group(2), m.group(3)
-    expected = len(prefix) + len(stars) + len(suffix)
-    return len(real) == expected and real.startswith(prefix) and real.endswith(suffix)
-
 def _match_name(pdf_name: str, real_name: str) -> bool:
     pdf_parts  = pdf_name.upper().split()
     real_parts = real_name.upper().split()
@@ -65,11 +58,10 @@ def _match_name(pdf_name: str, real_name: str) -> bool:
                 break
     return matched >= max(1, len(pdf_parts) - 1)
 
-def match_personel(row: dict, personel_list: list[dict]) -> Optional[dict]:
+def match_personel(row: dict, eslestirici: PersonelEslestirici) -> Optional[dict]:
     tc_masked = row.get("TCKimlikNo", "")
     pdf_name  = row.get("AdSoyad", "")
-    candidates = [p for p in personel_list
-                  if _match_tc(tc_masked, str(p.get("KimlikNo", "")))]
+    candidates = eslestirici.adaylar(tc_masked)
     if not candidates:
         return None
     if len(candidates) == 1:
@@ -171,9 +163,10 @@ def run(self):
                     db.close()
                 except Exception:
                     pass
+            eslestirici = PersonelEslestirici(personel_list)
             eslesen = eslesmez = 0
             for r in rows:
-                p = match_personel(r, personel_list)
+                p = match_personel(r, eslestirici)
                 if p:
                     r["PersonelID"]     = str(p["KimlikNo"]).strip()
                     r["AdSoyad"]        = str(p["AdSoyad"]).strip()
@@ -204,9 +197,9 @@ def run(self):
             db = SQLiteManager(db_path=db_path, check_same_thread=False)
             svc = get_dozimetre_service(db)
             rno = self._header.get("RaporNo", "")
-            yeni = atlanan = 0
+            kayitlar = []
             for r in self._rows:
-                kayit = {
+                kayitlar.append({
                     "KayitNo":       uuid.uuid4().hex[:12].upper(),
                     "RaporNo":       rno,
                     "Periyot":       self._header.get("Periyot"),
@@ -222,14 +215,14 @@ def run(self):
                     "Hp10":          r["Hp10"],
                     "Hp007":         r["Hp007"],
                     "Durum":         r["Durum"],
-                }
-                sonuc = svc.olcum_ekle(kayit)
-                if sonuc.basarili:
-                    yeni += 1
-                else:
-                    atlanan += 1
+                })
+            # Tek transaction + executemany
+            sonuc = svc.olcum_ekle_toplu(kayitlar)
             db.close()
-            self.finished.emit(yeni, atlanan)
+            if not sonuc.basarili:
+                self.error.emit(sonuc.mesaj)
+                return
+            self.finished.emit(sonuc.veri, 0)
         except Exception as exc:
             self.error.emit(str(exc))
 
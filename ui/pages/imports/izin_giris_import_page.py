@@ -32,6 +32,7 @@ def _normalize(kayit: dict) -> dict:
     baslik="Toplu İzin Giriş İçe Aktarma",
     servis_fabrika=get_izin_service,
     servis_metod="insert_izin_giris",
+    servis_toplu_metod="toplu_izin_giris_ekle",
     tablo_adi="Izin_Giris",
     normalize_fn=_normalize,
 
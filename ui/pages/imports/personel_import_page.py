@@ -42,6 +42,7 @@ def _normalize(kayit: dict) -> dict:
         "core.di", fromlist=["get_personel_service"]
     ).get_personel_service(db),
     servis_metod="ekle",
+    servis_toplu_metod="toplu_ekle",
     tablo_adi="Personel",
     normalize_fn=_normalize,
 
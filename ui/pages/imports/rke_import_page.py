@@ -36,6 +36,7 @@ def _get_rke_servis(db):
     baslik="Toplu RKE Ekipman Listesi İçe Aktarma",
     servis_fabrika=_get_rke_servis,
     servis_metod="rke_ekle",
+    servis_toplu_metod="toplu_rke_ekle",
     tablo_adi="RKE_List",
 
     duplicate=DuplicateKontrol(
@@ -113,6 +114,7 @@ def _get_rke_servis(db):
     baslik="Toplu RKE Muayene Kaydı İçe Aktarma",
     servis_fabrika=_get_rke_servis,
     servis_metod="muayene_ekle",
+    servis_toplu_metod="toplu_muayene_ekle",
     tablo_adi="RKE_Muayene",
 
     duplicate=DuplicateKontrol(
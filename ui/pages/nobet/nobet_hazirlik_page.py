@@ -13,7 +13,7 @@
 from __future__ import annotations
 import uuid
 from calendar import monthrange
-from datetime import date, datetime, timedelta
+from datetime import date, datetime
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QColor
 from PySide6.QtWidgets import (
@@ -23,6 +23,7 @@
 )
 from core.di import get_registry
 from core.hata_yonetici import hata_goster
+from core.is_takvimi import listeden_takvim
 from core.logger import logger
 from ui.styles import DarkTheme
 from ui.styles.icons import IconRenderer, IconColors
@@ -39,12 +40,7 @@
 
 
 def _networkdays(bas, bit, tatiller):
-    if bas > bit: return 0
-    n, g = 0, bas
-    while g <= bit:
-        if g.weekday() < 5 and g.isoformat() not in tatiller: n += 1
-        g += timedelta(days=1)
-    return n
+    return listeden_takvim(tatiller).is_gunu(bas, bit)
 
 def _tatil_set(yil, ay, reg):
     try:
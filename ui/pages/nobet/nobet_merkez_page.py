@@ -21,7 +21,7 @@
 
 import uuid
 from calendar import monthrange
-from datetime import date, datetime, timedelta
+from datetime import date, datetime
 
 from PySide6.QtCore import Qt, QThread, Signal
 from PySide6.QtWidgets import (
@@ -31,6 +31,7 @@
 
 from core.di import get_registry
 from core.hata_yonetici import bilgi_goster, hata_goster, soru_sor, uyari_goster
+from core.is_takvimi import listeden_takvim
 from core.logger import logger
 from ui.styles import DarkTheme
 from ui.styles.icons import IconRenderer, IconColors
@@ -42,12 +43,7 @@
 
 
 def _networkdays(bas: date, bit: date, tatiller: set) -> int:
-    if bas > bit: return 0
-    n, g = 0, bas
-    while g <= bit:
-        if g.weekday() < 5 and g.isoformat() not in tatiller: n += 1
-        g += timedelta(days=1)
-    return n
+    return listeden_takvim(tatiller).is_gunu(bas, bit)
 
 
 def _tatil_set(yil, ay, reg, tur=None) -> set:
@@ -89,6 +85,31 @@ def run(self):
             self.hata.emit(str(e))
 
 
+class _TopluPlanThread(QThread):
+    """Birden çok birimi NbTopluPlan ile planlar (hesap işçi süreçlerde)."""
+    ilerleme = Signal(str, int, int, object)   # birim_id, tamamlanan, toplam, sonuç
+    bitti    = Signal(object)
+    hata     = Signal(str)
+
+    def __init__(self, db, birim_idler, yil, ay):
+        super().__init__()
+        self._db = db
+        self._birim_idler = birim_idler
+        self._yil = yil
+        self._ay  = ay
+
+    def run(self):
+        try:
+            from core.di import get_nobet_service
+            svc   = get_nobet_service(self._db)
+            sonuc = svc.toplu_otomatik_plan_olustur(
+                self._yil, self._ay, self._birim_idler,
+                ilerleme=self.ilerleme.emit)
+            self.bitti.emit(sonuc)
+        except Exception as e:
+            self.hata.emit(str(e))
+
+
 # ══════════════════════════════════════════════════════════════
 #  Ana Merkez Sayfası
 # ══════════════════════════════════════════════════════════════
@@ -136,6 +157,8 @@ def _build(self):
 
         self._plan = NobetPlanPage(
             db=self._db, action_guard=self._ag, parent=self)
+        # Plan verisi arka planda yüklenir; onay/temizle durumu gelince güncellenir
+        self._plan.veri_degisti.connect(self._plan_durum_guncelle)
 
         self._stack.addWidget(self._hazirlik)
         self._stack.addWidget(self._plan)
@@ -349,6 +372,16 @@ def _build_alt_bar(self) -> QFrame:
         self._btn_oto.clicked.connect(self._oto_plan)
         ph.addWidget(self._btn_oto)
 
+        self._btn_toplu = QPushButton("Tüm Birimler")
+        self._btn_toplu.setProperty("style-role","secondary")
+        self._btn_toplu.setFixedHeight(32)
+        IconRenderer.set_button_icon(
+            self._btn_toplu, "bolt", color=IconColors.MUTED, size=14)
+        self._btn_toplu.setToolTip(
+            "Hazırlığı onaylı tüm birimler için otomatik plan (paralel)")
+        self._btn_toplu.clicked.connect(self._toplu_plan)
+        ph.addWidget(self._btn_toplu)
+
         self._btn_temizle = QPushButton("Taslağı Temizle")
         self._btn_temizle.setProperty("style-role","danger")
         self._btn_temizle.setFixedHeight(32)
@@ -803,6 +836,80 @@ def _oto_plan_hata(self, msg: str):
         hata_goster(self, msg)
         self._oto_durum_guncelle()
 
+    def _toplu_plan(self):
+        try:
+            onayli = {
+                str(r.get("BirimID",""))
+                for r in self._reg().get("NB_HazirlikOnay").get_all() or []
+                if int(r.get("Yil",0)) == self._yil
+                and int(r.get("Ay",0)) == self._ay
+                and str(r.get("Durum","")) == "onaylandi"
+            }
+        except Exception as e:
+            hata_goster(self, str(e))
+            return
+        birimler = [self._cmb_birim.itemData(i)
+                    for i in range(self._cmb_birim.count())]
+        hazir = [b for b in birimler if b in onayli]
+        if not hazir:
+            uyari_goster(self, "Hazırlığı onaylanmış birim yok.")
+            return
+        atlanan = len(birimler) - len(hazir)
+        if not soru_sor(
+            self,
+            f"{_AY[self._ay]} {self._yil} için {len(hazir)} birimde otomatik plan "
+            "oluşturulacak; mevcut taslaklar silinecek.\n"
+            + (f"Hazırlığı onaylanmamış {atlanan} birim atlanacak.\n" if atlanan else "")
+            + "Devam edilsin mi?",
+        ):
+            return
+        self._btn_oto.setEnabled(False)
+        self._btn_toplu.setEnabled(False)
+        self._pbar.setRange(0, len(hazir))
+        self._pbar.setValue(0)
+        self._pbar.setVisible(True)
+        self._toplu_thread = _TopluPlanThread(
+            self._db, hazir, self._yil, self._ay)
+        self._toplu_thread.ilerleme.connect(self._toplu_plan_ilerleme)
+        self._toplu_thread.bitti.connect(self._toplu_plan_bitti)
+        self._toplu_thread.hata.connect(self._toplu_plan_hata)
+        self._toplu_thread.start()
+
+    def _toplu_plan_ilerleme(self, birim_id: str, n: int, toplam: int, sonuc):
+        self._pbar.setValue(n)
+        adi = next((self._cmb_birim.itemText(i)
+                    for i in range(self._cmb_birim.count())
+                    if self._cmb_birim.itemData(i) == birim_id), birim_id)
+        self._pbar.setToolTip(f"{n}/{toplam} — {adi}")
+        if birim_id == self._birim_id and sonuc.basarili:
+            self._yukle()
+
+    def _toplu_plan_bitti(self, sonuc):
+        self._toplu_bitir()
+        if not sonuc.basarili:
+            hata_goster(self, sonuc.mesaj)
+            return
+        hatalar = [
+            f"• {self._cmb_birim.itemText(self._cmb_birim.findData(bid))}: {s.mesaj}"
+            for bid, s in (sonuc.veri or {}).items() if not s.basarili
+        ]
+        if hatalar:
+            uyari_goster(self, sonuc.mesaj + "\n\n" + "\n".join(hatalar))
+        else:
+            bilgi_goster(self, sonuc.mesaj)
+
+    def _toplu_plan_hata(self, msg: str):
+        self._toplu_bitir()
+        hata_goster(self, msg)
+
+    def _toplu_bitir(self):
+        self._pbar.setVisible(False)
+        self._pbar.setRange(0, 0)
+        self._pbar.setToolTip("")
+        self._btn_toplu.setEnabled(True)
+        self._yukle()
+        self._oto_durum_guncelle()
+
     def _taslak_temizle(self):
         if not soru_sor(self, "Tüm taslak satırlar silinecek. Emin misiniz?"):
             return
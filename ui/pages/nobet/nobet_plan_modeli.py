@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""
+nobet_plan_modeli.py — Nöbet Plan takviminin görünüm modeli
+
+NobetPlanPage'in çizdiği her şey (gün → nöbetler, tatil / dini bayram,
+eksik slot ve revizyon günleri, personel ve vardiya listeleri) tek
+nesnede tutulur. Qt bağımlılığı yoktur; yukle() QThread'de çalışır.
+
+  model = PlanTakvimModeli.yukle(svc, birim_id, birim_adi, yil, ay)
+  model.hucre_durumu(tarih)      → hücrenin çizim imzası (diff için)
+  model.satir_ekle(satir)        → etkilenen tarihler (artımlı güncelleme)
+"""
+from __future__ import annotations
+
+from calendar import monthrange
+from collections import Counter
+from datetime import date
+
+from core.logger import logger
+
+
+class PlanTakvimModeli:
+    """Bir birim / ay için takvim verisi; düzenlemeler artımlı işlenir."""
+
+    def __init__(self, birim_id: str = "", birim_adi: str = "",
+                 yil: int = 0, ay: int = 0):
+        self.birim_id  = birim_id
+        self.birim_adi = birim_adi
+        self.yil = yil or date.today().year
+        self.ay  = ay or date.today().month
+        self.onay_durumu = "yok"
+        self.kapasite    = 0                     # günlük beklenen nöbet (0 → tanımsız)
+        self.tatil:  set[str] = set()
+        self.dini:   set[str] = set()
+        self.revizyon_gunleri: set[str] = set()
+        self.p_map:  dict[str, str]  = {}
+        self.v_map:  dict[str, dict] = {}
+        self.personeller: list[tuple[str, str]] = []   # (KimlikNo, AdSoyad)
+        self.vardiyalar:  list[dict] = []
+        self._satirlar: dict[str, dict] = {}            # SatirID → satır (sıra korunur)
+        self._gunler:   dict[str, list[str]] = {}       # tarih → [SatirID]
+
+    @property
+    def anahtar(self) -> tuple:
+        """Izgara yerleşimini belirleyen kimlik (değişirse hücreler yeniden kurulur)."""
+        return (self.birim_id, self.yil, self.ay)
+
+    # ── Yükleme (UI thread dışında) ─────────────────────────
+
+    @classmethod
+    def yukle(cls, svc, birim_id: str, birim_adi: str,
+              yil: int, ay: int) -> "PlanTakvimModeli":
+        m = cls(birim_id, birim_adi, yil, ay)
+        if not birim_id:
+            return m
+        reg = svc._r
+        ab, ae = m.tarihler()[0], m.tarihler()[-1]
+
+        try:
+            m.v_map = {str(v["VardiyaID"]): dict(v)
+                       for v in (reg.get("NB_Vardiya").get_all() or [])}
+        except Exception as e:
+            logger.error(f"plan_modeli.vardiya: {e}")
+        try:
+            for r in reg.get("Tatiller").query().between("Tarih", ab, ae).all():
+                turu = r.get("TatilTuru")
+                if turu == "Resmi":
+                    m.tatil.add(str(r.get("Tarih", "")))
+                elif turu == "DiniBayram":
+                    m.dini.add(str(r.get("Tarih", "")))
+        except Exception as e:
+            logger.error(f"plan_modeli.tatil: {e}")
+        try:
+            for p in (svc.get_personel_listesi(birim_adi).veri or []):
+                pid = str(p.get("KimlikNo", ""))
+                if pid:
+                    m.personeller.append((pid, p.get("AdSoyad", "")))
+            m.p_map = dict(m.personeller)
+        except Exception as e:
+            logger.error(f"plan_modeli.personel: {e}")
+        try:
+            m.vardiyalar = list(svc.get_vardiyalar(birim_id).veri or [])
+        except Exception as e:
+            logger.error(f"plan_modeli.vardiyalar: {e}")
+
+        plan = svc.plan.get_plan(birim_id, yil, ay)
+        plan = plan.veri if plan.basarili else None
+        if plan:
+            m.onay_durumu = str(plan.get("Durum", "taslak"))
+            sonuc = svc.get_plan(yil, ay, birim_id)
+            satirlar = sonuc.veri or [] if sonuc.basarili else []
+            # Birim dışından atanmış personelin adı
+            eksik = sorted({str(r.get("PersonelID", "")) for r in satirlar}
+                           - set(m.p_map) - {""})
+            if eksik:
+                try:
+                    for p in (reg.get("Personel").query("KimlikNo", "AdSoyad")
+                              .where(KimlikNo=eksik).all()):
+                        m.p_map[str(p["KimlikNo"])] = p.get("AdSoyad", "")
+                except Exception as e:
+                    logger.error(f"plan_modeli.personel_adi: {e}")
+            for r in satirlar:
+                m._ekle(r)
+            tum = svc.plan.get_satirlar(plan["PlanID"], sadece_aktif=False)
+            for s in (tum.veri or [] if tum.basarili else []):
+                tarih = str(s.get("NobetTarihi", "")).strip()
+                if tarih and (str(s.get("Durum", "aktif")) != "aktif"
+                              or s.get("OncekiSatirID")):
+                    m.revizyon_gunleri.add(tarih)
+        try:
+            m.kapasite = int(svc.gunluk_slot_kapasitesi(birim_id) or 0)
+        except Exception as e:
+            logger.error(f"plan_modeli.kapasite: {e}")
+        return m
+
+    # ── Okuma ───────────────────────────────────────────────
+
+    def tarihler(self) -> list[str]:
+        return [date(self.yil, self.ay, g).isoformat()
+                for g in range(1, monthrange(self.yil, self.ay)[1] + 1)]
+
+    @property
+    def plan_data(self) -> list[dict]:
+        return list(self._satirlar.values())
+
+    def gun_nobetleri(self, tarih: str) -> list[dict]:
+        return [self._satirlar[sid] for sid in self._gunler.get(tarih, ())]
+
+    def eksik_slot_mu(self, tarih: str) -> bool:
+        """Gün beklenen nöbet sayısının altında mı (dini bayram hariç)."""
+        if self.onay_durumu == "yok" and not self._satirlar:
+            return False
+        if self.kapasite <= 0 or tarih in self.dini:
+            return False
+        return len(self._gunler.get(tarih, ())) < self.kapasite
+
+    @property
+    def eksik_slot_gunleri(self) -> set[str]:
+        return {t for t in self.tarihler() if self.eksik_slot_mu(t)}
+
+    def personel_sayimi(self) -> Counter:
+        return Counter(str(r.get("PersonelID", "")).strip()
+                       for r in self._satirlar.values()
+                       if str(r.get("PersonelID", "")).strip())
+
+    def hucre_durumu(self, tarih: str) -> tuple:
+        """Hücre çizimini belirleyen değerler; eşitse hücre yeniden çizilmez."""
+        return (
+            tuple((r.get("SatirID"), r.get("AdSoyad"), r.get("PersonelID"))
+                  for r in self.gun_nobetleri(tarih)),
+            tarih in self.tatil, tarih in self.dini,
+            self.eksik_slot_mu(tarih), tarih in self.revizyon_gunleri,
+        )
+
+    # ── Artımlı güncelleme ──────────────────────────────────
+
+    def _ekle(self, satir: dict) -> str:
+        satir = dict(satir)
+        pid = str(satir.get("PersonelID", ""))
+        if not satir.get("AdSoyad"):
+            satir["AdSoyad"] = self.p_map.get(pid, "")
+        v = self.v_map.get(str(satir.get("VardiyaID", "")), {})
+        satir.setdefault("BirimID", self.birim_id)
+        if not satir.get("VardiyaAdi"):
+            satir["VardiyaAdi"] = v.get("VardiyaAdi", "")
+        satir.setdefault("BasSaat", v.get("BasSaat", ""))
+        satir.setdefault("BitSaat", v.get("BitSaat", ""))
+        satir.setdefault("SureDakika", v.get("SureDakika", 0))
+        satir.setdefault("VardiyaRolu", v.get("Rol", "ana"))
+        sid = str(satir.get("SatirID", ""))
+        tarih = str(satir.get("NobetTarihi", ""))
+        self._satirlar[sid] = satir
+        if tarih:
+            self._gunler.setdefault(tarih, []).append(sid)
+        return tarih
+
+    def _eksik_kapisi(self) -> bool:
+        return not (self.onay_durumu == "yok" and not self._satirlar)
+
+    def satir_ekle(self, satir: dict) -> set[str]:
+        """Yeni aktif satırı işler; yeniden çizilmesi gereken tarihleri döner."""
+        once = self._eksik_kapisi()
+        if self.onay_durumu == "yok":
+            self.onay_durumu = "taslak"
+        tarih = self._ekle(satir)
+        if once != self._eksik_kapisi():
+            return set(self.tarihler())
+        return {tarih} if tarih else set()
+
+    def satir_cikar(self, satir_id: str) -> set[str]:
+        """İptal edilen / değiştirilen satırı düşer; gün revizyonlu işaretlenir."""
+        satir = self._satirlar.pop(str(satir_id), None)
+        if not satir:
+            return set()
+        tarih = str(satir.get("NobetTarihi", ""))
+        gunluk = self._gunler.get(tarih, [])
+        if str(satir_id) in gunluk:
+            gunluk.remove(str(satir_id))
+        if not gunluk:
+            self._gunler.pop(tarih, None)
+        if tarih:
+            self.revizyon_gunleri.add(tarih)
+        return {tarih} if tarih else set()
+
+    def satir_degistir(self, eski_satir_id: str, yeni: dict) -> set[str]:
+        return self.satir_cikar(eski_satir_id) | self.satir_ekle(yeni)
@@ -10,12 +10,17 @@
   get_onay_durumu() -> str
   get_plan_data() -> list
   hazirlik_onay_degisti(onaylandi: bool)
+  veri_degisti (Signal) — yükleme veya düzenleme sonrası
+
+Veri PlanTakvimModeli'nde (nobet_plan_modeli.py) tutulur ve QThread'de
+yüklenir. Aynı birim/ay yeniden yüklenince yalnızca durumu değişen gün
+hücreleri yeniden çizilir; ekle / değiştir / sil modele artımlı işlenir.
 """
 from __future__ import annotations
 from calendar import monthrange
 from datetime import date
 from typing import Optional
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, QThread, Signal
 from PySide6.QtGui import QCursor
 from PySide6.QtWidgets import (
     QWidget, QHBoxLayout, QVBoxLayout, QFrame, QLabel,
@@ -27,6 +32,7 @@
 from core.logger import logger
 from ui.styles import DarkTheme
 from ui.styles.icons import IconRenderer, IconColors
+from ui.pages.nobet.nobet_plan_modeli import PlanTakvimModeli
 
 _AY  = ["","Ocak","Şubat","Mart","Nisan","Mayıs","Haziran",
          "Temmuz","Ağustos","Eylül","Ekim","Kasım","Aralık"]
@@ -137,7 +143,27 @@ def __init__(self, parent=None):
         )
 
 
+class _ModelYukleyici(QThread):
+    """PlanTakvimModeli'ni UI thread dışında kurar."""
+    hazir = Signal(object, int)     # model, istek no
+    hata  = Signal(str, int)
+
+    def __init__(self, svc, birim_id, birim_adi, yil, ay, istek: int):
+        super().__init__()
+        self._svc = svc
+        self._args = (birim_id, birim_adi, yil, ay)
+        self._istek = istek
+
+    def run(self):
+        try:
+            self.hazir.emit(
+                PlanTakvimModeli.yukle(self._svc, *self._args), self._istek)
+        except Exception as e:
+            self.hata.emit(str(e), self._istek)
+
+
 class NobetPlanPage(QWidget):
+    veri_degisti = Signal()
 
     def __init__(self, db=None, action_guard=None, parent=None):
         super().__init__(parent)
@@ -147,14 +173,11 @@ def __init__(self, db=None, action_guard=None, parent=None):
         self._ay   = date.today().month
         self._birim_id  = ""
         self._birim_adi = ""
-        self._onay_durumu  = "yok"
-        self._plan_data:  list[dict]      = []
-        self._p_map:      dict[str,str]   = {}
-        self._v_map:      dict[str,dict]  = {}
-        self._tatil:      set[str]        = set()
-        self._dini:       set[str]        = set()
-        self._eksik_slot_gunleri: set[str] = set()
-        self._revizyon_gunleri: set[str] = set()
+        self._model = PlanTakvimModeli()
+        self._izgara_anahtari: Optional[tuple] = None
+        self._hucre_durumlari: dict[str,tuple] = {}
+        self._istek_no = 0
+        self._yukleyiciler: list[_ModelYukleyici] = []
         self._hucreler:   dict[str,_Hucre]= {}
         self._secili_gun: Optional[date]  = None
         self._hazirlik_ok: bool           = False
@@ -348,10 +371,10 @@ def yukle(self, birim_id: str, birim_adi: str, yil: int, ay: int):
         self._yukle_data()
 
     def get_onay_durumu(self) -> str:
-        return self._onay_durumu
+        return self._model.onay_durumu
 
     def get_plan_data(self) -> list:
-        return self._plan_data
+        return self._model.plan_data
 
     def hazirlik_onay_degisti(self, onaylandi: bool):
         self._hazirlik_ok = onaylandi
@@ -359,134 +382,53 @@ def hazirlik_onay_degisti(self, onaylandi: bool):
     # ── Veri ──────────────────────────────────────────────────
 
     def _yukle_data(self):
-        if not self._birim_id:
-            self._plan_data = []; self._onay_durumu = "yok"; self._ciz(); return
-        try:
-            svc = self._svc(); reg = svc._r
-            try:
-                self._v_map = {str(v["VardiyaID"]): dict(v)
-                               for v in (reg.get("NB_Vardiya").get_all() or [])}
-            except Exception: self._v_map = {}
-            try:
-                self._p_map = {str(p["KimlikNo"]): p.get("AdSoyad","")
-                               for p in (reg.get("Personel").get_all() or [])}
-            except Exception: self._p_map = {}
-            try:
-                t_rows = reg.get("Tatiller").get_all() or []
-                ab = f"{self._yil:04d}-{self._ay:02d}-01"
-                ae = f"{self._yil:04d}-{self._ay:02d}-31"
-                self._tatil = {str(r.get("Tarih","")) for r in t_rows
-                               if ab <= str(r.get("Tarih","")) <= ae
-                               and r.get("TatilTuru") == "Resmi"}
-                self._dini  = {str(r.get("Tarih","")) for r in t_rows
-                               if ab <= str(r.get("Tarih","")) <= ae
-                               and r.get("TatilTuru") == "DiniBayram"}
-            except Exception: self._tatil = set(); self._dini = set()
-
-            # Durum tutarlılığı için birim çözümünü metne bırakma; doğrudan BirimID kullan.
-            sonuc = svc.get_plan(self._yil, self._ay, self._birim_id)
-            self._plan_data = sonuc.veri or [] if sonuc.basarili else []
-            for r in self._plan_data:
-                if not r.get("AdSoyad"):
-                    r["AdSoyad"] = self._p_map.get(str(r.get("PersonelID","")), "")
-                if not r.get("VardiyaAdi"):
-                    r["VardiyaAdi"] = self._v_map.get(
-                        str(r.get("VardiyaID","")), {}).get("VardiyaAdi","")
-            try:
-                rows = (svc.onay_getir(self._yil, self._ay, self._birim_id).veri or [])
-                self._onay_durumu = rows[0].get("Durum","yok") if rows else "yok"
-            except Exception: self._onay_durumu = "yok"
-            self._eksik_slot_gunleri = self._eksik_slot_gunlerini_hesapla(reg)
-            self._revizyon_gunleri = self._revizyon_gunlerini_hesapla()
-        except Exception as e:
-            logger.error(f"plan._yukle_data: {e}")
-            self._plan_data = []; self._onay_durumu = "yok"
-            self._eksik_slot_gunleri = set()
-            self._revizyon_gunleri = set()
+        """Modeli arka planda yükler; gelene kadar mevcut takvim kalır."""
+        self._istek_no += 1
+        if not self._birim_id or not self._svc():
+            self._model_uygula(PlanTakvimModeli(
+                self._birim_id, self._birim_adi, self._yil, self._ay))
+            return
+        self._lbl_sol_ozet.setText("Yükleniyor…")
+        th = _ModelYukleyici(self._svc(), self._birim_id, self._birim_adi,
+                             self._yil, self._ay, self._istek_no)
+        th.hazir.connect(self._model_geldi)
+        th.hata.connect(self._model_hatasi)
+        th.finished.connect(lambda t=th: self._yukleyici_bitti(t))
+        self._yukleyiciler.append(th)
+        th.start()
+
+    def _yukleyici_bitti(self, th: _ModelYukleyici):
+        if th in self._yukleyiciler:
+            self._yukleyiciler.remove(th)
+        th.deleteLater()
+
+    def _model_geldi(self, model: PlanTakvimModeli, istek: int):
+        if istek != self._istek_no:
+            return  # arada başka birim / ay istendi
+        self._model_uygula(model)
+
+    def _model_hatasi(self, mesaj: str, istek: int):
+        logger.error(f"plan._yukle_data: {mesaj}")
+        if istek == self._istek_no:
+            self._model_uygula(PlanTakvimModeli(
+                self._birim_id, self._birim_adi, self._yil, self._ay))
+
+    def _model_uygula(self, model: PlanTakvimModeli):
+        self._model = model
         self._ciz()
         self._manuel_sec_yukle()
         self._sol_panel_guncelle()
+        if self._secili_gun and self._sag.isVisible():
+            self._gun_paneli_doldur(self._secili_gun)
+        self.veri_degisti.emit()
 
-    def _revizyon_gunlerini_hesapla(self) -> set[str]:
-        if not self._birim_id:
-            return set()
-        try:
-            plan_sonuc = self._svc().plan.get_plan(self._birim_id, self._yil, self._ay)
-            if not plan_sonuc.basarili:
-                return set()
-            plan = plan_sonuc.veri
-            if not plan:
-                return set()
-            sonuc = self._svc().plan.get_satirlar(plan["PlanID"], sadece_aktif=False)
-            if not sonuc.basarili:
-                return set()
-
-            revizyon_gunleri: set[str] = set()
-            for satir in (sonuc.veri or []):
-                tarih = str(satir.get("NobetTarihi", "")).strip()
-                if not tarih:
-                    continue
-                if str(satir.get("Durum", "aktif")) != "aktif" or satir.get("OncekiSatirID"):
-                    revizyon_gunleri.add(tarih)
-            return revizyon_gunleri
-        except Exception as e:
-            logger.error(f"revizyon_gunlerini_hesapla: {e}")
-            return set()
-
-    def _eksik_slot_gunlerini_hesapla(self, reg) -> set[str]:
-        if self._onay_durumu == "yok" and not self._plan_data:
-            return set()
-
-        try:
-            ayar_rows = reg.get("NB_BirimAyar").get_all() or []
-            ayar = next(
-                (r for r in ayar_rows if str(r.get("BirimID", "")) == str(self._birim_id)),
-                None,
-            )
-            slot_sayisi = int((ayar or {}).get("GunlukSlotSayisi", 4) or 4)
-        except Exception:
-            slot_sayisi = 4
-
-        try:
-            grup_rows = reg.get("NB_VardiyaGrubu").get_all() or []
-            aktif_grup_idleri = {
-                str(r.get("GrupID", ""))
-                for r in grup_rows
-                if str(r.get("BirimID", "")) == str(self._birim_id)
-                and int(r.get("Aktif", 1))
-            }
-            v_rows = reg.get("NB_Vardiya").get_all() or []
-            aktif_ana_vardiya_sayisi = sum(
-                1 for v in v_rows
-                if str(v.get("GrupID", "")) in aktif_grup_idleri
-                and str(v.get("Rol", "ana")) == "ana"
-                and int(v.get("Aktif", 1))
-            )
-        except Exception:
-            aktif_ana_vardiya_sayisi = 0
-
-        if slot_sayisi <= 0 or aktif_ana_vardiya_sayisi <= 0:
-            return set()
-
-        beklenen = slot_sayisi * aktif_ana_vardiya_sayisi
-        if beklenen <= 0:
-            return set()
-
-        sayim: dict[str, int] = {}
-        for n in self._plan_data:
-            tarih = str(n.get("NobetTarihi", "")).strip()
-            if tarih:
-                sayim[tarih] = sayim.get(tarih, 0) + 1
-
-        eksik: set[str] = set()
-        ay_son = monthrange(self._yil, self._ay)[1]
-        for gun_no in range(1, ay_son + 1):
-            tarih = date(self._yil, self._ay, gun_no).isoformat()
-            if tarih in self._dini:
-                continue
-            if sayim.get(tarih, 0) < beklenen:
-                eksik.add(tarih)
-        return eksik
+    def _duzenleme_uygula(self, tarihler: set[str]):
+        """Artımlı düzenleme sonrası yalnızca etkilenen günleri günceller."""
+        self._hucreleri_guncelle(tarihler)
+        self._sol_panel_guncelle()
+        if self._secili_gun and self._secili_gun.isoformat() in tarihler:
+            self._gun_paneli_doldur(self._secili_gun)
+        self.veri_degisti.emit()
 
     def _sol_panel_guncelle(self):
         while self._sol_l.count():
@@ -502,27 +444,12 @@ def _sol_panel_guncelle(self):
             self._sol_l.addStretch()
             return
 
-        sayim: dict[str, int] = {}
-        for n in self._plan_data:
-            pid = str(n.get("PersonelID", "")).strip()
-            if pid:
-                sayim[pid] = sayim.get(pid, 0) + 1
-
-        personeller: list[tuple[str, str]] = []
-        try:
-            sonuc = self._svc().get_personel_listesi(self._birim_adi)
-            p_rows = sonuc.veri or []
-            for p in p_rows:
-                pid = str(p.get("KimlikNo", ""))
-                ad = p.get("AdSoyad", "")
-                if pid:
-                    personeller.append((pid, ad))
-        except Exception as e:
-            logger.error(f"sol_panel_personel: {e}")
+        sayim = self._model.personel_sayimi()
+        personeller = list(self._model.personeller)
 
         if not personeller and sayim:
             for pid, adet in sorted(sayim.items(), key=lambda x: x[1], reverse=True):
-                personeller.append((pid, self._p_map.get(pid, pid)))
+                personeller.append((pid, self._model.p_map.get(pid, pid)))
 
         toplam_nobet = sum(sayim.values())
         self._lbl_sol_ozet.setText(
@@ -556,25 +483,31 @@ def _sol_panel_guncelle(self):
     # ── Takvim ────────────────────────────────────────────────
 
     def _ciz(self):
+        """Izgarayı kurar (birim / ay değiştiyse) ya da değişen günleri günceller."""
+        if (self._model.birim_id and self._hucreler
+                and self._izgara_anahtari == self._model.anahtar):
+            self._hucreleri_guncelle(self._model.tarihler())
+            return
+
         while self._tl.count():
             item = self._tl.takeAt(0)
             if item.widget(): item.widget().deleteLater()
         self._hucreler.clear()
-        if not self._birim_id:
+        self._hucre_durumlari.clear()
+        self._izgara_anahtari = self._model.anahtar
+        if not self._model.birim_id:
             lbl = QLabel("Birim seçin")
             lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
             lbl.setProperty("color-role", "secondary")
             lbl.setStyleSheet("font-size:14px;")
             self._tl.addWidget(lbl, 0, 0, 1, 7); return
 
-        nobet_map: dict[str,list] = {}
-        for n in self._plan_data:
-            t = str(n.get("NobetTarihi",""))
-            if t: nobet_map.setdefault(t,[]).append(n)
-
-        ay_son = monthrange(self._yil, self._ay)[1]
-        ilk_gun = date(self._yil, self._ay, 1)
-        baslangic_kolon = ilk_gun.weekday()
+        yil, ay = self._model.yil, self._model.ay
+        if self._secili_gun and (self._secili_gun.year, self._secili_gun.month) != (yil, ay):
+            self._secili_gun = None
+            self._sag.setVisible(False)
+        ay_son = monthrange(yil, ay)[1]
+        baslangic_kolon = date(yil, ay, 1).weekday()
 
         gun_no = 1
         for row in range(6):
@@ -584,36 +517,47 @@ def _ciz(self):
                     self._tl.addWidget(_BosHucre(), row, col)
                     continue
 
-                gun = date(self._yil, self._ay, gun_no)
-                t = gun.isoformat()
+                gun = date(yil, ay, gun_no)
                 h = _Hucre(gun)
-                h.guncelle(nobet_map.get(t,[]),
-                           tatil=(t in self._tatil), dini=(t in self._dini),
-                           secili=(gun == self._secili_gun),
-                           eksik_slot=(t in self._eksik_slot_gunleri),
-                           revizyon_var=(t in self._revizyon_gunleri))
                 h.tiklandi.connect(self._gun_tiklandi)
                 self._tl.addWidget(h, row, col)
-                self._hucreler[t] = h
+                self._hucreler[gun.isoformat()] = h
                 gun_no += 1
+        self._hucreleri_guncelle(self._hucreler)
 
-    def _gun_tiklandi(self, gun: date, nobetler: list):
+    def _hucreleri_guncelle(self, tarihler):
+        """Yalnızca çizim durumu değişen hücreleri yeniden çizer."""
+        for t in tarihler:
+            h = self._hucreler.get(t)
+            if h is None:
+                continue
+            durum = self._model.hucre_durumu(t) + (h.gun == self._secili_gun,)
+            if self._hucre_durumlari.get(t) == durum:
+                continue
+            nobetler, tatil, dini, eksik, revizyon, secili = durum
+            h.guncelle(self._model.gun_nobetleri(t),
+                       tatil=tatil, dini=dini, secili=secili,
+                       eksik_slot=eksik, revizyon_var=revizyon)
+            self._hucre_durumlari[t] = durum
+
+    def _gun_tiklandi(self, gun: date, nobetler: list = None):
+        onceki = self._secili_gun
         self._secili_gun = gun
         self._secili_satir = None
-        secili_tarih = gun.isoformat()
-        for t, h in self._hucreler.items():
-            h.guncelle([n for n in self._plan_data
-                        if str(n.get("NobetTarihi","")) == t],
-                       tatil=(t in self._tatil), dini=(t in self._dini),
-                       secili=(h.gun == self._secili_gun),
-                       eksik_slot=(t in self._eksik_slot_gunleri),
-                       revizyon_var=(t in self._revizyon_gunleri))
+        self._hucreleri_guncelle(
+            {gun.isoformat()} | ({onceki.isoformat()} if onceki else set()))
         self._sag.setVisible(True)
-        self._lbl_m_gun.setText(f"{gun.day} {_AY[gun.month]} {gun.year}")
         self._degisim_secimini_temizle()
-        bos_veya_eksik = (len(nobetler) == 0) or (secili_tarih in self._eksik_slot_gunleri)
-        self._btn_form_ac.setVisible(bos_veya_eksik)
         self._revizyon_alani_goster(False)
+        self._gun_paneli_doldur(gun)
+
+    def _gun_paneli_doldur(self, gun: date):
+        """Sağ paneldeki günün nöbet listesini modelden doldurur."""
+        secili_tarih = gun.isoformat()
+        nobetler = self._model.gun_nobetleri(secili_tarih)
+        self._lbl_m_gun.setText(f"{gun.day} {_AY[gun.month]} {gun.year}")
+        bos_veya_eksik = (len(nobetler) == 0) or self._model.eksik_slot_mu(secili_tarih)
+        self._btn_form_ac.setVisible(bos_veya_eksik)
         while self._ml.count():
             w = self._ml.takeAt(0).widget()
             if w: w.deleteLater()
@@ -695,17 +639,14 @@ def _revizyon_gecmisi_goster(self):
 
     def _manuel_sec_yukle(self):
         self._cmb_mv.clear(); self._cmb_mp.clear()
-        if not self._birim_id: return
+        if not self._model.birim_id: return
         try:
-            svc = self._svc()
-            for v in (svc.get_vardiyalar(self._birim_id).veri or []):
+            for v in self._model.vardiyalar:
                 self._cmb_mv.addItem(
                     f"{v.get('VardiyaAdi','')} ({v.get('BasSaat','')}-{v.get('BitSaat','')})",
                     userData=v.get("VardiyaID",""))
-            p_rows = svc.get_personel_listesi(self._birim_adi).veri or []
-            for p in p_rows:
-                self._cmb_mp.addItem(p.get("AdSoyad",""),
-                                    userData=str(p["KimlikNo"]))
+            for pid, ad in self._model.personeller:
+                self._cmb_mp.addItem(ad, userData=pid)
         except Exception as e: logger.error(f"manuel_sec_yukle: {e}")
 
     def _manuel_kaydet(self):
@@ -725,7 +666,7 @@ def _manuel_kaydet(self):
             s = self._svc().plan_ekle(veri)
             if s.basarili:
                 self._txt_neden.clear()
-                self._yukle_data()
+                self._duzenleme_uygula(self._model.satir_ekle(s.veri))
                 return
 
             hata_msg = str(
@@ -747,7 +688,7 @@ def _manuel_kaydet(self):
                     s2 = self._svc().plan_ekle(veri)
                     if s2.basarili:
                         self._txt_neden.clear()
-                        self._yukle_data()
+                        self._duzenleme_uygula(self._model.satir_ekle(s2.veri))
                         return
                     msg2 = str(
                         getattr(s2, "mesaj", "")
@@ -773,21 +714,17 @@ def _nobet_degistir(self):
             uyari_goster(self, "Seçili nöbet zaten bu personele ait.")
             return
         try:
+            eski_satir_id = str(self._secili_satir.get("SatirID", ""))
             sonuc = self._svc().plan_degistir(
-                satir_id=str(self._secili_satir.get("SatirID", "")),
+                satir_id=eski_satir_id,
                 yeni_personel_id=str(yeni_pid),
                 neden=self._txt_neden.text().strip(),
             )
             if sonuc.basarili:
                 self._txt_neden.clear()
-                self._yukle_data()
-                if self._secili_gun:
-                    secili_tarih = self._secili_gun.isoformat()
-                    gun_satirlari = [
-                        n for n in self._plan_data
-                        if str(n.get("NobetTarihi", "")) == secili_tarih
-                    ]
-                    self._gun_tiklandi(self._secili_gun, gun_satirlari)
+                self._degisim_secimini_temizle()
+                self._duzenleme_uygula(
+                    self._model.satir_degistir(eski_satir_id, sonuc.veri))
                 return
             hata_goster(self, str(sonuc.mesaj or sonuc.hata))
         except Exception as e:
@@ -797,6 +734,6 @@ def _nobet_sil(self, satir_id: str):
         if not satir_id: return
         try:
             s = self._svc().plan_iptal(satir_id)
-            if s.basarili: self._yukle_data()
+            if s.basarili: self._duzenleme_uygula(self._model.satir_cikar(satir_id))
             else: hata_goster(self, str(s.hata))
         except Exception as e: hata_goster(self, str(e))
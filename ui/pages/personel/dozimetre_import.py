@@ -4,9 +4,8 @@
 Yenilikler: mükerrer önleme (UNIQUE RaporNo+SiraNo) + personel eşleştirme
 """
 from __future__ import annotations
-import re, uuid
+import uuid
 from typing import Optional
-import pdfplumber
 from PySide6.QtCore import Qt, QThread, Signal as _Signal
 from PySide6.QtGui import QColor
 from PySide6.QtWidgets import (
@@ -15,6 +14,7 @@
     QProgressBar, QAbstractItemView,
 )
 from core.logger import logger
+from core.services.dozimetre_pdf_service import PersonelEslestirici, parse_radat_pdf
 from core.hata_yonetici import soru_sor, bilgi_goster, hata_goster
 from ui.components.base_table_model import BaseTableModel
 from ui.styles import DarkTheme
@@ -38,170 +38,6 @@ def _resolve_theme_color(color: str) -> str:
         "accent": DarkTheme.ACCENT,
     }.get(color, color)
 
-# ─── Eşleştirme ────────────────────────────────────────────────
-def _match_tc(masked: str, real: str) -> bool:
-    m = re.match(r"^([0-9]+)(\*+)([0-9]+)$", masked)
-    if not m:
-        return False
-    prefix, stars, suffix = m.group(1), m.group(2), m.group(3)
-    expected = len(prefix) + len(stars) + len(suffix)
-    return len(real) == expected and real.startswith(prefix) and real.endswith(suffix)
-
-
-def _name_score(pdf_name: str, real_name: str) -> int:
-    """
-    PDF'deki kısmi isim ile DB'deki tam isim arasında eşleşme skoru.
-    Yıldız-arası TÜM görünür segmentler değerlendirilir.
-    Örnek: 'ZEYN**TÜRKDÖNM**' → ['ZEYN','TÜRKDÖNM'] her ikisi de aranır.
-    """
-    import unicodedata
-    def norm(s):
-        s = unicodedata.normalize("NFKD", s.upper())
-        return s.encode("ascii", "ignore").decode()
-    real_parts = [norm(p) for p in real_name.split() if p]
-    if not real_parts:
-        return 0
-    score = 0
-    for pp in pdf_name.split():
-        segs = [s for s in pp.split("*") if s]
-        for seg in segs:
-            seg_n = norm(seg)
-            if not seg_n:
-                continue
-            for rp in real_parts:
-                if rp.startswith(seg_n):
-                    score += len(seg_n)
-                    break
-    return score
-
-
-def match_personel(row: dict, personel_list: list[dict]) -> Optional[dict]:
-    """
-    1. TC maskesiyle DB'de aday bul.
-    2. Aday yoksa → None (masked TC kalır).
-    3. Adaylar arasında PDF ismiyle skor hesapla:
-       - En yüksek skor > 0 → o kişiyi döndür
-       - Tüm skorlar 0 → isim örtüşmesi yok, None (masked TC kalır)
-       Tek aday olsa bile isim uyuşmuyorsa yanlış eşleşme olmaz.
-    """
-    tc_masked = row.get("PersonelID", "")
-    pdf_name  = row.get("AdSoyad", "")
-    candidates = [p for p in personel_list
-                  if _match_tc(tc_masked, str(p.get("KimlikNo", "")))]
-    if not candidates:
-        return None
-    en_iyi: Optional[dict] = None
-    en_iyi_skor = 0
-    for aday in candidates:
-        skor = _name_score(pdf_name, str(aday.get("AdSoyad", "")))
-        if skor > en_iyi_skor:
-            en_iyi_skor = skor
-            en_iyi = aday
-    return en_iyi if en_iyi_skor > 0 else None
-
-# ─── PDF Parser ─────────────────────────────────────────────────
-def _parse_hp(raw) -> Optional[float]:
-    if not raw: return None
-    s = str(raw).strip()
-    if "0,05" in s or "altındadır" in s: return 0.05
-    s = s.replace(",", ".")
-    try:
-        v = float(s)
-        return v if 0 <= v <= 500 else None
-    except ValueError:
-        return None
-
-def _is_tc_masked(s: str) -> bool:
-    return bool(re.match(r"^\d+\*+\d+$", str(s).strip()))
-
-
-def _smart_parse_row(row: list) -> dict:
-    birim = vucut = dzm_no = durum = ""
-    hp10 = hp007 = None
-
-    # row[1] ve row[2] — TC ile ad pozisyonu otomatik tespit
-    r1 = str(row[1] or "").strip().replace("\n", " ")
-    r2 = str(row[2] or "").strip().replace("\n", " ")
-
-    if _is_tc_masked(r1.split()[0] if r1.split() else ""):
-        tc_raw   = r1.split()[0]
-        ad_soyad = r2
-    else:
-        ad_soyad = r1
-        tc_raw   = r2.split()[0] if r2.split() else r2
-
-    for i in range(3, len(row)):
-        v = row[i]
-        if not v: continue
-        s = str(v).strip()
-        if "Radyoloji" in s and not birim:
-            birim = "Radyoloji A.B.D."
-        elif any(k in s for k in ("Vücut","Önlük","Bilek","Yaka")) and not vucut:
-            vucut = s.replace("\n"," ")
-        elif s.isdigit() and not dzm_no:
-            dzm_no = s
-        elif "Sınırın" in s or "Aşım" in s:
-            durum = s
-        elif _parse_hp(s) is not None and dzm_no:
-            if hp10 is None: hp10 = _parse_hp(s)
-            elif hp007 is None: hp007 = _parse_hp(s)
-    return {
-        "AdSoyad":      ad_soyad,
-        "PersonelID":   tc_raw,   # masked TC → başlangıç değeri, eşleşince gerçek TC yazılır
-        "CalistiBirim": birim or "Radyoloji A.B.D.",
-        "VucutBolgesi": vucut,
-        "DozimetreNo":  dzm_no,
-        "Hp10":         hp10,
-        "Hp007":        hp007,
-        "Durum":        durum or "Sınırın Altında",
-    }
-
-def parse_radat_pdf(pdf_path: str) -> tuple[dict, list[dict]]:
-    header: dict = {}
-    all_rows: list[dict] = []
-    with pdfplumber.open(pdf_path) as pdf:
-        for idx, page in enumerate(pdf.pages):
-            text = page.extract_text() or ""
-
-            if "RaporNo" not in header:
-                m = re.search(r"Rapor\s*(?:No|Numaras[ıiIİ])\s*[:\s]+([0-9]{3,12})",
-                              text, re.IGNORECASE)
-                if m:
-                    header["RaporNo"] = m.group(1).strip()
-                else:
-                    for line in text.splitlines():
-                        line = line.strip()
-                        if re.fullmatch(r"\d{3,12}", line):
-                            header["RaporNo"] = line
-                            break
-
-            if "Periyot" not in header:
-                m = re.search(
-                    r"Periyot\s*/\s*Y[ıi]l\s*[:\s]+(\d+)\s*\(([^)]+)\)\s*/\s*(\d{4})",
-                    text, re.IGNORECASE)
-                if m:
-                    header["Periyot"]    = int(m.group(1))
-                    header["PeriyotAdi"] = m.group(2).strip()
-                    header["Yil"]        = int(m.group(3))
-                else:
-                    m = re.search(r"(\d+)[.\s]*\s*Periyot\s*/\s*(\d{4})", text, re.IGNORECASE)
-                    if m:
-                        header["Periyot"] = int(m.group(1))
-                        header["Yil"]     = int(m.group(2))
-
-            if "DozimetriTipi" not in header:
-                m = re.search(r"Dozimetr[ei]\s+Tip[i]?\s*[:\s]+(\w+)", text, re.IGNORECASE)
-                if m:
-                    header["DozimetriTipi"] = m.group(1)
-
-            for table in page.extract_tables():
-                for row in table:
-                    if not row or not row[0]: continue
-                    if not str(row[0]).strip().isdigit(): continue
-                    all_rows.append(_smart_parse_row(row))
-
-    return header, all_rows
-
 # ─── Workers ────────────────────────────────────────────────────
 class _PdfLoader(QThread):
     finished = _Signal(dict, list, int, int)
@@ -237,9 +73,10 @@ def run(self):
                     db.close()
                 except Exception:
                     pass
+            eslestirici = PersonelEslestirici(personel_list)
             eslesen = eslesmez = 0
             for r in rows:
-                p = match_personel(r, personel_list)
+                p, _ = eslestirici.eslestir(r.get("PersonelID", ""), r.get("AdSoyad", ""))
                 if p:
                     r["PersonelID"]     = str(p["KimlikNo"]).strip()
                     r["AdSoyad"]        = str(p["AdSoyad"]).strip()
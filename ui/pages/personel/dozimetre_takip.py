@@ -443,7 +443,7 @@ def run(self):
             db = SQLiteManager(db_path=db_path, check_same_thread=False)
             svc = get_dozimetre_service(db)
 
-            sonuc = svc.get_tum_olcumler()
+            sonuc = svc.get_tum_olcumler(compact=True)
             rows = sonuc.veri or []
 
             # Yıl DESC, Periyot DESC, AdSoyad sıralaması
@@ -13,7 +13,7 @@
 • İzin      : Dönem aralığıyla kesişim (overlap) iş günü hesabı
 • Pasif     : AyrılışTarihi dönem içindeyse, bitiş = ayrılış
 • Kayıt     : Eski sil → yeni ekle → şua bakiye güncelle
-• Hesap     : hesaplamalar.py → sua_hak_edis_hesapla, is_gunu_hesapla
+• Hesap     : hesaplamalar.py → sua_hak_edis_hesapla, is_gunu_hesapla (IsTakvimi)
 """
 from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
@@ -31,6 +31,7 @@
 from core.di import get_fhsz_service
 from core.date_utils import parse_date
 from core.hesaplamalar import sua_hak_edis_hesapla, is_gunu_hesapla, tr_upper
+from core.is_takvimi import listeden_takvim
 from ui.styles import DarkTheme
 from ui.styles.icons import IconRenderer
 
@@ -659,9 +660,9 @@ def _hucre_degisti(self, item):
     def _kesisim_izin_gunu(self, kimlik, donem_bas, donem_bit):
         """
         Personelin izin kayıtlarıyla dönem aralığının kesişen
-        iş günlerini hesaplar (numpy busday_count).
+        iş günlerini hesaplar (IsTakvimi, aralıklar tek seferde).
         """
-        toplam = 0
+        baslar, bitler = [], []
         kimlik_str = str(kimlik).strip()
 
         for iz in self._all_izin:
@@ -675,14 +676,14 @@ def _kesisim_izin_gunu(self, kimlik, donem_bas, donem_bit):
             if not izin_bas or not izin_bit:
                 continue
 
-            # Kesişim aralığı
-            k_bas = max(donem_bas, izin_bas)
-            k_bit = min(donem_bit, izin_bit)
+            baslar.append(izin_bas)
+            bitler.append(izin_bit)
 
-            if k_bas <= k_bit:
-                toplam += is_gunu_hesapla(k_bas, k_bit, self._tatil_listesi_np)
-
-        return toplam
+        try:
+            return listeden_takvim(self._tatil_listesi_np).kesisim_is_gunu(
+                baslar, bitler, donem_bas, donem_bit)
+        except Exception:
+            return 0
 
     def _calc_personel_is_gunu(self, kimlik, donem_bas, donem_bit):
         """Personel için dönem iş günü (gross) hesabı."""
@@ -626,7 +626,7 @@ def load_data(self):
                 self._tatiller = []
 
             # ── İzin Kayıtları ──
-            self._all_izin = self._svc.get_tum_izin_giris().veri or [] if self._svc else []
+            self._all_izin = self._svc.get_tum_izin_giris(compact=True).veri or [] if self._svc else []
 
             # Yeniden eskiye sırala (çoklu tarih formatı)
             self._all_izin.sort(